@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark for the decryption backends.
+
+Creates a throwaway GnuPG home with a passphrase-less key and a synthetic
+password store, then times decrypting every entry through each backend.
+
+Usage:
+    python3 scripts/benchmark_decryption_backends.py [--entries N]
+"""
+
+import argparse
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from src.secrets.utils.decryption_backend import DECRYPTION_BACKENDS, find_gpg_binary  # noqa: E402
+
+KEY_UID = "Secrets Benchmark <benchmark@example.invalid>"
+
+
+def create_key(gpg: str, env: dict) -> None:
+    """Generate an unprotected key in the temporary GnuPG home."""
+    subprocess.run(
+        [gpg, "--batch", "--passphrase", "", "--quick-gen-key", KEY_UID, "default", "default", "never"],
+        env=env, check=True, capture_output=True,
+    )
+
+
+def create_store(gpg: str, env: dict, store_dir: Path, entries: int) -> list:
+    """Encrypt `entries` synthetic passwords into a store layout."""
+    (store_dir / ".gpg-id").write_text(KEY_UID + "\n")
+    paths = []
+    for i in range(entries):
+        path = f"folder{i % 10}/entry{i}"
+        target = store_dir / (path + ".gpg")
+        target.parent.mkdir(parents=True, exist_ok=True)
+        subprocess.run(
+            [gpg, "--batch", "--yes", "--quiet", "-e", "-r", KEY_UID, "-o", str(target)],
+            input=f"password{i}\nusername: user{i}\nurl: https://site{i}.example.com\n".encode(),
+            env=env, check=True,
+        )
+        paths.append(path)
+    return paths
+
+
+def run_backend(name: str, store_dir: Path, env: dict, paths: list) -> tuple:
+    """Decrypt all entries with one backend, returning (seconds, failures)."""
+    backend = DECRYPTION_BACKENDS[name](str(store_dir), lambda: dict(env))
+    try:
+        start = time.perf_counter()
+        failures = sum(1 for _, (success, _) in backend.decrypt_many(paths) if not success)
+        return time.perf_counter() - start, failures
+    finally:
+        backend.close()
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark the decryption backends")
+    parser.add_argument("--entries", type=int, default=200, help="number of entries to create")
+    args = parser.parse_args()
+
+    gpg = find_gpg_binary()
+    if not shutil.which(gpg):
+        print("gpg is not installed", file=sys.stderr)
+        return 1
+
+    with tempfile.TemporaryDirectory(prefix="secrets-bench-") as tmp:
+        gnupg_home = Path(tmp) / "gnupg"
+        gnupg_home.mkdir(mode=0o700)
+        store_dir = Path(tmp) / "store"
+        store_dir.mkdir()
+
+        env = os.environ.copy()
+        env["GNUPGHOME"] = str(gnupg_home)
+        env["PASSWORD_STORE_DIR"] = str(store_dir)
+
+        print(f"Creating {args.entries} entries...")
+        create_key(gpg, env)
+        paths = create_store(gpg, env, store_dir, args.entries)
+
+        try:
+            for name in DECRYPTION_BACKENDS:
+                if name == "pass" and not shutil.which("pass"):
+                    print(f"{name:>6}: skipped (pass is not installed)")
+                    continue
+                elapsed, failures = run_backend(name, store_dir, env, paths)
+                rate = len(paths) / elapsed if elapsed else float("inf")
+                print(f"{name:>6}: {elapsed:8.3f}s  {rate:8.1f} entries/s  {failures} failures")
+        finally:
+            subprocess.run(["gpgconf", "--kill", "gpg-agent"], env=env, check=False)
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
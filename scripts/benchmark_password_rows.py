@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark for the password row widgets.
+
+Creates and fills PasswordEntryRow (template based) and LeanPasswordRow
+(built in code) rows the way the password tree binds them, adds them to an
+unshown window and measures them so their styles are computed, and reports
+rows per second for each.
+
+Needs a display and the compiled resources, i.e. a meson build directory:
+
+Usage:
+    python3 scripts/benchmark_password_rows.py [--rows N] [--gresource PATH]
+"""
+
+import argparse
+import os
+import sys
+import time
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+import gi  # noqa: E402
+gi.require_version("Gtk", "4.0")
+gi.require_version("Adw", "1")
+from gi.repository import Adw, Gio, Gtk  # noqa: E402
+
+DEFAULT_GRESOURCE = PROJECT_ROOT / "build" / "src" / "secrets" / "secrets.gresource"
+COLORS = ("#3584e4", "#33d17a", "#f6d32d", "#ff7800", "#e01b24", "#9141ac")
+
+
+def fill_rows(row_class, count: int, PasswordEntry) -> float:
+    """Create and bind `count` rows, returning the seconds it took."""
+    window = Gtk.Window()
+    box = Gtk.Box(orientation=Gtk.Orientation.VERTICAL)
+    window.set_child(box)
+
+    start = time.perf_counter()
+    for i in range(count):
+        row = row_class()
+        row.set_password_entry(PasswordEntry(path=f"folder{i % 10}/entry{i}"))
+        row.set_avatar_color_and_icon(COLORS[i % len(COLORS)], "dialog-password-symbolic")
+        row.set_bulk_processing_results(i % 3 == 0, i % 2 == 0)
+        box.append(row)
+    box.measure(Gtk.Orientation.VERTICAL, -1)
+    elapsed = time.perf_counter() - start
+
+    window.destroy()
+    return elapsed
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark the password row widgets")
+    parser.add_argument("--rows", type=int, default=2000, help="number of rows to create per widget")
+    parser.add_argument("--gresource", default=os.environ.get("SECRETS_RESOURCE_PATH", str(DEFAULT_GRESOURCE)),
+                        help="compiled secrets.gresource (for the row templates)")
+    args = parser.parse_args()
+
+    if not os.path.exists(args.gresource):
+        print(f"{args.gresource} not found; build the project with meson first", file=sys.stderr)
+        return 1
+    # Templates are looked up when the widget classes are defined
+    Gio.Resource._register(Gio.Resource.load(args.gresource))
+    Adw.init()
+
+    from src.secrets.models import PasswordEntry
+    from src.secrets.ui.widgets import LeanPasswordRow, PasswordEntryRow
+
+    # Warm up type registration and the icon theme
+    for row_class in (PasswordEntryRow, LeanPasswordRow):
+        fill_rows(row_class, 10, PasswordEntry)
+
+    results = {}
+    for row_class in (PasswordEntryRow, LeanPasswordRow):
+        elapsed = fill_rows(row_class, args.rows, PasswordEntry)
+        results[row_class.__name__] = elapsed
+        rate = args.rows / elapsed if elapsed else float("inf")
+        print(f"{row_class.__name__:>16}: {elapsed:8.3f}s  {rate:10.1f} rows/s")
+
+    speedup = results["PasswordEntryRow"] / results["LeanPasswordRow"] if results["LeanPasswordRow"] else float("inf")
+    print(f"{'speedup':>16}: {speedup:8.2f}x")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
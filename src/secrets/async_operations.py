@@ -3,11 +3,18 @@ Async operations and background task management.
 """
 import asyncio
 import threading
+import time
 from typing import Callable, Any, Optional, Tuple
 from concurrent.futures import ThreadPoolExecutor
 from gi.repository import GLib, GObject
 from .services import PasswordService
 from .managers import ToastManager
+from .utils.decrypt_scheduler import DecryptQueue
+
+
+# Matches per batch handed to the UI, and the longest a match waits for its batch
+SEARCH_BATCH_SIZE = 20
+SEARCH_BATCH_INTERVAL = 0.1
 
 
 class BackgroundTask(GObject.Object):
@@ -59,6 +66,8 @@ class AsyncPasswordOperations:
         self.toast_manager = toast_manager
         self.executor = ThreadPoolExecutor(max_workers=3)
         self._running_tasks = {}
+        # (task, queue) of the running content search
+        self._search: Optional[Tuple[BackgroundTask, DecryptQueue]] = None
     
     def load_passwords_async(self, callback: Callable[[bool, list], None]) -> BackgroundTask:
         """Load passwords asynchronously."""
@@ -96,36 +105,80 @@ class AsyncPasswordOperations:
         self.executor.submit(worker)
         return task
     
-    def search_passwords_async(self, query: str, callback: Callable[[bool, list], None]) -> BackgroundTask:
-        """Search passwords asynchronously."""
+    def search_passwords_async(self, query: str, callback: Callable[[bool, list], None],
+                               on_matches: Optional[Callable[[list], None]] = None) -> BackgroundTask:
+        """
+        Search entry content asynchronously.
+
+        Entries are decrypted in parallel and matching entries are passed to
+        on_matches in small batches as they are found; callback receives all
+        of them once the search is complete. Starting a new search cancels
+        the previous one, whose callbacks are then no longer called.
+        """
+        self.cancel_search()
         task = BackgroundTask("search_passwords", f"Searching for '{query}'...")
-        
+        queue = DecryptQueue()
+        self._search = (task, queue)
+
+        def deliver(batch):
+            if not task.is_cancelled and on_matches:
+                on_matches(batch)
+            return False
+
+        def finish(success, entries):
+            if not task.is_cancelled:
+                callback(success, entries)
+            return False
+
         def worker():
             try:
                 task.update_progress(0.2, "Starting search...")
-                
-                success, entries = self.password_service.search_entries(query)
-                
-                if not success:
-                    task.fail("Search failed")
-                    GLib.idle_add(lambda: callback(False, []))
+
+                if not query:
+                    entries = self.password_service.get_all_entries()
+                    task.complete(True, entries)
+                    GLib.idle_add(finish, True, entries)
                     return
-                
-                task.update_progress(0.8, f"Found {len(entries)} results")
-                task.update_progress(1.0, "Search complete")
+
+                entries = []
+                batch = []
+                last_flush = time.monotonic()
+                for entry in self.password_service.iter_search_entries(query, queue):
+                    entries.append(entry)
+                    batch.append(entry)
+                    # Hand matches to the UI in small batches rather than one idle call each
+                    now = time.monotonic()
+                    if len(batch) >= SEARCH_BATCH_SIZE or now - last_flush >= SEARCH_BATCH_INTERVAL:
+                        GLib.idle_add(deliver, batch)
+                        batch = []
+                        last_flush = now
+
+                if task.is_cancelled:
+                    return
+                if batch:
+                    GLib.idle_add(deliver, batch)
+
+                task.update_progress(1.0, f"Found {len(entries)} results")
                 task.complete(True, entries)
-                
-                GLib.idle_add(lambda: callback(True, entries))
-                
+                GLib.idle_add(finish, True, entries)
+
             except Exception as e:
                 error_msg = f"Search error: {e}"
                 task.fail(error_msg)
-                GLib.idle_add(lambda: callback(False, []))
-        
+                GLib.idle_add(finish, False, [])
+
         task.is_running = True
         self.executor.submit(worker)
         return task
-    
+
+    def cancel_search(self):
+        """Stop the running content search, if any."""
+        if self._search is not None:
+            task, queue = self._search
+            task.cancel()
+            queue.cancel()
+            self._search = None
+
     def get_entry_details_async(self, path: str, callback: Callable[[bool, Any], None]) -> BackgroundTask:
         """Get password entry details asynchronously."""
         task = BackgroundTask("get_details", f"Loading details for {path}...")
@@ -229,6 +282,7 @@ class AsyncPasswordOperations:
     
     def shutdown(self):
         """Shutdown the executor and cancel running tasks."""
+        self.cancel_search()
         self.executor.shutdown(wait=False)
 
 
@@ -1,182 +1,563 @@
 """
 Password Content Cache System for storing TOTP/URL detection results.
 Provides encrypted caching to avoid re-decrypting passwords on every app start.
+
+Everything written to disk is encrypted to the store's root .gpg-id through
+the store's GPG backend, so a warm start needs a single decryption of the
+snapshot instead of one per entry.
+
+Lookups are served from memory. Mutations are written behind: they are queued
+and a background flusher encrypts each batch into a journal segment next to
+the snapshot. Once the journal holds more records than the cache has entries,
+or too many segments, it is compacted into a new snapshot (written to a
+temporary file and atomically renamed); closing the cache compacts as well.
+Every record carries a sequence number and the snapshot stores the last one
+it includes, so loading decrypts the snapshot and replays only newer records.
+A crash at any point loses at most the mutations that were still queued.
+
+Entries are keyed on the git blob id of the encrypted file, so they survive
+git pulls, fresh clones and checkouts that rewrite files without changing
+their ciphertext. The file's size and mtime are stored alongside so that
+unchanged files are validated without reading them.
 """
 
 import os
 import json
 import time
+import atexit
 import hashlib
-from typing import Dict, Optional, Tuple, Any
+import threading
+import subprocess
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Optional, Tuple, Any, List, Set, Iterable
 from ..logging_system import get_logger, LogCategory
 
 
+def git_blob_id(data: bytes) -> str:
+    """The id git gives a blob with this content (SHA-1 of header and data)."""
+    return hashlib.sha1(b"blob %d\0" % len(data) + data).hexdigest()
+
+
 class PasswordContentCache:
     """
     Encrypted cache for password content analysis results (TOTP, URL detection).
     Stores results to avoid re-decrypting passwords on every app startup.
     """
-    
+
+    CACHE_VERSION = '3.0'
+    IGNORED_DIRS = {'.git', '.secrets-cache'}
+    FLUSH_INTERVAL = 5.0  # Seconds between write-behind flushes
+    MIN_COMPACTION_RECORDS = 1000  # Journal records tolerated regardless of cache size
+    MAX_JOURNAL_SEGMENTS = 8  # Each segment costs one decryption at startup
+
     def __init__(self, password_store):
         self.password_store = password_store
         self.logger = get_logger(LogCategory.SECURITY, "PasswordContentCache")
         self._cache = {}
+        self._cache_dir = None
         self._cache_file = None
+        self._backend = getattr(password_store, 'decryption_backend', None)
+
+        # Write-behind state: queued journal records and the flusher thread
+        self._lock = threading.Lock()
+        self._io_lock = threading.Lock()
+        self._pending: List[Dict[str, Any]] = []
+        self._segments: List[str] = []
+        self._journal_records = 0
+        self._seq = 0  # Sequence number of the latest mutation
+        self._snapshot_seq = 0  # Latest mutation included in the snapshot
+        self._wakeup = threading.Event()
+        self._closed = False
+        self._flusher = None
+
         self._initialize_cache_file()
         self._load_cache()
-    
+
+        if self._cache_file:
+            self._flusher = threading.Thread(target=self._flush_loop, daemon=True,
+                                             name="content-cache-flusher")
+            self._flusher.start()
+            atexit.register(self.close)
+
     def _initialize_cache_file(self):
         """Initialize the cache file path in the password store directory."""
-        if hasattr(self.password_store, 'store_dir') and self.password_store.store_dir:
-            cache_dir = os.path.join(self.password_store.store_dir, '.secrets-cache')
-            os.makedirs(cache_dir, exist_ok=True)
-            self._cache_file = os.path.join(cache_dir, 'content_cache.json')
-        else:
+        if not (hasattr(self.password_store, 'store_dir') and self.password_store.store_dir):
             self.logger.warning("Password store directory not available, cache disabled")
-    
+            return
+        if self._backend is None:
+            self.logger.warning("No GPG backend available, content cache will not be saved")
+            return
+        self._cache_dir = os.path.join(self.password_store.store_dir, '.secrets-cache')
+        os.makedirs(self._cache_dir, exist_ok=True)
+        self._cache_file = os.path.join(self._cache_dir, 'content_cache.snapshot')
+
+    def _segment_files(self) -> List[str]:
+        """Encrypted journal segments on disk, oldest first."""
+        prefix = 'content_cache.journal.'
+        return sorted(os.path.join(self._cache_dir, name) for name in os.listdir(self._cache_dir)
+                      if name.startswith(prefix) and name[len(prefix):].isdigit())
+
+    def _legacy_files(self) -> List[str]:
+        """Plaintext cache files written by earlier versions."""
+        return [path for path in (os.path.join(self._cache_dir, 'content_cache.json'),
+                                  os.path.join(self._cache_dir, 'content_cache.journal'))
+                if os.path.exists(path)]
+
     def _load_cache(self):
-        """Load existing cache from file."""
-        if not self._cache_file or not os.path.exists(self._cache_file):
+        """Decrypt the snapshot and replay any journal segments on top of it."""
+        if not self._cache_file:
             return
-        
-        try:
-            with open(self._cache_file, 'r') as f:
-                data = json.load(f)
+
+        if os.path.exists(self._cache_file):
+            success, output = self._backend.decrypt_file(self._cache_file)
+            if not success:
+                # Keep the files for the next start rather than overwriting them
+                self.logger.warning(f"Could not decrypt content cache, not saving it this session: {output}")
+                self._cache_file = None
+                return
+            try:
+                data = json.loads(output)
                 self._cache = data.get('cache', {})
-                
-            self.logger.debug(f"Loaded content cache with {len(self._cache)} entries")
-            
-        except Exception as e:
-            self.logger.warning(f"Failed to load content cache: {e}")
-            self._cache = {}
-    
-    def _save_cache(self):
-        """Save cache to file."""
+                self._snapshot_seq = self._seq = data.get('seq', 0)
+            except ValueError as e:
+                self.logger.warning(f"Failed to load content cache: {e}")
+                self._cache = {}
+        else:
+            self._import_legacy_files()
+
+        replayed = self._replay_journal()
+        self.logger.debug(f"Loaded content cache with {len(self._cache)} entries "
+                          f"({replayed} journal records replayed)")
+
+        # Search tokens were saved by an earlier version; they are only kept
+        # in memory while unlocked, so rewrite the snapshot without them
+        scrubbed = 0
+        for entry in self._cache.values():
+            if entry.pop('tokens', None) is not None:
+                scrubbed += 1
+
+        # Leave a single snapshot so the next start needs one decryption
+        if self._segments or self._legacy_files() or scrubbed:
+            self._compact()
+
+    def _import_legacy_files(self):
+        """Load a plaintext cache written by an earlier version; it is removed on compaction."""
+        legacy_snapshot = os.path.join(self._cache_dir, 'content_cache.json')
+        if os.path.exists(legacy_snapshot):
+            try:
+                with open(legacy_snapshot, 'r') as f:
+                    data = json.load(f)
+                    self._cache = data.get('cache', {})
+                    self._snapshot_seq = self._seq = data.get('seq', 0)
+            except Exception as e:
+                self.logger.warning(f"Failed to load content cache: {e}")
+                self._cache = {}
+
+        legacy_journal = os.path.join(self._cache_dir, 'content_cache.journal')
+        if os.path.exists(legacy_journal):
+            try:
+                with open(legacy_journal, 'r') as f:
+                    self._replay_lines(f)
+            except Exception as e:
+                self.logger.warning(f"Failed to replay content cache journal: {e}")
+
+    def _replay_journal(self) -> int:
+        """Decrypt journal segments and apply them; returns the number of records read."""
+        self._segments = self._segment_files()
+        replayed = 0
+        for segment in self._segments:
+            success, output = self._backend.decrypt_file(segment)
+            if not success:
+                self.logger.warning(f"Could not decrypt content cache journal segment: {output}")
+                break
+            replayed += self._replay_lines(output.splitlines())
+
+        self._journal_records = replayed
+        return replayed
+
+    def _replay_lines(self, lines) -> int:
+        """Apply JSON-lines journal records newer than the snapshot."""
+        replayed = 0
+        for line in lines:
+            try:
+                record = json.loads(line)
+            except ValueError:
+                # A torn write can only affect the tail; nothing after it is valid
+                self.logger.warning("Ignoring truncated content cache journal record")
+                break
+            # Records already folded into the snapshot are skipped
+            if record.get('seq', 0) > self._snapshot_seq:
+                self._apply(record)
+                self._seq = max(self._seq, record['seq'])
+            replayed += 1
+        return replayed
+
+    def _apply(self, record: Dict[str, Any]):
+        """Apply one journal record to the in-memory cache."""
+        op = record.get('op')
+        if op == 'set':
+            if 'entries' in record:
+                self._cache.update(record['entries'])
+            else:
+                self._cache[record['path']] = record['entry']
+        elif op == 'del':
+            for path in record.get('paths', [record.get('path')]):
+                self._cache.pop(path, None)
+        elif op == 'clear':
+            self._cache.clear()
+
+    def _record(self, record: Dict[str, Any]):
+        """Apply a mutation in memory and queue its journal record for the flusher."""
+        with self._lock:
+            # Recording under the same lock keeps the journal in mutation order
+            self._seq += 1
+            record['seq'] = self._seq
+            self._apply(record)
+            if self._cache_file:
+                self._pending.append(record)
+        self._wakeup.set()
+
+    def _flush_loop(self):
+        """Background flusher: batch queued records into the journal."""
+        while not self._closed:
+            self._wakeup.wait()
+            if self._closed:
+                break
+            # Let a burst of mutations accumulate into one write
+            time.sleep(self.FLUSH_INTERVAL)
+            self._wakeup.clear()
+            self.flush()
+
+    def flush(self):
+        """
+        Write queued mutations to disk now as one encrypted journal segment,
+        compacting the journal if it has grown too large.
+        """
         if not self._cache_file:
             return
-        
-        try:
+
+        with self._io_lock:
+            with self._lock:
+                records, self._pending = self._pending, []
+            if not records:
+                return
+
+            segment = os.path.join(self._cache_dir, f"content_cache.journal.{records[0]['seq']:012d}")
+            content = ''.join(json.dumps(record, separators=(',', ':')) + '\n' for record in records)
+            success, error = self._backend.encrypt_file(content, segment)
+            if not success:
+                self.logger.error(f"Failed to write content cache journal: {error}")
+                # Keep the records so the next flush (or a compaction) persists them
+                with self._lock:
+                    self._pending = records + self._pending
+                return
+            self._segments.append(segment)
+            self._journal_records += len(records)
+
+            if self._needs_compaction():
+                self._compact()
+
+    def _needs_compaction(self) -> bool:
+        """Compact once replaying the journal costs more than reading the cache."""
+        return (len(self._segments) >= self.MAX_JOURNAL_SEGMENTS
+                or self._journal_records > max(self.MIN_COMPACTION_RECORDS, len(self._cache)))
+
+    def _compact(self):
+        """Write the current cache as a new encrypted snapshot and drop the journal."""
+        with self._lock:
+            # The snapshot includes the queued mutations, so once it is written
+            # they need no journaling
+            snapshotted = len(self._pending)
             cache_data = {
-                'version': '1.0',
+                'version': self.CACHE_VERSION,
                 'created': time.time(),
-                'cache': self._cache
+                'seq': self._seq,
+                'cache': dict(self._cache)
             }
-            
-            # Write to temporary file first, then rename for atomic operation
-            temp_file = self._cache_file + '.tmp'
-            with open(temp_file, 'w') as f:
-                json.dump(cache_data, f, indent=2)
-            
-            os.rename(temp_file, self._cache_file)
-            self.logger.debug(f"Saved content cache with {len(self._cache)} entries")
-            
-        except Exception as e:
-            self.logger.error(f"Failed to save content cache: {e}")
-    
+
+        # Written to a temporary file and renamed into place by the backend
+        success, error = self._backend.encrypt_file(
+            json.dumps(cache_data, separators=(',', ':')), self._cache_file
+        )
+        if not success:
+            self.logger.error(f"Failed to save content cache: {error}")
+            return
+
+        # Segments carry sequence numbers at or below the snapshot's, so a
+        # crash before they are removed is harmless
+        for path in self._segments + self._legacy_files():
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+        self._segments = []
+        self._journal_records = 0
+        self._snapshot_seq = cache_data['seq']
+        with self._lock:
+            del self._pending[:snapshotted]
+        self.logger.debug(f"Compacted content cache with {len(cache_data['cache'])} entries")
+
+    def close(self):
+        """Flush queued mutations into a single snapshot and stop the background flusher."""
+        if self._closed:
+            return
+        self._closed = True
+        self._wakeup.set()
+        with self._io_lock:
+            if self._cache_file and (self._pending or self._segments):
+                self._compact()
+
     def _get_file_hash(self, password_path: str) -> Optional[str]:
-        """Get hash of password file for cache invalidation."""
+        """Get the git blob id of a password file's ciphertext."""
         try:
             if hasattr(self.password_store, 'store_dir') and self.password_store.store_dir:
                 file_path = os.path.join(self.password_store.store_dir, password_path + '.gpg')
-                if os.path.exists(file_path):
-                    stat = os.stat(file_path)
-                    # Use file size and modification time for hash
-                    content = f"{stat.st_size}:{stat.st_mtime}"
-                    return hashlib.md5(content.encode()).hexdigest()
+                with open(file_path, 'rb') as f:
+                    return git_blob_id(f.read())
             return None
         except Exception:
             return None
-    
+
+    @staticmethod
+    def _stat_key(stat: os.stat_result) -> str:
+        """Size and modification time, used to skip re-hashing unchanged files."""
+        return f"{stat.st_size}:{stat.st_mtime_ns}"
+
+    def _get_stat_key(self, password_path: str) -> Optional[str]:
+        try:
+            file_path = os.path.join(self.password_store.store_dir, password_path + '.gpg')
+            return self._stat_key(os.stat(file_path))
+        except Exception:
+            return None
+
+    def _scan_file_stats(self) -> Dict[str, str]:
+        """Stat every password file of the store in a single os.scandir sweep."""
+        store_dir = getattr(self.password_store, 'store_dir', None)
+        stats = {}
+        if not store_dir:
+            return stats
+
+        stack = ['']
+        while stack:
+            folder = stack.pop()
+            try:
+                with os.scandir(os.path.join(store_dir, folder)) as it:
+                    for dir_entry in it:
+                        relative = f"{folder}/{dir_entry.name}" if folder else dir_entry.name
+                        try:
+                            if dir_entry.is_dir(follow_symlinks=False):
+                                if dir_entry.name not in self.IGNORED_DIRS:
+                                    stack.append(relative)
+                            elif dir_entry.name.endswith('.gpg'):
+                                stats[relative[:-4]] = self._stat_key(dir_entry.stat())
+                        except OSError:
+                            continue
+            except OSError as e:
+                self.logger.debug(f"Could not scan {folder or 'store'} for cache validation: {e}")
+        return stats
+
+    def _compute_blob_ids(self, password_paths: List[str]) -> Dict[str, str]:
+        """
+        Get the git blob ids of many password files at once.
+
+        Ids of files that are unmodified in a git store are read from the git
+        index with one `git ls-files`; the remaining files are hashed in
+        parallel.
+        """
+        blob_ids = {}
+        if not password_paths:
+            return blob_ids
+
+        tracked = self._git_index_blob_ids()
+        to_hash = []
+        for path in password_paths:
+            if path in tracked:
+                blob_ids[path] = tracked[path]
+            else:
+                to_hash.append(path)
+
+        if to_hash:
+            workers = min(8, os.cpu_count() or 2, len(to_hash))
+            with ThreadPoolExecutor(max_workers=workers) as pool:
+                for path, blob_id in zip(to_hash, pool.map(self._get_file_hash, to_hash)):
+                    if blob_id is not None:
+                        blob_ids[path] = blob_id
+        return blob_ids
+
+    def _git_index_blob_ids(self) -> Dict[str, str]:
+        """
+        Blob ids of the store's password files from the git index, excluding
+        files whose working copy differs from the index.
+        """
+        store_dir = getattr(self.password_store, 'store_dir', None)
+        if not store_dir or not os.path.exists(os.path.join(store_dir, '.git')):
+            return {}
+
+        try:
+            staged = self._run_git(store_dir, ['ls-files', '-s', '-z', '--', '*.gpg'])
+            modified = self._run_git(store_dir, ['ls-files', '-m', '-z', '--', '*.gpg'])
+        except (OSError, subprocess.SubprocessError) as e:
+            self.logger.debug(f"Could not read blob ids from git, hashing files instead: {e}")
+            return {}
+
+        modified_paths = set(modified.split('\0'))
+        blob_ids = {}
+        for record in staged.split('\0'):
+            # "<mode> <object> <stage>\t<path>"
+            info, _, path = record.partition('\t')
+            fields = info.split()
+            if len(fields) != 3 or fields[2] != '0' or path in modified_paths:
+                continue
+            blob_ids[path[:-4]] = fields[1]
+        return blob_ids
+
+    @staticmethod
+    def _run_git(store_dir: str, args: List[str]) -> str:
+        result = subprocess.run(['git', '-C', store_dir] + args, capture_output=True,
+                                text=True, timeout=30, check=True)
+        return result.stdout
+
+    def validate_all(self, password_paths: Optional[Iterable[str]] = None) -> Set[str]:
+        """
+        Validate every cached entry against the store in one directory sweep.
+
+        Entries whose size and mtime are unchanged are valid as they are.
+        For the others the ciphertext's blob id is computed in bulk: entries
+        whose ciphertext is unchanged (e.g. after a clone, checkout or touch)
+        are kept and re-stamped, the rest are dropped. Both updates are
+        written as single journal records.
+
+        Args:
+            password_paths: Paths the caller needs content info for (defaults
+                to every password in the store)
+
+        Returns:
+            The subset of password_paths without a valid cache entry
+        """
+        file_stats = self._scan_file_stats()
+
+        with self._lock:
+            stale = [path for path, entry in self._cache.items() if path not in file_stats]
+            changed = {path: entry for path, entry in self._cache.items()
+                       if path in file_stats and entry.get('stat') != file_stats[path]}
+
+        restamped = {}
+        blob_ids = self._compute_blob_ids(list(changed))
+        for path, entry in changed.items():
+            if blob_ids.get(path) is not None and blob_ids[path] == entry.get('file_hash'):
+                restamped[path] = dict(entry, stat=file_stats[path])
+            else:
+                stale.append(path)
+
+        if stale:
+            self._record({'op': 'del', 'paths': stale})
+            self.logger.debug(f"Dropped {len(stale)} stale content cache entries")
+        if restamped:
+            self._record({'op': 'set', 'entries': restamped})
+            self.logger.debug(f"Kept {len(restamped)} content cache entries with unchanged ciphertext")
+
+        if password_paths is None:
+            password_paths = file_stats
+        return {path for path in password_paths if path not in self._cache}
+
     def get_content_info(self, password_path: str) -> Optional[Dict[str, Any]]:
         """
         Get cached content info for a password.
         Returns None if not cached or cache is invalid.
         """
-        if password_path not in self._cache:
+        cached_entry = self._cache.get(password_path)
+        if cached_entry is None:
             return None
-        
-        cached_entry = self._cache[password_path]
-        
-        # Check if cache is still valid by comparing file hash
-        current_hash = self._get_file_hash(password_path)
-        if current_hash != cached_entry.get('file_hash'):
-            # Cache is stale, remove it
-            del self._cache[password_path]
-            self._save_cache()
-            self.logger.debug(f"Cache invalidated for {password_path} (stale hash)")
-            return None
-        
+
+        # Check if cache is still valid: unchanged stat, or unchanged ciphertext
+        stat_key = self._get_stat_key(password_path)
+        if stat_key is None or stat_key != cached_entry.get('stat'):
+            current_hash = self._get_file_hash(password_path)
+            if current_hash != cached_entry.get('file_hash'):
+                # Cache is stale, remove it
+                self.invalidate(password_path)
+                self.logger.debug(f"Cache invalidated for {password_path} (stale hash)")
+                return None
+            self._record({'op': 'set', 'path': password_path,
+                          'entry': dict(cached_entry, stat=stat_key)})
+
         content_info = {
             'has_totp': cached_entry.get('has_totp', False),
             'has_url': cached_entry.get('has_url', False),
             'url': cached_entry.get('url'),
+            'username': cached_entry.get('username'),
             'cached_at': cached_entry.get('cached_at')
         }
-        
+
         return content_info
-    
-    def set_content_info(self, password_path: str, has_totp: bool, has_url: bool, url: Optional[str] = None):
+
+    def set_content_info(self, password_path: str, has_totp: bool, has_url: bool,
+                         url: Optional[str] = None, username: Optional[str] = None):
         """Cache content info for a password."""
         file_hash = self._get_file_hash(password_path)
         if file_hash is None:
             self.logger.warning(f"Could not get file hash for {password_path}, not caching")
             return
-        
-        self._cache[password_path] = {
+
+        entry = {
             'has_totp': has_totp,
             'has_url': has_url,
             'url': url,
+            'username': username,
             'file_hash': file_hash,
+            'stat': self._get_stat_key(password_path),
             'cached_at': time.time()
         }
-        
-        self._save_cache()
+
+        self._record({'op': 'set', 'path': password_path, 'entry': entry})
         self.logger.debug(f"Cached content info for {password_path}")
-    
+
     def invalidate(self, password_path: str):
         """Invalidate cache entry for a specific password."""
         if password_path in self._cache:
-            del self._cache[password_path]
-            self._save_cache()
+            self._record({'op': 'del', 'path': password_path})
             self.logger.debug(f"Invalidated cache for {password_path}")
-    
+
     def get_uncached_passwords(self, password_list: list) -> list:
         """Get list of passwords that need content processing (now processes ALL passwords)."""
         # Process all passwords to ensure complete TOTP/URL detection
         cached_count = 0
         empty_cached_count = 0
         never_cached_count = 0
-        
+
+        uncached = self.validate_all(password_list)
         for password_path in password_list:
-            content_info = self.get_content_info(password_path)
+            content_info = None if password_path in uncached else self._cache.get(password_path)
             if content_info is None:
                 never_cached_count += 1
             else:
                 # Check if this is a meaningful cache entry or just defaults
                 has_meaningful_content = (
-                    content_info.get('has_totp', False) or 
-                    content_info.get('has_url', False) or 
+                    content_info.get('has_totp', False) or
+                    content_info.get('has_url', False) or
                     content_info.get('url')
                 )
-                
+
                 if has_meaningful_content:
                     cached_count += 1
                 else:
                     empty_cached_count += 1
-        
+
         self.logger.info(f"Cache analysis: {cached_count} meaningfully cached, {empty_cached_count} empty cached, {never_cached_count} never cached, {len(password_list)} total will be processed")
         # Return all passwords for processing to ensure complete detection
         return password_list.copy()
-    
+
     def clear_all(self):
         """Clear all cached content."""
-        self._cache.clear()
-        self._save_cache()
+        self._record({'op': 'clear'})
         self.logger.info("Cleared all content cache")
-    
+
     def get_cache_stats(self) -> Dict[str, int]:
         """Get cache statistics."""
         return {
             'total_entries': len(self._cache),
-            'cache_file_exists': os.path.exists(self._cache_file) if self._cache_file else False
-        }
\ No newline at end of file
+            'cache_file_exists': os.path.exists(self._cache_file) if self._cache_file else False,
+            'journal_records': self._journal_records,
+            'journal_segments': len(self._segments),
+            'pending_writes': len(self._pending)
+        }
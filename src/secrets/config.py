@@ -8,7 +8,7 @@ import json
 import logging
 from typing import Any, Dict, Optional
 from pathlib import Path
-from dataclasses import dataclass, asdict
+from dataclasses import dataclass, asdict, field
 from gi.repository import GLib, Adw
 
 from .i18n import get_translation_function
@@ -121,6 +121,11 @@ class GitConfig:
     # Advanced settings
     auto_commit_on_changes: bool = False
     commit_message_template: str = "Update passwords from Secrets app"
+    # Saves, removals and renames are committed together once the store has
+    # been idle this long, or after commit_max_changes changes (0 = one
+    # commit per change through `pass`)
+    commit_idle_seconds: float = 5.0
+    commit_max_changes: int = 20
     show_git_notifications: bool = True
     check_remote_on_startup: bool = True
 
@@ -174,6 +179,16 @@ class LoggingConfig:
     disk_usage_critical_threshold_percent: int = 95
 
 
+@dataclass
+class PerformanceConfig:
+    """Performance-related configuration."""
+    # How entries are decrypted: "gpg" calls gpg directly on the .gpg files,
+    # "pass" goes through the `pass` shell wrapper
+    decryption_backend: str = "gpg"
+    # Upper bound for concurrent decrypts in bulk reads (0 = number of CPUs)
+    max_decryption_workers: int = 0
+
+
 @dataclass
 class AppConfig:
     """Main application configuration."""
@@ -184,6 +199,7 @@ class AppConfig:
     compliance: ComplianceConfig
     logging: LoggingConfig
     last_selected_path: Optional[str] = None
+    performance: PerformanceConfig = field(default_factory=PerformanceConfig)
     
     def __post_init__(self):
         """Ensure all nested configs are proper dataclass instances."""
@@ -199,6 +215,8 @@ class AppConfig:
             self.compliance = ComplianceConfig(**self.compliance)
         if isinstance(self.logging, dict):
             self.logging = LoggingConfig(**self.logging)
+        if isinstance(self.performance, dict):
+            self.performance = PerformanceConfig(**self.performance)
 
 
 class ConfigManager:
@@ -261,7 +279,8 @@ class ConfigManager:
             search=SearchConfig(),
             git=GitConfig(),
             compliance=ComplianceConfig(),
-            logging=LoggingConfig()
+            logging=LoggingConfig(),
+            performance=PerformanceConfig()
         )
     
     def get_config(self) -> AppConfig:
@@ -310,6 +329,14 @@ class ConfigManager:
                 setattr(config.git, key, value)
         self.save_config(config)
     
+    def update_performance_config(self, **kwargs):
+        """Update performance configuration."""
+        config = self.get_config()
+        for key, value in kwargs.items():
+            if hasattr(config.performance, key):
+                setattr(config.performance, key, value)
+        self.save_config(config)
+    
     def update_logging_config(self, **kwargs):
         """Update logging configuration and apply changes to logging system."""
         config = self.get_config()
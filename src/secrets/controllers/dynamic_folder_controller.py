@@ -1,37 +1,82 @@
 """
-Dynamic Folder Controller for the redesigned UI with AdwExpanderRow folders.
-This controller dynamically creates folder and password rows based on the password store data.
+Dynamic Folder Controller for the redesigned UI.
+This controller shows the password store's folders and passwords in a Gtk.ListView
+over a Gtk.TreeListModel. Only the rows near the viewport exist as widgets; they are
+recycled as the list scrolls.
 """
 
 import os
 import threading
-from gi.repository import Gtk, Adw, GLib, Gdk, GdkPixbuf
-from ..models import PasswordEntry
-from ..ui.widgets import FolderExpanderRow
+from urllib.parse import urlparse
+from gi.repository import Gtk, Adw, GLib, Gdk, GdkPixbuf, Gio
+from ..models import PasswordEntry, PasswordListItem
+from ..ui.widgets import FolderListRow, LeanPasswordRow
 from ..managers import get_favicon_manager
 from ..logging_system import get_logger, LogCategory
+from ..utils.decrypt_scheduler import DecryptQueue
+from ..utils.fuzzy_index import FuzzyPathIndex
+from ..utils.field_query import FieldIndex, parse_query
+from ..utils.frame_scheduler import FrameScheduler
+from ..utils.search_filter import PathSearchFilter
+from ..utils.tree_diff import diff_tree, entry_fingerprints, splice_ops
+from ..cache.content_cache import PasswordContentCache
+
+# Root items created per scheduled population step
+ROOT_ITEMS_PER_CHUNK = 200
 
 
 class DynamicFolderController:
     """Controller for managing dynamically created folder structure in the sidebar."""
     
-    def __init__(self, password_store, toast_manager, folders_listbox, search_entry, on_selection_changed=None, parent_window=None, password_list_scrolled=None, welcome_status_page=None):
+    def __init__(self, password_store, toast_manager, list_view, search_entry, on_selection_changed=None, parent_window=None, password_list_scrolled=None, welcome_status_page=None):
         # Initialize logger for this controller
         self.logger = get_logger(LogCategory.UI, "DynamicFolderController")
         
         self.password_store = password_store
         self.toast_manager = toast_manager
-        self.folders_listbox = folders_listbox
+        self.list_view = list_view
         self.search_entry = search_entry
         self.on_selection_changed = on_selection_changed
         self.parent_window = parent_window
         self.password_list_scrolled = password_list_scrolled
         self.welcome_status_page = welcome_status_page
         
-        # Store references to created widgets
-        self.folder_rows = {}  # folder_path -> AdwExpanderRow
-        self.password_rows = {}  # password_path -> AdwActionRow
+        # Rows currently bound in the list view; rows are recycled, so only
+        # entries near the viewport have one
+        self.folder_rows = {}  # folder_path -> FolderListRow
+        self.password_rows = {}  # password_path -> LeanPasswordRow
         self.current_selection = None
+
+        # Passwords directly in each folder; a folder's child model is built
+        # from its list when the folder row is first shown
+        self._folder_children = {}
+        self._password_paths = set()
+        self._folder_positions = {}  # folder_path -> position in the root model
+        self._expanded_folders = set()
+        # What the root model holds, as (path, is_folder), and the child
+        # models handed to the tree, so a reload can splice in its changes
+        self._root_entries = []
+        self._child_models = {}  # folder_path -> Gtk.StringList
+        # Ciphertext fingerprints of the shown entries, to tell edited and
+        # moved entries apart on reload
+        self._entry_fingerprints = {}
+        self._loaded_store_dir = None
+        # Bulk processing results per password, (has_totp, has_url, url), and
+        # the favicons they led to per host, applied whenever a row is bound
+        self._processing_results = {}
+        self._favicons = {}
+        self._password_metadata_cache = {}
+        self._folder_metadata_cache = {}
+        self._password_url_cache = {}
+
+        # Lowercased path indexes for search, rebuilt on every load; the
+        # ranked paths of the last search (best match first)
+        self._password_index = FuzzyPathIndex()
+        self._folder_index = FuzzyPathIndex()
+        self._search_results = []
+        # Folders and tags per entry, plus username/URL/TOTP as the bulk
+        # processing decrypts entries, for queries like "user:alice has:totp"
+        self._field_index = FieldIndex()
         
         # Threading for password loading
         self._loading_thread = None
@@ -41,46 +86,276 @@ class DynamicFolderController:
         self._bulk_processing_thread = None
         self._bulk_processing_active = False
         self._bulk_processing_results = {}
-        
-        # Virtual scrolling optimization
-        self._virtual_scrolling_enabled = True
-        self._viewport_size = 20  # Number of items to render at once
-        self._scroll_buffer = 5   # Extra items to render above/below viewport
-        self._virtual_items = []  # All items data (not widgets)
-        self._visible_range = (0, 0)  # (start_index, end_index) of visible items
-        
+
+        # Streaming TOTP/URL processing; the queue is reprioritized as the
+        # user scrolls or expands folders and cancelled on reload
+        self._decrypt_queue = None
+        self._reprioritize_source_id = None
+        # Encrypted snapshot of analysis results; created off the UI thread
+        # because loading it may prompt for the GPG passphrase
+        self._content_cache = None
+        self._content_cache_store_dir = None
+        # Filling the root model, decorating rows and applying favicons run
+        # from the list view's frame clock, within a per-frame time budget
+        self._ui_scheduler = FrameScheduler(self.list_view)
+        if self.password_list_scrolled:
+            self.password_list_scrolled.get_vadjustment().connect(
+                "value-changed", self._on_password_list_scrolled
+            )
+
+        self._build_list_view()
+
         # Connect search functionality
         if self.search_entry:
             self.search_entry.connect("search-changed", self._on_search_entry_changed)
+            self.search_entry.connect("activate", self._on_search_entry_activated)
     
+    def _build_list_view(self):
+        """Set up the models and row factory of the list view."""
+        # Folders, then root passwords; each folder expands to its passwords
+        self._root_store = Gio.ListStore.new(PasswordListItem)
+        # Shared by the root and every folder's model, so search filters the whole tree
+        self._search_filter = PathSearchFilter()
+        self._root_model = Gtk.FilterListModel.new(self._root_store, self._search_filter)
+
+        def create_child_model(item, user_data):
+            return self._create_child_model(item)
+
+        self._tree_model = Gtk.TreeListModel.new(
+            self._root_model,
+            passthrough=False,
+            autoexpand=False,
+            create_func=create_child_model,
+            user_data=None
+        )
+
+        factory = Gtk.SignalListItemFactory()
+        factory.connect("setup", self._on_list_item_setup)
+        factory.connect("bind", self._on_list_item_bind)
+        factory.connect("unbind", self._on_list_item_unbind)
+
+        self.list_view.set_model(Gtk.NoSelection.new(self._tree_model))
+        self.list_view.set_factory(factory)
+        self.list_view.connect("activate", self._on_list_view_activated)
+
+    def _create_child_model(self, item):
+        """The passwords of a folder, or None for passwords and empty folders."""
+        if not item.is_folder:
+            return None
+        password_paths = self._folder_children.get(item.full_path)
+        if not password_paths:
+            return None
+        # Also called just to find out whether a row can expand, so the
+        # children are plain strings rather than one GObject per password
+        string_list = Gtk.StringList.new(password_paths)
+        self._child_models[item.full_path] = string_list
+        return Gtk.FilterListModel.new(string_list, self._search_filter)
+
+    def _on_list_item_setup(self, factory, list_item):
+        """Create the recycled part of a row; folder and password rows are added on demand."""
+        expander = Gtk.TreeExpander()
+        expander._folder_row = None
+        expander._password_row = None
+        expander._expanded_handler = None
+        list_item.set_child(expander)
+
+    def _on_list_item_bind(self, factory, list_item):
+        """Show a folder or password in a recycled row."""
+        expander = list_item.get_child()
+        tree_row = list_item.get_item()
+        expander.set_list_row(tree_row)
+
+        item = tree_row.get_item()
+        if isinstance(item, Gtk.StringObject):
+            row = self._bind_password_row(expander, item.get_string())
+        elif item.is_folder:
+            row = self._bind_folder_row(expander, item.full_path)
+            expander._expanded_handler = tree_row.connect(
+                "notify::expanded", self._on_folder_expanded_changed, item.full_path
+            )
+        else:
+            row = self._bind_password_row(expander, item.full_path)
+        if expander.get_child() is not row:
+            expander.set_child(row)
+
+    def _on_list_item_unbind(self, factory, list_item):
+        """Forget a row that no longer shows its entry."""
+        expander = list_item.get_child()
+        if expander._expanded_handler is not None:
+            list_item.get_item().disconnect(expander._expanded_handler)
+            expander._expanded_handler = None
+
+        row = expander.get_child()
+        if isinstance(row, FolderListRow):
+            rows, path = self.folder_rows, row.get_folder_path()
+        else:
+            rows, path = self.password_rows, row.path
+        if rows.get(path) is row:
+            del rows[path]
+        expander.set_list_row(None)
+
+    def _bind_folder_row(self, expander, folder_path):
+        """Show a folder in the row widget of a list item."""
+        folder_row = expander._folder_row
+        if folder_row is None:
+            folder_row = expander._folder_row = self._create_folder_row()
+        self._bind_folder_row_data(folder_row, folder_path)
+
+        self.folder_rows[folder_path] = folder_row
+        return folder_row
+
+    def _bind_folder_row_data(self, folder_row, folder_path):
+        """Show a folder's name, password count and avatar in a folder row."""
+        folder_row.set_folder(folder_path, len(self._folder_children.get(folder_path, ())))
+
+        # Set avatar color and icon from cached metadata
+        folder_metadata = self._folder_metadata_cache.get(folder_path)
+        if folder_metadata:
+            folder_color = folder_metadata["color"]
+            folder_icon = folder_metadata["icon"]
+        else:
+            # Fallback to default values if cache miss
+            folder_color = "#f66151"  # Default red
+            folder_icon = "folder-symbolic"
+        folder_row.set_avatar_color_and_icon(folder_color, folder_icon)
+
+    def _create_folder_row(self):
+        """Create a folder row; its signals act on whichever folder it shows."""
+        folder_row = FolderListRow()
+        folder_row.connect("add-password-to-folder",
+                           lambda row: self._on_add_password_to_folder_clicked(row, row.get_folder_path()))
+        folder_row.connect("add-subfolder",
+                           lambda row: self._on_add_subfolder_clicked(row, row.get_folder_path()))
+        folder_row.connect("edit-folder",
+                           lambda row: self._on_folder_edit_clicked(row, row.get_folder_path(), row.get_folder_path()))
+        folder_row.connect("remove-folder",
+                           lambda row: self._on_folder_delete_clicked(row, row.get_folder_path(), row.get_folder_path()))
+        return folder_row
+
+    def _bind_password_row(self, expander, password_path):
+        """Show a password in the row widget of a list item."""
+        password_row = expander._password_row
+        if password_row is None:
+            password_row = expander._password_row = self._create_password_row()
+
+        password_row.set_password_entry(PasswordEntry(path=password_path, is_folder=False))
+        self._decorate_password_row(password_row, password_path)
+
+        self.password_rows[password_path] = password_row
+        return password_row
+
+    def _decorate_password_row(self, password_row, password_path):
+        """Show a password's avatar and what bulk processing found about it."""
+        # Set avatar color, icon and cached favicon data from cached metadata
+        password_metadata = self._password_metadata_cache.get(password_path)
+        if password_metadata:
+            password_color = password_metadata["color"]
+            password_icon = password_metadata["icon"]
+            favicon_data = password_metadata["favicon_data"]
+        else:
+            # Fallback to default values if cache miss
+            password_color = "#3584e4"  # Default blue
+            password_icon = "dialog-password-symbolic"
+            favicon_data = None
+        password_row.set_avatar_color_and_icon(password_color, password_icon, None, favicon_data)
+        # URL loaded lazily if needed (e.g. to visit it before bulk processing found it)
+        password_row.set_lazy_url_loader(self._get_password_url_lazy, password_path)
+
+        # Decoration found by bulk processing so far
+        has_totp, has_url, url = self._processing_results.get(password_path, (False, False, None))
+        password_row.set_bulk_processing_results(has_totp, has_url)
+        if url:
+            password_row.set_url(url)
+            favicon = self._favicons.get(self._favicon_key(url))
+            if favicon is not None:
+                password_row.show_favicon(favicon)
+
+    def _create_password_row(self):
+        """Create a password row; its signals act on whichever password it shows."""
+        password_row = LeanPasswordRow()
+        password_row.connect("copy-username", lambda row: self._on_copy_username_clicked(row, row.path))
+        password_row.connect("copy-password", lambda row: self._on_copy_password_clicked(row, row.path))
+        password_row.connect("copy-totp", lambda row: self._on_copy_totp_clicked(row, row.path))
+        password_row.connect("visit-url", self._on_visit_url_clicked)
+        password_row.connect("edit-password", self._on_edit_password_clicked)
+        password_row.connect("view-details", self._on_view_details_clicked)
+        password_row.connect("remove-password", self._on_remove_password_clicked)
+        password_row.connect("favicon-downloaded", self._on_row_favicon_downloaded)
+        return password_row
+
+    def _on_row_favicon_downloaded(self, password_row, password_path, favicon_data):
+        """Save a favicon a row downloaded, so later binds and starts show it right away."""
+        try:
+            self.password_store.set_password_favicon(password_path, favicon_data)
+        except Exception as e:
+            self.logger.warning(f"Failed to save favicon for {password_path}: {e}")
+            return
+        password_metadata = self._password_metadata_cache.get(password_path)
+        if password_metadata is not None:
+            self._password_metadata_cache[password_path] = dict(password_metadata, favicon_data=favicon_data)
+
+    def _on_list_view_activated(self, list_view, position):
+        """Select a password, or open/close a folder (single click)."""
+        tree_row = self._tree_model.get_row(position)
+        if tree_row is None:
+            return
+        item = tree_row.get_item()
+        if isinstance(item, Gtk.StringObject):
+            self._select_password(item.get_string())
+        elif item.is_folder:
+            tree_row.set_expanded(not tree_row.get_expanded())
+            self._on_folder_activated(self.folder_rows.get(item.full_path), item.full_path)
+        else:
+            self._select_password(item.full_path)
+
+    def _find_tree_position(self, path, is_folder=False):
+        """Position of a shown folder or password in the flattened tree, or None."""
+        for position in range(self._tree_model.get_n_items()):
+            item = self._tree_model.get_row(position).get_item()
+            if isinstance(item, Gtk.StringObject):
+                if not is_folder and item.get_string() == path:
+                    return position
+            elif item.full_path == path and item.is_folder == is_folder:
+                return position
+        return None
+
     def load_passwords(self):
         """Load and display passwords in the dynamic folder structure using threading."""
         # Cancel any existing loading thread
         if self._loading_thread and self._loading_thread.is_alive():
             self.logger.debug("Cancelling existing password loading thread")
             return  # Don't start a new load if one is already running
+
+        # A fully built tree of the same store is updated in place with
+        # what changed, keeping its rows, expansion and scroll position
+        incremental = (bool(self._root_entries) and not self._is_loading and
+                       self._loaded_store_dir == self.password_store.store_dir)
         
         # Set loading state
         self._is_loading = True
+
+        # Results for the old rows are no longer needed
+        self._cancel_fast_bulk_processing()
         
         # Save current expansion state before clearing
         expansion_state = self._save_expansion_state()
 
-        # Clear existing widgets immediately on UI thread
-        self._clear_all_widgets()
-        
-        # Show loading indicator if available
-        self._show_loading_state()
+        if not incremental:
+            # Clear existing widgets immediately on UI thread
+            self._clear_all_widgets()
+
+            # Show loading indicator if available
+            self._show_loading_state()
 
         # Start background thread for password loading
         self._loading_thread = threading.Thread(
             target=self._load_passwords_background,
-            args=(expansion_state,),
+            args=(expansion_state, incremental),
             daemon=True
         )
         self._loading_thread.start()
 
-    def _load_passwords_background(self, expansion_state):
+    def _load_passwords_background(self, expansion_state, incremental=False):
         """Background thread function for loading passwords."""
         try:
             self.logger.debug("Starting background password loading")
@@ -109,6 +384,14 @@ class DynamicFolderController:
                         "favicon_data": None
                     }
             
+            # Tags live in the per-entry metadata files; one sweep for all of them
+            try:
+                for password_path, tags in self.password_store.get_all_password_tags().items():
+                    if password_path in password_metadata_cache:
+                        password_metadata_cache[password_path] = dict(password_metadata_cache[password_path], tags=tags)
+            except Exception as e:
+                self.logger.warning(f"Failed to load password tags: {e}")
+
             # Load folder metadata in background
             for folder_path in all_folders:
                 try:
@@ -121,8 +404,12 @@ class DynamicFolderController:
                         "icon": "folder-symbolic"
                     }
             
+            # Search index for the new rows, built here rather than on the UI thread
+            password_index = FuzzyPathIndex(raw_password_list)
+            fingerprints = entry_fingerprints(self.password_store.store_dir or "", raw_password_list)
+
             # Schedule UI updates on main thread with pre-loaded data
-            GLib.idle_add(self._complete_password_loading, raw_password_list, all_folders, expansion_state, password_metadata_cache, folder_metadata_cache)
+            GLib.idle_add(self._complete_password_loading, raw_password_list, all_folders, expansion_state, password_metadata_cache, folder_metadata_cache, password_index, fingerprints, incremental)
             
         except Exception as e:
             self.logger.error("Error in background password loading", extra={
@@ -132,20 +419,27 @@ class DynamicFolderController:
             # Schedule error handling on main thread
             GLib.idle_add(self._handle_loading_error, str(e))
 
-    def _complete_password_loading(self, raw_password_list, all_folders, expansion_state, password_metadata_cache, folder_metadata_cache):
+    def _complete_password_loading(self, raw_password_list, all_folders, expansion_state, password_metadata_cache, folder_metadata_cache, password_index=None, fingerprints=None, incremental=False):
         """Complete password loading on the main UI thread."""
         try:
             self.logger.debug("Completing password loading on UI thread", extra={
                 'password_count': len(raw_password_list),
-                'folder_count': len(all_folders)
+                'folder_count': len(all_folders),
+                'incremental': incremental
             })
             
             # Hide loading indicator
             self._hide_loading_state()
+
+            if incremental and (raw_password_list or all_folders):
+                self._apply_reload_changes(raw_password_list, all_folders, password_metadata_cache, folder_metadata_cache, password_index, fingerprints)
+                return False  # Don't repeat this idle call
+            if incremental:
+                self._clear_all_widgets()
             
             # Build dynamic folder structure on UI thread with pre-loaded metadata
             # Always build folder structure even if there are no passwords, to show empty folders
-            self._build_dynamic_folder_structure_with_data(raw_password_list, all_folders, password_metadata_cache, folder_metadata_cache)
+            self._build_dynamic_folder_structure_with_data(raw_password_list, all_folders, password_metadata_cache, folder_metadata_cache, password_index, fingerprints)
             
             # Manage visibility of password list vs welcome status page
             if not raw_password_list and not all_folders:
@@ -154,16 +448,8 @@ class DynamicFolderController:
             else:
                 self._show_password_list()
 
-            # Restore expansion state
-            self._restore_expansion_state(expansion_state)
-            
-            self._is_loading = False
-            self.logger.debug("Password loading completed successfully")
-            
-            # Start simple fast bulk processing for ALL passwords
-            if raw_password_list:
-                self.logger.info(f"Starting fast parallel TOTP/URL processing for {len(raw_password_list)} passwords")
-                GLib.timeout_add(500, self._start_fast_bulk_processing, raw_password_list)
+            # Runs once the root model has been filled
+            self._ui_scheduler.add('populate', self._finish_password_loading, raw_password_list, expansion_state)
             
         except Exception as e:
             self.logger.error("Error completing password loading", extra={
@@ -174,6 +460,115 @@ class DynamicFolderController:
         
         return False  # Don't repeat this idle call
 
+    def _finish_password_loading(self, raw_password_list, expansion_state):
+        """Restore the view state once every root item is in the model."""
+        # Restore expansion state
+        self._restore_expansion_state(expansion_state)
+
+        # Keep showing the results of a search typed before the reload
+        if self.search_entry and self.search_entry.get_text().strip():
+            self._on_search_entry_changed(self.search_entry)
+
+        self._is_loading = False
+        self.logger.debug("Password loading completed successfully")
+
+        # Start simple fast bulk processing for ALL passwords
+        if raw_password_list:
+            self.logger.info(f"Starting fast parallel TOTP/URL processing for {len(raw_password_list)} passwords")
+            GLib.timeout_add(500, self._start_fast_bulk_processing, raw_password_list)
+
+    def _apply_reload_changes(self, raw_password_list, all_folders, password_metadata_cache, folder_metadata_cache, password_index, fingerprints):
+        """Update the shown tree with what changed since the last load."""
+        folder_children, root_passwords = self._group_by_folder(raw_password_list, all_folders)
+        diff = diff_tree(self._entry_fingerprints, fingerprints or {}, self._folder_children, folder_children,
+                         self._password_metadata_cache, password_metadata_cache)
+        self.logger.debug("Applying reload changes", extra={
+            'added': len(diff.added),
+            'removed': len(diff.removed),
+            'moved': len(diff.moved),
+            'changed': len(diff.changed),
+            'metadata_changed': len(diff.metadata_changed),
+            'folders_added': len(diff.folders_added),
+            'folders_removed': len(diff.folders_removed)
+        })
+
+        # Moved entries keep what processing found; removed and edited ones lose it
+        for old_path, new_path in diff.moved.items():
+            for cache in (self._processing_results, self._password_url_cache):
+                if old_path in cache:
+                    cache[new_path] = cache.pop(old_path)
+            self._field_index.move(old_path, new_path)
+        for password_path in diff.removed + diff.changed:
+            self._processing_results.pop(password_path, None)
+            self._password_url_cache.pop(password_path, None)
+        for password_path in diff.removed:
+            self._field_index.remove(password_path)
+
+        self._password_metadata_cache = password_metadata_cache or {}
+        self._folder_metadata_cache = folder_metadata_cache or {}
+        for password_path in diff.added + diff.metadata_changed:
+            password_metadata = self._password_metadata_cache.get(password_path) or {}
+            self._field_index.add_path(password_path, password_metadata.get("tags") or ())
+        self._password_index = password_index or FuzzyPathIndex(raw_password_list)
+        self._folder_index = FuzzyPathIndex(folder_children)
+        self._search_results = []
+        self._entry_fingerprints = fingerprints or {}
+        self._password_paths = set(raw_password_list)
+
+        old_children = self._folder_children
+        self._folder_children = folder_children
+        self._update_root_model(folder_children, root_passwords, old_children)
+        for folder_path, string_list in list(self._child_models.items()):
+            if folder_path not in folder_children:
+                del self._child_models[folder_path]
+                continue
+            for position, n_removals, additions in splice_ops(old_children.get(folder_path, []), folder_children[folder_path]):
+                string_list.splice(position, n_removals, additions)
+
+        # Rows still bound show the new metadata, counts and decoration
+        for folder_path, folder_row in self.folder_rows.items():
+            self._bind_folder_row_data(folder_row, folder_path)
+        for password_path in diff.changed + diff.metadata_changed:
+            password_row = self.password_rows.get(password_path)
+            if password_row is not None:
+                self._decorate_password_row(password_row, password_path)
+
+        self._show_password_list()
+        if self.search_entry and self.search_entry.get_text().strip():
+            self._on_search_entry_changed(self.search_entry)
+        self._is_loading = False
+
+        # Only new, edited and not yet processed entries are decrypted
+        pending = [password_path for password_path in raw_password_list if password_path not in self._processing_results]
+        if pending:
+            GLib.timeout_add(500, self._start_fast_bulk_processing, pending)
+
+    def _update_root_model(self, folder_children, root_passwords, old_children):
+        """Splice the differences between the shown and the new root items into the root model."""
+        root_entries = [(folder_path, True) for folder_path in folder_children]
+        root_entries += [(password_path, False) for password_path in root_passwords]
+
+        # A folder that gains its first or loses its last password gets a
+        # new item, as the tree only asks once whether a row can expand
+        for position, (path, is_folder) in enumerate(self._root_entries):
+            if (is_folder and path in folder_children and
+                    bool(old_children.get(path)) != bool(folder_children[path])):
+                self._child_models.pop(path, None)
+                self._expanded_folders.discard(path)
+                self._root_store.splice(position, 1, [PasswordListItem(PasswordEntry(path=path, is_folder=True))])
+
+        for position, n_removals, additions in splice_ops(self._root_entries, root_entries):
+            items = [PasswordListItem(PasswordEntry(path=path, is_folder=is_folder)) for path, is_folder in additions]
+            self._root_store.splice(position, n_removals, items)
+        self._root_entries = root_entries
+        self._folder_positions = {path: position for position, (path, is_folder) in enumerate(root_entries) if is_folder}
+        self._expanded_folders &= set(self._folder_positions)
+
+    def _schedule_ui_work(self, kind, callback, *args):
+        """Queue UI work from an idle callback (e.g. one added by a worker thread)."""
+        self._ui_scheduler.add(kind, callback, *args)
+        return False
+
     def _show_loading_state(self):
         """Show loading indicator while passwords are being loaded."""
         # You could add a spinner or loading message here
@@ -196,12 +591,23 @@ class DynamicFolderController:
 
     def refresh_password_display(self, password_path):
         """Refresh the display of a specific password after metadata changes."""
-        # Find the password row in our dictionary and update its avatar
+        if password_path not in self._password_paths:
+            # Not in the tree yet (e.g. renamed); reload to show it
+            self.load_passwords()
+            return
+
+        # Rows bound later are built from the updated metadata
+        password_metadata = self.password_store.get_password_metadata(password_path)
+        # Tags come from the .metadata/ files and are kept until the next load
+        tags = (self._password_metadata_cache.get(password_path) or {}).get("tags")
+        if tags:
+            password_metadata = dict(password_metadata, tags=tags)
+        self._password_metadata_cache[password_path] = password_metadata
+
+        # Update the avatar of the row if it is currently shown
         if password_path in self.password_rows:
             password_row = self.password_rows[password_path]
 
-            # Get updated metadata
-            password_metadata = self.password_store.get_password_metadata(password_path)
             password_color = password_metadata["color"]
             password_icon = password_metadata["icon"]
             favicon_data = password_metadata["favicon_data"]
@@ -218,41 +624,38 @@ class DynamicFolderController:
                 'icon': password_icon,
                 'user_action': True
             })
-        else:
-            self.logger.warning("Password row not found for refresh", extra={
-                'password_path': password_path
-            })
-            # Fallback to full reload if we can't find the specific row
-            self.load_passwords()
 
     def _save_expansion_state(self):
-        """Save the current expansion state of all folder rows."""
-        expansion_state = {}
-        for folder_path, folder_row in self.folder_rows.items():
-            if hasattr(folder_row, 'get_expanded'):
-                expansion_state[folder_path] = folder_row.get_expanded()
-        return expansion_state
+        """Save the current expansion state of all folders."""
+        return {folder_path: True for folder_path in self._expanded_folders}
 
     def _restore_expansion_state(self, expansion_state):
-        """Restore the expansion state of folder rows."""
+        """Restore the expansion state of folders (the tree must not be filtered)."""
         if not expansion_state:
             return
 
         for folder_path, was_expanded in expansion_state.items():
-            if folder_path in self.folder_rows:
-                folder_row = self.folder_rows[folder_path]
-                if hasattr(folder_row, 'set_expanded'):
-                    folder_row.set_expanded(was_expanded)
+            position = self._folder_positions.get(folder_path)
+            if was_expanded and position is not None:
+                tree_row = self._tree_model.get_child_row(position)
+                if tree_row is not None:
+                    tree_row.set_expanded(True)
+                    self._expanded_folders.add(folder_path)
     
     def _clear_all_widgets(self):
-        """Clear all existing folder and password widgets."""
-        # Remove all children from the listbox
-        child = self.folders_listbox.get_first_child()
-        while child:
-            next_child = child.get_next_sibling()
-            self.folders_listbox.remove(child)
-            child = next_child
-        
+        """Clear all existing folders and passwords from the list view."""
+        # Work for the old rows must not reach the new ones
+        self._ui_scheduler.cancel('populate')
+        self._ui_scheduler.cancel('favicon')
+        # Unbinding the rows also drops them from folder_rows/password_rows
+        self._root_store.remove_all()
+        self._root_entries = []
+        self._child_models = {}
+        self._folder_children = {}
+        self._password_paths = set()
+        self._folder_positions = {}
+        self._expanded_folders = set()
+
         # Clear our references
         self.folder_rows.clear()
         self.password_rows.clear()
@@ -295,7 +698,7 @@ class DynamicFolderController:
         all_folders = self.password_store.list_folders()
         self._build_dynamic_folder_structure_with_data(raw_password_list, all_folders)
 
-    def _build_dynamic_folder_structure_with_data(self, raw_password_list, all_folders, password_metadata_cache=None, folder_metadata_cache=None):
+    def _build_dynamic_folder_structure_with_data(self, raw_password_list, all_folders, password_metadata_cache=None, folder_metadata_cache=None, password_index=None, fingerprints=None):
         """Build dynamic folder structure from pre-loaded password list and folder data."""
         # Store metadata caches for use by widget creation methods
         self._password_metadata_cache = password_metadata_cache or {}
@@ -303,7 +706,52 @@ class DynamicFolderController:
         
         # Initialize URL cache for lazy loading
         self._password_url_cache = {}
-        # Group passwords by their immediate parent folder
+        folder_children, root_passwords = self._group_by_folder(raw_password_list, all_folders)
+
+        self._password_index = password_index or FuzzyPathIndex(raw_password_list)
+        self._folder_index = FuzzyPathIndex(folder_children)
+        self._search_results = []
+        self._field_index = FieldIndex()
+        for password_path in raw_password_list:
+            password_metadata = self._password_metadata_cache.get(password_path) or {}
+            self._field_index.add_path(password_path, password_metadata.get("tags") or ())
+
+        # Only the items of the root model are created here: folders first,
+        # then root passwords. A folder's passwords become a model of their
+        # own when its row is shown (see _create_child_model).
+        folder_paths = list(folder_children)
+        self._folder_children = folder_children
+        self._password_paths = set(raw_password_list)
+        self._folder_positions = {folder_path: position for position, folder_path in enumerate(folder_paths)}
+        self._expanded_folders = set()
+        self._processing_results = {}
+        self._child_models = {}
+        self._entry_fingerprints = fingerprints or {}
+        self._loaded_store_dir = self.password_store.store_dir
+
+        # The items are created and appended a chunk at a time, as many
+        # chunks per frame as the frame budget allows
+        root_entries = [(folder_path, True) for folder_path in folder_paths]
+        root_entries += [(password_path, False) for password_path in root_passwords]
+        self._search_filter.set_query("", None, items_changed=True)
+        self._ui_scheduler.cancel('populate')
+        self._root_store.remove_all()
+        self._root_entries = root_entries
+        for start in range(0, len(root_entries), ROOT_ITEMS_PER_CHUNK):
+            self._ui_scheduler.add('populate', self._append_root_items, root_entries[start:start + ROOT_ITEMS_PER_CHUNK])
+        self.logger.debug("Password tree built", extra={
+            'folder_count': len(folder_paths),
+            'root_password_count': len(root_passwords)
+        })
+
+    @staticmethod
+    def _group_by_folder(raw_password_list, all_folders):
+        """
+        Group passwords by their immediate parent folder.
+
+        Returns:
+            (folder_path -> password paths, sorted by folder, root password paths)
+        """
         folder_structure = {}
         root_passwords = []
 
@@ -313,243 +761,23 @@ class DynamicFolderController:
 
             if len(parts) == 1:
                 # Root level password - add to separate list
-                root_passwords.append({
-                    'name': parts[0],
-                    'path': password_path
-                })
+                root_passwords.append(password_path)
             else:
                 # Password in a folder - get immediate parent folder path
                 folder_path = os.sep.join(parts[:-1])
-                password_name = parts[-1]
-
-                if folder_path not in folder_structure:
-                    folder_structure[folder_path] = []
-
-                folder_structure[folder_path].append({
-                    'name': password_name,
-                    'path': password_path
-                })
+                folder_structure.setdefault(folder_path, []).append(password_path)
 
         # Add all existing folders (both empty and with passwords)
         for folder_path in all_folders:
             if folder_path not in folder_structure:
                 folder_structure[folder_path] = []  # Empty folder
 
-        # Step 1: Create all folder widgets first (without passwords)
-        for folder_path in sorted(folder_structure.keys()):
-            self._create_empty_folder_widget(folder_path)
-
-        # Step 2: Add passwords to their respective folders (in batches to avoid UI freeze)
-        self._add_passwords_in_batches(folder_structure, root_passwords)
-
-    def _add_passwords_in_batches(self, folder_structure, root_passwords):
-        """Add passwords to folders in batches to avoid UI freezing."""
-        # Prepare all password additions as a queue
-        password_queue = []
-        
-        # Add folder passwords to queue
-        for folder_path in sorted(folder_structure.keys()):
-            passwords = folder_structure[folder_path]
-            for password_data in passwords:
-                password_queue.append(('folder', password_data, folder_path))
-        
-        # Add root passwords to queue
-        for password_data in root_passwords:
-            password_queue.append(('root', password_data, None))
-        
-        # Process passwords in small batches using idle callbacks
-        self._process_password_batch(password_queue, 0)
-
-    def _process_password_batch(self, password_queue, start_index, batch_size=5):
-        """Process a batch of passwords on the UI thread."""
-        end_index = min(start_index + batch_size, len(password_queue))
-        
-        # Process this batch
-        for i in range(start_index, end_index):
-            password_type, password_data, folder_path = password_queue[i]
-            
-            if password_type == 'folder':
-                self._add_password_to_folder(password_data, folder_path)
-            elif password_type == 'root':
-                self._create_root_password_widget(password_data)
-        
-        # Schedule next batch if there are more passwords
-        if end_index < len(password_queue):
-            GLib.idle_add(self._process_password_batch, password_queue, end_index, batch_size)
-            return False  # Don't repeat this specific call
-        else:
-            # All passwords processed
-            self.logger.debug("All passwords added to UI")
-            return False
-    
-    def _create_folder_widget(self, folder_path, passwords):
-        """Create a FolderExpanderRow for a folder with its passwords."""
-        # For subfolders, show the full path; for top-level folders, show just the name
-        if '/' in folder_path:
-            folder_display_name = folder_path  # Show full path like "websites/social"
-        else:
-            folder_display_name = folder_path  # Show just the name like "websites"
+        return {folder_path: folder_structure[folder_path] for folder_path in sorted(folder_structure)}, root_passwords
 
-        # Create folder expander row using the custom widget
-        folder_row = FolderExpanderRow(folder_path=folder_path)
-        folder_row.set_title(folder_display_name)
-        folder_row.set_subtitle(f"{len(passwords)} password{'s' if len(passwords) != 1 else ''}")
-
-        # Set avatar color and icon from cached metadata
-        folder_metadata = getattr(self, '_folder_metadata_cache', {}).get(folder_path)
-        if folder_metadata:
-            folder_color = folder_metadata["color"]
-            folder_icon = folder_metadata["icon"]
-        else:
-            # Fallback to default values if cache miss
-            folder_color = "#f66151"  # Default red
-            folder_icon = "folder-symbolic"
-        folder_row.set_avatar_color_and_icon(folder_color, folder_icon)
-
-        self.folder_rows[folder_path] = folder_row
-
-        # Connect folder signals
-        folder_row.connect("activate", self._on_folder_activated, folder_path)
-        folder_row.connect("add-password-to-folder", self._on_add_password_to_folder_clicked, folder_path)
-        folder_row.connect("add-subfolder", self._on_add_subfolder_clicked, folder_path)
-        folder_row.connect("edit-folder", self._on_folder_edit_clicked, folder_path, folder_display_name)
-        folder_row.connect("remove-folder", self._on_folder_delete_clicked, folder_path, folder_display_name)
-
-        # Create password rows within the folder
-        for password_data in passwords:
-            password_row = self._create_password_widget(password_data, folder_row)
-
-        # Disable expansion for empty folders (no passwords)
-        if len(passwords) == 0:
-            folder_row.set_enable_expansion(False)
-
-        # Add folder to listbox
-        self.folders_listbox.append(folder_row)
-
-    def _create_empty_folder_widget(self, folder_path):
-        """Create a FolderExpanderRow for a folder without passwords initially."""
-        # For subfolders, show the full path; for top-level folders, show just the name
-        if '/' in folder_path:
-            folder_display_name = folder_path  # Show full path like "websites/social"
-        else:
-            folder_display_name = folder_path  # Show just the name like "websites"
-
-        # Create folder expander row using the custom widget
-        folder_row = FolderExpanderRow(folder_path=folder_path)
-        folder_row.set_title(folder_display_name)
-        folder_row.set_subtitle("0 passwords")  # Will be updated when passwords are added
-
-        # Set avatar color and icon from cached metadata
-        folder_metadata = getattr(self, '_folder_metadata_cache', {}).get(folder_path)
-        if folder_metadata:
-            folder_color = folder_metadata["color"]
-            folder_icon = folder_metadata["icon"]
-        else:
-            # Fallback to default values if cache miss
-            folder_color = "#f66151"  # Default red
-            folder_icon = "folder-symbolic"
-        folder_row.set_avatar_color_and_icon(folder_color, folder_icon)
-
-        self.folder_rows[folder_path] = folder_row
-
-        # Connect folder signals
-        folder_row.connect("activate", self._on_folder_activated, folder_path)
-        folder_row.connect("add-password-to-folder", self._on_add_password_to_folder_clicked, folder_path)
-        folder_row.connect("add-subfolder", self._on_add_subfolder_clicked, folder_path)
-        folder_row.connect("edit-folder", self._on_folder_edit_clicked, folder_path, folder_display_name)
-        folder_row.connect("remove-folder", self._on_folder_delete_clicked, folder_path, folder_display_name)
-
-        # Start with expansion disabled (will be enabled if passwords are added)
-        folder_row.set_enable_expansion(False)
-
-        # Add folder to listbox
-        self.folders_listbox.append(folder_row)
-
-    def _add_password_to_folder(self, password_data, folder_path):
-        """Add a password to an existing folder."""
-        # Get the folder row
-        if folder_path not in self.folder_rows:
-            self.logger.warning(f"Folder {folder_path} not found when adding password {password_data['path']}")
-            return
-
-        folder_row = self.folder_rows[folder_path]
-        
-        # Create the password widget (but don't add it to the folder yet)
-        password_row = self._create_password_widget_standalone(password_data)
-        
-        # Use the folder's method to properly add the password row
-        folder_row.add_password_row(password_row)
-        
-        # Enable expansion now that the folder has passwords
-        password_count = folder_row.get_password_count()
-        if password_count > 0:
-            folder_row.set_enable_expansion(True)
-
-    def _create_password_widget_standalone(self, password_data):
-        """Create a PasswordEntryRow for a password without adding it to a parent."""
-        from ..ui.widgets.password_entry_row import PasswordEntryRow
-
-        # Create a PasswordEntry object for the row
-        password_entry = PasswordEntry(path=password_data['path'], is_folder=False)
-        password_row = PasswordEntryRow(password_entry)
-
-        # Set the password entry path for metadata saving
-        password_row._password_entry = password_data['path']  # Keep for compatibility with favicon saving
-
-        # Set avatar color and icon from cached metadata
-        password_metadata = getattr(self, '_password_metadata_cache', {}).get(password_data['path'])
-        if password_metadata:
-            password_color = password_metadata["color"]
-            password_icon = password_metadata["icon"]
-            favicon_data = password_metadata["favicon_data"]
-        else:
-            # Fallback to default values if cache miss
-            password_color = "#3584e4"  # Default blue
-            password_icon = "dialog-password-symbolic"
-            favicon_data = None
-
-        # Set avatar with color, icon, and cached favicon data (URL loaded lazily if needed)
-        password_row.set_avatar_color_and_icon(password_color, password_icon, None, favicon_data)
-        
-        # Set up lazy URL loading for when the password becomes visible (if no favicon cached)
-        if not favicon_data:
-            password_row.set_lazy_url_loader(self._get_password_url_lazy, password_data['path'])
-
-        # Store reference
-        password_path = password_data['path']
-        self.password_rows[password_path] = password_row
-
-        # Connect signals
-        password_row.connect("activated", self._on_password_activated, password_path)
-        password_row.connect("copy-username", self._on_copy_username_clicked, password_path)
-        password_row.connect("copy-password", self._on_copy_password_clicked, password_path)
-        password_row.connect("copy-totp", self._on_copy_totp_clicked, password_path)
-        password_row.connect("visit-url", self._on_visit_url_clicked)
-        password_row.connect("edit-password", self._on_edit_password_clicked)
-        password_row.connect("view-details", self._on_view_details_clicked)
-        password_row.connect("remove-password", self._on_remove_password_clicked)
-
-        return password_row
-    
-    def _create_password_widget(self, password_data, parent_folder):
-        """Create a PasswordEntryRow for a password and add it to the parent folder."""
-        # Create the password widget
-        password_row = self._create_password_widget_standalone(password_data)
-        
-        # Add password row to folder using the proper method
-        parent_folder.add_password_row(password_row)
-
-        return password_row
-
-    def _create_root_password_widget(self, password_data):
-        """Create a PasswordEntryRow for a root-level password (not in a folder)."""
-        # Create the password widget using the standalone method
-        password_row = self._create_password_widget_standalone(password_data)
-
-        # Add password row directly to listbox (not to a folder)
-        self.folders_listbox.append(password_row)
-
-        return password_row
+    def _append_root_items(self, root_entries):
+        """Append (path, is_folder) entries to the root model."""
+        items = [PasswordListItem(PasswordEntry(path=path, is_folder=is_folder)) for path, is_folder in root_entries]
+        self._root_store.splice(self._root_store.get_n_items(), 0, items)
 
     def _get_cached_url_from_password(self, password_path):
         """Get URL from password using cached metadata to avoid blocking operations."""
@@ -569,7 +797,7 @@ class DynamicFolderController:
                 
                 # Update UI on main thread if URL was found
                 if url and password_path in self.password_rows:
-                    GLib.idle_add(self._update_password_favicon, password_path, url)
+                    GLib.idle_add(self._schedule_ui_work, 'favicon', self._update_password_favicon, password_path, url)
                     
             except Exception as e:
                 self.logger.warning(f"Failed to extract URL for {password_path}: {e}")
@@ -737,7 +965,7 @@ class DynamicFolderController:
         self.current_selection = {
             'type': 'folder',
             'path': folder_path,
-            'name': folder_row.get_title()
+            'name': folder_path
         }
 
         if self.on_selection_changed:
@@ -933,48 +1161,59 @@ class DynamicFolderController:
     
     def _show_all_items(self):
         """Show all folder and password items."""
-        for folder_row in self.folder_rows.values():
-            folder_row.set_visible(True)
-        
-        for password_row in self.password_rows.values():
-            password_row.set_visible(True)
+        self._search_results = []
+        self._search_filter.set_query("", None)
     
     def _filter_items(self, query):
-        """Filter items based on search query."""
-        # Filter folders and their passwords
-        for folder_path, folder_row in self.folder_rows.items():
-            folder_title = folder_row.get_title().lower()
-            folder_matches = query in folder_title
-
-            # Check passwords in this folder
-            password_matches = False
-            for password_path, password_row in self.password_rows.items():
-                # Check if password belongs to this folder
-                if folder_path and password_path.startswith(folder_path + "/"):
-                    password_title = password_row.get_title().lower()
-                    password_subtitle = password_row.get_subtitle().lower()
-
-                    if query in password_title or query in password_subtitle:
-                        password_matches = True
-                        password_row.set_visible(True)
-                    else:
-                        password_row.set_visible(False)
-
-            # Show folder if it matches or contains matching passwords
-            folder_row.set_visible(folder_matches or password_matches)
-
-        # Filter root passwords (passwords not in any folder)
-        for password_path, password_row in self.password_rows.items():
-            # Check if this is a root password (no "/" in path)
-            if "/" not in password_path:
-                password_title = password_row.get_title().lower()
-                password_subtitle = password_row.get_subtitle().lower()
-
-                if query in password_title or query in password_subtitle:
-                    password_row.set_visible(True)
-                else:
-                    password_row.set_visible(False)
-    
+        """
+        Show only the rows matching the query.
+
+        Free text is matched fuzzily against paths (see FuzzyPathIndex);
+        field terms such as "user:alice" or "has:totp" are looked up in the
+        field index (see field_query). Folders are then shown only as the
+        ancestors of matching passwords. Rows are hidden by filtering the
+        tree's models, not by hiding widgets.
+        """
+        parsed = parse_query(query)
+        field_matches = self._field_index.search(parsed)
+        if field_matches is None:
+            self._search_results = [path for path, _ in self._password_index.search(query)]
+            visible_folders = {path for path, _ in self._folder_index.search(query)}
+        elif parsed.text:
+            self._search_results = [path for path, _ in self._password_index.search(parsed.text)
+                                    if path in field_matches]
+            visible_folders = set()
+        else:
+            self._search_results = sorted(field_matches)
+            visible_folders = set()
+        visible_passwords = set(self._search_results)
+
+        # Folders stay visible while any password below them matches
+        for password_path in visible_passwords:
+            folder_path = os.path.dirname(password_path)
+            while folder_path and folder_path not in visible_folders:
+                visible_folders.add(folder_path)
+                folder_path = os.path.dirname(folder_path)
+
+        # Field terms may match more as the query grows ("has:" -> "has:t"),
+        # so only plain queries let the filter re-check just the current matches
+        self._search_filter.set_query(query, visible_passwords | visible_folders, items_changed=':' in query)
+
+    def _on_search_entry_activated(self, search_entry):
+        """Select the best match of the current search (Enter in the search entry)."""
+        if not search_entry.get_text().strip() or not self._search_results:
+            return
+        password_path = self._search_results[0]
+        folder_path = os.path.dirname(password_path)
+        if folder_path:
+            position = self._find_tree_position(folder_path, is_folder=True)
+            if position is not None:
+                self._tree_model.get_row(position).set_expanded(True)
+        self._select_password(password_path)
+        position = self._find_tree_position(password_path)
+        if position is not None:
+            self.list_view.scroll_to(position, Gtk.ListScrollFlags.FOCUS, None)
+
     def get_selected_item(self):
         """Get the currently selected item."""
         if self.current_selection:
@@ -1082,84 +1321,205 @@ class DynamicFolderController:
     # ========== Simple Fast Bulk Processing ==========
 
     def _start_fast_bulk_processing(self, password_list):
-        """Start efficient bulk processing of ALL passwords using optimized caching."""
-        
+        """
+        Start streaming TOTP/URL processing of ALL passwords.
+
+        Entries are decrypted in priority order (visible rows, then rows in
+        expanded folders, then everything else) and each row is updated as
+        soon as its entry has been processed.
+        """
+        self._cancel_fast_bulk_processing()
+
         self.logger.info(f"Starting optimized bulk processing of {len(password_list)} passwords")
         self.toast_manager.show_info("Processing passwords with enhanced caching...")
-        
+
+        queue = DecryptQueue(password_list)
+        queue.prioritize(self._get_expanded_folder_password_paths(), DecryptQueue.EXPANDED)
+        queue.prioritize(self._get_visible_password_paths(), DecryptQueue.VISIBLE)
+        self._decrypt_queue = queue
+        self._fast_processing_counts = {'processed': 0, 'totp': 0, 'url': 0}
+
         def run_bulk_processing():
             """Run bulk processing in background thread."""
+            total = len(password_list)
+            processed = 0
+            batch = {}
+            last_flush = GLib.get_monotonic_time()
             try:
-                # Use the new optimized bulk processing method with reduced concurrency
-                bulk_results = self.password_store.get_bulk_password_contents(password_list, max_workers=2)
-                
-                # Process results to extract TOTP/URL information
-                results = {}
-                processed = 0
-                total = len(password_list)
-                
-                for password_path, (success, content) in bulk_results.items():
+                # Entries whose ciphertext is unchanged come from the snapshot
+                content_cache = self._get_content_cache()
+                uncached = content_cache.validate_all(password_list)
+                for password_path in password_list:
+                    if password_path in uncached:
+                        continue
+                    info = content_cache.get_content_info(password_path)
+                    if info is None:
+                        continue
+                    batch[password_path] = {'has_totp': info['has_totp'], 'has_url': info['has_url'],
+                                            'url': info['url'], 'username': info['username']}
+                    queue.discard(password_path)
+                    processed += 1
+                if batch:
+                    GLib.idle_add(self._apply_fast_processing_results, queue, batch)
+                    batch = {}
+                self.logger.info(f"Content cache supplied {processed} of {total} passwords")
+
+                if processed < total:
+                    self.password_store.enable_bulk_processing_mode()
+
+                # Concurrency is scaled by the store once the GPG agent is unlocked
+                for password_path, (success, content) in self.password_store.iter_password_contents(queue):
                     try:
                         if success and content:
-                            # Simple TOTP detection
-                            content_lower = content.lower()
-                            has_totp = any(keyword in content_lower for keyword in [
-                                'otpauth://', 'totp:', 'otp:', 'secret:', 'authenticator', '2fa'
-                            ])
-                            
-                            # Simple URL detection
-                            has_url = False
-                            url = None
-                            for line in content.split('\n'):
-                                line = line.strip()
-                                if line.startswith(('http://', 'https://')):
-                                    has_url = True
-                                    url = line
-                                    break
-                                elif any(line.lower().startswith(prefix) for prefix in ['url:', 'website:', 'site:']):
-                                    has_url = True
-                                    # Extract URL after the prefix
-                                    for prefix in ['url:', 'website:', 'site:']:
-                                        if line.lower().startswith(prefix):
-                                            url = line[len(prefix):].strip()
-                                            if url and not url.startswith(('http://', 'https://')):
-                                                if '.' in url and ' ' not in url:
-                                                    url = f"https://{url}"
-                                            break
-                                    break
-                            
-                            results[password_path] = {
-                                'has_totp': has_totp, 
-                                'has_url': has_url, 
-                                'url': url
-                            }
+                            result = self._analyze_password_content(content)
+                            content_cache.set_content_info(password_path, result['has_totp'], result['has_url'],
+                                                           result['url'], result['username'])
+                            batch[password_path] = result
                         else:
-                            results[password_path] = {'has_totp': False, 'has_url': False, 'url': None}
-                        
-                        processed += 1
-                        
-                        # Update progress every 50 passwords for better performance
-                        if processed % 50 == 0 or processed == total:
-                            progress = (processed / total) * 100
-                            GLib.idle_add(self._update_processing_progress, processed, total, progress)
-                            
+                            batch[password_path] = {'has_totp': False, 'has_url': False, 'url': None, 'username': None}
                     except Exception as e:
                         self.logger.warning(f"Error analyzing content for {password_path}: {e}")
-                        results[password_path] = {'has_totp': False, 'has_url': False, 'url': None}
-                        processed += 1
-                
-                # Update UI with all results
-                GLib.idle_add(self._complete_fast_processing, results, processed)
-                
+                        batch[password_path] = {'has_totp': False, 'has_url': False, 'url': None, 'username': None}
+                    processed += 1
+
+                    # Hand results to the UI in small batches rather than one idle call per entry
+                    now = GLib.get_monotonic_time()
+                    if len(batch) >= 20 or now - last_flush >= 100000:
+                        GLib.idle_add(self._apply_fast_processing_results, queue, batch)
+                        batch = {}
+                        last_flush = now
+
+                    # Update progress every 50 passwords for better performance
+                    if processed % 50 == 0 or processed == total:
+                        progress = (processed / total) * 100
+                        GLib.idle_add(self._update_processing_progress, processed, total, progress)
+
+                if batch:
+                    GLib.idle_add(self._apply_fast_processing_results, queue, batch)
+                # Queued behind the rows still to be decorated
+                GLib.idle_add(self._schedule_ui_work, 'decorate', self._complete_fast_processing, queue)
+
             except Exception as e:
                 self.logger.error(f"Bulk processing failed: {e}")
-                GLib.idle_add(self._complete_fast_processing, {}, 0)
-        
+                GLib.idle_add(self._schedule_ui_work, 'decorate', self._complete_fast_processing, queue)
+
         # Start processing in background thread
-        import threading
         threading.Thread(target=run_bulk_processing, daemon=True).start()
-        
+
         return False  # Don't repeat timeout
+
+    def _cancel_fast_bulk_processing(self):
+        """Stop decrypting for the current rows (reload or navigation)."""
+        if self._decrypt_queue is not None:
+            self._decrypt_queue.cancel()
+            self._decrypt_queue = None
+        self._ui_scheduler.cancel('decorate')
+
+    def _get_content_cache(self):
+        """The content cache for the current store, loading its snapshot on first use."""
+        store_dir = self.password_store.store_dir
+        if self._content_cache is None or self._content_cache_store_dir != store_dir:
+            if self._content_cache is not None:
+                self._content_cache.close()
+            self._content_cache = PasswordContentCache(self.password_store)
+            self._content_cache_store_dir = store_dir
+        return self._content_cache
+
+    def clear_session_data(self):
+        """Forget decrypted usernames, URLs and field index entries (e.g. when locking)."""
+        self._cancel_fast_bulk_processing()
+        self._field_index = FieldIndex()
+        self._password_url_cache = {}
+        if self._content_cache is not None:
+            # Reloaded from its encrypted snapshot on the next load after unlocking
+            self._content_cache.close()
+            self._content_cache = None
+            self._content_cache_store_dir = None
+
+    def _analyze_password_content(self, content):
+        """Detect TOTP, URL and username information in decrypted password content."""
+        # Simple TOTP detection
+        content_lower = content.lower()
+        has_totp = any(keyword in content_lower for keyword in [
+            'otpauth://', 'totp:', 'otp:', 'secret:', 'authenticator', '2fa'
+        ])
+
+        # Simple URL detection
+        has_url = False
+        url = None
+        for line in content.split('\n'):
+            line = line.strip()
+            if line.startswith(('http://', 'https://')):
+                has_url = True
+                url = line
+                break
+            elif any(line.lower().startswith(prefix) for prefix in ['url:', 'website:', 'site:']):
+                has_url = True
+                # Extract URL after the prefix
+                for prefix in ['url:', 'website:', 'site:']:
+                    if line.lower().startswith(prefix):
+                        url = line[len(prefix):].strip()
+                        if url and not url.startswith(('http://', 'https://')):
+                            if '.' in url and ' ' not in url:
+                                url = f"https://{url}"
+                        break
+                break
+
+        # The first line is the password itself
+        username = None
+        for line in content.split('\n')[1:]:
+            line = line.strip()
+            for prefix in ('username:', 'user:', 'login:'):
+                if line.lower().startswith(prefix):
+                    username = line[len(prefix):].strip() or None
+                    break
+            if username:
+                break
+
+        return {'has_totp': has_totp, 'has_url': has_url, 'url': url, 'username': username}
+
+    def _get_visible_password_paths(self):
+        """Paths of password rows currently inside the scrolled viewport."""
+        if not self.password_list_scrolled:
+            return []
+        viewport_height = self.password_list_scrolled.get_height()
+        visible = []
+        for password_path, password_row in self.password_rows.items():
+            # Rows of collapsed folders are not mapped
+            if not password_row.get_mapped():
+                continue
+            found, _, y = password_row.translate_coordinates(self.password_list_scrolled, 0, 0)
+            if found and y + password_row.get_height() >= 0 and y <= viewport_height:
+                visible.append(password_path)
+        return visible
+
+    def _get_expanded_folder_password_paths(self):
+        """Paths of passwords directly inside expanded folders."""
+        return [password_path
+                for folder_path in self._expanded_folders
+                for password_path in self._folder_children.get(folder_path, ())]
+
+    def _on_password_list_scrolled(self, adjustment):
+        """Decrypt newly visible rows first, at most every 150 ms while scrolling."""
+        if self._decrypt_queue is None or self._reprioritize_source_id is not None:
+            return
+        self._reprioritize_source_id = GLib.timeout_add(150, self._reprioritize_visible_rows)
+
+    def _reprioritize_visible_rows(self):
+        """Move the rows in the viewport to the front of the decrypt queue."""
+        self._reprioritize_source_id = None
+        if self._decrypt_queue is not None:
+            self._decrypt_queue.prioritize(self._get_visible_password_paths(), DecryptQueue.VISIBLE)
+        return False
+
+    def _on_folder_expanded_changed(self, tree_row, pspec, folder_path):
+        """Track open folders, and decrypt the entries of a folder the user just opened first."""
+        if not tree_row.get_expanded():
+            self._expanded_folders.discard(folder_path)
+            return
+        self._expanded_folders.add(folder_path)
+        if self._decrypt_queue is not None:
+            self._decrypt_queue.prioritize(self._folder_children.get(folder_path, []), DecryptQueue.VISIBLE)
     
     def _update_processing_progress(self, processed, total, progress):
         """Update processing progress."""
@@ -1167,36 +1527,87 @@ class DynamicFolderController:
         if processed % 100 == 0:  # Show toast every 100 passwords
             self.toast_manager.show_info(f"Processing... {processed}/{total} passwords")
         return False
+
+    def _apply_fast_processing_results(self, queue, results):
+        """Queue a batch of processing results to be applied within the frame budget."""
+        if queue is not self._decrypt_queue:
+            return False  # Rows were rebuilt since these entries were queued
+
+        for password_path, result in results.items():
+            self._ui_scheduler.add('decorate', self._apply_processing_result, queue, password_path, result)
+        return False
+
+    def _apply_processing_result(self, queue, password_path, result):
+        """Record one entry's processing result and update its row if bound."""
+        if queue is not self._decrypt_queue:
+            return
+
+        counts = self._fast_processing_counts
+        counts['processed'] += 1
+        counts['totp'] += result['has_totp']
+        counts['url'] += result['has_url']
+        self._field_index.set_content(password_path, result['username'], result['url'], result['has_totp'])
+
+        # Kept for the rows bound later, as rows are recycled
+        url = result['url'] if result['url'] and result['url'].startswith(('http://', 'https://')) else None
+        self._processing_results[password_path] = (result['has_totp'], result['has_url'], url)
+
+        # Load the site's favicon once for all of its entries
+        favicon_key = self._favicon_key(url) if url else None
+        if favicon_key and favicon_key not in self._favicons:
+            self._favicons[favicon_key] = None
+            favicon_manager = get_favicon_manager()
+            favicon_manager.get_favicon_pixbuf_async(url,
+                lambda pixbuf, key=favicon_key: self._on_site_favicon_loaded(key, pixbuf))
+
+        password_row = self.password_rows.get(password_path)
+        if password_row is None:
+            return
+
+        # Update TOTP and URL button visibility
+        password_row.set_bulk_processing_results(result['has_totp'], result['has_url'])
+        if url:
+            password_row.set_url(url)
+            if self._favicons.get(favicon_key) is not None:
+                password_row.show_favicon(self._favicons[favicon_key])
+
+    @staticmethod
+    def _favicon_key(url):
+        """Entries of the same site share one favicon."""
+        return urlparse(url).hostname
+
+    def _on_site_favicon_loaded(self, favicon_key, pixbuf):
+        """Show a site's favicon on the currently bound rows of its entries."""
+        if pixbuf is None:
+            return False
+        self._favicons[favicon_key] = pixbuf
+        for password_path, password_row in self.password_rows.items():
+            url = self._processing_results.get(password_path, (False, False, None))[2]
+            if url and self._favicon_key(url) == favicon_key:
+                self._ui_scheduler.add('favicon', self._apply_site_favicon, password_path, password_row, pixbuf)
+        return False
+
+    def _apply_site_favicon(self, password_path, password_row, pixbuf):
+        """Show a favicon on a row, unless the row was rebound in the meantime."""
+        if self.password_rows.get(password_path) is password_row:
+            password_row.show_favicon(pixbuf)
     
-    def _complete_fast_processing(self, results, processed_count):
-        """Complete fast processing and update password rows."""
+    def _complete_fast_processing(self, queue):
+        """Report the outcome of fast processing."""
+        if queue is not self._decrypt_queue:
+            return False
+        self._decrypt_queue = None
+
         try:
-            if not results:
+            counts = self._fast_processing_counts
+            processed_count = counts['processed']
+            totp_count = counts['totp']
+            url_count = counts['url']
+
+            if not processed_count:
                 self.toast_manager.show_info("Processing completed!")
                 return False
-            
-            # Count features found
-            totp_count = sum(1 for r in results.values() if r.get('has_totp', False))
-            url_count = sum(1 for r in results.values() if r.get('has_url', False))
-            updated_count = 0
-            
-            # Update password rows with results
-            for password_path, result in results.items():
-                if password_path in self.password_rows:
-                    password_row = self.password_rows[password_path]
-                    
-                    # Update TOTP and URL button visibility
-                    if hasattr(password_row, 'set_bulk_processing_results'):
-                        password_row.set_bulk_processing_results(result['has_totp'], result['has_url'])
-                        updated_count += 1
-                    
-                    # Load favicon if URL found
-                    if result['url'] and result['url'].startswith(('http://', 'https://')):
-                        from ..managers import get_favicon_manager
-                        favicon_manager = get_favicon_manager()
-                        favicon_manager.get_favicon_pixbuf_async(result['url'], 
-                            lambda pixbuf, path=password_path: self._update_password_favicon(path, pixbuf))
-            
+
             # Show comprehensive completion message
             features = []
             if totp_count > 0:
@@ -1218,12 +1629,6 @@ class DynamicFolderController:
         
         return False
     
-    def _update_password_favicon(self, password_path, pixbuf):
-        """Update password row favicon after bulk processing."""
-        if password_path in self.password_rows and pixbuf:
-            password_row = self.password_rows[password_path]
-            if hasattr(password_row, '_on_favicon_loaded'):
-    
     def _start_bulk_content_processing(self, password_list):
         """Start bulk processing of all password content to detect TOTP and URLs with single passphrase."""
         if self._bulk_processing_active:
@@ -1362,5 +1767,5 @@ class DynamicFolderController:
         """Update password row favicon from bulk processing results."""
         if password_path in self.password_rows:
             password_row = self.password_rows[password_path]
-            if hasattr(password_row, '_on_favicon_loaded') and pixbuf:
-                GLib.idle_add(password_row._on_favicon_loaded, pixbuf)
+            if pixbuf:
+                GLib.idle_add(password_row.show_favicon, pixbuf)
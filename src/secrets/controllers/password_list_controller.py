@@ -12,6 +12,9 @@ from typing import Optional, Callable
 
 from ..models import PasswordListItem, PasswordEntry
 from ..managers import ToastManager
+from ..utils.fuzzy_index import FuzzyPathIndex
+from ..utils.path_tree import PathTree
+from ..utils.search_filter import PathSearchFilter
 
 
 class PasswordListController:
@@ -34,6 +37,15 @@ class PasswordListController:
         self.list_store = None
         self.tree_list_model = None
         self.selection_model = None
+
+        # Search shows a flat, filtered list of every password instead of the
+        # tree; the tree is kept as it is and shown again when search ends
+        self.search_store = None  # Gtk.StringList of every password path
+        self.search_filter = None
+        self.filter_model = None
+        self._path_index = FuzzyPathIndex()
+        # Folder contents are read from here when a folder is first expanded
+        self._path_tree = PathTree()
         
         # Connect search signal
         self.search_entry.connect("search-changed", self._on_search_entry_changed)
@@ -45,11 +57,8 @@ class PasswordListController:
         """Build the hierarchical password list view with optimized performance."""
         self.list_store = Gio.ListStore.new(PasswordListItem)
 
-        # TreeListModel setup with improved error handling
         def get_child_model_func(item, user_data):
-            if item and item.is_folder and hasattr(item, 'children_model'):
-                return item.children_model
-            return None
+            return self._create_child_model(item)
 
         # Create the tree model with optimized expansion settings
         self.tree_list_model = Gtk.TreeListModel.new(
@@ -60,6 +69,13 @@ class PasswordListController:
             user_data=None
         )
 
+        # Every password, filtered while searching
+        self.search_store = Gtk.StringList.new([])
+        self.search_filter = PathSearchFilter()
+        self.filter_model = Gtk.FilterListModel.new(self.search_store, self.search_filter)
+        # Large stores are filtered in chunks instead of in one blocking pass
+        self.filter_model.set_incremental(True)
+
         # Create an optimized factory for list items
         factory = Gtk.SignalListItemFactory()
         factory.connect("setup", self._on_list_item_setup)
@@ -80,6 +96,20 @@ class PasswordListController:
         # Add the list view to the scrolled window
         self.treeview_scrolled_window.set_child(self.list_view)
 
+    def _create_child_model(self, item):
+        """The items of a folder, created when the folder is first expanded."""
+        if not item or not item.is_folder:
+            return None
+        store = item.children_model
+        if store.get_n_items() == 0:
+            store.splice(0, 0, self._create_items(self._path_tree.children(item.full_path)))
+        return store
+
+    @staticmethod
+    def _create_items(children):
+        """PasswordListItems for (path, is_folder) children."""
+        return [PasswordListItem(PasswordEntry(path=path, is_folder=is_folder)) for path, is_folder in children]
+
     def _on_list_item_setup(self, factory, list_item):
         """Setup list item widget."""
         # Use Adw.ActionRow for a nice look and feel
@@ -89,14 +119,15 @@ class PasswordListController:
     def _on_list_item_bind(self, factory, list_item):
         """Bind data to list item widget."""
         row_widget = list_item.get_child()  # This is the Adw.ActionRow
-        tree_list_row = list_item.get_item()  # This is a TreeListRow when using TreeListModel
+        tree_list_row = list_item.get_item()  # A TreeListRow, or a PasswordListItem while searching
 
         if tree_list_row:
             # Get the actual PasswordListItem from the TreeListRow
-            item_data = tree_list_row.get_item()
+            item_data = self._get_item_data(tree_list_row)
 
             if item_data:
-                row_widget.set_title(item_data.name)
+                # Search results are flat, so they show where they live
+                row_widget.set_title(item_data.full_path if self._is_searching() else item_data.name)
 
                 # Add icons to distinguish folders from password entries
                 if item_data.is_folder:
@@ -133,10 +164,22 @@ class PasswordListController:
         if self.on_selection_changed:
             self.on_selection_changed(selection_model, *args)
 
+    @staticmethod
+    def _get_item_data(row):
+        """The PasswordListItem of a row of the tree or of the search results."""
+        if isinstance(row, Gtk.TreeListRow):
+            return row.get_item()
+        if isinstance(row, Gtk.StringObject):
+            return PasswordListItem(PasswordEntry(path=row.get_string()))
+        return row
+
+    def _is_searching(self) -> bool:
+        return self.selection_model is not None and self.selection_model.get_model() is self.filter_model
+
     def _on_item_activated(self, list_view, position):
         """Handle item activation (single-click) for folder expansion."""
         tree_list_row = self.selection_model.get_item(position)
-        if tree_list_row:
+        if isinstance(tree_list_row, Gtk.TreeListRow):
             item_data = tree_list_row.get_item()
             if item_data and item_data.is_folder:
                 # Toggle folder expansion
@@ -151,7 +194,10 @@ class PasswordListController:
     def load_passwords(self):
         """Load and display passwords in the list."""
         self.list_store.remove_all()
+        self.search_store.splice(0, self.search_store.get_n_items(), [])
         raw_password_list = self.password_store.list_passwords()
+        self._path_index = FuzzyPathIndex(raw_password_list)
+        self._path_tree = PathTree(raw_password_list)
 
         # Check if no passwords were found and provide helpful feedback
         if not raw_password_list:
@@ -177,107 +223,40 @@ class PasswordListController:
             self.toast_manager.show_info("No passwords found. Click '+' to add your first password.")
 
     def _build_hierarchical_structure(self, raw_password_list):
-        """Build hierarchical structure from flat password list."""
-        root_items_dict = {}
-
-        for path_str in sorted(raw_password_list):
-            parts = path_str.split(os.sep)
-            current_parent_dict = root_items_dict
-            current_parent_list_store = self.list_store
-            current_path_prefix = ""
-
-            for i, part_name in enumerate(parts):
-                current_full_path = os.path.join(current_path_prefix, part_name) if current_path_prefix else part_name
-                is_password_file = (i == len(parts) - 1)
-
-                if part_name not in current_parent_dict:
-                    is_folder = not is_password_file
-                    # Create PasswordEntry first, then PasswordListItem
-                    entry = PasswordEntry(path=current_full_path, is_folder=is_folder)
-                    new_item = PasswordListItem(entry)
-                    current_parent_dict[part_name] = new_item
-                    current_parent_list_store.append(new_item)
-
-                # Move to the next level
-                item_obj = current_parent_dict[part_name]
-                if not is_password_file:  # If it's a folder, prepare for its children
-                    current_parent_dict = getattr(item_obj, '_children_dict_cache', {})
-                    if not hasattr(item_obj, '_children_dict_cache'):
-                        item_obj._children_dict_cache = current_parent_dict
-                    current_parent_list_store = item_obj.children_model
-                    current_path_prefix = item_obj.full_path
-
-        # Clean up temporary caches
-        self._cleanup_cache(self.list_store)
-
-    def _cleanup_cache(self, store):
-        """Clean up temporary caches used during hierarchy building."""
-        for i in range(store.get_n_items()):
-            item = store.get_item(i)
-            if hasattr(item, '_children_dict_cache'):
-                delattr(item, '_children_dict_cache')
-            if item.is_folder and item.children_model:
-                self._cleanup_cache(item.children_model)
+        """Show the top level of the store; folders are filled in as they are expanded."""
+        self.list_store.splice(0, self.list_store.get_n_items(), self._create_items(self._path_tree.children()))
+
+        self.search_store.splice(0, self.search_store.get_n_items(), self._path_tree.paths)
+        if self._is_searching():
+            # The old matches refer to the previous items
+            self._apply_search(self.search_filter.query, items_changed=True)
 
     def _on_search_entry_changed(self, search_entry):
-        """Handle search entry changes."""
-        query = search_entry.get_text().strip()
+        """Filter the list as the query changes."""
+        self._apply_search(search_entry.get_text().strip().lower())
 
+    def _apply_search(self, query, items_changed=False):
+        """Show the passwords whose path matches query, or the tree if it is empty."""
         if not query:
-            # If query is empty, reload the full hierarchical list
-            self.load_passwords()
+            # The tree was never touched, so there is nothing to rebuild
+            self.search_filter.set_query("", None)
+            if self._is_searching():
+                self.selection_model.set_model(self.tree_list_model)
             return
 
-        # If there's a query, perform search
-        success, result = self.password_store.search_passwords(query)
-
-        # Create a new flat ListStore for search results
-        search_results_store = Gio.ListStore.new(PasswordListItem)
-
-        if success:
-            if result:  # If there are matching paths
-                for path_str in sorted(result):
-                    # Create PasswordEntry first, then PasswordListItem
-                    entry = PasswordEntry(path=path_str, is_folder=False)
-                    item = PasswordListItem(entry)
-                    search_results_store.append(item)
-                
-                # Update the list view with search results
-                self._update_list_with_search_results(search_results_store)
-                self.toast_manager.show_info(f"Found {len(result)} matching items")
-            else:  # No results found
-                # Clear the list but show a message
-                self._update_list_with_search_results(search_results_store)
-                self.toast_manager.show_info("No matching passwords found")
-        else:
-            # result contains the error message
-            self.toast_manager.show_error(f"Search error: {result}")
-            # Restore full list on error
-            self.load_passwords()
-
-    def _update_list_with_search_results(self, search_results_store):
-        """Update the list view with search results while preserving selection state."""
-        # Save current selection if any
-        selected_path = None
-        tree_list_row = self.selection_model.get_selected_item()
-        if tree_list_row:
-            selected_item = tree_list_row.get_item()
-            if selected_item:
-                selected_path = selected_item.full_path
-
-        # Replace the list store with search results
-        self.list_store.remove_all()
-
-        # Copy items from search results to main list store
-        for i in range(search_results_store.get_n_items()):
-            self.list_store.append(search_results_store.get_item(i))
+        matches = [path for path, _ in self._path_index.search(query)]
+        self.search_filter.set_query(query, matches, items_changed)
+        if not self._is_searching():
+            self.selection_model.set_model(self.filter_model)
+        if not matches:
+            self.toast_manager.show_info("No matching passwords found")
 
     def get_selected_item(self):
         """Get the currently selected item."""
         if self.selection_model:
             tree_list_row = self.selection_model.get_selected_item()
             if tree_list_row:
-                return tree_list_row.get_item()  # Get the actual PasswordListItem
+                return self._get_item_data(tree_list_row)  # Get the actual PasswordListItem
         return None
 
     def clear_selection(self):
@@ -290,6 +269,5 @@ class PasswordListController:
         self.search_entry.grab_focus()
 
     def clear_search(self):
-        """Clear the search entry and reload full list."""
+        """Clear the search entry; the full list comes back without a reload."""
         self.search_entry.set_text("")
-        self.load_passwords()
@@ -204,7 +204,7 @@ class WindowController:
         self.dynamic_folder_controller = DynamicFolderController(
             password_store=self.window.password_store,
             toast_manager=self.toast_manager,
-            folders_listbox=self.window.password_list_box,
+            list_view=self.window.password_list_view,
             search_entry=self.window.search_entry,
             on_selection_changed=self.window._on_selection_changed,
             parent_window=self.window
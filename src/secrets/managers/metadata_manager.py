@@ -5,6 +5,7 @@ Metadata Manager for storing and retrieving color/icon metadata for folders and
 import os
 import json
 import logging
+from contextlib import contextmanager
 from typing import Dict, Optional, Any
 from gi.repository import GLib
 
@@ -23,6 +24,9 @@ class MetadataManager:
         self.metadata_file = os.path.join(store_dir, ".secrets_metadata.json")
         self._metadata = {}
         self.logger = logging.getLogger(__name__)
+        # Nesting depth of batch_update() and whether it deferred a save
+        self._batch_depth = 0
+        self._batch_dirty = False
         self._load_metadata()
     
     def _load_metadata(self):
@@ -48,8 +52,29 @@ class MetadataManager:
                 "passwords": {}
             }
     
+    @contextmanager
+    def batch_update(self):
+        """
+        Group several changes into a single rewrite of the metadata file.
+
+        Inside the block, set/remove/rename calls only change memory; the
+        file is written once when the outermost block exits.
+        """
+        self._batch_depth += 1
+        try:
+            yield self
+        finally:
+            self._batch_depth -= 1
+            if not self._batch_depth and self._batch_dirty:
+                self._batch_dirty = False
+                self._save_metadata()
+
     def _save_metadata(self):
         """Save metadata to the JSON file."""
+        if self._batch_depth:
+            self._batch_dirty = True
+            return
+
         try:
             # Create a backup first
             if os.path.exists(self.metadata_file):
@@ -54,10 +54,8 @@ class PasswordListItem(GObject.Object):
     def __init__(self, entry: PasswordEntry):
         super().__init__()
         self._entry = entry
+        # Created on first use: most folders are never expanded
         self._children_model = None
-        
-        if entry.is_folder:
-            self._children_model = Gio.ListStore.new(PasswordListItem)
     
     @property
     def entry(self) -> PasswordEntry:
@@ -77,6 +75,8 @@ class PasswordListItem(GObject.Object):
     
     @property
     def children_model(self) -> Optional[Gio.ListStore]:
+        if self._children_model is None and self._entry.is_folder:
+            self._children_model = Gio.ListStore.new(PasswordListItem)
         return self._children_model
 
 
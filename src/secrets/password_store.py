@@ -3,7 +3,17 @@ import subprocess
 import glob # For listing files
 import re # Added
 import logging
-from .utils.gpg_utils import GPGSetupHelper
+import threading
+from .utils.gpg_utils import GPGSetupHelper, get_gpg_session
+from .utils.decryption_backend import create_decryption_backend, compile_search_pattern
+from .utils.decrypt_scheduler import AdaptiveDecryptScheduler, DecryptQueue
+from .utils.store_index import StoreIndex
+from .utils.plaintext_cache import PlaintextCache
+from .utils.single_flight import SingleFlight, FailureCache
+from .utils.store_transaction import StoreTransaction
+from .utils.commit_coalescer import CommitCoalescer
+from .utils.content_index import ContentIndex
+from .utils.metadata_handler import MetadataHandler
 
 # GTK imports are conditional to avoid hanging in headless environments
 _gtk_available = False
@@ -17,7 +27,8 @@ except (ImportError, ValueError):
     pass
 
 class PasswordStore:
-    def __init__(self, store_dir=None):
+    def __init__(self, store_dir=None, decryption_backend="gpg", max_decryption_workers=0,
+                 commit_idle_seconds=0, commit_max_changes=20):
         self.store_dir_override = store_dir # Store the override if provided
         self.logger = logging.getLogger(f"{__name__}.PasswordStore")
         self.store_dir = self._determine_store_dir(self.store_dir_override)
@@ -28,31 +39,63 @@ class PasswordStore:
         from .managers.metadata_manager import MetadataManager
         self.metadata_manager = MetadataManager(self.store_dir)
         
+        # In-memory index of entries and folders, built on first listing
+        self.index = StoreIndex(self.store_dir)
+
         # Content caching system to avoid redundant decryption
-        self._content_cache = {}  # path -> {'content': str, 'timestamp': float, 'mtime': float}
         self._cache_timeout = 3600  # 1 hour cache timeout for bulk processing
-        self._max_cache_size = 1000  # Increased cache size for bulk operations
+        self._max_cache_bytes = 16 * 1024 * 1024  # Plaintext budget
+        self._content_cache = PlaintextCache(
+            max_bytes=self._max_cache_bytes, ttl_seconds=self._cache_timeout
+        )
         
+        # Concurrent requests for one entry share a single decrypt, and recent
+        # failures (cancelled pinentry, missing secret key) are remembered
+        # briefly so independent callers don't re-prompt in a loop
+        self._decrypt_flights = SingleFlight()
+        self._failure_cache_timeout = 15
+        self._failed_decrypts = FailureCache(ttl_seconds=self._failure_cache_timeout)
+
+        # Search tokens of every entry decrypted this session, so content
+        # search does not have to decrypt the whole store for each query
+        self.content_index = ContentIndex()
+
         # Bulk processing optimization
         self._bulk_processing_mode = False
         self._bulk_cache_timeout = 7200  # 2 hours during bulk processing
 
+        # Backend used for every read of an entry ("gpg" or "pass")
+        self._decryption_backend_lock = threading.Lock()
+        self.decryption_backend = create_decryption_backend(
+            decryption_backend, self.store_dir, self._get_gpg_environment
+        )
+        # Upper bound for concurrent decrypts in batch reads (0 = number of CPUs)
+        self.max_decryption_workers = max_decryption_workers
+
+        # Interactive saves, removals and renames of a git store are written
+        # directly and committed together once the store is idle, instead of
+        # one `pass` commit each (commit_idle_seconds=0 keeps using `pass`)
+        self.commits = CommitCoalescer(
+            self.store_dir, self._get_gpg_environment,
+            idle_seconds=commit_idle_seconds, max_changes=commit_max_changes
+        )
+        if self.commits.enabled:
+            self.commits.recover()
+
     def enable_bulk_processing_mode(self):
         """Enable bulk processing mode for better caching."""
         self._bulk_processing_mode = True
+        self._content_cache.ttl_seconds = self._bulk_cache_timeout
         self.logger.info("Enabled bulk processing mode with enhanced caching")
 
     def disable_bulk_processing_mode(self):
         """Disable bulk processing mode and clean up cache."""
         self._bulk_processing_mode = False
-        # Optionally clean up cache when exiting bulk mode
-        self._cleanup_cache()
+        self._content_cache.ttl_seconds = self._cache_timeout
+        # Drop entries that were only kept alive by the bulk timeout
+        self._content_cache.purge_expired()
         self.logger.info("Disabled bulk processing mode")
 
-    def _get_effective_cache_timeout(self):
-        """Get the effective cache timeout based on processing mode."""
-        return self._bulk_cache_timeout if self._bulk_processing_mode else self._cache_timeout
-
     def _get_file_mtime(self, password_path):
         """Get the modification time of a password file."""
         try:
@@ -61,88 +104,36 @@ class PasswordStore:
         except (OSError, IOError):
             return 0
 
-    def _is_cache_valid(self, password_path, cache_entry):
-        """Check if a cache entry is still valid."""
-        import time
-        current_time = time.time()
-        
-        # Check if cache has expired using effective timeout
-        effective_timeout = self._get_effective_cache_timeout()
-        if current_time - cache_entry['timestamp'] > effective_timeout:
-            return False
-        
-        # Check if file has been modified
-        current_mtime = self._get_file_mtime(password_path)
-        if current_mtime != cache_entry['mtime']:
-            return False
-        
-        return True
-
-    def _cleanup_cache(self):
-        """Clean up expired cache entries and maintain size limit."""
-        import time
-        current_time = time.time()
-        
-        # Remove expired entries using effective timeout
-        effective_timeout = self._get_effective_cache_timeout()
-        expired_keys = []
-        for path, entry in self._content_cache.items():
-            if current_time - entry['timestamp'] > effective_timeout:
-                expired_keys.append(path)
-        
-        for key in expired_keys:
-            del self._content_cache[key]
-        
-        # If still over size limit, remove oldest entries
-        if len(self._content_cache) > self._max_cache_size:
-            # Sort by timestamp and remove oldest
-            sorted_entries = sorted(self._content_cache.items(), key=lambda x: x[1]['timestamp'])
-            entries_to_remove = len(self._content_cache) - self._max_cache_size
-            
-            for i in range(entries_to_remove):
-                path = sorted_entries[i][0]
-                del self._content_cache[path]
-
-    def _cache_content(self, password_path, content):
-        """Cache password content with metadata."""
-        import time
-        
-        # Clean up cache first
-        self._cleanup_cache()
-        
-        # Add new entry
-        self._content_cache[password_path] = {
-            'content': content,
-            'timestamp': time.time(),
-            'mtime': self._get_file_mtime(password_path)
-        }
+    def _cache_content(self, password_path, content, stamp=None):
+        """Cache password content, stamped with the file's mtime."""
+        if stamp is None:
+            stamp = self._get_file_mtime(password_path)
+        self._content_cache.put(password_path, content, stamp=stamp)
 
     def _get_cached_content(self, password_path):
-        """Get cached content if available and valid."""
-        if password_path not in self._content_cache:
-            return None
-        
-        cache_entry = self._content_cache[password_path]
-        
-        if self._is_cache_valid(password_path, cache_entry):
-            self.logger.debug(f"Cache hit for password: {password_path}")
-            return cache_entry['content']
-        else:
-            # Remove invalid cache entry
-            del self._content_cache[password_path]
-            self.logger.debug(f"Cache expired for password: {password_path}")
-            return None
+        """Get cached content if available and the file has not changed since."""
+        return self._content_cache.get(password_path, stamp=self._get_file_mtime(password_path))
 
     def invalidate_cache(self, password_path=None):
-        """Invalidate cache for a specific password or all passwords."""
+        """Invalidate (and wipe) cached content for a specific password or all passwords."""
         if password_path:
-            if password_path in self._content_cache:
-                del self._content_cache[password_path]
+            self._failed_decrypts.invalidate(password_path)
+            if self._content_cache.invalidate(password_path):
                 self.logger.debug(f"Cache invalidated for password: {password_path}")
         else:
+            self._failed_decrypts.clear()
             self._content_cache.clear()
+            self.content_index.clear()
             self.logger.debug("All password cache invalidated")
 
+    def clear_content_index(self):
+        """Forget the search tokens of decrypted entries (e.g. when locking)."""
+        self.content_index.clear()
+
+    def get_cache_stats(self):
+        """Get hit/miss counters and occupancy of the content cache."""
+        return self._content_cache.stats()
+
     def _preserve_empty_folder_after_deletion(self, deleted_password_path):
         """
         Preserve empty folders after password deletion by creating .gitkeep files.
@@ -236,8 +227,7 @@ class PasswordStore:
 
         # Check if GPG is installed
         try:
-            # Set up GPG environment for Flatpak compatibility
-            env = GPGSetupHelper.setup_gpg_environment()
+            env = get_gpg_session().environment()
             result = subprocess.run(["gpg", "--version"], capture_output=True, text=True, timeout=5, env=env)
             if result.returncode == 0:
                 status['gpg_installed'] = True
@@ -263,8 +253,7 @@ class PasswordStore:
         # Check if any GPG keys exist
         try:
             # Use a shorter timeout and add --batch flag to prevent hanging
-            # Set up GPG environment for Flatpak compatibility
-            env = GPGSetupHelper.setup_gpg_environment()
+            env = get_gpg_session().environment()
             result = subprocess.run(["gpg", "--batch", "--list-secret-keys", "--with-colons"],
                                   capture_output=True, text=True, timeout=5, env=env)
             if result.returncode == 0 and result.stdout.strip():
@@ -295,8 +284,7 @@ class PasswordStore:
                         status['store_gpg_id'] = store_gpg_id
 
                         # Check if this GPG ID exists in the keyring
-                        # Set up GPG environment for Flatpak compatibility
-                        env = GPGSetupHelper.setup_gpg_environment()
+                        env = get_gpg_session().environment()
                         result = subprocess.run(["gpg", "--batch", "--list-keys", store_gpg_id],
                                               capture_output=True, text=True, timeout=5, env=env)
                         if result.returncode == 0:
@@ -529,10 +517,12 @@ class PasswordStore:
 
     def list_passwords(self):
         """
-        Recursively scans the password store directory and returns a list of password entries.
-        Each entry could be a dictionary or a custom object representing a password or folder.
-        For now, it will return a flat list of paths relative to the store root.
-        Ignores the .git directory and other non-password files.
+        Returns a sorted, flat list of password entry paths relative to the
+        store root (without the .gpg extension). Ignores the .git directory
+        and other non-password files.
+
+        Answered from the in-memory store index, which is built with a single
+        scan and kept current with file monitoring.
 
         Note: This method only lists .gpg files that exist. If GPG setup is invalid,
         passwords may exist but not be accessible. Use validate_gpg_setup() to check
@@ -541,52 +531,36 @@ class PasswordStore:
         if not self.store_dir or not os.path.isdir(self.store_dir):
             return []
 
-        password_files = []
-        # +1 to include the trailing slash if store_dir doesn't have one, for correct slicing
-        root_len = len(os.path.join(self.store_dir, ''))
-
-        for root, dirs, files in os.walk(self.store_dir, topdown=True):
-            # Exclude .git directory
-            if '.git' in dirs:
-                dirs.remove('.git')
-
-            for file_name in files:
-                if file_name.endswith(".gpg"):
-                    full_path = os.path.join(root, file_name)
-                    # Get path relative to store_dir, remove .gpg extension
-                    relative_path = full_path[root_len:-4]
-                    password_files.append(relative_path)
-
-        password_files.sort()
-        return password_files
+        self._ensure_index()
+        return self.index.list_entries()
 
     def list_folders(self):
         """
-        Recursively scans the password store directory and returns a list of all folders.
-        Returns a flat list of folder paths relative to the store root.
-        Ignores the .git directory.
+        Returns a sorted, flat list of all folder paths relative to the store
+        root, from the in-memory store index. Ignores the .git directory.
         """
         if not self.store_dir or not os.path.isdir(self.store_dir):
             return []
 
-        folders = []
-        # +1 to include the trailing slash if store_dir doesn't have one, for correct slicing
-        root_len = len(os.path.join(self.store_dir, ''))
+        self._ensure_index()
+        return self.index.list_folders()
 
-        for root, dirs, files in os.walk(self.store_dir, topdown=True):
-            # Exclude .git directory
-            if '.git' in dirs:
-                dirs.remove('.git')
+    def has_password(self, path_to_password):
+        """Check whether a password entry exists, without touching the disk."""
+        self._ensure_index()
+        return self.index.has_entry(path_to_password)
 
-            # Add all directories found
-            for dir_name in dirs:
-                full_path = os.path.join(root, dir_name)
-                # Get path relative to store_dir
-                relative_path = full_path[root_len:]
-                folders.append(relative_path)
+    def has_folder(self, folder_path):
+        """Check whether a folder exists, without touching the disk."""
+        self._ensure_index()
+        return self.index.has_folder(folder_path)
 
-        folders.sort()
-        return folders
+    def _ensure_index(self):
+        """Build the store index and start watching the store on first use."""
+        if not self.index.is_monitoring:
+            self.index.ensure_built()
+            if _gtk_available:
+                self.index.start_monitoring()
 
     def copy_password(self, path_to_password):
         """
@@ -605,18 +579,12 @@ class PasswordStore:
              return False, "Invalid password path."
 
         try:
-            # Ensure GUI pinentry is configured for Flatpak
-            GPGSetupHelper.ensure_gui_pinentry()
-
             # Use `pass show -c <path>`
             # The `-c` flag copies to clipboard.
             # `pass show <path>` would print to stdout.
             command = ["pass", "show", "-c", path_to_password]
 
-            # Set up GPG environment for Flatpak compatibility
-            env = GPGSetupHelper.setup_gpg_environment()
-            if self.store_dir != os.path.expanduser("~/.password-store"):
-                 env["PASSWORD_STORE_DIR"] = self.store_dir
+            env = self._get_gpg_environment()
 
             process = subprocess.run(command, capture_output=True, text=True, check=False, env=env)
 
@@ -648,16 +616,18 @@ class PasswordStore:
 
     def _run_pass_git_command(self, git_args):
         """Helper to run `pass git <args>`."""
+        # Deferred changes belong before anything pushed or merged
+        self.flush_pending_commits()
         try:
             command = ["pass", "git"] + git_args
-            # Set up GPG environment for Flatpak compatibility
-            env = GPGSetupHelper.setup_gpg_environment()
-            if self.store_dir != os.path.expanduser("~/.password-store"):
-                 env["PASSWORD_STORE_DIR"] = self.store_dir
+            env = self._get_gpg_environment()
 
             process = subprocess.run(command, capture_output=True, text=True, check=False, env=env)
 
             if process.returncode == 0:
+                if git_args[:1] == ["pull"]:
+                    # A pull can touch any part of the store
+                    self.index.invalidate()
                 return True, process.stdout.strip() if process.stdout else "Success"
             else:
                 error_message = process.stderr.strip() if process.stderr.strip() else process.stdout.strip()
@@ -676,10 +646,7 @@ class PasswordStore:
             return False, "GPG ID cannot be empty."
         try:
             command = ["pass", "init", gpg_id]
-            # Set up GPG environment for Flatpak compatibility
-            env = GPGSetupHelper.setup_gpg_environment()
-            if self.store_dir != os.path.expanduser("~/.password-store"):
-                 env["PASSWORD_STORE_DIR"] = self.store_dir
+            env = self._get_gpg_environment()
 
             process = subprocess.run(command, capture_output=True, text=True, check=False, env=env)
 
@@ -710,16 +677,16 @@ class PasswordStore:
         if ".." in path_to_password or path_to_password.startswith("/"):
              return False, "Invalid password path."
 
+        if self.commits.enabled:
+            return self._delete_password_deferred(path_to_password)
+
         try:
             # Use `pass rm --force <path>`
             # The `--force` flag bypasses confirmation from `pass` itself,
             # as we'll handle confirmation in the GUI.
             command = ["pass", "rm", "--force", path_to_password]
 
-            # Set up GPG environment for Flatpak compatibility
-            env = GPGSetupHelper.setup_gpg_environment()
-            if self.store_dir != os.path.expanduser("~/.password-store"):
-                 env["PASSWORD_STORE_DIR"] = self.store_dir
+            env = self._get_gpg_environment()
 
             process = subprocess.run(command, capture_output=True, text=True, check=False, env=env)
 
@@ -727,9 +694,15 @@ class PasswordStore:
                 # `pass rm` might not output much on success
                 # Invalidate cache for this password since it was deleted
                 self.invalidate_cache(path_to_password)
+                self.content_index.remove(path_to_password)
                 
                 # Check if the parent folder still exists and preserve it if it became empty
                 self._preserve_empty_folder_after_deletion(path_to_password)
+
+                # `pass rm` may have pruned now-empty parent folders
+                self.index.remove_entry(path_to_password)
+                if "/" in path_to_password:
+                    self.index.sync_folder(os.path.dirname(path_to_password))
                 
                 return True, f"Successfully deleted '{path_to_password}'."
             else:
@@ -742,7 +715,8 @@ class PasswordStore:
 
     def get_password_content(self, path_to_password):
         """
-        Retrieves the content of the specified password file using `pass show`.
+        Retrieves the content of the specified password file through the
+        configured decryption backend.
         Returns a tuple (success_bool, content_or_error_string).
         Uses caching to avoid redundant decryption operations.
         """
@@ -758,132 +732,209 @@ class PasswordStore:
             return True, cached_content
 
         try:
-            # Ensure GUI pinentry is configured for Flatpak
-            GPGSetupHelper.ensure_gui_pinentry()
+            success, output = self._decrypt_shared(path_to_password)
 
-            # Use `pass show <path>` (without -c, so it prints to stdout)
-            command = ["pass", "show", path_to_password]
-
-            # Set up GPG environment for Flatpak compatibility
-            env = GPGSetupHelper.setup_gpg_environment()
-            if self.store_dir != os.path.expanduser("~/.password-store"):
-                 env["PASSWORD_STORE_DIR"] = self.store_dir
-
-            process = subprocess.run(command, capture_output=True, text=True, check=False, env=env)
-
-            if process.returncode == 0:
+            if success:
                 # The first line is the password, subsequent lines are extra data.
-                # `pass show` outputs the full content of the decrypted file.
-                content = process.stdout
-                
-                # Cache the content for future use
-                self._cache_content(path_to_password, content)
-                
-                return True, content
+                return True, output
             else:
-                error_message = process.stderr.strip() if process.stderr.strip() else process.stdout.strip()
-                return False, f"Error showing password '{path_to_password}': {error_message}"
+                return False, f"Error showing password '{path_to_password}': {output}"
         except FileNotFoundError:
             return False, "The 'pass' command was not found. Is it installed and in your PATH?"
         except Exception as e:
             return False, f"An unexpected error occurred while showing password: {e}"
 
-    def get_bulk_password_contents(self, password_paths, max_workers=8):
+    def _decrypt_shared(self, password_path):
         """
-        Retrieve multiple password contents efficiently using threading and caching.
-        Uses bulk processing mode to extend cache timeouts.
-        Implements sequential processing for first few passwords to establish GPG session.
-        
+        Decrypt an entry through the backend, sharing the result with any
+        concurrent request for the same entry.
+
+        Successful results are cached; failures are remembered for a few
+        seconds (until the file changes) and returned without running gpg.
+
+        Returns:
+            Tuple (success, content_or_backend_error)
+        """
+        stamp = self._get_file_mtime(password_path)
+        failure = self._failed_decrypts.get(password_path, stamp)
+        if failure is not None:
+            return False, failure
+
+        def decrypt():
+            # Another request may have finished while this one was queued
+            cached_content = self._get_cached_content(password_path)
+            if cached_content is not None:
+                return True, cached_content
+            success, output = self.decryption_backend.decrypt(password_path)
+            if success:
+                self._cache_content(password_path, output, stamp=stamp)
+                self.content_index.update(password_path, output, stamp)
+            else:
+                self._failed_decrypts.put(password_path, output, stamp)
+            return success, output
+
+        return self._decrypt_flights.do(password_path, decrypt)
+
+    def _get_gpg_environment(self):
+        """Get the environment for pass/gpg subprocesses of this store."""
+        # Session-scoped GPG environment, rebuilt only when GNUPGHOME or the
+        # agent socket changes
+        env = get_gpg_session().environment()
+        if self.store_dir != os.path.expanduser("~/.password-store"):
+             env["PASSWORD_STORE_DIR"] = self.store_dir
+        return env
+
+    def set_decryption_backend(self, name):
+        """
+        Switch the backend used to decrypt entries.
+
+        Args:
+            name: Backend name from the performance config ("gpg" or "pass")
+        """
+        with self._decryption_backend_lock:
+            if name == self.decryption_backend.name:
+                return
+            old_backend = self.decryption_backend
+            self.decryption_backend = create_decryption_backend(
+                name, self.store_dir, self._get_gpg_environment
+            )
+        old_backend.close()
+        self.logger.info(f"Using '{self.decryption_backend.name}' decryption backend")
+
+    def flush_pending_commits(self):
+        """
+        Commit deferred changes now (before push/pull, on lock and shutdown).
+        Returns True on success, False otherwise, along with a message.
+        """
+        if not self.commits.is_git_store():
+            return True, "Nothing to commit."
+        return self.commits.flush()
+
+    def shutdown_decryption_backend(self):
+        """Release the decryption backend's resources (e.g. its worker process)."""
+        self.decryption_backend.close()
+        self.logger.debug("Decryption backend shut down")
+
+    def get_password_contents_batch(self, password_paths, callback=None, max_workers=None):
+        """
+        Retrieve many password contents through the decryption backend.
+
         Args:
             password_paths: List of password paths to retrieve
-            max_workers: Maximum number of worker threads
-            
+            callback: Optional callable(path, (success, content_or_error)) invoked
+                as each entry completes
+            max_workers: Upper bound for concurrent decrypts (defaults to the
+                configured maximum, or the number of CPUs)
+
         Returns:
             Dict mapping password_path -> (success, content_or_error)
         """
-        from concurrent.futures import ThreadPoolExecutor, as_completed
-        import time
-        
-        # Enable bulk processing mode for better caching
-        self.enable_bulk_processing_mode()
-        
-        # Pre-warm GPG agent to establish session before bulk processing
-        from .utils.gpg_utils import GPGSetupHelper
-        warm_success, warm_message = GPGSetupHelper.warm_gpg_agent()
-        if warm_success:
-            self.logger.info(f"GPG agent pre-warmed: {warm_message}")
-        else:
-            self.logger.warning(f"GPG agent warming failed: {warm_message}")
-        
         results = {}
-        cached_results = {}
-        uncached_paths = []
-        
-        # First, check which passwords are already cached
-        for path in password_paths:
-            cached_content = self._get_cached_content(path)
-            if cached_content is not None:
-                cached_results[path] = (True, cached_content)
+        for path, result in self.iter_password_contents(password_paths, max_workers=max_workers):
+            results[path] = result
+            if callback:
+                callback(path, result)
+        return results
+
+    def iter_password_contents(self, password_paths, max_workers=None):
+        """
+        Decrypt many entries, yielding (path, (success, content_or_error)) as
+        each one completes.
+
+        Cached entries, remembered failures and invalid paths are yielded
+        first. Decrypts then run one at a time until gpg-agent is known to
+        hold the passphrase (so the user is asked once, not once per entry),
+        after which the number of concurrent decrypts is scaled by measured
+        latency and error rate (see AdaptiveDecryptScheduler).
+
+        Args:
+            password_paths: Password paths, or a DecryptQueue whose priorities
+                can be changed, and which can be cancelled, while iterating
+            max_workers: Upper bound for concurrent decrypts (defaults to the
+                configured maximum, or the number of CPUs)
+        """
+        if isinstance(password_paths, DecryptQueue):
+            queue = password_paths
+        else:
+            queue = DecryptQueue(password_paths)
+
+        for path in queue.pending():
+            if queue.cancelled:
+                return
+            result = self._get_immediate_result(path)
+            if result is not None:
+                queue.discard(path)
+                yield path, result
+
+        to_decrypt = queue.pending()
+        if not to_decrypt or queue.cancelled:
+            return
+
+        scheduler = AdaptiveDecryptScheduler(
+            self._decrypt_shared,
+            max_workers=max_workers or self.max_decryption_workers or None,
+            unlocked=len(to_decrypt) > 1 and self._is_gpg_agent_unlocked(to_decrypt),
+        )
+        for path, (success, output) in scheduler.run(queue):
+            if success:
+                yield path, (True, output)
             else:
-                uncached_paths.append(path)
-        
-        self.logger.info(f"Bulk processing: {len(cached_results)} cached, {len(uncached_paths)} need decryption")
-        
-        if uncached_paths:
-            # Process first 3 passwords sequentially to establish GPG session and cache passphrase
-            sequential_paths = uncached_paths[:3]
-            parallel_paths = uncached_paths[3:]
-            
-            self.logger.info(f"Processing {len(sequential_paths)} passwords sequentially to establish GPG session")
-            
-            # Sequential processing for session establishment
-            for path in sequential_paths:
-                try:
-                    success, content = self.get_password_content(path)
-                    results[path] = (success, content)
-                    if success:
-                        self.logger.debug(f"Successfully established GPG session with {path}")
-                    else:
-                        self.logger.warning(f"Failed to establish GPG session with {path}: {content}")
-                    
-                    # Small delay between sequential operations to let GPG agent stabilize
-                    time.sleep(0.1)
-                    
-                except Exception as e:
-                    self.logger.warning(f"Failed to process password {path} sequentially: {e}")
-                    results[path] = (False, f"Processing failed: {e}")
-            
-            # Now process remaining passwords in parallel with very limited concurrency
-            if parallel_paths:
-                self.logger.info(f"Processing remaining {len(parallel_paths)} passwords in parallel")
-                # Use very conservative concurrency to avoid overwhelming GPG agent
-                max_parallel_workers = min(2, max_workers, len(parallel_paths))
-                
-                with ThreadPoolExecutor(max_workers=max_parallel_workers) as executor:
-                    # Submit remaining password retrieval tasks
-                    future_to_path = {
-                        executor.submit(self.get_password_content, path): path 
-                        for path in parallel_paths
-                    }
-                    
-                    # Collect results as they complete
-                    for future in as_completed(future_to_path):
-                        path = future_to_path[future]
-                        try:
-                            success, content = future.result(timeout=45)  # Longer timeout for parallel processing
-                            results[path] = (success, content)
-                        except Exception as e:
-                            self.logger.warning(f"Failed to process password {path}: {e}")
-                            results[path] = (False, f"Processing failed: {e}")
-        
-        # Combine cached and newly retrieved results
-        results.update(cached_results)
-        
+                yield path, (False, f"Error showing password '{path}': {output}")
+
+        self.logger.debug(f"Batch decrypt finished with {scheduler.controller.workers} concurrent workers")
+
+    def _get_immediate_result(self, password_path):
+        """Result for an entry that needs no decrypt (invalid, cached or recently failed), else None."""
+        if not password_path:
+            return False, "Password path cannot be empty."
+        if ".." in password_path or password_path.startswith("/"):
+            return False, "Invalid password path."
+        cached_content = self._get_cached_content(password_path)
+        if cached_content is not None:
+            return True, cached_content
+        failure = self._failed_decrypts.get(password_path, self._get_file_mtime(password_path))
+        if failure is not None:
+            return False, f"Error showing password '{password_path}': {failure}"
+        return None
+
+    def _is_gpg_agent_unlocked(self, password_paths):
+        """Check whether gpg-agent can decrypt the given entries without prompting."""
+        recipients = set()
+        for path in password_paths:
+            recipients.update(self.decryption_backend.recipients.recipients_for(path))
+        return GPGSetupHelper.probe_agent_cache(
+            sorted(recipients), self._get_gpg_environment(), self.decryption_backend.gpg_binary
+        ) is True
+
+    def get_bulk_password_contents(self, password_paths, max_workers=None):
+        """
+        Retrieve multiple password contents efficiently using adaptive
+        concurrency and caching. Uses bulk processing mode to extend cache
+        timeouts.
+
+        Args:
+            password_paths: List of password paths to retrieve
+            max_workers: Upper bound for concurrent decrypts (defaults to the
+                configured maximum, or the number of CPUs)
+
+        Returns:
+            Dict mapping password_path -> (success, content_or_error)
+        """
+        # Enable bulk processing mode for better caching
+        self.enable_bulk_processing_mode()
+
+        self.logger.info(f"Bulk processing {len(password_paths)} passwords through "
+                         f"'{self.decryption_backend.name}' decryption backend")
+
+        # Decrypts stay serial until the agent is unlocked, so there is no
+        # pinentry storm; the first entry establishes the GPG session.
+        results = self.get_password_contents_batch(password_paths, max_workers=max_workers)
+
         self.logger.info(f"Bulk processing complete: {len(results)} total passwords processed")
-        
+
         # Keep bulk processing mode enabled for the session
         # It will be disabled when the controller is done with bulk operations
-        
+
         return results
 
     def get_password_path_and_content(self, path_to_password):
@@ -916,10 +967,12 @@ class PasswordStore:
         if ".." in path_to_password or path_to_password.startswith("/"):
              return False, "Invalid password path."
 
-        try:
-            # Ensure GUI pinentry is configured for Flatpak
-            GPGSetupHelper.ensure_gui_pinentry()
+        if self.commits.enabled:
+            if not multiline:
+                content = content.split("\n", 1)[0] + "\n"
+            return self._insert_password_deferred(path_to_password, content, force)
 
+        try:
             command = ["pass", "insert"]
             if multiline:
                 command.append("-m") # or --multiline
@@ -927,10 +980,7 @@ class PasswordStore:
                 command.append("-f") # or --force
             command.append(path_to_password)
 
-            # Set up GPG environment for Flatpak compatibility
-            env = GPGSetupHelper.setup_gpg_environment()
-            if self.store_dir != os.path.expanduser("~/.password-store"):
-                 env["PASSWORD_STORE_DIR"] = self.store_dir
+            env = self._get_gpg_environment()
 
             # The content needs to be passed via stdin to the `pass insert` command
             # Add timeout to prevent hanging
@@ -940,6 +990,8 @@ class PasswordStore:
                 # `pass insert` might not output much on success
                 # Invalidate cache for this password since it was modified
                 self.invalidate_cache(path_to_password)
+                self.index.add_entry(path_to_password)
+                self.content_index.update(path_to_password, content, self._get_file_mtime(path_to_password))
                 return True, f"Successfully saved '{path_to_password}'."
             else:
                 error_message = process.stderr.strip() if process.stderr.strip() else process.stdout.strip()
@@ -951,47 +1003,111 @@ class PasswordStore:
         except Exception as e:
             return False, f"An unexpected error occurred while saving: {e}"
 
+    def transaction(self, max_workers=None):
+        """
+        Start a transaction for writing many entries with a single git commit.
+
+        Entries are added with transaction.insert(path, content, force) and
+        written by transaction.commit(message, progress_callback), which
+        encrypts them in parallel and rolls everything back on failure.
+        """
+        return StoreTransaction(
+            self.store_dir, self.decryption_backend,
+            max_workers=max_workers or self.max_decryption_workers or None,
+            on_commit=self._on_transaction_committed
+        )
+
+    def bulk_insert(self, entries, force=True, progress_callback=None, commit_message=None):
+        """
+        Inserts or updates many passwords at once, like insert_password but
+        with one git commit for the whole batch.
+        - entries: Mapping or iterable of (path, content) pairs.
+        - force: If False, existing entries are left untouched and skipped.
+        - progress_callback: Called as (encrypted, total) while encrypting.
+        Returns True on success, False otherwise, along with an output/error message.
+        Nothing is written unless every entry could be saved.
+        """
+        transaction = self.transaction()
+        items = entries.items() if hasattr(entries, "items") else entries
+        for path, content in items:
+            accepted, message = transaction.insert(path, content, force=force)
+            if not accepted and path not in transaction.skipped:
+                return False, message
+
+        success, message = transaction.commit(commit_message, progress_callback)
+        if success and transaction.skipped:
+            message = f"{message} Skipped {len(transaction.skipped)} existing passwords."
+        return success, message
+
+    def _on_transaction_committed(self, entries):
+        """Bring caches and the indexes up to date after a transaction."""
+        for path, content in entries.items():
+            self.invalidate_cache(path)
+            self.index.add_entry(path)
+            self.content_index.update(path, content, self._get_file_mtime(path))
+
     def search_passwords(self, query):
         """
-        Searches passwords using `pass grep`.
+        Searches the content of all passwords (usernames, URLs, fields and
+        notes; never the password line). Entries decrypted this session are
+        answered from the content index; the others are decrypted once and
+        indexed. Every word of the query must be the start of a word in the
+        entry. Queries without words fall back to the backend's grep.
         Returns a tuple (success_bool, list_of_matching_paths_or_error_string).
-        `pass grep` outputs matching entry names, one per line.
         """
         if not query:
             return False, "Search query cannot be empty."
 
         try:
-            # Ensure GUI pinentry is configured for Flatpak
-            GPGSetupHelper.ensure_gui_pinentry()
-
-            # Use `pass grep <query>`
-            # Note: `pass grep` can be slow on very large stores.
-            # It searches the content of encrypted files.
-            command = ["pass", "grep", query] # Add any other flags if needed, e.g. -i for case-insensitive
-
-            # Set up GPG environment for Flatpak compatibility
-            env = GPGSetupHelper.setup_gpg_environment()
-            if self.store_dir != os.path.expanduser("~/.password-store"):
-                 env["PASSWORD_STORE_DIR"] = self.store_dir
-
-            process = subprocess.run(command, capture_output=True, text=True, check=False, env=env)
+            password_paths = self.list_passwords()
+            if self.content_index.search(query) is None:
+                success, result = self.decryption_backend.grep(query, password_paths)
+                if success:
+                    return True, result
+                return False, f"Error searching passwords: {result}"
+
+            # Entries not decrypted yet, or changed since they were indexed
+            unindexed = self.content_index.unindexed(password_paths, self._get_file_mtime)
+            if unindexed:
+                self.logger.debug(f"Indexing {len(unindexed)} passwords for content search")
+                for path, (success, content) in self.iter_password_contents(unindexed):
+                    if success:
+                        self.content_index.update(path, content, self._get_file_mtime(path))
 
-            if process.returncode == 0:
-                # Output is a list of matching password names, one per line.
-                # Need to strip empty lines that might result from splitlines()
-                matching_paths = [line for line in process.stdout.splitlines() if line.strip()]
-                return True, matching_paths
-            elif process.returncode == 1: # `grep` returns 1 if no lines were selected
-                return True, [] # No matches found is not an error in this context
-            else:
-                # Other return codes indicate an error with `pass` or `grep` itself
-                error_message = process.stderr.strip() if process.stderr.strip() else process.stdout.strip()
-                return False, f"Error searching passwords: {error_message}"
+            present = set(password_paths)
+            return True, sorted(path for path in self.content_index.search(query) if path in present)
         except FileNotFoundError:
             return False, "The 'pass' command was not found. Is it installed and in your PATH?"
         except Exception as e:
             return False, f"An unexpected error occurred during search: {e}"
 
+    def iter_search_passwords(self, query, queue=None, max_workers=None):
+        """
+        Searches the content of passwords like `pass grep` (a regular
+        expression, or literal text if the query is not a valid one), yielding
+        each matching path as soon as its entry has been decrypted.
+
+        Entries are decrypted in parallel through iter_password_contents, so
+        content decrypted earlier in the session is reused and every new
+        decrypt also feeds the content index.
+
+        Args:
+            query: Regular expression or text to look for
+            queue: DecryptQueue of the entries to search (default: all
+                entries); cancel it to stop the search
+            max_workers: Upper bound for concurrent decrypts
+        """
+        if not query:
+            return
+        pattern = compile_search_pattern(query)
+        if queue is None:
+            queue = DecryptQueue(self.list_passwords())
+        for path, (success, content) in self.iter_password_contents(queue, max_workers=max_workers):
+            if queue.cancelled:
+                return
+            if success and pattern.search(content):
+                yield path
+
     def move_password(self, old_path, new_path, preserve_empty_folders=True):
         """
         Moves/renames a password entry using `pass mv`.
@@ -1017,13 +1133,23 @@ class PasswordStore:
         # Store the old folder path for preservation check
         old_folder = os.path.dirname(old_path) if '/' in old_path else ""
 
+        if self.commits.enabled:
+            success, message = self._move_password_deferred(old_path, new_path)
+            if success:
+                if preserve_empty_folders and old_folder:
+                    self._preserve_empty_folder_after_move(old_folder)
+                self.invalidate_cache(old_path)
+                self.index.remove_entry(old_path)
+                self.index.add_entry(new_path)
+                self.content_index.move(old_path, new_path, self._get_file_mtime(new_path))
+                if old_folder:
+                    self.index.sync_folder(old_folder)
+            return success, message
+
         try:
             command = ["pass", "mv", old_path, new_path]
 
-            # Set up GPG environment for Flatpak compatibility
-            env = GPGSetupHelper.setup_gpg_environment()
-            if self.store_dir != os.path.expanduser("~/.password-store"):
-                 env["PASSWORD_STORE_DIR"] = self.store_dir
+            env = self._get_gpg_environment()
 
             process = subprocess.run(command, capture_output=True, text=True, check=False, env=env)
 
@@ -1033,6 +1159,12 @@ class PasswordStore:
                 if preserve_empty_folders and old_folder:
                     self._preserve_empty_folder_after_move(old_folder)
 
+                self.index.remove_entry(old_path)
+                self.index.add_entry(new_path)
+                self.content_index.move(old_path, new_path, self._get_file_mtime(new_path))
+                if old_folder:
+                    self.index.sync_folder(old_folder)
+
                 return True, f"Successfully moved '{old_path}' to '{new_path}'."
             else:
                 error_message = process.stderr.strip() if process.stderr.strip() else process.stdout.strip()
@@ -1065,6 +1197,221 @@ class PasswordStore:
             # This is a best-effort operation
             pass
 
+    def _entry_file(self, path_to_password):
+        return os.path.join(self.store_dir, path_to_password + ".gpg")
+
+    def _insert_password_deferred(self, path_to_password, content, force):
+        """Encrypt an entry like `pass insert`, leaving the git commit to self.commits."""
+        entry_file = self._entry_file(path_to_password)
+        if not force and os.path.exists(entry_file):
+            return False, f"Error saving password '{path_to_password}': An entry already exists for {path_to_password}."
+
+        with self.commits.change(f"Add given password for {path_to_password} to store.",
+                                 [path_to_password + ".gpg"]) as change:
+            try:
+                os.makedirs(os.path.dirname(entry_file), exist_ok=True)
+                success, error = self.decryption_backend.encrypt_file(
+                    content, entry_file, os.path.dirname(path_to_password)
+                )
+            except OSError as e:
+                success, error = False, str(e)
+            if not success:
+                change.discard()
+
+        if not success:
+            return False, f"Error saving password '{path_to_password}': {error}"
+        self.invalidate_cache(path_to_password)
+        self.index.add_entry(path_to_password)
+        self.content_index.update(path_to_password, content, self._get_file_mtime(path_to_password))
+        return True, f"Successfully saved '{path_to_password}'."
+
+    def _delete_password_deferred(self, path_to_password):
+        """Remove an entry like `pass rm`, leaving the git commit to self.commits."""
+        entry_file = self._entry_file(path_to_password)
+        if not os.path.isfile(entry_file):
+            return False, f"Error deleting password '{path_to_password}': {path_to_password} is not in the password store."
+
+        folder = os.path.dirname(path_to_password)
+        paths = [path_to_password + ".gpg"]
+        if folder:
+            # Created if the folder becomes empty, and committed along with the removal
+            paths.append(os.path.join(folder, ".gitkeep"))
+        with self.commits.change(f"Remove {path_to_password} from store.", paths) as change:
+            try:
+                os.remove(entry_file)
+            except OSError as e:
+                change.discard()
+                return False, f"Error deleting password '{path_to_password}': {e}"
+            self._preserve_empty_folder_after_deletion(path_to_password)
+
+        self.invalidate_cache(path_to_password)
+        self.index.remove_entry(path_to_password)
+        self.content_index.remove(path_to_password)
+        return True, f"Successfully deleted '{path_to_password}'."
+
+    def _move_password_deferred(self, old_path, new_path):
+        """Rename an entry like `pass mv`, leaving the git commit to self.commits."""
+        old_file = self._entry_file(old_path)
+        new_file = self._entry_file(new_path)
+        if not os.path.isfile(old_file):
+            return False, f"Error moving password: {old_path} is not in the password store."
+        if os.path.exists(new_file):
+            return False, f"Error moving password: {new_path} already exists."
+
+        with self.commits.change(f"Rename {old_path} to {new_path}.",
+                                 [old_path + ".gpg", new_path + ".gpg"]) as change:
+            try:
+                os.makedirs(os.path.dirname(new_file), exist_ok=True)
+                recipients = self.decryption_backend.recipients
+                if recipients.recipients_for(old_path) == recipients.recipients_for(new_path):
+                    os.replace(old_file, new_file)
+                else:
+                    # Like `pass mv`, re-encrypt for the destination's .gpg-id
+                    success, content = self.decryption_backend.decrypt(old_path)
+                    if not success:
+                        change.discard()
+                        return False, f"Error moving password: {content}"
+                    success, error = self.decryption_backend.encrypt_file(
+                        content, new_file, os.path.dirname(new_path)
+                    )
+                    if not success:
+                        change.discard()
+                        return False, f"Error moving password: {error}"
+                    os.remove(old_file)
+            except OSError as e:
+                return False, f"Error moving password: {e}"
+
+        return True, f"Successfully moved '{old_path}' to '{new_path}'."
+
+    def delete_passwords(self, paths):
+        """
+        Deletes many passwords with one git commit and one metadata rewrite.
+        Either every entry is deleted or none is.
+        Returns True on success, False otherwise, along with a message.
+        """
+        paths = list(dict.fromkeys(paths))
+        for path in paths:
+            if not path or ".." in path or path.startswith("/"):
+                return False, f"Invalid password path: '{path}'."
+            if not os.path.isfile(self._entry_file(path)):
+                return False, f"Error deleting passwords: {path} is not in the password store."
+        if not paths:
+            return True, "No passwords to delete."
+
+        message = (f"Remove {paths[0]} from store." if len(paths) == 1
+                   else f"Remove {len(paths)} passwords from store.")
+        folders = {os.path.dirname(path) for path in paths if "/" in path}
+        git_paths = [path + ".gpg" for path in paths] + [os.path.join(f, ".gitkeep") for f in folders]
+        with self.commits.change(message, git_paths) as change:
+            # Entries are set aside first so a failure part-way can be undone
+            removed = []
+            try:
+                for path in paths:
+                    backup = self._entry_file(path) + ".batch.bak"
+                    os.replace(self._entry_file(path), backup)
+                    removed.append((path, backup))
+            except OSError as e:
+                for path, backup in reversed(removed):
+                    os.replace(backup, self._entry_file(path))
+                change.discard()
+                return False, f"Error deleting passwords: {e}"
+            for _, backup in removed:
+                os.remove(backup)
+            for path in paths:
+                self._preserve_empty_folder_after_deletion(path)
+        if not self.commits.enabled:
+            self.commits.flush()
+
+        with self.metadata_manager.batch_update():
+            for path in paths:
+                self.metadata_manager.remove_password_metadata(path)
+        for path in paths:
+            self.invalidate_cache(path)
+            self.index.remove_entry(path)
+            self.content_index.remove(path)
+        return True, f"Successfully deleted {len(paths)} passwords."
+
+    def move_passwords(self, moves, preserve_empty_folders=True):
+        """
+        Moves/renames many passwords with one git commit and one metadata rewrite.
+        Either every entry is moved or none is.
+        - moves: Mapping or iterable of (old_path, new_path) pairs.
+        Returns True on success, False otherwise, along with a message.
+        """
+        moves = list(moves.items() if hasattr(moves, "items") else moves)
+        destinations = set()
+        for old_path, new_path in moves:
+            if not old_path or not new_path or ".." in old_path or ".." in new_path \
+                    or old_path.startswith("/") or new_path.startswith("/"):
+                return False, f"Invalid old or new path: '{old_path}' -> '{new_path}'."
+            if old_path == new_path:
+                return False, f"Old and new paths cannot be the same: '{old_path}'."
+            if not os.path.isfile(self._entry_file(old_path)):
+                return False, f"Error moving passwords: {old_path} is not in the password store."
+            if os.path.exists(self._entry_file(new_path)) or new_path in destinations:
+                return False, f"Error moving passwords: {new_path} already exists."
+            destinations.add(new_path)
+        if not moves:
+            return True, "No passwords to move."
+
+        message = (f"Rename {moves[0][0]} to {moves[0][1]}." if len(moves) == 1
+                   else f"Move {len(moves)} passwords.")
+        git_paths = [path + ".gpg" for move in moves for path in move]
+        recipients = self.decryption_backend.recipients
+        moved = []  # (old_path, new_path, re-encrypted)
+        with self.commits.change(message, git_paths) as change:
+            error = None
+            try:
+                for old_path, new_path in moves:
+                    new_file = self._entry_file(new_path)
+                    os.makedirs(os.path.dirname(new_file), exist_ok=True)
+                    if recipients.recipients_for(old_path) == recipients.recipients_for(new_path):
+                        os.replace(self._entry_file(old_path), new_file)
+                        moved.append((old_path, new_path, False))
+                        continue
+                    # Like `pass mv`, re-encrypt for the destination's .gpg-id
+                    success, content = self.decryption_backend.decrypt(old_path)
+                    if success:
+                        success, content = self.decryption_backend.encrypt_file(
+                            content, new_file, os.path.dirname(new_path)
+                        )
+                    if not success:
+                        error = f"{old_path}: {content}"
+                        break
+                    moved.append((old_path, new_path, True))
+            except OSError as e:
+                error = str(e)
+
+            if error is not None:
+                for old_path, new_path, reencrypted in reversed(moved):
+                    if reencrypted:
+                        os.remove(self._entry_file(new_path))
+                    else:
+                        os.replace(self._entry_file(new_path), self._entry_file(old_path))
+                change.discard()
+                return False, f"Error moving passwords: {error}"
+            # Originals of re-encrypted entries are only removed once all moves succeeded
+            for old_path, _, reencrypted in moved:
+                if reencrypted:
+                    os.remove(self._entry_file(old_path))
+        if not self.commits.enabled:
+            self.commits.flush()
+
+        with self.metadata_manager.batch_update():
+            for old_path, new_path in moves:
+                self.metadata_manager.rename_password_metadata(old_path, new_path)
+        old_folders = {os.path.dirname(old_path) for old_path, _ in moves if "/" in old_path}
+        for old_path, new_path in moves:
+            self.invalidate_cache(old_path)
+            self.index.remove_entry(old_path)
+            self.index.add_entry(new_path)
+            self.content_index.move(old_path, new_path, self._get_file_mtime(new_path))
+        for folder in old_folders:
+            if preserve_empty_folders:
+                self._preserve_empty_folder_after_move(folder)
+            self.index.sync_folder(folder)
+        return True, f"Successfully moved {len(moves)} passwords."
+
     def create_folder(self, folder_path):
         """
         Create a folder in the password store.
@@ -1100,6 +1447,7 @@ class PasswordStore:
 
             # Verify creation
             if os.path.isdir(full_folder_path):
+                self.index.add_folder(folder_path)
                 return True, f"Folder '{folder_path}' created successfully"
             else:
                 return False, f"Failed to create folder '{folder_path}'"
@@ -1111,7 +1459,7 @@ class PasswordStore:
 
     def is_folder_empty(self, folder_path):
         """
-        Check if a folder is empty (contains no .gpg files).
+        Check if a folder is empty (contains no .gpg files), using the store index.
 
         Args:
             folder_path (str): The path of the folder to check
@@ -1126,32 +1474,21 @@ class PasswordStore:
         folder_path = folder_path.strip().strip('/')
 
         try:
-            # Create the full path in the password store
-            full_folder_path = os.path.join(self.store_dir, folder_path)
+            self._ensure_index()
 
             # Check if folder exists
-            if not os.path.exists(full_folder_path):
+            if not self.index.has_folder(folder_path):
+                if self.index.has_entry(folder_path):
+                    return False, False, f"'{folder_path}' is not a folder"
                 return False, False, f"Folder '{folder_path}' does not exist"
 
-            if not os.path.isdir(full_folder_path):
-                return False, False, f"'{folder_path}' is not a folder"
-
-            # Check for .gpg files recursively
-            for root, dirs, files in os.walk(full_folder_path):
-                # Exclude .git directory
-                if '.git' in dirs:
-                    dirs.remove('.git')
-
-                # Check if any .gpg files exist
-                for file_name in files:
-                    if file_name.endswith('.gpg'):
-                        return True, False, f"Folder '{folder_path}' contains password files"
+            # Check for entries recursively
+            if self.index.has_entries_under(folder_path):
+                return True, False, f"Folder '{folder_path}' contains password files"
 
             # No .gpg files found
             return True, True, f"Folder '{folder_path}' is empty"
 
-        except OSError as e:
-            return False, False, f"Error checking folder: {str(e)}"
         except Exception as e:
             return False, False, f"Unexpected error checking folder: {str(e)}"
 
@@ -1192,6 +1529,7 @@ class PasswordStore:
 
             # Verify deletion
             if not os.path.exists(full_folder_path):
+                self.index.remove_folder(folder_path)
                 return True, f"Folder '{folder_path}' deleted successfully"
             else:
                 return False, f"Failed to delete folder '{folder_path}'"
@@ -1205,6 +1543,9 @@ class PasswordStore:
         """
         Rename a folder in the password store by moving all its contents.
 
+        The entries, their metadata and the metadata of the folder and its
+        subfolders move together, with one git commit and one metadata rewrite.
+
         Args:
             old_folder_path (str): The current path of the folder to rename
             new_folder_path (str): The new path for the folder
@@ -1241,20 +1582,49 @@ class PasswordStore:
             if os.path.exists(new_full_path):
                 return False, f"Folder '{new_folder_path}' already exists"
 
+            # Every file under the folder, so the commit records both sides
+            old_files = []
+            for root, _, files in os.walk(old_full_path):
+                for name in files:
+                    old_files.append(os.path.relpath(os.path.join(root, name), self.store_dir))
+            prefix = old_folder_path + "/"
+            git_paths = old_files + [new_folder_path + "/" + path[len(prefix):] for path in old_files]
+
             # Rename the directory
-            os.rename(old_full_path, new_full_path)
+            with self.commits.change(f"Rename {old_folder_path} to {new_folder_path}.", git_paths):
+                os.makedirs(os.path.dirname(new_full_path), exist_ok=True)
+                os.rename(old_full_path, new_full_path)
 
             # Verify rename
-            if os.path.isdir(new_full_path) and not os.path.exists(old_full_path):
-                return True, f"Folder renamed from '{old_folder_path}' to '{new_folder_path}'"
-            else:
+            if not os.path.isdir(new_full_path) or os.path.exists(old_full_path):
                 return False, f"Failed to rename folder '{old_folder_path}'"
-
+            if not self.commits.enabled:
+                self.commits.flush()
         except OSError as e:
             return False, f"Error renaming folder: {str(e)}"
         except Exception as e:
             return False, f"Unexpected error renaming folder: {str(e)}"
 
+        moves = [(path[:-len(".gpg")], new_folder_path + "/" + path[len(prefix):-len(".gpg")])
+                 for path in old_files if path.endswith(".gpg")]
+        folders = [folder for folder in self.metadata_manager.get_all_folder_metadata()
+                   if folder == old_folder_path or folder.startswith(prefix)]
+        with self.metadata_manager.batch_update():
+            for folder in folders:
+                self.metadata_manager.rename_folder_metadata(
+                    folder, new_folder_path + folder[len(old_folder_path):]
+                )
+            for old_path, new_path in moves:
+                self.metadata_manager.rename_password_metadata(old_path, new_path)
+
+        self.decryption_backend.recipients.invalidate()
+        for old_path, new_path in moves:
+            self.invalidate_cache(old_path)
+            self.content_index.move(old_path, new_path, self._get_file_mtime(new_path))
+        self.index.remove_folder(old_folder_path)
+        self.index.add_folder(new_folder_path)
+        return True, f"Folder renamed from '{old_folder_path}' to '{new_folder_path}'"
+
     # Metadata management methods
 
     def set_folder_metadata(self, folder_path: str, color: str, icon: str):
@@ -1273,6 +1643,31 @@ class PasswordStore:
         """Get color, icon, and favicon metadata for a password."""
         return self.metadata_manager.get_password_metadata(password_path)
 
+    def get_all_password_tags(self):
+        """Tags of every tagged password, from the per-entry files in .metadata/."""
+        if not os.path.isdir(os.path.join(self.store_dir, ".metadata")):
+            # MetadataHandler would create the directory
+            return {}
+        return MetadataHandler(self.store_dir).get_all_entry_tags()
+
+    def set_passwords_metadata(self, password_paths, color: str, icon: str):
+        """
+        Set the same color and icon on many passwords with one metadata rewrite.
+        Either every entry is updated or none is.
+        Returns True on success, False otherwise, along with a message.
+        """
+        password_paths = list(dict.fromkeys(password_paths))
+        for path in password_paths:
+            if not path or ".." in path or path.startswith("/"):
+                return False, f"Invalid password path: '{path}'."
+            if not os.path.isfile(self._entry_file(path)):
+                return False, f"Error updating passwords: {path} is not in the password store."
+
+        with self.metadata_manager.batch_update():
+            for password_path in password_paths:
+                self.metadata_manager.set_password_metadata(password_path, color, icon)
+        return True, f"Updated {len(password_paths)} passwords."
+
     def set_password_favicon(self, password_path: str, favicon_data: str):
         """Set favicon base64 data for a password."""
         self.metadata_manager.set_password_favicon(password_path, favicon_data)
@@ -1293,98 +1688,6 @@ class PasswordStore:
         """Update metadata when a password is renamed/moved."""
         self.metadata_manager.rename_password_metadata(old_path, new_path)
 
-    def is_folder_empty(self, folder_path):
-        """
-        Check if a folder is empty (contains no .gpg files).
-
-        Args:
-            folder_path (str): The path of the folder to check
-
-        Returns:
-            tuple: (success: bool, is_empty: bool, message: str)
-        """
-        if not folder_path or not folder_path.strip():
-            return False, False, "Folder path cannot be empty"
-
-        # Clean the folder path
-        folder_path = folder_path.strip().strip('/')
-
-        try:
-            # Create the full path in the password store
-            full_folder_path = os.path.join(self.store_dir, folder_path)
-
-            # Check if folder exists
-            if not os.path.exists(full_folder_path):
-                return False, False, f"Folder '{folder_path}' does not exist"
-
-            if not os.path.isdir(full_folder_path):
-                return False, False, f"'{folder_path}' is not a folder"
-
-            # Check for .gpg files recursively
-            for root, dirs, files in os.walk(full_folder_path):
-                # Exclude .git directory
-                if '.git' in dirs:
-                    dirs.remove('.git')
-
-                # Check if any .gpg files exist
-                for file_name in files:
-                    if file_name.endswith('.gpg'):
-                        return True, False, f"Folder '{folder_path}' contains password files"
-
-            # No .gpg files found
-            return True, True, f"Folder '{folder_path}' is empty"
-
-        except OSError as e:
-            return False, False, f"Error checking folder: {str(e)}"
-        except Exception as e:
-            return False, False, f"Unexpected error checking folder: {str(e)}"
-
-    def delete_folder(self, folder_path):
-        """
-        Delete an empty folder from the password store.
-
-        Args:
-            folder_path (str): The path of the folder to delete
-
-        Returns:
-            tuple: (success: bool, message: str)
-        """
-        if not folder_path or not folder_path.strip():
-            return False, "Folder path cannot be empty"
-
-        # Clean the folder path
-        folder_path = folder_path.strip().strip('/')
-
-        # Validate folder path
-        if ".." in folder_path or folder_path.startswith("/"):
-            return False, "Invalid folder path"
-
-        try:
-            # First check if folder is empty
-            success, is_empty, message = self.is_folder_empty(folder_path)
-            if not success:
-                return False, message
-
-            if not is_empty:
-                return False, f"Cannot delete folder '{folder_path}': folder is not empty"
-
-            # Create the full path in the password store
-            full_folder_path = os.path.join(self.store_dir, folder_path)
-
-            # Delete the directory
-            os.rmdir(full_folder_path)
-
-            # Verify deletion
-            if not os.path.exists(full_folder_path):
-                return True, f"Folder '{folder_path}' deleted successfully"
-            else:
-                return False, f"Failed to delete folder '{folder_path}'"
-
-        except OSError as e:
-            return False, f"Error deleting folder: {str(e)}"
-        except Exception as e:
-            return False, f"Unexpected error deleting folder: {str(e)}"
-
     def get_parsed_password_details(self, path_to_password):
         """
         Retrieves and parses the content of the specified password file.
@@ -217,6 +217,17 @@ class SecurityManager:
             }
         )
         
+        # Commit deferred store changes so nothing is left pending while locked,
+        # and drop the content search index, which only lives while unlocked
+        password_store = getattr(self.main_window, 'password_store', None)
+        if password_store is not None:
+            password_store.flush_pending_commits()
+            password_store.clear_content_index()
+        # Usernames, URLs and field index entries decrypted this session too
+        folder_controller = getattr(self.main_window, 'folder_controller', None)
+        if folder_controller is not None:
+            folder_controller.clear_session_data()
+
         # Clear sensitive data if configured
         config = self.config_manager.get_config()
         if config.security.clear_memory_on_lock:
@@ -338,6 +349,11 @@ class SecurityManager:
             password_cache.clear()
         except ImportError:
             pass
+
+        # Wipe decrypted password contents held by the store
+        password_store = getattr(self.main_window, 'password_store', None)
+        if password_store is not None:
+            password_store.invalidate_cache()
             
     def _show_lock_screen(self):
         """Show the lock screen dialog."""
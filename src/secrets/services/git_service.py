@@ -10,7 +10,7 @@ from dataclasses import dataclass
 from datetime import datetime
 
 from ..config import ConfigManager
-from ..utils.gpg_utils import GPGSetupHelper
+from ..utils.gpg_utils import get_gpg_session
 from ..logging_system import get_logger, LogCategory
 
 
@@ -248,7 +248,7 @@ class GitService:
         """Run a Git command in the store directory."""
         try:
             command = ["git"] + args
-            env = GPGSetupHelper.setup_gpg_environment()
+            env = get_gpg_session().environment()
             
             result = subprocess.run(
                 command,
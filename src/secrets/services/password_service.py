@@ -1,10 +1,11 @@
 """
 Service layer for password operations and business logic.
 """
-from typing import Tuple, List, Optional, Dict, Any
+from typing import Callable, Iterable, Iterator, Tuple, List, Optional, Dict, Any
 import os
 from ..models import PasswordEntry
 from ..password_store import PasswordStore
+from ..utils.decrypt_scheduler import DecryptQueue
 from ..performance import password_cache, performance_monitor, memoize_with_ttl
 from ..logging_system import get_logger, LogCategory
 
@@ -15,6 +16,22 @@ class PasswordService:
     def __init__(self, password_store: PasswordStore):
         self.password_store = password_store
         self.logger = get_logger(LogCategory.PASSWORD_STORE, "PasswordService")
+        self._change_callbacks: List[Callable[[Dict[str, Any]], None]] = []
+
+    def register_change_callback(self, callback: Callable[[Dict[str, Any]], None]):
+        """
+        Register a callback for batch operations. It is called once per
+        operation with a dict describing the change, e.g.
+        {'action': 'move', 'paths': {old_path: new_path, ...}}.
+        """
+        self._change_callbacks.append(callback)
+
+    def _notify_change(self, change: Dict[str, Any]):
+        for callback in self._change_callbacks:
+            try:
+                callback(change)
+            except Exception as e:
+                self.logger.error("Error in change callback", extra={'error': str(e)})
     
     def get_all_entries(self) -> List[PasswordEntry]:
         """Get all password entries as PasswordEntry objects."""
@@ -82,8 +99,7 @@ class PasswordService:
     
     def _is_folder_path(self, path: str) -> bool:
         """Check if a path represents a folder."""
-        all_passwords = self.password_store.list_passwords()
-        return any(p.startswith(path + os.sep) for p in all_passwords)
+        return self.password_store.has_folder(path)
     
     def search_entries(self, query: str) -> Tuple[bool, List[PasswordEntry]]:
         """Search for password entries."""
@@ -103,6 +119,22 @@ class PasswordService:
         
         return True, entries
     
+    def iter_search_entries(self, query: str,
+                            queue: Optional[DecryptQueue] = None) -> Iterator[PasswordEntry]:
+        """
+        Search entry content, yielding matches as they are found.
+
+        Args:
+            query: Regular expression or text to look for
+            queue: Optional empty DecryptQueue that receives every entry of
+                the store; cancel it (from any thread) to stop the search
+        """
+        if queue is None:
+            queue = DecryptQueue()
+        queue.add(self.password_store.list_passwords())
+        for path_str in self.password_store.iter_search_passwords(query, queue=queue):
+            yield PasswordEntry(path=path_str, is_folder=False)
+
     def create_entry(self, path: str, content: str) -> Tuple[bool, str]:
         """Create a new password entry."""
         self.logger.info("Creating password entry", extra={'path': path})
@@ -144,6 +176,53 @@ class PasswordService:
             password_cache.invalidate(new_path)
         return result
     
+    def move_entries(self, moves: Dict[str, str], preserve_empty_folders: bool = True) -> Tuple[bool, str]:
+        """Move/rename many password entries with a single commit."""
+        self.logger.info("Moving password entries", extra={'count': len(moves)})
+        result = self.password_store.move_passwords(moves, preserve_empty_folders)
+        if result[0]:
+            for old_path, new_path in moves.items():
+                password_cache.invalidate(old_path)
+                password_cache.invalidate(new_path)
+            self._notify_change({'action': 'move', 'paths': dict(moves)})
+        else:
+            self.logger.error("Failed to move password entries", extra={'error': result[1]})
+        return result
+
+    def delete_entries(self, paths: Iterable[str]) -> Tuple[bool, str]:
+        """Delete many password entries with a single commit."""
+        paths = list(paths)
+        self.logger.info("Deleting password entries", extra={'count': len(paths)})
+        result = self.password_store.delete_passwords(paths)
+        if result[0]:
+            for path in paths:
+                password_cache.invalidate(path)
+            self._notify_change({'action': 'delete', 'paths': paths})
+        else:
+            self.logger.error("Failed to delete password entries", extra={'error': result[1]})
+        return result
+
+    def retag_entries(self, paths: Iterable[str], color: str, icon: str) -> Tuple[bool, str]:
+        """Set the color and icon of many password entries at once."""
+        paths = list(paths)
+        result = self.password_store.set_passwords_metadata(paths, color, icon)
+        if result[0]:
+            self._notify_change({'action': 'retag', 'paths': paths, 'color': color, 'icon': icon})
+        else:
+            self.logger.error("Failed to retag password entries", extra={'error': result[1]})
+        return result
+
+    def rename_folder(self, old_folder: str, new_folder: str) -> Tuple[bool, str]:
+        """Rename a folder and every entry in it with a single commit."""
+        self.logger.info("Renaming folder", extra={'old_folder': old_folder, 'new_folder': new_folder})
+        result = self.password_store.rename_folder(old_folder, new_folder)
+        if result[0]:
+            password_cache.clear()
+            self._notify_change({'action': 'rename_folder', 'paths': {old_folder: new_folder}})
+        else:
+            self.logger.error("Failed to rename folder", extra={'error': result[1]})
+        return result
+
     def copy_password_to_clipboard(self, path: str) -> Tuple[bool, str]:
         """Copy password to clipboard using pass -c."""
         return self.password_store.copy_password(path)
@@ -124,6 +124,21 @@ class ImportExportDialog(Adw.Window):
         self.import_safari_button.set_sensitive(sensitive)
         self.import_edge_button.set_sensitive(sensitive)
     
+    def _commit_import(self, transaction, skipped_count):
+        """Write the queued entries with a single git commit (runs in background thread)."""
+        def on_progress(done, total):
+            # Update progress every 100 entries for large imports
+            if done % 100 == 0 and total > 100:
+                progress_msg = f"Encrypting... {done}/{total}"
+                GLib.idle_add(lambda msg=progress_msg: self.toast_manager.show_info(msg))
+
+        success, message = transaction.commit(progress_callback=on_progress)
+        if success:
+            GLib.idle_add(self._import_completed, len(transaction.inserted), skipped_count)
+        else:
+            # Nothing was written
+            GLib.idle_add(self._import_completed, 0, 0, message)
+
     def _import_completed(self, imported_count, skipped_count, error_message=None):
         """Called when import operation completes (from main thread)."""
         self._is_importing = False
@@ -170,6 +185,10 @@ class ImportExportDialog(Adw.Window):
             passwords = self.password_store.list_passwords()
             export_data = []
             
+            # Decrypt everything in one pass through the decryption worker;
+            # the per-entry lookups below are then served from the cache.
+            self.password_store.get_password_contents_batch(passwords)
+            
             for password_path in passwords:
                 details = self.password_store.get_parsed_password_details(password_path)
                 if 'error' not in details:
@@ -220,6 +239,9 @@ class ImportExportDialog(Adw.Window):
         try:
             passwords = self.password_store.list_passwords()
             
+            # Decrypt everything in one pass through the decryption worker
+            self.password_store.get_password_contents_batch(passwords)
+            
             with open(file_path, 'w', newline='', encoding='utf-8') as f:
                 writer = csv.writer(f)
                 writer.writerow(['Path', 'Password', 'Username', 'URL', 'Notes'])
@@ -274,7 +296,7 @@ class ImportExportDialog(Adw.Window):
                 import_data = json.load(f)
             
             total_entries = len(import_data) if isinstance(import_data, list) else 0
-            imported_count = 0
+            transaction = self.password_store.transaction()
             skipped_count = 0
             processed_count = 0
             
@@ -297,11 +319,8 @@ class ImportExportDialog(Adw.Window):
                     
                     content = '\n'.join(content_lines)
                     
-                    # Try to import
-                    success, message = self.password_store.insert_password(path, content, multiline=True, force=False)
-                    if success:
-                        imported_count += 1
-                    else:
+                    # Try to import; existing entries are skipped, the rest are written on commit
+                    if not transaction.insert(path, content, force=False)[0]:
                         skipped_count += 1
                 
                 processed_count += 1
@@ -311,8 +330,8 @@ class ImportExportDialog(Adw.Window):
                     progress_msg = f"Processing... {processed_count}/{total_entries}"
                     GLib.idle_add(lambda msg=progress_msg: self.toast_manager.show_info(msg))
 
-            # Schedule completion callback on main thread
-            GLib.idle_add(self._import_completed, imported_count, skipped_count)
+            # Encrypt and commit all entries at once, then report on the main thread
+            self._commit_import(transaction, skipped_count)
 
         except Exception as e:
             # Schedule error callback on main thread
@@ -350,7 +369,7 @@ class ImportExportDialog(Adw.Window):
     def _import_from_csv_threaded(self, file_path: str):
         """Import passwords from CSV file (runs in background thread)."""
         try:
-            imported_count = 0
+            transaction = self.password_store.transaction()
             skipped_count = 0
             processed_count = 0
             
@@ -381,11 +400,8 @@ class ImportExportDialog(Adw.Window):
                     
                     content = '\n'.join(content_lines)
                     
-                    # Try to import
-                    success, message = self.password_store.insert_password(path, content, multiline=True, force=False)
-                    if success:
-                        imported_count += 1
-                    else:
+                    # Try to import; existing entries are skipped, the rest are written on commit
+                    if not transaction.insert(path, content, force=False)[0]:
                         skipped_count += 1
                     
                     # Update progress every 25 entries for large files
@@ -393,8 +409,8 @@ class ImportExportDialog(Adw.Window):
                         progress_msg = f"Processing... {processed_count} entries"
                         GLib.idle_add(lambda msg=progress_msg: self.toast_manager.show_info(msg))
 
-            # Schedule completion callback on main thread
-            GLib.idle_add(self._import_completed, imported_count, skipped_count)
+            # Encrypt and commit all entries at once, then report on the main thread
+            self._commit_import(transaction, skipped_count)
 
         except Exception as e:
             # Schedule error callback on main thread
@@ -438,7 +454,7 @@ class ImportExportDialog(Adw.Window):
     def _import_from_1password_csv(self, file_path: str):
         """Import passwords from 1Password CSV file."""
         try:
-            imported_count = 0
+            transaction = self.password_store.transaction()
             skipped_count = 0
             
             with open(file_path, 'r', encoding='utf-8') as f:
@@ -470,15 +486,12 @@ class ImportExportDialog(Adw.Window):
                     
                     content = '\n'.join(content_lines)
                     
-                    # Try to import
-                    success, message = self.password_store.insert_password(path, content, multiline=True, force=False)
-                    if success:
-                        imported_count += 1
-                    else:
+                    # Try to import; existing entries are skipped, the rest are written on commit
+                    if not transaction.insert(path, content, force=False)[0]:
                         skipped_count += 1
             
-            # Schedule completion callback on main thread
-            GLib.idle_add(self._import_completed, imported_count, skipped_count)
+            # Encrypt and commit all entries at once, then report on the main thread
+            self._commit_import(transaction, skipped_count)
                 
         except Exception as e:
             # Schedule error callback on main thread  
@@ -511,7 +524,7 @@ class ImportExportDialog(Adw.Window):
     def _import_from_lastpass_csv(self, file_path: str):
         """Import passwords from LastPass CSV file."""
         try:
-            imported_count = 0
+            transaction = self.password_store.transaction()
             skipped_count = 0
             
             with open(file_path, 'r', encoding='utf-8') as f:
@@ -547,15 +560,12 @@ class ImportExportDialog(Adw.Window):
                     
                     content = '\n'.join(content_lines)
                     
-                    # Try to import
-                    success, message = self.password_store.insert_password(path, content, multiline=True, force=False)
-                    if success:
-                        imported_count += 1
-                    else:
+                    # Try to import; existing entries are skipped, the rest are written on commit
+                    if not transaction.insert(path, content, force=False)[0]:
                         skipped_count += 1
             
-            # Schedule completion callback on main thread
-            GLib.idle_add(self._import_completed, imported_count, skipped_count)
+            # Encrypt and commit all entries at once, then report on the main thread
+            self._commit_import(transaction, skipped_count)
                 
         except Exception as e:
             # Schedule error callback on main thread
@@ -588,7 +598,7 @@ class ImportExportDialog(Adw.Window):
     def _import_from_bitwarden_json(self, file_path: str):
         """Import passwords from Bitwarden JSON file."""
         try:
-            imported_count = 0
+            transaction = self.password_store.transaction()
             skipped_count = 0
             
             with open(file_path, 'r', encoding='utf-8') as f:
@@ -636,15 +646,12 @@ class ImportExportDialog(Adw.Window):
                 
                 content = '\n'.join(content_lines)
                 
-                # Try to import
-                success, message = self.password_store.insert_password(path, content, multiline=True, force=False)
-                if success:
-                    imported_count += 1
-                else:
+                # Try to import; existing entries are skipped, the rest are written on commit
+                if not transaction.insert(path, content, force=False)[0]:
                     skipped_count += 1
             
-            # Schedule completion callback on main thread
-            GLib.idle_add(self._import_completed, imported_count, skipped_count)
+            # Encrypt and commit all entries at once, then report on the main thread
+            self._commit_import(transaction, skipped_count)
                 
         except Exception as e:
             # Schedule error callback on main thread
@@ -677,7 +684,7 @@ class ImportExportDialog(Adw.Window):
     def _import_from_dashlane_csv(self, file_path: str):
         """Import passwords from Dashlane CSV file."""
         try:
-            imported_count = 0
+            transaction = self.password_store.transaction()
             skipped_count = 0
             
             with open(file_path, 'r', encoding='utf-8') as f:
@@ -713,15 +720,12 @@ class ImportExportDialog(Adw.Window):
                     
                     content = '\n'.join(content_lines)
                     
-                    # Try to import
-                    success, message = self.password_store.insert_password(path, content, multiline=True, force=False)
-                    if success:
-                        imported_count += 1
-                    else:
+                    # Try to import; existing entries are skipped, the rest are written on commit
+                    if not transaction.insert(path, content, force=False)[0]:
                         skipped_count += 1
             
-            # Schedule completion callback on main thread
-            GLib.idle_add(self._import_completed, imported_count, skipped_count)
+            # Encrypt and commit all entries at once, then report on the main thread
+            self._commit_import(transaction, skipped_count)
                 
         except Exception as e:
             # Schedule error callback on main thread
@@ -754,7 +758,7 @@ class ImportExportDialog(Adw.Window):
     def _import_from_keepass_csv(self, file_path: str):
         """Import passwords from KeePass CSV file."""
         try:
-            imported_count = 0
+            transaction = self.password_store.transaction()
             skipped_count = 0
             
             with open(file_path, 'r', encoding='utf-8') as f:
@@ -790,15 +794,12 @@ class ImportExportDialog(Adw.Window):
                     
                     content = '\n'.join(content_lines)
                     
-                    # Try to import
-                    success, message = self.password_store.insert_password(path, content, multiline=True, force=False)
-                    if success:
-                        imported_count += 1
-                    else:
+                    # Try to import; existing entries are skipped, the rest are written on commit
+                    if not transaction.insert(path, content, force=False)[0]:
                         skipped_count += 1
             
-            # Schedule completion callback on main thread
-            GLib.idle_add(self._import_completed, imported_count, skipped_count)
+            # Encrypt and commit all entries at once, then report on the main thread
+            self._commit_import(transaction, skipped_count)
                 
         except Exception as e:
             # Schedule error callback on main thread
@@ -833,7 +834,7 @@ class ImportExportDialog(Adw.Window):
     def _import_from_chrome_csv(self, file_path: str):
         """Import passwords from Chrome CSV file."""
         try:
-            imported_count = 0
+            transaction = self.password_store.transaction()
             skipped_count = 0
             
             with open(file_path, 'r', encoding='utf-8') as f:
@@ -866,15 +867,12 @@ class ImportExportDialog(Adw.Window):
                     
                     content = '\n'.join(content_lines)
                     
-                    # Try to import
-                    success, message = self.password_store.insert_password(path, content, multiline=True, force=False)
-                    if success:
-                        imported_count += 1
-                    else:
+                    # Try to import; existing entries are skipped, the rest are written on commit
+                    if not transaction.insert(path, content, force=False)[0]:
                         skipped_count += 1
             
-            # Schedule completion callback on main thread
-            GLib.idle_add(self._import_completed, imported_count, skipped_count)
+            # Encrypt and commit all entries at once, then report on the main thread
+            self._commit_import(transaction, skipped_count)
                 
         except Exception as e:
             # Schedule error callback on main thread
@@ -907,7 +905,7 @@ class ImportExportDialog(Adw.Window):
     def _import_from_firefox_csv(self, file_path: str):
         """Import passwords from Firefox CSV file."""
         try:
-            imported_count = 0
+            transaction = self.password_store.transaction()
             skipped_count = 0
             
             with open(file_path, 'r', encoding='utf-8') as f:
@@ -938,15 +936,12 @@ class ImportExportDialog(Adw.Window):
                     
                     content = '\n'.join(content_lines)
                     
-                    # Try to import
-                    success, message = self.password_store.insert_password(path, content, multiline=True, force=False)
-                    if success:
-                        imported_count += 1
-                    else:
+                    # Try to import; existing entries are skipped, the rest are written on commit
+                    if not transaction.insert(path, content, force=False)[0]:
                         skipped_count += 1
             
-            # Schedule completion callback on main thread
-            GLib.idle_add(self._import_completed, imported_count, skipped_count)
+            # Encrypt and commit all entries at once, then report on the main thread
+            self._commit_import(transaction, skipped_count)
                 
         except Exception as e:
             # Schedule error callback on main thread
@@ -979,7 +974,7 @@ class ImportExportDialog(Adw.Window):
     def _import_from_safari_csv(self, file_path: str):
         """Import passwords from Safari CSV file."""
         try:
-            imported_count = 0
+            transaction = self.password_store.transaction()
             skipped_count = 0
             
             with open(file_path, 'r', encoding='utf-8') as f:
@@ -1019,15 +1014,12 @@ class ImportExportDialog(Adw.Window):
                     
                     content = '\n'.join(content_lines)
                     
-                    # Try to import
-                    success, message = self.password_store.insert_password(path, content, multiline=True, force=False)
-                    if success:
-                        imported_count += 1
-                    else:
+                    # Try to import; existing entries are skipped, the rest are written on commit
+                    if not transaction.insert(path, content, force=False)[0]:
                         skipped_count += 1
             
-            # Schedule completion callback on main thread
-            GLib.idle_add(self._import_completed, imported_count, skipped_count)
+            # Encrypt and commit all entries at once, then report on the main thread
+            self._commit_import(transaction, skipped_count)
                 
         except Exception as e:
             # Schedule error callback on main thread
@@ -1060,7 +1052,7 @@ class ImportExportDialog(Adw.Window):
     def _import_from_edge_csv(self, file_path: str):
         """Import passwords from Edge CSV file."""
         try:
-            imported_count = 0
+            transaction = self.password_store.transaction()
             skipped_count = 0
             
             with open(file_path, 'r', encoding='utf-8') as f:
@@ -1093,15 +1085,12 @@ class ImportExportDialog(Adw.Window):
                     
                     content = '\n'.join(content_lines)
                     
-                    # Try to import
-                    success, message = self.password_store.insert_password(path, content, multiline=True, force=False)
-                    if success:
-                        imported_count += 1
-                    else:
+                    # Try to import; existing entries are skipped, the rest are written on commit
+                    if not transaction.insert(path, content, force=False)[0]:
                         skipped_count += 1
             
-            # Schedule completion callback on main thread
-            GLib.idle_add(self._import_completed, imported_count, skipped_count)
+            # Encrypt and commit all entries at once, then report on the main thread
+            self._commit_import(transaction, skipped_count)
                 
         except Exception as e:
             # Schedule error callback on main thread
@@ -1134,7 +1123,7 @@ class ImportExportDialog(Adw.Window):
     def _import_from_protonpass_json(self, file_path: str):
         """Import passwords from Proton Pass JSON file."""
         try:
-            imported_count = 0
+            transaction = self.password_store.transaction()
             skipped_count = 0
             
             with open(file_path, 'r', encoding='utf-8') as f:
@@ -1196,15 +1185,12 @@ class ImportExportDialog(Adw.Window):
                     
                     content_text = '\n'.join(content_lines)
                     
-                    # Try to import
-                    success, message = self.password_store.insert_password(path, content_text, multiline=True, force=False)
-                    if success:
-                        imported_count += 1
-                    else:
+                    # Try to import; existing entries are skipped, the rest are written on commit
+                    if not transaction.insert(path, content_text, force=False)[0]:
                         skipped_count += 1
             
-            # Schedule completion callback on main thread
-            GLib.idle_add(self._import_completed, imported_count, skipped_count)
+            # Encrypt and commit all entries at once, then report on the main thread
+            self._commit_import(transaction, skipped_count)
                 
         except Exception as e:
             # Schedule error callback on main thread
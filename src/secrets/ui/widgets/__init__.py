@@ -8,10 +8,14 @@ from .color_paintable import ColorPaintable
 from .password_row import PasswordRow
 from .password_entry_row import PasswordEntryRow
 from .folder_expander_row import FolderExpanderRow
+from .folder_list_row import FolderListRow
+from .lean_password_row import LeanPasswordRow
 
 __all__ = [
     'ColorPaintable',
     'PasswordRow',
     'PasswordEntryRow',
     'FolderExpanderRow',
+    'FolderListRow',
+    'LeanPasswordRow',
 ]
@@ -0,0 +1,73 @@
+"""
+Folder row widget for the virtualized password tree.
+"""
+
+import gi
+gi.require_version("Gtk", "4.0")
+gi.require_version("Adw", "1")
+
+from gi.repository import Gtk, Adw, GObject
+from .color_paintable import ColorPaintable
+
+
+@Gtk.Template(resource_path='/io/github/tobagin/secrets/ui/widgets/folder_list_row.ui')
+class FolderListRow(Adw.ActionRow):
+    """
+    A folder row of a Gtk.ListView.
+
+    Unlike FolderExpanderRow it does not hold its password rows: the list
+    view's Gtk.TreeExpander expands it, and the row is rebound to another
+    folder when it is recycled.
+    """
+
+    __gtype_name__ = "FolderListRow"
+
+    # Template widgets
+    folder_avatar = Gtk.Template.Child()
+    folder_actions_box = Gtk.Template.Child()
+    add_password_to_folder_button = Gtk.Template.Child()
+    add_subfolder_button = Gtk.Template.Child()
+    edit_folder_button = Gtk.Template.Child()
+    remove_folder_button = Gtk.Template.Child()
+
+    # Signals
+    __gsignals__ = {
+        'add-password-to-folder': (GObject.SignalFlags.RUN_FIRST, None, ()),
+        'add-subfolder': (GObject.SignalFlags.RUN_FIRST, None, ()),
+        'edit-folder': (GObject.SignalFlags.RUN_FIRST, None, ()),
+        'remove-folder': (GObject.SignalFlags.RUN_FIRST, None, ()),
+    }
+
+    def __init__(self, **kwargs):
+        """Initialize the folder row."""
+        super().__init__(**kwargs)
+        self._folder_path = None
+        self.add_password_to_folder_button.connect('clicked', lambda button: self.emit('add-password-to-folder'))
+        self.add_subfolder_button.connect('clicked', lambda button: self.emit('add-subfolder'))
+        self.edit_folder_button.connect('clicked', lambda button: self.emit('edit-folder'))
+        self.remove_folder_button.connect('clicked', lambda button: self.emit('remove-folder'))
+
+    def set_folder(self, folder_path, password_count):
+        """
+        Show a folder in this row.
+
+        Args:
+            folder_path: The folder path this row represents
+            password_count: Number of passwords directly in the folder
+        """
+        self._folder_path = folder_path
+        self.set_title(folder_path)
+        if password_count == 0:
+            self.set_subtitle(folder_path)
+        elif password_count == 1:
+            self.set_subtitle(f"{folder_path} • 1 password")
+        else:
+            self.set_subtitle(f"{folder_path} • {password_count} passwords")
+
+    def get_folder_path(self):
+        """Get the folder path associated with this row."""
+        return self._folder_path
+
+    def set_avatar_color_and_icon(self, color, icon_name):
+        """Set the avatar color and icon using custom paintable."""
+        self.folder_avatar.set_custom_image(ColorPaintable(color, icon_name))
@@ -0,0 +1,323 @@
+"""
+Lightweight password row for the virtualized password tree.
+
+PasswordEntryRow instantiates a template with seven buttons and connects
+their signals for every row it creates. LeanPasswordRow builds its children
+in code and only the ones every row shows: an avatar and two labels. Its
+action buttons are created the first time the pointer enters the row or the
+row is selected, and all but "copy password" are entries of one popover
+menu shared by every row.
+
+Avatar paintables are shared too: rows with the same color and icon, or the
+same favicon, draw the same ColorPaintable.
+
+Rows are recycled, so a favicon download remembers the entry that asked for
+it and is dropped if the row shows another entry by the time it finishes.
+Downloaded favicons are handed to the owner of the row with the
+"favicon-downloaded" signal rather than saved by the row.
+"""
+
+import base64
+import weakref
+from functools import lru_cache
+
+import gi
+gi.require_version("Gtk", "4.0")
+gi.require_version("Adw", "1")
+
+from gi.repository import Gtk, Adw, GObject, GdkPixbuf, Gio, GLib, Pango
+from .color_paintable import ColorPaintable
+from ...managers.favicon_manager import get_favicon_manager
+
+# (action name, menu label); the actions emit the row signal of the same name
+MENU_ACTIONS = (
+    ("view-details", "View Details"),
+    ("copy-username", "Copy Username"),
+    ("copy-password", "Copy Password"),
+    ("copy-totp", "Copy TOTP"),
+    ("visit-url", "Visit URL"),
+    ("edit-password", "Edit Password"),
+    ("remove-password", "Remove Password"),
+)
+
+
+@lru_cache(maxsize=None)
+def _color_paintable(color, icon_name):
+    """The avatar of every row with this color and icon."""
+    return ColorPaintable(color, icon_name)
+
+
+@lru_cache(maxsize=256)
+def _favicon_data_paintable(favicon_data):
+    """The avatar for a favicon cached as base64 in the entry's metadata."""
+    try:
+        stream = Gio.MemoryInputStream.new_from_data(base64.b64decode(favicon_data))
+        pixbuf = GdkPixbuf.Pixbuf.new_from_stream(stream)
+    except Exception:
+        return None
+    return ColorPaintable("transparent", favicon_pixbuf=pixbuf)
+
+
+_favicon_paintables = weakref.WeakKeyDictionary()
+
+
+def _favicon_paintable(pixbuf):
+    """The avatar for a downloaded favicon, shared while the pixbuf lives."""
+    paintable = _favicon_paintables.get(pixbuf)
+    if paintable is None:
+        paintable = _favicon_paintables[pixbuf] = ColorPaintable("transparent", favicon_pixbuf=pixbuf)
+    return paintable
+
+
+class _SharedRowMenu:
+    """One popover menu, attached to the menu button of whichever row opens it."""
+
+    def __init__(self):
+        menu = Gio.Menu()
+        for name, label in MENU_ACTIONS:
+            menu.append(label, f"row.{name}")
+        self.popover = Gtk.PopoverMenu.new_from_model(menu)
+        self.popover.connect("closed", self._on_closed)
+
+        # The actions live on the popover itself, so they work wherever it is attached
+        self._actions = Gio.SimpleActionGroup()
+        for name, _label in MENU_ACTIONS:
+            action = Gio.SimpleAction.new(name, None)
+            action.connect("activate", self._on_action, name)
+            self._actions.add_action(action)
+        self.popover.insert_action_group("row", self._actions)
+        self._row = None
+
+    def popup(self, row, button):
+        """Show the menu for a row, next to its menu button."""
+        if self.popover.get_parent() is not None:
+            self.popover.unparent()
+        self.popover.set_parent(button)
+        self._row = row
+        self._actions.lookup_action("copy-totp").set_enabled(row._has_totp)
+        self._actions.lookup_action("visit-url").set_enabled(row._has_url or bool(row._url))
+        self.popover.popup()
+
+    def _on_action(self, action, parameter, name):
+        if self._row is not None:
+            self._row.run_action(name)
+
+    def _on_closed(self, popover):
+        # Detached once the activated action has run, so recycled rows never
+        # keep the popover alive
+        GLib.idle_add(self._detach)
+
+    def _detach(self):
+        if not self.popover.get_visible() and self.popover.get_parent() is not None:
+            self.popover.unparent()
+            self._row = None
+        return False
+
+
+_shared_menu = None
+
+
+def get_shared_row_menu():
+    """The popover menu shared by all LeanPasswordRows."""
+    global _shared_menu
+    if _shared_menu is None:
+        _shared_menu = _SharedRowMenu()
+    return _shared_menu
+
+
+class LeanPasswordRow(Gtk.Box):
+    """
+    A password row of a Gtk.ListView, built without a template.
+
+    It has the signals and the setters the password tree uses on
+    PasswordEntryRow, so either can be bound to a list item.
+    """
+
+    __gtype_name__ = "LeanPasswordRow"
+
+    # Same signals as PasswordEntryRow
+    __gsignals__ = {
+        'copy-username': (GObject.SignalFlags.RUN_FIRST, None, ()),
+        'copy-password': (GObject.SignalFlags.RUN_FIRST, None, ()),
+        'copy-totp': (GObject.SignalFlags.RUN_FIRST, None, ()),
+        'visit-url': (GObject.SignalFlags.RUN_FIRST, None, (str,)),
+        'edit-password': (GObject.SignalFlags.RUN_FIRST, None, (str,)),
+        'view-details': (GObject.SignalFlags.RUN_FIRST, None, (str,)),
+        'remove-password': (GObject.SignalFlags.RUN_FIRST, None, (str,)),
+        # Entry path and base64 PNG data of a favicon downloaded for it
+        'favicon-downloaded': (GObject.SignalFlags.RUN_FIRST, None, (str, str)),
+    }
+
+    def __init__(self, password_entry=None, **kwargs):
+        """Initialize the password row."""
+        super().__init__(orientation=Gtk.Orientation.HORIZONTAL, spacing=12, **kwargs)
+        self.add_css_class("lean-password-row")
+        self.set_margin_top(6)
+        self.set_margin_bottom(6)
+        self.set_margin_start(12)
+        self.set_margin_end(12)
+
+        self.password_avatar = Adw.Avatar(size=32, icon_name="dialog-password-symbolic")
+        self.append(self.password_avatar)
+
+        labels = Gtk.Box(orientation=Gtk.Orientation.VERTICAL, valign=Gtk.Align.CENTER, hexpand=True)
+        self._title_label = Gtk.Label(xalign=0, ellipsize=Pango.EllipsizeMode.END)
+        self._subtitle_label = Gtk.Label(xalign=0, ellipsize=Pango.EllipsizeMode.END)
+        self._subtitle_label.add_css_class("dim-label")
+        self._subtitle_label.add_css_class("caption")
+        labels.append(self._title_label)
+        labels.append(self._subtitle_label)
+        self.append(labels)
+
+        # Created on first hover or selection
+        self.action_buttons = None
+        self._sensitive_actions = True
+
+        self._password_entry = None
+        self._color = "#3584e4"
+        self._icon_name = "dialog-password-symbolic"
+        self._url = None
+        self._url_loaded = False
+        self._lazy_url_loader = None
+        self._lazy_url_loader_args = ()
+        self._has_totp = False
+        self._has_url = False
+
+        motion = Gtk.EventControllerMotion()
+        motion.connect("enter", lambda controller, x, y: self._ensure_action_buttons())
+        self.add_controller(motion)
+        self.connect("state-flags-changed", self._on_state_flags_changed)
+
+        if password_entry:
+            self.set_password_entry(password_entry)
+
+    def set_password_entry(self, password_entry):
+        """Set the password entry data for this row."""
+        self._password_entry = password_entry
+        if password_entry:
+            self._title_label.set_label(password_entry.name)
+            self._subtitle_label.set_label(password_entry.path)
+
+    def get_password_entry(self):
+        """Get the password entry associated with this row."""
+        return self._password_entry
+
+    @property
+    def path(self):
+        """Store path of the entry this row shows, or None."""
+        entry = self._password_entry
+        if not entry:
+            return None
+        return entry.path if hasattr(entry, 'path') else str(entry)
+
+    def set_url(self, url):
+        """Set the entry's URL once it is known, so it is not loaded lazily."""
+        self._url = url
+        self._url_loaded = True
+
+    def set_avatar_color_and_icon(self, color, icon_name, url=None, favicon_data=None):
+        """Set the avatar color and icon, with optional favicon for URLs or cached base64 data."""
+        self._color = color
+        self._icon_name = icon_name
+        self._url = url
+
+        paintable = _favicon_data_paintable(favicon_data) if favicon_data else None
+        if paintable is not None:
+            self.password_avatar.set_custom_image(paintable)
+            return
+
+        self.password_avatar.set_custom_image(_color_paintable(color, icon_name))
+        if url and url.strip() and self._password_entry:
+            path = self.path
+            get_favicon_manager().get_favicon_pixbuf_async(
+                url, lambda pixbuf: self._on_favicon_downloaded(path, url, pixbuf)
+            )
+
+    def set_lazy_url_loader(self, loader_func, *args):
+        """Set a lazy URL loader function that will be called when the URL is needed."""
+        self._lazy_url_loader = loader_func
+        self._lazy_url_loader_args = args
+        self._url_loaded = False
+
+    def set_bulk_processing_results(self, has_totp, has_url):
+        """Set the results from bulk content processing."""
+        self._has_totp = has_totp
+        self._has_url = has_url
+
+    def set_sensitive_actions(self, sensitive=True):
+        """Set the sensitivity of the action buttons."""
+        self._sensitive_actions = sensitive
+        if self.action_buttons is not None:
+            self.action_buttons.set_sensitive(sensitive)
+
+    def show_favicon(self, pixbuf):
+        """Show a favicon, or the color and icon if there is none."""
+        if pixbuf:
+            self.password_avatar.set_custom_image(_favicon_paintable(pixbuf))
+        else:
+            self.password_avatar.set_custom_image(_color_paintable(self._color, self._icon_name))
+
+    def _on_favicon_downloaded(self, path, url, pixbuf):
+        """Show a favicon downloaded for an entry and announce it, unless the row was rebound."""
+        if self.path != path or self._url != url:
+            return
+        self.show_favicon(pixbuf)
+        if not pixbuf:
+            return
+        try:
+            success, buffer = pixbuf.save_to_bufferv("png", [], [])
+        except Exception:
+            # Favicons are cosmetic; failing to encode one is not worth reporting
+            return
+        if success:
+            self.emit('favicon-downloaded', path, base64.b64encode(buffer).decode('utf-8'))
+
+    def _load_url_if_needed(self):
+        """Load the URL lazily if bulk processing has not found it yet."""
+        if self._url_loaded or not self._lazy_url_loader:
+            return
+        self._url_loaded = True
+        try:
+            url = self._lazy_url_loader(*self._lazy_url_loader_args)
+        except Exception:
+            return
+        if url:
+            self._url = url
+
+    def _on_state_flags_changed(self, widget, previous_flags):
+        if self.get_state_flags() & Gtk.StateFlags.SELECTED:
+            self._ensure_action_buttons()
+
+    def _ensure_action_buttons(self):
+        """Create the action buttons the first time they can be used."""
+        if self.action_buttons is not None:
+            return
+        self.action_buttons = Gtk.Box(orientation=Gtk.Orientation.HORIZONTAL, spacing=6, valign=Gtk.Align.CENTER)
+        self.action_buttons.set_sensitive(self._sensitive_actions)
+
+        copy_button = Gtk.Button(icon_name="io.github.tobagin.secrets-password-symbolic",
+                                 tooltip_text="Copy Password")
+        copy_button.add_css_class("flat")
+        copy_button.connect("clicked", lambda button: self.run_action("copy-password"))
+        self.action_buttons.append(copy_button)
+
+        menu_button = Gtk.Button(icon_name="view-more-symbolic", tooltip_text="More Actions")
+        menu_button.add_css_class("flat")
+        menu_button.connect("clicked", lambda button: get_shared_row_menu().popup(self, button))
+        self.action_buttons.append(menu_button)
+
+        self.append(self.action_buttons)
+
+    def run_action(self, name):
+        """Emit the signal of a row action (see MENU_ACTIONS)."""
+        if not self._password_entry:
+            return
+        if name in ("copy-username", "copy-password", "copy-totp"):
+            self.emit(name)
+        elif name == "visit-url":
+            self._load_url_if_needed()
+            url = self._url or getattr(self._password_entry, 'url', None)
+            if url:
+                self.emit(name, url)
+        else:
+            self.emit(name, self.path)
@@ -6,7 +6,24 @@ This module contains utility functions and helpers.
 
 from .ui_utils import DialogManager, UIConstants, AccessibilityHelper
 from .system_utils import SystemSetupHelper
-from .gpg_utils import GPGSetupHelper
+from .gpg_utils import GPGSetupHelper, GPGSession, get_gpg_session
+from .decryption_worker import DecryptionWorker
+from .decryption_backend import (
+    DecryptionBackend, PassCliBackend, DirectGpgBackend, GpgIdResolver, create_decryption_backend
+)
+from .decrypt_scheduler import AdaptiveDecryptScheduler, ConcurrencyController, DecryptQueue
+from .store_index import StoreIndex
+from .plaintext_cache import PlaintextCache
+from .single_flight import SingleFlight, FailureCache
+from .store_transaction import StoreTransaction
+from .commit_coalescer import CommitCoalescer
+from .content_index import ContentIndex
+from .fuzzy_index import FuzzyPathIndex
+from .field_query import FieldIndex, FieldQuery, parse_query
+from .frame_scheduler import FrameScheduler, WorkQueue
+from .search_filter import PathSearchFilter
+from .tree_diff import TreeDiff, diff_tree, entry_fingerprints, splice_ops
+from .path_tree import PathTree
 from .path_validator import PathValidator
 from .environment_setup import EnvironmentSetup, PasswordStoreEnvironment, GPGEnvironment
 from .metadata_handler import MetadataHandler, EntryMetadata, FolderMetadata
@@ -22,6 +39,36 @@ __all__ = [
     'AccessibilityHelper',
     'SystemSetupHelper',
     'GPGSetupHelper',
+    'GPGSession',
+    'get_gpg_session',
+    'DecryptionWorker',
+    'DecryptionBackend',
+    'PassCliBackend',
+    'DirectGpgBackend',
+    'GpgIdResolver',
+    'create_decryption_backend',
+    'AdaptiveDecryptScheduler',
+    'ConcurrencyController',
+    'DecryptQueue',
+    'StoreIndex',
+    'PlaintextCache',
+    'SingleFlight',
+    'FailureCache',
+    'StoreTransaction',
+    'CommitCoalescer',
+    'ContentIndex',
+    'FuzzyPathIndex',
+    'FieldIndex',
+    'FieldQuery',
+    'parse_query',
+    'FrameScheduler',
+    'WorkQueue',
+    'PathSearchFilter',
+    'TreeDiff',
+    'diff_tree',
+    'entry_fingerprints',
+    'splice_ops',
+    'PathTree',
     'PathValidator',
     'EnvironmentSetup',
     'PasswordStoreEnvironment',
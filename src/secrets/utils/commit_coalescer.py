@@ -0,0 +1,251 @@
+"""
+Deferred, coalesced git commits for interactive edits.
+
+`pass` commits every insert, removal and rename on its own, so reorganising a
+folder produces a burst of slow commits. With a CommitCoalescer, PasswordStore
+applies file changes immediately and only records them here; the coalescer
+creates one commit for everything recorded once the store has been idle for
+`idle_seconds`, or as soon as `max_changes` changes are pending.
+
+Changes are written to a journal inside the git directory (so it is never
+tracked or listed as an entry) before the files are touched. After a crash,
+recover() commits whatever the previous session left pending.
+"""
+
+import json
+import os
+import subprocess
+import threading
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+# Import logging for error handling
+try:
+    from ..logging_system import get_logger, LogCategory
+    logger = get_logger(LogCategory.GIT, "CommitCoalescer")
+except ImportError:
+    import logging
+    logger = logging.getLogger(__name__)
+
+
+# Paths per git command line when staging many files
+GIT_PATHS_PER_CALL = 500
+# Change messages listed in a coalesced commit before summarizing the rest
+COMMIT_MESSAGE_CHANGES = 50
+
+
+class PendingChange:
+    """A change being applied inside CommitCoalescer.change()."""
+
+    def __init__(self):
+        self.discarded = False
+
+    def discard(self):
+        """Drop the change from the journal: the block left the store as it was."""
+        self.discarded = True
+
+
+class CommitCoalescer:
+    """Journal of uncommitted store changes, committed together when idle."""
+
+    JOURNAL_NAME = "secrets-pending-commits"
+
+    def __init__(self, store_dir: str, env_factory: Optional[Callable[[], Dict[str, str]]] = None,
+                 idle_seconds: float = 5.0, max_changes: int = 20):
+        """
+        Args:
+            store_dir: Password store directory
+            env_factory: Callable returning the environment for git subprocesses
+            idle_seconds: Quiet period before pending changes are committed
+                (0 disables deferral)
+            max_changes: Pending changes that trigger a commit right away
+        """
+        self.store_dir = store_dir
+        self.env_factory = env_factory or os.environ.copy
+        self.idle_seconds = idle_seconds
+        self.max_changes = max_changes
+        self._lock = threading.RLock()
+        self._timer: Optional[threading.Timer] = None
+        self._pending = 0
+
+    @property
+    def enabled(self) -> bool:
+        """Whether changes to this store should be deferred."""
+        return self.idle_seconds > 0 and self.is_git_store()
+
+    def is_git_store(self) -> bool:
+        return bool(self.store_dir) and os.path.isdir(os.path.join(self.store_dir, ".git"))
+
+    @property
+    def journal_file(self) -> str:
+        return os.path.join(self.store_dir, ".git", self.JOURNAL_NAME)
+
+    @contextmanager
+    def change(self, message: str, paths: Iterable[str]):
+        """
+        Record a change to the store, then apply it in the with-block.
+
+        The record is journaled before the block runs, so a crash while (or
+        after) the files are changed still gets the change committed later.
+        A block that fails without changing anything calls discard() on the
+        yielded PendingChange, which removes the record again. With deferral
+        disabled the caller commits with flush(). Stores that are not git
+        repositories are changed without a record.
+
+        Args:
+            message: Commit message for this change alone, in `pass` style
+            paths: Files (relative to the store) the change may touch
+        """
+        change = PendingChange()
+        if not self.is_git_store():
+            yield change
+            return
+        with self._lock:
+            offset = self._append({"message": message, "paths": list(paths)})
+            try:
+                yield change
+            finally:
+                if change.discarded:
+                    self._truncate_journal(offset)
+                else:
+                    self._pending += 1
+                    if self._pending >= self.max_changes:
+                        self.flush()
+                    elif self.idle_seconds > 0:
+                        self._schedule(self.idle_seconds)
+
+    def pending(self) -> int:
+        """Number of changes waiting to be committed."""
+        with self._lock:
+            return len(self._read_journal())
+
+    def recover(self):
+        """Commit changes left pending by a previous session (e.g. after a crash)."""
+        with self._lock:
+            self._pending = len(self._read_journal())
+            if self._pending:
+                logger.info(f"Committing {self._pending} changes left pending by a previous session")
+                self._schedule(0)
+
+    def flush(self) -> Tuple[bool, str]:
+        """
+        Commit every pending change now.
+
+        Returns:
+            Tuple of (success, message)
+        """
+        with self._lock:
+            self._cancel_timer()
+            records = self._read_journal()
+            if not records:
+                self._pending = 0
+                return True, "Nothing to commit."
+
+            success, message = self._commit(records)
+            if success:
+                self._truncate_journal()
+                self._pending = 0
+            else:
+                logger.error(message)
+            return success, message
+
+    def close(self):
+        """Commit pending changes and stop the idle timer (shutdown, lock)."""
+        self.flush()
+
+    def _schedule(self, delay: float):
+        self._cancel_timer()
+        self._timer = threading.Timer(delay, self.flush)
+        self._timer.daemon = True
+        self._timer.start()
+
+    def _cancel_timer(self):
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+
+    def _append(self, record: Dict) -> int:
+        """Journal a record, returning the journal's size before it."""
+        try:
+            offset = os.path.getsize(self.journal_file)
+        except FileNotFoundError:
+            offset = 0
+        with open(self.journal_file, "a") as f:
+            f.write(json.dumps(record) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+        return offset
+
+    def _read_journal(self) -> List[Dict]:
+        records = []
+        try:
+            with open(self.journal_file, "r") as f:
+                for line in f:
+                    try:
+                        records.append(json.loads(line))
+                    except ValueError:
+                        # Only the record being written during a crash can be torn
+                        break
+        except FileNotFoundError:
+            pass
+        return records
+
+    def _truncate_journal(self, size: int = 0):
+        """Cut the journal back to `size` bytes, removing it when that leaves nothing."""
+        try:
+            if not size:
+                os.remove(self.journal_file)
+                return
+            with open(self.journal_file, "r+") as f:
+                f.truncate(size)
+                f.flush()
+                os.fsync(f.fileno())
+        except FileNotFoundError:
+            pass
+
+    def _run_git(self, args: List[str]) -> subprocess.CompletedProcess:
+        return subprocess.run(["git", "-C", self.store_dir] + args, capture_output=True,
+                              text=True, check=False, env=self.env_factory())
+
+    def _commit(self, records: List[Dict]) -> Tuple[bool, str]:
+        """Stage every path the records touched and create one commit."""
+        paths = sorted({path for record in records for path in record["paths"]})
+
+        # Paths that neither exist nor are tracked (e.g. a failed insert)
+        # would make `git add` fail
+        tracked = set()
+        for start in range(0, len(paths), GIT_PATHS_PER_CALL):
+            process = self._run_git(["ls-files", "-z", "--"] + paths[start:start + GIT_PATHS_PER_CALL])
+            tracked.update(filter(None, process.stdout.split("\0")))
+        paths = [path for path in paths
+                 if path in tracked or os.path.exists(os.path.join(self.store_dir, path))]
+
+        for start in range(0, len(paths), GIT_PATHS_PER_CALL):
+            process = self._run_git(["add", "-A", "--"] + paths[start:start + GIT_PATHS_PER_CALL])
+            if process.returncode != 0:
+                return False, f"Error staging changes: {process.stderr.strip()}"
+
+        if self._run_git(["diff", "--cached", "--quiet"]).returncode == 0:
+            return True, "Nothing to commit."
+
+        command = ["commit", "-q", "-m", self._message(records)]
+        # Honour the same setting `pass` uses for signed commits
+        if self._run_git(["config", "--bool", "pass.signcommits"]).stdout.strip() == "true":
+            command.insert(1, "-S")
+        process = self._run_git(command)
+        if process.returncode != 0:
+            error = process.stderr.strip() or process.stdout.strip()
+            return False, f"Error committing changes: {error}"
+        logger.info(f"Committed {len(records)} changes to the password store")
+        return True, f"Committed {len(records)} changes."
+
+    @staticmethod
+    def _message(records: List[Dict]) -> str:
+        """A lone change keeps its own message; a group lists them."""
+        if len(records) == 1:
+            return records[0]["message"]
+        lines = [f"Apply {len(records)} changes to store.", ""]
+        lines += [f"- {record['message']}" for record in records[:COMMIT_MESSAGE_CHANGES]]
+        if len(records) > COMMIT_MESSAGE_CHANGES:
+            lines.append(f"- ... and {len(records) - COMMIT_MESSAGE_CHANGES} more")
+        return "\n".join(lines)
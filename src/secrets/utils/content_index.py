@@ -0,0 +1,157 @@
+"""
+In-memory inverted index over decrypted entry content.
+
+Content search used to decrypt every entry of the store on every query
+(`pass grep`). ContentIndex instead keeps, for the unlocked session only, a
+map from search tokens to the entries containing them. It is filled as a side
+effect of decrypting entries (the bulk TOTP/URL pass decrypts all of them)
+and updated when the application writes entries, so queries are answered
+from memory without running gpg.
+
+Tokens are taken from every line except the first (the password itself):
+usernames, URLs, custom fields and note words. Values of secret-looking
+fields (OTP secrets, PINs, ...) are never indexed. A query matches an entry
+when every word of the query is a prefix of one of the entry's tokens.
+"""
+
+import bisect
+import re
+import threading
+from typing import Dict, FrozenSet, Hashable, Iterable, List, Optional, Set, Tuple
+
+_TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+
+# Field names whose values must stay out of the index
+SENSITIVE_FIELDS = {"password", "pass", "passphrase", "pin", "secret", "otp", "totp", "otpauth", "recovery"}
+
+
+def content_tokens(content: str) -> FrozenSet[str]:
+    """Extract the searchable tokens of an entry's decrypted content."""
+    tokens = set()
+    for line in content.splitlines()[1:]:
+        line = line.strip()
+        if not line or line.lower().startswith("otpauth://"):
+            continue
+        key, separator, _ = line.partition(":")
+        if separator and key.strip().lower() in SENSITIVE_FIELDS:
+            # Keep the field name searchable, but not its value
+            line = key
+        tokens.update(token.lower() for token in _TOKEN_RE.findall(line))
+    return frozenset(tokens)
+
+
+def query_terms(query: str) -> List[str]:
+    """Split a search query into the terms that must all match."""
+    return [term.lower() for term in _TOKEN_RE.findall(query)]
+
+
+class ContentIndex:
+    """Token -> entries index with per-entry stamps (the file's mtime)."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._postings: Dict[str, Set[str]] = {}
+        self._entries: Dict[str, Tuple[Optional[Hashable], FrozenSet[str]]] = {}
+        # Sorted view of the tokens for prefix lookups, rebuilt after changes
+        self._sorted_tokens: Optional[List[str]] = None
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def update(self, path: str, content: str, stamp: Optional[Hashable] = None):
+        """Index (or re-index) an entry from its decrypted content."""
+        self.add_tokens(path, content_tokens(content), stamp)
+
+    def add_tokens(self, path: str, tokens: Iterable[str], stamp: Optional[Hashable] = None):
+        """Index an entry from tokens extracted earlier (e.g. by content_tokens)."""
+        tokens = frozenset(tokens)
+        with self._lock:
+            self._remove(path)
+            self._entries[path] = (stamp, tokens)
+            for token in tokens:
+                postings = self._postings.get(token)
+                if postings is None:
+                    self._postings[token] = {path}
+                    self._sorted_tokens = None
+                else:
+                    postings.add(path)
+
+    def remove(self, path: str):
+        """Forget an entry."""
+        with self._lock:
+            self._remove(path)
+
+    def move(self, old_path: str, new_path: str, stamp: Optional[Hashable] = None):
+        """Re-key an entry whose content did not change."""
+        with self._lock:
+            entry = self._entries.get(old_path)
+            self._remove(old_path)
+        if entry is not None:
+            self.add_tokens(new_path, entry[1], stamp)
+
+    def clear(self):
+        """Forget everything (e.g. when the application is locked)."""
+        with self._lock:
+            self._postings.clear()
+            self._entries.clear()
+            self._sorted_tokens = None
+
+    def unindexed(self, paths: Iterable[str], stamp_for) -> List[str]:
+        """
+        Entries that are missing from the index or changed since they were indexed.
+
+        Args:
+            paths: Entries that should be searchable
+            stamp_for: Callable returning an entry's current stamp
+        """
+        with self._lock:
+            entries = dict(self._entries)
+        result = []
+        for path in paths:
+            entry = entries.get(path)
+            if entry is None or (entry[0] is not None and entry[0] != stamp_for(path)):
+                result.append(path)
+        return result
+
+    def search(self, query: str) -> Optional[Set[str]]:
+        """
+        Find indexed entries matching every term of the query.
+
+        Returns:
+            Set of matching paths, or None if the query has no searchable terms
+        """
+        terms = query_terms(query)
+        if not terms:
+            return None
+        with self._lock:
+            if self._sorted_tokens is None:
+                self._sorted_tokens = sorted(self._postings)
+            result = None
+            # Rarest terms first keeps the intersections small
+            for matches in sorted((self._prefix_matches(term) for term in terms), key=len):
+                result = matches if result is None else result & matches
+                if not result:
+                    break
+            return result or set()
+
+    def _prefix_matches(self, term: str) -> Set[str]:
+        tokens = self._sorted_tokens
+        matches = set()
+        index = bisect.bisect_left(tokens, term)
+        while index < len(tokens) and tokens[index].startswith(term):
+            matches |= self._postings[tokens[index]]
+            index += 1
+        return matches
+
+    def _remove(self, path: str):
+        entry = self._entries.pop(path, None)
+        if entry is None:
+            return
+        for token in entry[1]:
+            postings = self._postings.get(token)
+            if postings is None:
+                continue
+            postings.discard(path)
+            if not postings:
+                del self._postings[token]
+                self._sorted_tokens = None
@@ -0,0 +1,320 @@
+"""
+Adaptive, agent-aware scheduling of bulk decryption for the Secrets application.
+
+Decrypting many entries in parallel while gpg-agent does not hold the
+passphrase makes every decrypt ask for it at once. The scheduler therefore
+runs one decrypt at a time until the agent is known to be unlocked (either by
+probing its key cache up front or by the first successful decrypt), then
+hill-climbs the number of concurrent decrypts using the measured per-decrypt
+latency and backs off when errors appear. If decrypts keep failing while the
+agent is still locked (the prompt was dismissed, or there is no secret key),
+the run stops instead of prompting again for every entry.
+
+Entries are taken from a DecryptQueue, whose priorities can be changed (e.g.
+when the user scrolls or expands a folder) and which can be cancelled while a
+run is in progress.
+"""
+
+import heapq
+import itertools
+import os
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple, Union
+
+# Import logging for error handling
+try:
+    from ..logging_system import get_logger, LogCategory
+    logger = get_logger(LogCategory.SECURITY, "DecryptScheduler")
+except ImportError:
+    import logging
+    logger = logging.getLogger(__name__)
+
+
+DecryptResult = Tuple[bool, str]
+
+
+def default_max_workers() -> int:
+    """Upper bound for concurrent decrypts when none is configured."""
+    return os.cpu_count() or 2
+
+
+class ConcurrencyController:
+    """
+    Decides how many decrypts may run at once.
+
+    Stays at one worker until mark_unlocked() is called. After that, every
+    window of results is evaluated: throughput is estimated as
+    workers / mean latency, a worker is added while that keeps improving, the
+    last step is undone (and becomes the ceiling) when it does not, and the
+    count is halved when the error rate exceeds the threshold.
+    """
+
+    def __init__(self, max_workers: int, initial_workers: int = 2,
+                 error_threshold: float = 0.2, min_gain: float = 0.05):
+        """
+        Args:
+            max_workers: Hard upper bound for concurrent decrypts
+            initial_workers: Workers to use right after the agent is unlocked
+            error_threshold: Error rate per window that triggers a back-off
+            min_gain: Relative throughput gain required to keep a new worker
+        """
+        self.max_workers = max(1, max_workers)
+        self.initial_workers = max(1, min(initial_workers, self.max_workers))
+        self.error_threshold = error_threshold
+        self.min_gain = min_gain
+
+        self.workers = 1
+        self._unlocked = False
+        self._ceiling = self.max_workers
+        self._previous: Optional[Tuple[int, float]] = None  # (workers, throughput)
+        self._latencies = []
+        self._failures = 0
+        self._lock = threading.Lock()
+
+    @property
+    def unlocked(self) -> bool:
+        """Whether the agent is known to hold the passphrase."""
+        return self._unlocked
+
+    def mark_unlocked(self):
+        """Leave the serial phase; called once a decrypt is known not to prompt."""
+        with self._lock:
+            if self._unlocked:
+                return
+            self._unlocked = True
+            self.workers = self.initial_workers
+            self._reset_window()
+            logger.debug("GPG agent unlocked, scaling decryption", extra={'workers': self.workers})
+
+    def record(self, latency: float, success: bool):
+        """
+        Record the outcome of one decrypt.
+
+        Args:
+            latency: Wall-clock seconds the decrypt took
+            success: Whether it succeeded
+        """
+        with self._lock:
+            self._latencies.append(latency)
+            if not success:
+                self._failures += 1
+            if self._unlocked and len(self._latencies) >= max(4, 2 * self.workers):
+                self._evaluate()
+
+    def _evaluate(self):
+        count = len(self._latencies)
+        error_rate = self._failures / count
+        mean_latency = max(sum(self._latencies) / count, 1e-6)
+        self._reset_window()
+
+        if error_rate > self.error_threshold:
+            self._ceiling = max(1, self.workers - 1)
+            self.workers = max(1, self.workers // 2)
+            self._previous = None
+            logger.debug("Decrypt errors, backing off",
+                         extra={'error_rate': error_rate, 'workers': self.workers})
+            return
+
+        throughput = self.workers / mean_latency
+        if self._previous is not None:
+            previous_workers, previous_throughput = self._previous
+            if (self.workers > previous_workers
+                    and throughput < previous_throughput * (1 + self.min_gain)):
+                # The extra worker did not pay off; settle on the previous count
+                self._ceiling = previous_workers
+                self.workers = previous_workers
+                return
+
+        self._previous = (self.workers, throughput)
+        if self.workers < min(self.max_workers, self._ceiling):
+            self.workers += 1
+
+    def _reset_window(self):
+        self._latencies = []
+        self._failures = 0
+
+
+class DecryptQueue:
+    """
+    Thread-safe priority queue of entry paths waiting to be decrypted.
+
+    Lower priority values are taken first. Among equal priorities, the paths
+    of the most recent prioritize() call go first; otherwise insertion order
+    is kept.
+    """
+
+    VISIBLE = 0
+    EXPANDED = 1
+    NORMAL = 2
+
+    def __init__(self, paths: Iterable[str] = (), priority: int = NORMAL):
+        """
+        Args:
+            paths: Initial entry paths
+            priority: Priority of the initial paths
+        """
+        self._lock = threading.Lock()
+        self._heap = []
+        self._queued: Dict[str, Tuple[int, int, int]] = {}  # path -> current heap key
+        self._counter = itertools.count()
+        self._boost = 0
+        self._cancelled = False
+        self.add(paths, priority)
+
+    def add(self, paths: Iterable[str], priority: int = NORMAL):
+        """Queue paths that are not queued yet."""
+        with self._lock:
+            if self._cancelled:
+                return
+            for path in paths:
+                if path not in self._queued:
+                    self._push(path, (priority, 0, next(self._counter)))
+
+    def prioritize(self, paths: Iterable[str], priority: int = VISIBLE):
+        """
+        Move queued paths ahead of everything with the same or a lower
+        priority. Paths that are not queued (already taken) are ignored, and
+        a path's priority is never lowered.
+        """
+        with self._lock:
+            self._boost += 1
+            for path in paths:
+                key = self._queued.get(path)
+                if key is not None and (priority, -self._boost) < key[:2]:
+                    self._push(path, (priority, -self._boost, next(self._counter)))
+
+    def pop(self) -> Optional[str]:
+        """Take the next path, or None if the queue is empty."""
+        with self._lock:
+            while self._heap:
+                key, path = heapq.heappop(self._heap)
+                # Entries superseded by prioritize() or discard() are stale
+                if self._queued.get(path) == key:
+                    del self._queued[path]
+                    return path
+            return None
+
+    def discard(self, path: str):
+        """Remove a path without taking it."""
+        with self._lock:
+            self._queued.pop(path, None)
+
+    def pending(self) -> List[str]:
+        """Queued paths in the order they would be taken."""
+        with self._lock:
+            return sorted(self._queued, key=self._queued.__getitem__)
+
+    def cancel(self):
+        """Drop everything queued; runs using the queue stop as soon as possible."""
+        with self._lock:
+            self._cancelled = True
+            self._heap = []
+            self._queued.clear()
+
+    @property
+    def cancelled(self) -> bool:
+        """Whether cancel() was called."""
+        return self._cancelled
+
+    def __len__(self) -> int:
+        return len(self._queued)
+
+    def _push(self, path: str, key: Tuple[int, int, int]):
+        self._queued[path] = key
+        heapq.heappush(self._heap, (key, path))
+
+
+class AdaptiveDecryptScheduler:
+    """Runs a decrypt callable over many entries with adaptive concurrency."""
+
+    # Failures in a row, while the agent is still locked, that end a run:
+    # each further decrypt would only ask for the passphrase again
+    LOCKED_FAILURE_LIMIT = 3
+    # Errors after which asking again is pointless (pinentry dismissed,
+    # secret key missing), so the run ends right away
+    FATAL_ERRORS = ("cancel", "no secret key")
+
+    def __init__(self, decrypt: Callable[[str], DecryptResult],
+                 max_workers: Optional[int] = None, unlocked: bool = False):
+        """
+        Args:
+            decrypt: Callable decrypting one entry path into (success, output)
+            max_workers: Upper bound for concurrent decrypts (defaults to CPU count)
+            unlocked: Whether the agent is already known to hold the passphrase
+        """
+        self.decrypt = decrypt
+        self.controller = ConcurrencyController(max_workers or default_max_workers())
+        if unlocked:
+            self.controller.mark_unlocked()
+
+    def run(self, paths: Union[Iterable[str], DecryptQueue]) -> Iterator[Tuple[str, DecryptResult]]:
+        """
+        Decrypt entries, yielding (path, (success, output)) as they complete.
+
+        Args:
+            paths: Entry paths, or a DecryptQueue that may be reprioritized,
+                extended or cancelled while the run is in progress
+
+        Stopping iteration early stops new decrypts from being started; the
+        ones already running are allowed to finish. When the queue is
+        cancelled, no further results are yielded and the run returns
+        without waiting for running decrypts. The run cancels the queue
+        itself when decrypts keep failing before the agent is unlocked (see
+        LOCKED_FAILURE_LIMIT and FATAL_ERRORS).
+        """
+        queue = paths if isinstance(paths, DecryptQueue) else DecryptQueue(paths)
+        if not len(queue):
+            return
+
+        locked_failures = 0
+        in_flight = {}
+        pool = ThreadPoolExecutor(max_workers=self.controller.max_workers,
+                                  thread_name_prefix="decrypt")
+        try:
+            while not queue.cancelled:
+                while len(in_flight) < self.controller.workers:
+                    path = queue.pop()
+                    if path is None:
+                        break
+                    in_flight[pool.submit(self._timed_decrypt, path)] = path
+                if not in_flight:
+                    break
+
+                # Wake up regularly to notice cancellation during slow decrypts
+                done, _ = wait(in_flight, timeout=0.2, return_when=FIRST_COMPLETED)
+                for future in done:
+                    path = in_flight.pop(future)
+                    result, latency = future.result()
+                    if result[0]:
+                        self.controller.mark_unlocked()
+                    elif not self.controller.unlocked:
+                        locked_failures += 1
+                    self.controller.record(latency, result[0])
+                    if queue.cancelled:
+                        break
+                    yield path, result
+                    if not result[0] and not self.controller.unlocked and self._gives_up(result[1], locked_failures):
+                        logger.warning(f"Stopping bulk decryption after {locked_failures} failed "
+                                       f"decrypts while gpg-agent is locked: {result[1]}")
+                        queue.cancel()
+                        break
+        finally:
+            if queue is not paths:
+                queue.cancel()
+            pool.shutdown(wait=not queue.cancelled, cancel_futures=True)
+
+    def _gives_up(self, error: str, locked_failures: int) -> bool:
+        """Whether a failure while the agent is locked should end the run."""
+        error = (error or "").lower()
+        return (locked_failures >= self.LOCKED_FAILURE_LIMIT
+                or any(fatal in error for fatal in self.FATAL_ERRORS))
+
+    def _timed_decrypt(self, path: str) -> Tuple[DecryptResult, float]:
+        start = time.monotonic()
+        try:
+            result = self.decrypt(path)
+        except OSError as e:
+            result = (False, str(e))
+        return result, time.monotonic() - start
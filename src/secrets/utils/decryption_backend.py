@@ -0,0 +1,421 @@
+"""
+Pluggable decryption backends for the Secrets application.
+
+Two implementations are provided:
+
+- PassCliBackend goes through the `pass` shell wrapper, one process chain
+  (bash, pass, gpg) per entry. It is the most faithful to `pass` but slow
+  for bulk work.
+- DirectGpgBackend decrypts `<store>/<path>.gpg` with gpg directly through
+  the persistent DecryptionWorker, using the same gpg options as `pass show`.
+
+Both return raw (success, output_or_error) tuples; PasswordStore adds the
+user-facing wording and caching on top. Backends can also decrypt and
+encrypt arbitrary files with the store's GPG environment and recipients,
+which the application uses for its own encrypted caches.
+"""
+
+import os
+import re
+import shlex
+import shutil
+import subprocess
+import threading
+from abc import ABC, abstractmethod
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from .decryption_worker import DecryptionWorker, GPG_DECRYPT_OPTIONS
+
+# Import logging for error handling
+try:
+    from ..logging_system import get_logger, LogCategory
+    logger = get_logger(LogCategory.SECURITY, "DecryptionBackend")
+except ImportError:
+    import logging
+    logger = logging.getLogger(__name__)
+
+
+EnvFactory = Callable[[], Dict[str, str]]
+
+# Same options `pass insert` uses when encrypting an entry
+GPG_ENCRYPT_OPTIONS = [
+    "-e", "--quiet", "--yes", "--compress-algo=none", "--no-encrypt-to",
+    "--batch", "--use-agent",
+]
+
+
+def find_gpg_binary() -> str:
+    """Pick the gpg executable the same way `pass` does (prefer gpg2)."""
+    return "gpg2" if shutil.which("gpg2") else "gpg"
+
+
+def compile_search_pattern(query: str) -> "re.Pattern":
+    """
+    Compile a content search query.
+
+    Queries are treated as regular expressions like `pass grep` does; a query
+    that is not a valid expression is matched literally instead.
+    """
+    try:
+        return re.compile(query)
+    except re.error:
+        return re.compile(re.escape(query))
+
+
+class GpgIdResolver:
+    """
+    Resolves the `.gpg-id` recipients that apply to a folder of the store.
+
+    `pass` uses the nearest `.gpg-id` walking up from the entry's folder to
+    the store root. Results are cached per folder and revalidated against the
+    mtime of the `.gpg-id` file they came from, so re-initialising a folder
+    with `pass init -p` is picked up without a full rescan.
+    """
+
+    def __init__(self, store_dir: str):
+        self.store_dir = store_dir
+        # folder -> (gpg_id_file, mtime, recipients)
+        self._cache: Dict[str, Tuple[Optional[str], float, List[str]]] = {}
+        self._lock = threading.Lock()
+
+    def recipients_for(self, password_path: str) -> List[str]:
+        """
+        Get the recipients an entry is (or would be) encrypted to.
+
+        Args:
+            password_path: Entry path relative to the store root
+
+        Returns:
+            List of key IDs / user IDs, empty if the store has no .gpg-id
+        """
+        return self.recipients_for_folder(os.path.dirname(password_path))
+
+    def recipients_for_folder(self, folder: str) -> List[str]:
+        """Get the recipients for a folder relative to the store root."""
+        folder = folder.strip("/")
+        with self._lock:
+            cached = self._cache.get(folder)
+            if cached is not None and self._is_fresh(cached):
+                return list(cached[2])
+
+        gpg_id_file = self._find_gpg_id(folder)
+        mtime = self._mtime(gpg_id_file)
+        recipients = self._read_gpg_id(gpg_id_file) if gpg_id_file else []
+
+        with self._lock:
+            self._cache[folder] = (gpg_id_file, mtime, recipients)
+        return list(recipients)
+
+    def invalidate(self):
+        """Drop all cached folder lookups."""
+        with self._lock:
+            self._cache.clear()
+
+    def _is_fresh(self, cached: Tuple[Optional[str], float, List[str]]) -> bool:
+        gpg_id_file, mtime, _ = cached
+        if gpg_id_file is None:
+            # Nothing was found; only the root file appearing can change that
+            return not os.path.exists(os.path.join(self.store_dir, ".gpg-id"))
+        return self._mtime(gpg_id_file) == mtime
+
+    def _find_gpg_id(self, folder: str) -> Optional[str]:
+        current = folder
+        while True:
+            candidate = os.path.join(self.store_dir, current, ".gpg-id")
+            if os.path.isfile(candidate):
+                return candidate
+            if not current:
+                return None
+            current = os.path.dirname(current)
+
+    @staticmethod
+    def _mtime(path: Optional[str]) -> float:
+        if path is None:
+            return 0.0
+        try:
+            return os.stat(path).st_mtime
+        except OSError:
+            return -1.0
+
+    @staticmethod
+    def _read_gpg_id(gpg_id_file: str) -> List[str]:
+        try:
+            with open(gpg_id_file, "r", encoding="utf-8") as f:
+                lines = f.read().splitlines()
+        except OSError as e:
+            logger.warning("Could not read .gpg-id", extra={'file': gpg_id_file, 'error': str(e)})
+            return []
+        # Same rules as pass: ignore comments and blank lines
+        return [line.split("#", 1)[0].strip() for line in lines
+                if line.split("#", 1)[0].strip()]
+
+
+class DecryptionBackend(ABC):
+    """Base class for the ways an entry of the store can be decrypted."""
+
+    name = ""
+
+    def __init__(self, store_dir: str, env_factory: Optional[EnvFactory] = None):
+        """
+        Args:
+            store_dir: Root of the password store
+            env_factory: Callable returning the GPG environment for subprocesses
+        """
+        self.store_dir = store_dir
+        self.env_factory = env_factory or os.environ.copy
+        self.recipients = GpgIdResolver(store_dir)
+        self.gpg_binary = find_gpg_binary()
+
+    @abstractmethod
+    def decrypt(self, password_path: str) -> Tuple[bool, str]:
+        """
+        Decrypt one entry.
+
+        Args:
+            password_path: Entry path relative to the store root
+
+        Returns:
+            Tuple of (success, plaintext_or_error)
+        """
+        pass
+
+    def decrypt_many(self, password_paths: Iterable[str]) -> Iterator[Tuple[str, Tuple[bool, str]]]:
+        """
+        Decrypt many entries.
+
+        Args:
+            password_paths: Entry paths relative to the store root
+
+        Yields:
+            (password_path, (success, plaintext_or_error)) as entries complete
+        """
+        for path in password_paths:
+            yield path, self.decrypt(path)
+
+    def grep(self, query: str, password_paths: Iterable[str]) -> Tuple[bool, object]:
+        """
+        Search the content of entries.
+
+        Args:
+            query: Regular expression (or literal text) to look for
+            password_paths: Entries to search
+
+        Returns:
+            Tuple of (success, list_of_matching_paths_or_error)
+        """
+        pattern = compile_search_pattern(query)
+        matches = []
+        for path, (success, content) in self.decrypt_many(password_paths):
+            if success and pattern.search(content):
+                matches.append(path)
+        return True, matches
+
+    def decrypt_file(self, file_path: str) -> Tuple[bool, str]:
+        """
+        Decrypt any gpg-encrypted file, not only store entries.
+
+        Args:
+            file_path: Absolute path of the encrypted file
+
+        Returns:
+            Tuple of (success, plaintext_or_error)
+        """
+        # Options come from the same environment the worker processes get
+        env = self.env_factory()
+        command = [self.gpg_binary] + GPG_DECRYPT_OPTIONS
+        command += shlex.split(env.get("PASSWORD_STORE_GPG_OPTS", ""))
+        process = subprocess.run(
+            command + [file_path],
+            capture_output=True, text=True, check=False, env=env
+        )
+        if process.returncode == 0:
+            return True, process.stdout
+        return False, process.stderr.strip()
+
+    def encrypt_file(self, content: str, file_path: str, folder: str = "") -> Tuple[bool, str]:
+        """
+        Encrypt content to the recipients of a store folder, like `pass insert`.
+
+        The file is written next to its destination and renamed into place,
+        so readers never see a partially written file.
+
+        Args:
+            content: Plaintext to encrypt
+            file_path: Absolute path of the file to (over)write
+            folder: Store folder whose .gpg-id applies
+
+        Returns:
+            Tuple of (success, error_message)
+        """
+        recipients = self.recipients.recipients_for_folder(folder)
+        if not recipients:
+            return False, "No .gpg-id found for the password store"
+
+        env = self.env_factory()
+        command = [self.gpg_binary] + GPG_ENCRYPT_OPTIONS
+        command += shlex.split(env.get("PASSWORD_STORE_GPG_OPTS", ""))
+        for recipient in recipients:
+            command += ["-r", recipient]
+
+        temp_path = file_path + ".tmp"
+        process = subprocess.run(
+            command + ["-o", temp_path],
+            input=content, capture_output=True, text=True, check=False, env=env
+        )
+        if process.returncode != 0:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            return False, process.stderr.strip()
+        try:
+            with open(temp_path, "rb") as f:
+                os.fsync(f.fileno())
+            os.replace(temp_path, file_path)
+        except OSError as e:
+            return False, str(e)
+        return True, ""
+
+    def close(self):
+        """Release any long-lived resources held by the backend."""
+
+    def gpg_file(self, password_path: str) -> str:
+        """Get the absolute path of an entry's encrypted file."""
+        return os.path.join(self.store_dir, password_path + ".gpg")
+
+
+class PassCliBackend(DecryptionBackend):
+    """Decrypts entries through `pass show`."""
+
+    name = "pass"
+
+    def decrypt(self, password_path: str) -> Tuple[bool, str]:
+        process = subprocess.run(
+            ["pass", "show", password_path],
+            capture_output=True, text=True, check=False, env=self.env_factory()
+        )
+        if process.returncode == 0:
+            return True, process.stdout
+        return False, process.stderr.strip() or process.stdout.strip()
+
+    def grep(self, query: str, password_paths: Iterable[str]) -> Tuple[bool, object]:
+        # `pass grep` walks the whole store itself
+        process = subprocess.run(
+            ["pass", "grep", query],
+            capture_output=True, text=True, check=False, env=self.env_factory()
+        )
+        if process.returncode == 0:
+            return True, [line for line in process.stdout.splitlines() if line.strip()]
+        if process.returncode == 1:  # `grep` returns 1 if no lines were selected
+            return True, []
+        return False, process.stderr.strip() or process.stdout.strip()
+
+
+class DirectGpgBackend(DecryptionBackend):
+    """
+    Decrypts entries by streaming their .gpg files through DecryptionWorkers.
+
+    Each concurrent caller gets its own worker process from a small pool, so
+    parallel decrypts (see AdaptiveDecryptScheduler) do not queue on one pipe.
+    Idle workers are kept for reuse until close().
+    """
+
+    name = "gpg"
+
+    def __init__(self, store_dir: str, env_factory: Optional[EnvFactory] = None,
+                 gpg_binary: Optional[str] = None):
+        super().__init__(store_dir, env_factory)
+        self.gpg_binary = gpg_binary or find_gpg_binary()
+        self._env: Optional[Dict[str, str]] = None
+        self._workers: List[DecryptionWorker] = []
+        self._idle_workers: List[DecryptionWorker] = []
+        self._worker_lock = threading.Lock()
+
+    def decrypt(self, password_path: str) -> Tuple[bool, str]:
+        for _, result in self.decrypt_many([password_path]):
+            return result
+        return False, "No result from decryption worker"
+
+    def decrypt_many(self, password_paths: Iterable[str]) -> Iterator[Tuple[str, Tuple[bool, str]]]:
+        gpg_files = {}
+        for path in password_paths:
+            gpg_file = self.gpg_file(path)
+            if os.path.isfile(gpg_file):
+                gpg_files[gpg_file] = path
+            else:
+                yield path, (False, f"Error: {path} is not in the password store.")
+
+        if not gpg_files:
+            return
+
+        worker = self._acquire_worker()
+        try:
+            for gpg_file, (success, output) in worker.decrypt_many(gpg_files):
+                path = gpg_files[gpg_file]
+                if not success and "No secret key" in output:
+                    recipients = self.recipients.recipients_for(path)
+                    if recipients:
+                        output = f"{output} (encrypted for: {', '.join(recipients)})"
+                yield path, (success, output)
+        finally:
+            self._release_worker(worker)
+
+    def decrypt_file(self, file_path: str) -> Tuple[bool, str]:
+        worker = self._acquire_worker()
+        try:
+            return worker.decrypt(file_path)
+        finally:
+            self._release_worker(worker)
+
+    def close(self):
+        with self._worker_lock:
+            workers, self._workers = self._workers, []
+            self._idle_workers = []
+        for worker in workers:
+            worker.stop()
+
+    def _acquire_worker(self) -> DecryptionWorker:
+        """Take an idle worker from the pool, creating one if none is free."""
+        env = self.env_factory()
+        stale = []
+        with self._worker_lock:
+            if env != self._env:
+                # Workers inherit the environment when they start, so the pool
+                # is recycled if it changed (e.g. a different GNUPGHOME).
+                # Busy workers are dropped too and stopped when released.
+                stale, self._idle_workers, self._workers = self._idle_workers, [], []
+                self._env = env
+            if self._idle_workers:
+                worker = self._idle_workers.pop()
+            else:
+                worker = DecryptionWorker(self._env, gpg_binary=self.gpg_binary)
+                self._workers.append(worker)
+        for stale_worker in stale:
+            stale_worker.stop()
+        return worker
+
+    def _release_worker(self, worker: DecryptionWorker):
+        """Return a worker to the pool (unless the backend was closed meanwhile)."""
+        with self._worker_lock:
+            if worker in self._workers:
+                self._idle_workers.append(worker)
+                return
+        worker.stop()
+
+
+DECRYPTION_BACKENDS = {
+    PassCliBackend.name: PassCliBackend,
+    DirectGpgBackend.name: DirectGpgBackend,
+}
+
+
+def create_decryption_backend(name: str, store_dir: str,
+                              env_factory: Optional[EnvFactory] = None) -> DecryptionBackend:
+    """
+    Create a decryption backend by its configuration name.
+
+    Unknown names fall back to the direct gpg backend.
+    """
+    backend_class = DECRYPTION_BACKENDS.get(name)
+    if backend_class is None:
+        logger.warning("Unknown decryption backend, using gpg", extra={'backend': name})
+        backend_class = DirectGpgBackend
+    return backend_class(store_dir, env_factory)
@@ -0,0 +1,217 @@
+"""
+Persistent batch-decryption worker for the Secrets application.
+
+Instead of forking `pass show` (a bash process, a gpg process and a fresh GPG
+environment) for every entry, a single helper process is started once per
+session. The parent streams .gpg file paths to it over a pipe and reads the
+decrypted plaintext back from another pipe.
+
+Wire protocol (both directions use length-prefixed frames):
+    request:  b"<len>\\n" + path bytes
+    response: b"<returncode> <len>\\n" + payload bytes
+The payload is gpg's stdout on success and its stderr on failure.
+
+This file is also executed directly as the worker process, so the code that
+runs in the child must only depend on the standard library.
+"""
+
+import os
+import shlex
+import subprocess
+import sys
+import threading
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+# Import logging for error handling
+try:
+    from ..logging_system import get_logger, LogCategory
+    logger = get_logger(LogCategory.SECURITY, "DecryptionWorker")
+except ImportError:
+    import logging
+    logger = logging.getLogger(__name__)
+
+
+# Same options `pass show` passes to gpg (see password-store.sh)
+GPG_DECRYPT_OPTIONS = [
+    "-d", "--quiet", "--yes", "--compress-algo=none", "--no-encrypt-to",
+    "--batch", "--use-agent",
+]
+
+
+def _read_frame_header(stream) -> Optional[bytes]:
+    """Read a single header line, returning None on EOF."""
+    line = stream.readline()
+    if not line:
+        return None
+    return line.rstrip(b"\n")
+
+
+def _worker_main():
+    """Entry point of the helper process: decrypt each requested path in turn."""
+    stdin = sys.stdin.buffer
+    stdout = sys.stdout.buffer
+
+    gpg = os.environ.get("SECRETS_GPG_BINARY", "gpg")
+    command = [gpg] + GPG_DECRYPT_OPTIONS
+    command += shlex.split(os.environ.get("PASSWORD_STORE_GPG_OPTS", ""))
+
+    while True:
+        header = _read_frame_header(stdin)
+        if header is None:
+            break
+        path = stdin.read(int(header))
+
+        try:
+            process = subprocess.run(
+                command + [os.fsdecode(path)],
+                stdin=subprocess.DEVNULL,
+                capture_output=True,
+                check=False,
+            )
+            status = process.returncode
+            payload = process.stdout if status == 0 else process.stderr
+        except OSError as e:
+            status, payload = 127, str(e).encode()
+
+        stdout.write(b"%d %d\n" % (status, len(payload)))
+        stdout.write(payload)
+        stdout.flush()
+
+
+class DecryptionWorker:
+    """Client side of the long-lived decryption helper process."""
+
+    def __init__(self, env: Optional[Dict[str, str]] = None, gpg_binary: str = "gpg"):
+        """
+        Args:
+            env: Environment for the helper (normally the prepared GPG environment)
+            gpg_binary: gpg executable the helper should invoke
+        """
+        self.env = dict(env) if env is not None else os.environ.copy()
+        self.env["SECRETS_GPG_BINARY"] = gpg_binary
+        self._process: Optional[subprocess.Popen] = None
+        self._lock = threading.Lock()
+
+    def start(self):
+        """Start the helper process if it is not already running."""
+        if self.is_alive():
+            return
+
+        self._process = subprocess.Popen(
+            [sys.executable, "-I", os.path.abspath(__file__)],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+            env=self.env,
+        )
+        logger.debug("Started decryption worker", extra={'pid': self._process.pid})
+
+    def is_alive(self) -> bool:
+        """Check whether the helper process is running."""
+        return self._process is not None and self._process.poll() is None
+
+    def stop(self):
+        """Stop the helper process. Closing its stdin makes it exit cleanly."""
+        with self._lock:
+            process, self._process = self._process, None
+            if process is None:
+                return
+            try:
+                process.stdin.close()
+                process.wait(timeout=5)
+            except (OSError, subprocess.TimeoutExpired):
+                process.kill()
+                process.wait()
+            finally:
+                process.stdout.close()
+
+    def decrypt(self, gpg_file: str) -> Tuple[bool, str]:
+        """
+        Decrypt a single file.
+
+        Args:
+            gpg_file: Absolute path of the .gpg file
+
+        Returns:
+            Tuple of (success, plaintext_or_error)
+        """
+        for _, result in list(self.decrypt_many([gpg_file])):
+            return result
+        return False, "Decryption worker returned no result"
+
+    def decrypt_many(self, gpg_files: Iterable[str]) -> Iterator[Tuple[str, Tuple[bool, str]]]:
+        """
+        Stream many files through the worker.
+
+        Requests are written from a separate thread so the worker never blocks
+        on a full pipe while we are still sending paths.
+
+        Args:
+            gpg_files: Absolute paths of the .gpg files
+
+        Yields:
+            (gpg_file, (success, plaintext_or_error)) in request order
+        """
+        gpg_files = list(gpg_files)
+        if not gpg_files:
+            return
+
+        with self._lock:
+            self.start()
+            process = self._process
+            writer = threading.Thread(
+                target=self._write_requests, args=(process, gpg_files), daemon=True
+            )
+            writer.start()
+
+            pending = len(gpg_files)
+            try:
+                for index, gpg_file in enumerate(gpg_files):
+                    result = self._read_response(process)
+                    if result is None:
+                        # Worker died; fail the remaining paths and let the
+                        # next call start a fresh process.
+                        pending = 0
+                        logger.warning("Decryption worker exited unexpectedly")
+                        for remaining in gpg_files[index:]:
+                            yield remaining, (False, "Decryption worker exited unexpectedly")
+                        return
+                    pending -= 1
+                    yield gpg_file, result
+            finally:
+                # If the caller stopped iterating early, drain the responses
+                # still in flight so the next batch starts on a frame boundary.
+                while pending and self._read_response(process) is not None:
+                    pending -= 1
+                writer.join()
+
+    def _write_requests(self, process: subprocess.Popen, gpg_files: List[str]):
+        """Write framed path requests to the worker's stdin."""
+        try:
+            for gpg_file in gpg_files:
+                path = os.fsencode(gpg_file)
+                process.stdin.write(b"%d\n" % len(path))
+                process.stdin.write(path)
+                process.stdin.flush()
+        except (OSError, ValueError) as e:
+            logger.warning("Failed to send paths to decryption worker", extra={'error': str(e)})
+
+    def _read_response(self, process: subprocess.Popen) -> Optional[Tuple[bool, str]]:
+        """Read one framed response, returning None if the worker is gone."""
+        try:
+            header = _read_frame_header(process.stdout)
+            if header is None:
+                return None
+            status, length = header.split(b" ")
+            payload = process.stdout.read(int(length))
+        except (OSError, ValueError):
+            return None
+
+        text = payload.decode("utf-8", errors="replace")
+        if int(status) == 0:
+            return True, text
+        return False, text.strip()
+
+
+if __name__ == "__main__":
+    _worker_main()
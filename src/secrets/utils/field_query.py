@@ -0,0 +1,228 @@
+"""
+Field-scoped search queries such as ``user:alice url:github folder:work has:totp``.
+
+parse_query splits a query into field terms and the remaining free text.
+FieldIndex keeps, per field, a map from values to the entries having them, so
+a query is answered with a few dictionary lookups and set intersections
+instead of looking at every entry:
+
+    user:VALUE    username (from the decrypted content)
+    url:VALUE     URL, without scheme or "www."
+    folder:VALUE  any folder the entry is in
+    tag:VALUE     tag from the entry's metadata
+    has:FIELD     entries with a user, url, tag or totp at all
+
+Values match by prefix ("url:git" matches github.com) on the whole value or
+on any of its words, case-insensitively. ``"quoted values"`` may contain
+spaces and a leading "-" excludes matches (``-tag:old``). Terms whose field
+is unknown or whose value is still empty stay part of the free text, which
+the caller matches against entry names.
+"""
+
+import bisect
+import re
+import threading
+from dataclasses import dataclass, field
+from typing import Dict, FrozenSet, Iterable, List, Optional, Set, Tuple
+
+FIELDS = ("user", "url", "folder", "tag", "totp")
+
+# Names accepted in queries -> indexed field
+FIELD_ALIASES = {
+    "user": "user", "username": "user", "login": "user", "email": "user",
+    "url": "url", "site": "url", "website": "url",
+    "folder": "folder", "in": "folder",
+    "tag": "tag", "tags": "tag",
+    "has": "has", "is": "has",
+}
+
+_TERM_RE = re.compile(r'(?<!\S)(-?)(\w+):(?:"([^"]*)"?|(\S*))')
+_WORD_RE = re.compile(r"\w+", re.UNICODE)
+_URL_PREFIX_RE = re.compile(r"^(?:[a-z][a-z0-9+.-]*://)?(?:www\.)?")
+
+
+@dataclass
+class FieldQuery:
+    """A parsed query: (field, value, negated) terms plus the free text."""
+    terms: List[Tuple[str, str, bool]] = field(default_factory=list)
+    text: str = ""
+
+
+def parse_query(query: str) -> FieldQuery:
+    """Split a search query into field terms and free text."""
+    terms = []
+    text_parts = []
+    position = 0
+    for match in _TERM_RE.finditer(query):
+        negated, name, quoted, value = match.groups()
+        name = FIELD_ALIASES.get(name.lower())
+        value = (quoted if quoted is not None else value).strip().lower()
+        if name is None or not value:
+            continue
+        terms.append((name, value, bool(negated)))
+        text_parts.append(query[position:match.start()])
+        position = match.end()
+    text_parts.append(query[position:])
+    return FieldQuery(terms, " ".join(" ".join(text_parts).split()))
+
+
+def _value_keys(field_name: str, value: str) -> Set[str]:
+    """The keys under which a field value is indexed."""
+    value = value.strip().lower()
+    if not value:
+        return set()
+    if field_name == "url":
+        value = _URL_PREFIX_RE.sub("", value)
+    keys = set(_WORD_RE.findall(value))
+    keys.add(value)
+    return keys
+
+
+def _folder_keys(path: str) -> Set[str]:
+    """Keys for every folder an entry is in ("a/b/c" -> "a", "a/b" and their words)."""
+    keys = set()
+    parts = path.split("/")[:-1]
+    for depth in range(1, len(parts) + 1):
+        keys |= _value_keys("folder", "/".join(parts[:depth]))
+    return keys
+
+
+class FieldIndex:
+    """Per-field value -> entries maps for field-scoped queries."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._postings: Dict[str, Dict[str, Set[str]]] = {name: {} for name in FIELDS}
+        # Entries with any value for a field, answering has:FIELD
+        self._present: Dict[str, Set[str]] = {name: set() for name in FIELDS}
+        self._entries: Dict[str, Dict[str, FrozenSet[str]]] = {}
+        # Sorted keys per field for prefix lookups, rebuilt after changes
+        self._sorted_keys: Dict[str, List[str]] = {}
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def add_path(self, path: str, tags: Iterable[str] = ()):
+        """Index an entry's folders and tags."""
+        tag_keys = set()
+        for tag in tags:
+            tag_keys |= _value_keys("tag", tag)
+        with self._lock:
+            self._set(path, "folder", _folder_keys(path))
+            self._set(path, "tag", tag_keys)
+
+    def set_content(self, path: str, username: Optional[str] = None, url: Optional[str] = None,
+                    has_totp: bool = False):
+        """Index the fields found in an entry's decrypted content."""
+        with self._lock:
+            self._set(path, "user", _value_keys("user", username or ""))
+            self._set(path, "url", _value_keys("url", url or ""))
+            self._set(path, "totp", {"totp"} if has_totp else set())
+
+    def remove(self, path: str):
+        """Forget an entry."""
+        with self._lock:
+            self._remove(path)
+
+    def move(self, old_path: str, new_path: str):
+        """Re-key an entry, keeping its fields; its folders follow the new path."""
+        with self._lock:
+            entry = self._remove(old_path)
+            if entry is None:
+                return
+            for name, keys in entry.items():
+                self._set(new_path, name, keys)
+            self._set(new_path, "folder", _folder_keys(new_path))
+
+    def clear(self):
+        """Forget everything (e.g. when the application is locked)."""
+        with self._lock:
+            for name in FIELDS:
+                self._postings[name].clear()
+                self._present[name].clear()
+            self._entries.clear()
+            self._sorted_keys.clear()
+
+    def search(self, query) -> Optional[Set[str]]:
+        """
+        Find the entries matching every field term of a query.
+
+        Args:
+            query: Query string or FieldQuery; free text is ignored here
+
+        Returns:
+            Set of matching paths, or None if the query has no field terms
+        """
+        if isinstance(query, str):
+            query = parse_query(query)
+        if not query.terms:
+            return None
+        with self._lock:
+            included = [self._lookup(name, value) for name, value, negated in query.terms if not negated]
+            excluded = [self._lookup(name, value) for name, value, negated in query.terms if negated]
+            if included:
+                # Rarest terms first keeps the intersections small
+                included.sort(key=len)
+                result = set(included[0])
+                for matches in included[1:]:
+                    if not result:
+                        break
+                    result &= matches
+            else:
+                result = set(self._entries)
+            for matches in excluded:
+                result -= matches
+            return result
+
+    def _lookup(self, name: str, value: str) -> Set[str]:
+        if name == "has":
+            name = FIELD_ALIASES.get(value, value)
+            return self._present.get(name, set())
+        postings = self._postings[name]
+        if name == "url":
+            value = _URL_PREFIX_RE.sub("", value)
+        keys = self._sorted_keys.get(name)
+        if keys is None:
+            keys = self._sorted_keys[name] = sorted(postings)
+        matches = set()
+        index = bisect.bisect_left(keys, value)
+        while index < len(keys) and keys[index].startswith(value):
+            matches |= postings[keys[index]]
+            index += 1
+        return matches
+
+    def _set(self, path: str, name: str, keys: Iterable[str]):
+        keys = frozenset(keys)
+        entry = self._entries.setdefault(path, {})
+        old_keys = entry.get(name, frozenset())
+        if keys == old_keys:
+            return
+        postings = self._postings[name]
+        for key in old_keys - keys:
+            paths = postings[key]
+            paths.discard(path)
+            if not paths:
+                del postings[key]
+                self._sorted_keys.pop(name, None)
+        for key in keys - old_keys:
+            paths = postings.get(key)
+            if paths is None:
+                postings[key] = {path}
+                self._sorted_keys.pop(name, None)
+            else:
+                paths.add(path)
+        entry[name] = keys
+        if keys:
+            self._present[name].add(path)
+        else:
+            self._present[name].discard(path)
+
+    def _remove(self, path: str) -> Optional[Dict[str, FrozenSet[str]]]:
+        entry = self._entries.get(path)
+        if entry is None:
+            return None
+        entry = dict(entry)
+        for name in entry:
+            self._set(path, name, ())
+        del self._entries[path]
+        return entry
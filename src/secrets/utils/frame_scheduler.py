@@ -0,0 +1,152 @@
+"""
+Frame-budgeted scheduling of UI work for the Secrets application.
+
+Large batches of UI mutations (filling the password list, decorating rows
+with bulk TOTP/URL results, applying favicons) used to run a fixed number
+of items per idle callback: too few on fast machines, too many on slow ones.
+A FrameScheduler instead runs queued work from a widget's frame clock tick
+and stops as soon as the frame's time budget is used.
+
+The cost of every kind of work is measured as it runs (a moving average per
+kind), so an item is only started when its expected cost still fits in the
+remaining budget. At least one item runs per frame, so work always
+progresses even when a single item is more expensive than the budget.
+"""
+
+import time
+from collections import deque
+from typing import Callable, Deque, Dict, Optional, Tuple
+
+import gi
+gi.require_version("Gtk", "4.0")
+from gi.repository import GLib
+
+# Import logging for error handling
+try:
+    from ..logging_system import get_logger, LogCategory
+    logger = get_logger(LogCategory.UI, "FrameScheduler")
+except ImportError:
+    import logging
+    logger = logging.getLogger(__name__)
+
+DEFAULT_BUDGET_MS = 4.0
+# Weight of the newest sample in the per-kind cost average
+COST_SMOOTHING = 0.2
+
+
+class WorkQueue:
+    """FIFO of (kind, callback, args) run against a time budget."""
+
+    def __init__(self, clock: Callable[[], float] = time.perf_counter):
+        self._clock = clock
+        self._items: Deque[Tuple[str, Callable, tuple]] = deque()
+        self._costs: Dict[str, float] = {}
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def push(self, kind: str, callback: Callable, *args):
+        """Queue callback(*args); kind groups work of similar cost."""
+        self._items.append((kind, callback, args))
+
+    def cancel(self, kind: Optional[str] = None):
+        """Drop the queued work of one kind, or all of it."""
+        if kind is None:
+            self._items.clear()
+        else:
+            self._items = deque(item for item in self._items if item[0] != kind)
+
+    def estimated_cost(self, kind: str) -> float:
+        """Average measured seconds per item of a kind (0 until measured)."""
+        return self._costs.get(kind, 0.0)
+
+    def run(self, budget: float) -> int:
+        """
+        Run queued work until the budget (seconds) is used up.
+
+        Returns:
+            Number of items run
+        """
+        clock = self._clock
+        start = clock()
+        deadline = start + budget
+        count = 0
+        while self._items:
+            kind, callback, args = self._items[0]
+            now = clock()
+            if count and now + self._costs.get(kind, 0.0) > deadline:
+                break
+            self._items.popleft()
+            try:
+                callback(*args)
+            except Exception as e:
+                logger.error(f"Scheduled UI work failed: {e}")
+            cost = clock() - now
+            previous = self._costs.get(kind)
+            self._costs[kind] = cost if previous is None else previous + COST_SMOOTHING * (cost - previous)
+            count += 1
+        return count
+
+
+class FrameScheduler(WorkQueue):
+    """
+    Runs queued UI work on a widget's frame clock, within a per-frame budget.
+
+    While the widget is not mapped (its frame clock does not tick), work runs
+    from idle callbacks with the same budget instead.
+    """
+
+    def __init__(self, widget, budget_ms: float = DEFAULT_BUDGET_MS):
+        """
+        Args:
+            widget: Widget whose frame clock paces the work
+            budget_ms: Time per frame to spend on queued work
+        """
+        super().__init__()
+        self._widget = widget
+        self._budget = budget_ms / 1000.0
+        self._tick_id = None
+        self._idle_id = None
+
+    def add(self, kind: str, callback: Callable, *args):
+        """Queue callback(*args) and make sure it runs on a coming frame."""
+        self.push(kind, callback, *args)
+        self._schedule()
+
+    def cancel(self, kind: Optional[str] = None):
+        super().cancel(kind)
+        if not len(self):
+            self._unschedule()
+
+    def _schedule(self):
+        if self._tick_id is not None or self._idle_id is not None:
+            return
+        if self._widget.get_mapped():
+            self._tick_id = self._widget.add_tick_callback(self._on_tick)
+        else:
+            self._idle_id = GLib.idle_add(self._on_idle)
+
+    def _unschedule(self):
+        if self._tick_id is not None:
+            self._widget.remove_tick_callback(self._tick_id)
+            self._tick_id = None
+        if self._idle_id is not None:
+            GLib.source_remove(self._idle_id)
+            self._idle_id = None
+
+    def _on_tick(self, widget, frame_clock):
+        self.run(self._budget)
+        if len(self) and widget.get_mapped():
+            return GLib.SOURCE_CONTINUE
+        self._tick_id = None
+        if len(self):
+            self._schedule()
+        return GLib.SOURCE_REMOVE
+
+    def _on_idle(self):
+        self.run(self._budget)
+        self._idle_id = None
+        if len(self):
+            # Switches to the frame clock once the widget is shown
+            self._schedule()
+        return GLib.SOURCE_REMOVE
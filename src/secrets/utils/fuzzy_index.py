@@ -0,0 +1,190 @@
+"""
+Fuzzy, ranked matching of entry and folder paths.
+
+A FuzzyPathIndex is built once per load from the store's paths. A query term
+matches a path when its characters appear in the path in order (fzf style);
+space-separated terms must all match. Matches are ranked by fuzzy_score:
+characters at the start of a path segment or word, consecutive characters and
+characters in the entry's own name (the last segment) score higher, gaps
+score lower.
+
+Candidates are found without looking at every path: each character of the
+store has a bitset of the paths containing it, so one AND per query character
+leaves only the paths containing all of them. When a query extends the
+previous one (the user typed another character), only the previous matches
+are checked again.
+"""
+
+import re
+from functools import lru_cache
+from itertools import compress
+from typing import Dict, Iterable, List, Optional, Tuple
+
+SCORE_MATCH = 16
+BONUS_SEGMENT = 10      # First character of a path segment
+BONUS_WORD = 8          # First character after "-", "_", "." or a space
+BONUS_CONSECUTIVE = 6   # Follows the previous matched character
+BONUS_NAME = 2          # Inside the last path segment
+PENALTY_GAP_START = 3
+PENALTY_GAP = 1
+
+_WORD_SEPARATORS = frozenset("-_. @+")
+_BINARY_DIGITS = bytes.maketrans(b"01", b"\x00\x01")
+
+# Matches scored precisely per query; larger result sets come from very short
+# queries, where the shortest paths are the best candidates anyway
+RANK_LIMIT = 500
+
+
+@lru_cache(maxsize=64)
+def subsequence_pattern(term: str) -> "re.Pattern":
+    """Regex matching text that contains the characters of term in order."""
+    # "[^b]*b" instead of ".*?b" keeps matching linear
+    parts = [re.escape(term[0])]
+    for char in term[1:]:
+        parts.append(f"[^{re.escape(char)}]*{re.escape(char)}")
+    return re.compile("".join(parts))
+
+
+def fuzzy_score(text: str, term: str, name_start: int = 0) -> Optional[int]:
+    """
+    Score a lowercase query term against a lowercase path.
+
+    Args:
+        text: Path to match
+        term: Query term; its characters must appear in text in order
+        name_start: Offset of the last path segment in text
+
+    Returns:
+        The score (higher is better), or None if the term does not match
+    """
+    find = text.find
+    # Prefer a match inside the entry's own name, then anywhere
+    for start in ((name_start, 0) if name_start else (0,)):
+        pos = start - 1
+        for char in term:
+            pos = find(char, pos + 1)
+            if pos < 0:
+                break
+        else:
+            break
+    else:
+        return None
+
+    # Walk back from the end of the match to the shortest window (fzf v1)
+    rfind = text.rfind
+    positions = [0] * len(term)
+    end = pos + 1
+    for k in range(len(term) - 1, -1, -1):
+        end = rfind(term[k], 0, end)
+        positions[k] = end
+
+    score = 0
+    previous = -2
+    for pos in positions:
+        score += SCORE_MATCH
+        if pos == 0 or text[pos - 1] == "/":
+            score += BONUS_SEGMENT
+        elif text[pos - 1] in _WORD_SEPARATORS:
+            score += BONUS_WORD
+        if pos == previous + 1:
+            score += BONUS_CONSECUTIVE
+        elif previous >= 0:
+            score -= PENALTY_GAP_START + (pos - previous - 1) * PENALTY_GAP
+        if pos >= name_start:
+            score += BONUS_NAME
+        previous = pos
+    return score
+
+
+class FuzzyPathIndex:
+    """Lowercased paths with per-character bitsets, for ranked fuzzy search."""
+
+    def __init__(self, paths: Iterable[str] = ()):
+        # Shortest paths first, so unranked tails of large results are ordered
+        self.paths: List[str] = sorted(paths, key=lambda path: (len(path), path))
+        self._lowered = [path.lower() for path in self.paths]
+        self._name_starts = [path.rfind("/") + 1 for path in self._lowered]
+        self._all = (1 << len(self.paths)) - 1
+        self._char_bits = self._build_char_bits(self._lowered)
+        # Matches of the previous query, reused when the next one extends it
+        self._last_query: Optional[str] = None
+        self._last_matches: List[int] = []
+
+    def __len__(self) -> int:
+        return len(self.paths)
+
+    def search(self, query: str, limit: Optional[int] = None) -> List[Tuple[str, int]]:
+        """
+        Find the paths matching every term of the query.
+
+        Matches are ranked by their total fuzzy_score. When a short query
+        matches more than RANK_LIMIT paths, only the RANK_LIMIT shortest are
+        scored; the others follow them, shortest first, with a score of 0.
+
+        Args:
+            query: Space-separated terms, matched case-insensitively
+            limit: Return at most this many results
+
+        Returns:
+            List of (path, score), best match first
+        """
+        query = query.lower().lstrip()
+        terms = query.split()
+        if not terms:
+            return []
+
+        narrowing = self._last_query is not None and query.startswith(self._last_query)
+        if narrowing:
+            candidates = self._last_matches
+        else:
+            candidates = self._candidates(query)
+
+        # Checking the order of the characters is left to the regex engine;
+        # single characters are already guaranteed by the bitsets
+        lowered = self._lowered
+        for term in terms:
+            if narrowing or len(term) > 1:
+                search = subsequence_pattern(term).search
+                candidates = [index for index in candidates if search(lowered[index])]
+        self._last_query = query
+        self._last_matches = candidates
+
+        name_starts = self._name_starts
+        ranked = []
+        for index in candidates[:RANK_LIMIT]:
+            text = lowered[index]
+            score = sum(fuzzy_score(text, term, name_starts[index]) for term in terms)
+            ranked.append((-score, index))
+        ranked.sort()
+        if limit is not None:
+            ranked = ranked[:limit]
+        results = [(self.paths[index], -score) for score, index in ranked]
+        if limit is None or limit > RANK_LIMIT:
+            results += [(self.paths[index], 0) for index in candidates[RANK_LIMIT:limit]]
+        return results
+
+    def _candidates(self, query: str) -> List[int]:
+        """Indexes of the paths containing every character of the query, in order."""
+        bits = self._all
+        for char in set(query) - {" "}:
+            bits &= self._char_bits.get(char, 0)
+            if not bits:
+                return []
+        # Bit i of the set is byte i of the reversed binary string; turned
+        # into 0/1 bytes, compress() picks the set indexes without a Python loop
+        flags = bin(bits)[:1:-1].encode().translate(_BINARY_DIGITS)
+        return list(compress(range(len(flags)), flags))
+
+    @staticmethod
+    def _build_char_bits(lowered: List[str]) -> Dict[str, int]:
+        size = (len(lowered) + 7) // 8
+        arrays: Dict[str, bytearray] = {}
+        for index, text in enumerate(lowered):
+            byte, bit = index >> 3, 1 << (index & 7)
+            for char in set(text):
+                array = arrays.get(char)
+                if array is None:
+                    array = arrays[char] = bytearray(size)
+                array[byte] |= bit
+        return {char: int.from_bytes(array, "little") for char, array in arrays.items()}
@@ -7,7 +7,8 @@ import subprocess
 import tempfile
 import os
 import shutil
-from typing import Tuple, Optional, Dict
+import threading
+from typing import Tuple, Optional, Dict, List
 
 # Import logging for error handling
 try:
@@ -564,11 +565,8 @@ Expire-Date: 0
             Tuple of (success, message)
         """
         try:
-            # Set up environment
-            env = GPGSetupHelper.setup_gpg_environment()
-
-            # Ensure GPG agent is properly configured and running
-            GPGSetupHelper.ensure_gui_pinentry()
+            # Session environment (also ensures the agent is configured)
+            env = get_gpg_session().environment()
             
             # Try a simple GPG operation that might require passphrase (if keys exist)
             result = subprocess.run(
@@ -610,6 +608,77 @@ Expire-Date: 0
         except Exception as e:
             return False, f"GPG agent warming failed: {e}"
 
+    @staticmethod
+    def probe_agent_cache(recipients: Optional[List[str]] = None,
+                          env: Optional[Dict[str, str]] = None,
+                          gpg_binary: str = "gpg") -> Optional[bool]:
+        """
+        Check whether gpg-agent can decrypt without prompting for a passphrase.
+
+        Looks at the agent's KEYINFO for the encryption-capable secret keys
+        (usually subkeys) of the given recipients, or of every secret key if
+        none are given. The agent caches each key separately, so a cached
+        signing key does not count. A key counts as unlocked if its
+        passphrase is cached or it is not protected at all.
+
+        Args:
+            recipients: Key IDs / user IDs from the store's .gpg-id
+            env: GPG environment to use (defaults to the session environment)
+            gpg_binary: The gpg executable the store decrypts with
+
+        Returns:
+            True if unlocked, False if a passphrase would be needed (or no
+            secret encryption key was found), None if gpg could not be queried
+        """
+        if env is None:
+            env = get_gpg_session().environment()
+
+        try:
+            result = subprocess.run(
+                [gpg_binary, '--batch', '--with-colons', '--with-keygrip',
+                 '--list-secret-keys', '--'] + list(recipients or []),
+                capture_output=True,
+                text=True,
+                timeout=10,
+                env=env
+            )
+            # A grp record holds the keygrip of the sec/ssb record before it;
+            # field 12 has that key's own capabilities in lower case
+            keygrips = set()
+            encrypts = False
+            for line in result.stdout.splitlines():
+                fields = line.split(':')
+                if fields[0] in ('sec', 'ssb'):
+                    encrypts = len(fields) > 11 and 'e' in fields[11]
+                elif fields[0] == 'grp' and encrypts and len(fields) > 9 and fields[9]:
+                    keygrips.add(fields[9])
+                    encrypts = False
+            if not keygrips:
+                return False
+
+            result = subprocess.run(
+                ['gpg-connect-agent', 'KEYINFO --list', '/bye'],
+                capture_output=True,
+                text=True,
+                timeout=10,
+                env=env
+            )
+            if result.returncode != 0:
+                return None
+
+            # S KEYINFO <keygrip> <type> <serialno> <idstr> <cached> <protection> ...
+            for line in result.stdout.splitlines():
+                fields = line.split()
+                if len(fields) < 8 or fields[:2] != ['S', 'KEYINFO']:
+                    continue
+                if fields[2] in keygrips and (fields[6] == '1' or fields[7] == 'C'):
+                    return True
+            return False
+
+        except (subprocess.TimeoutExpired, OSError) as e:
+            logger.debug("Could not query gpg-agent key cache", extra={'error': str(e)})
+            return None
+
     @staticmethod
     def test_gpg_operation() -> Tuple[bool, str]:
         """
@@ -655,3 +724,96 @@ Expire-Date: 0
             return False, "GPG operation timed out"
         except Exception as e:
             return False, f"GPG test failed: {e}"
+
+
+class GPGSession:
+    """
+    Session-scoped GPG environment shared by every pass/gpg/git subprocess.
+
+    GPGSetupHelper.setup_gpg_environment() forks `tty`, probes the pinentry
+    programs and chmods GNUPGHOME; doing that for every decrypt adds up
+    quickly. The session computes the environment once and only rebuilds it
+    when GNUPGHOME or the gpg-agent socket changes (e.g. the agent was
+    restarted, which recreates its socket).
+    """
+
+    def __init__(self):
+        self._env: Optional[Dict[str, str]] = None
+        self._gnupg_home: Optional[str] = None
+        self._agent_socket: Optional[str] = None
+        self._agent_socket_id: Optional[Tuple[int, int]] = None
+        self._lock = threading.Lock()
+
+    def environment(self) -> Dict[str, str]:
+        """
+        Get the GPG environment for a subprocess.
+
+        Returns:
+            A fresh copy of the session environment, safe for callers to modify
+        """
+        with self._lock:
+            if self._env is None or not self._is_current():
+                self._build()
+            return dict(self._env)
+
+    def invalidate(self):
+        """Force the environment to be rebuilt on next use."""
+        with self._lock:
+            self._env = None
+
+    def _is_current(self) -> bool:
+        if os.environ.get('GNUPGHOME', self._env.get('GNUPGHOME')) != self._gnupg_home:
+            return False
+        return self._socket_id(self._agent_socket) == self._agent_socket_id
+
+    def _build(self):
+        # Ensure GUI pinentry is configured for Flatpak (once per process)
+        GPGSetupHelper.ensure_gui_pinentry()
+
+        env = GPGSetupHelper.setup_gpg_environment()
+        self._gnupg_home = env.get('GNUPGHOME')
+        self._agent_socket = self._find_agent_socket(env)
+        self._agent_socket_id = self._socket_id(self._agent_socket)
+        self._env = env
+        logger.debug("GPG session environment built", extra={
+            'gnupg_home': self._gnupg_home,
+            'agent_socket': self._agent_socket
+        })
+
+    @staticmethod
+    def _find_agent_socket(env: Dict[str, str]) -> str:
+        try:
+            result = subprocess.run(
+                ['gpgconf', '--list-dirs', 'agent-socket'],
+                capture_output=True,
+                text=True,
+                timeout=5,
+                env=env
+            )
+            if result.returncode == 0 and result.stdout.strip():
+                return result.stdout.strip()
+        except (subprocess.TimeoutExpired, OSError):
+            pass
+        return os.path.join(env.get('GNUPGHOME', os.path.expanduser('~/.gnupg')), 'S.gpg-agent')
+
+    @staticmethod
+    def _socket_id(path: Optional[str]) -> Optional[Tuple[int, int]]:
+        if not path:
+            return None
+        try:
+            stat_result = os.stat(path)
+        except OSError:
+            return None
+        return stat_result.st_dev, stat_result.st_ino
+
+
+# Global GPG session instance
+_gpg_session = None
+
+def get_gpg_session() -> GPGSession:
+    """Get the global GPG session instance."""
+    global _gpg_session
+    if _gpg_session is None:
+        _gpg_session = GPGSession()
+    return _gpg_session
+
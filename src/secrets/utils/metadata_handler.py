@@ -248,6 +248,33 @@ class MetadataHandler:
         
         return matching_paths
     
+    def get_all_entry_tags(self) -> Dict[str, List[str]]:
+        """
+        Get the tags of every entry that has any, in one pass over the metadata files.
+        
+        Returns:
+            Dictionary mapping entry paths to their tags
+        """
+        entry_tags = {}
+        
+        for metadata_file in self.metadata_dir.glob("**/*.json"):
+            if metadata_file.name.startswith("_"):
+                continue  # Skip folder metadata
+            
+            try:
+                with open(metadata_file, 'r', encoding='utf-8') as f:
+                    data = json.load(f)
+            except (json.JSONDecodeError, OSError):
+                continue
+            
+            tags = data.get("tags", [])
+            if tags:
+                # Convert metadata file path back to entry path
+                relative_path = metadata_file.relative_to(self.metadata_dir)
+                entry_tags[str(relative_path)[:-len(".json")]] = list(tags)
+        
+        return entry_tags
+    
     def get_all_tags(self) -> List[str]:
         """
         Get all tags used in the password store.
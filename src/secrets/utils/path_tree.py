@@ -0,0 +1,59 @@
+"""
+A folder tree answered from the sorted list of entry paths.
+
+PathTree keeps nothing but the sorted paths. The direct children of a folder
+are found with binary searches: every entry of a folder "a/b" sorts between
+"a/b/" and "a/b0" ("0" follows "/"), and a subfolder found there is skipped
+the same way, so listing a folder costs a few lookups per child however many
+entries its subfolders hold. Nothing is built per folder up front.
+"""
+
+import bisect
+from typing import Iterable, List, Tuple
+
+SEPARATOR = "/"
+# Character sorting right after the separator
+_AFTER_SEPARATOR = chr(ord(SEPARATOR) + 1)
+
+
+class PathTree:
+    """Folders and entries of a store, from its entry paths."""
+
+    def __init__(self, paths: Iterable[str] = ()):
+        self._paths = sorted(paths)
+
+    def __len__(self) -> int:
+        return len(self._paths)
+
+    @property
+    def paths(self) -> List[str]:
+        """All entry paths, sorted."""
+        return self._paths
+
+    def children(self, folder: str = "") -> List[Tuple[str, bool]]:
+        """
+        The direct children of a folder, in path order.
+
+        Args:
+            folder: Folder path, "" for the root
+
+        Returns:
+            List of (path, is_folder)
+        """
+        paths = self._paths
+        prefix = folder + SEPARATOR if folder else ""
+        index = bisect.bisect_left(paths, prefix) if prefix else 0
+        end = bisect.bisect_left(paths, folder + _AFTER_SEPARATOR) if prefix else len(paths)
+
+        children = []
+        while index < end:
+            path = paths[index]
+            separator = path.find(SEPARATOR, len(prefix))
+            if separator < 0:
+                children.append((path, False))
+                index += 1
+            else:
+                subfolder = path[:separator]
+                children.append((subfolder, True))
+                index = bisect.bisect_left(paths, subfolder + _AFTER_SEPARATOR, index, end)
+        return children
@@ -0,0 +1,198 @@
+"""
+Concurrent cache for decrypted password contents.
+
+Keys are hashed onto a fixed number of stripes, each an OrderedDict guarded by
+its own lock, so get/put are O(1) and threads decrypting different entries
+rarely contend. Every stripe evicts least-recently-used entries once its share
+of the plaintext byte budget is exceeded, and entries older than the TTL are
+treated as misses.
+
+Plaintext is held in bytearrays that are overwritten with zeros when an entry
+is evicted, expires, is invalidated or the cache is cleared. Strings handed
+out by get() are copies and cannot be wiped; the cache only guarantees its
+own copy does not linger.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Hashable, Optional
+
+
+class _CacheEntry:
+    """Cached plaintext with its validity stamp and creation time."""
+
+    __slots__ = ("data", "stamp", "created")
+
+    def __init__(self, data: bytearray, stamp: Optional[Hashable], created: float):
+        self.data = data
+        self.stamp = stamp
+        self.created = created
+
+    def wipe(self):
+        """Overwrite the plaintext in place."""
+        self.data[:] = bytes(len(self.data))
+
+
+class _Stripe:
+    """One independently locked LRU segment of the cache."""
+
+    __slots__ = ("lock", "entries", "size", "hits", "misses", "evictions", "expirations")
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.entries: "OrderedDict[Hashable, _CacheEntry]" = OrderedDict()
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def discard(self, key: Hashable) -> bool:
+        """Remove and wipe an entry; caller holds the lock."""
+        entry = self.entries.pop(key, None)
+        if entry is None:
+            return False
+        self.size -= len(entry.data)
+        entry.wipe()
+        return True
+
+
+class PlaintextCache:
+    """LRU + TTL cache of plaintext strings with a byte budget and striped locks."""
+
+    def __init__(self, max_bytes: int = 16 * 1024 * 1024, ttl_seconds: float = 3600,
+                 stripes: int = 16):
+        """
+        Args:
+            max_bytes: Budget for cached plaintext (UTF-8 bytes), split evenly
+                across the stripes
+            ttl_seconds: Age after which an entry is no longer returned; may be
+                changed at any time
+            stripes: Number of independently locked segments
+        """
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds
+        self._stripes = [_Stripe() for _ in range(max(1, stripes))]
+        self._stripe_budget = max(1, max_bytes // len(self._stripes))
+
+    def _stripe(self, key: Hashable) -> _Stripe:
+        return self._stripes[hash(key) % len(self._stripes)]
+
+    def get(self, key: Hashable, stamp: Optional[Hashable] = None) -> Optional[str]:
+        """
+        Get a cached value.
+
+        Args:
+            key: Cache key (the password path)
+            stamp: If given, the entry is only valid if it was stored with the
+                same stamp (e.g. the file's mtime); otherwise it is dropped
+
+        Returns:
+            The cached plaintext, or None on a miss
+        """
+        stripe = self._stripe(key)
+        with stripe.lock:
+            entry = stripe.entries.get(key)
+            if entry is None:
+                stripe.misses += 1
+                return None
+            if time.monotonic() - entry.created > self.ttl_seconds:
+                stripe.discard(key)
+                stripe.expirations += 1
+                stripe.misses += 1
+                return None
+            if stamp is not None and entry.stamp != stamp:
+                stripe.discard(key)
+                stripe.misses += 1
+                return None
+            stripe.entries.move_to_end(key)
+            stripe.hits += 1
+            return entry.data.decode("utf-8")
+
+    def put(self, key: Hashable, value: str, stamp: Optional[Hashable] = None):
+        """
+        Store a value, evicting least-recently-used entries of its stripe if
+        the stripe's byte budget is exceeded.
+
+        Values larger than a stripe's budget are not cached.
+        """
+        data = bytearray(value.encode("utf-8"))
+        stripe = self._stripe(key)
+        with stripe.lock:
+            stripe.discard(key)
+            if len(data) > self._stripe_budget:
+                data[:] = bytes(len(data))
+                return
+            stripe.entries[key] = _CacheEntry(data, stamp, time.monotonic())
+            stripe.size += len(data)
+            while stripe.size > self._stripe_budget:
+                oldest = next(iter(stripe.entries))
+                stripe.discard(oldest)
+                stripe.evictions += 1
+
+    def invalidate(self, key: Hashable) -> bool:
+        """
+        Drop and wipe one entry.
+
+        Returns:
+            True if the entry was cached
+        """
+        stripe = self._stripe(key)
+        with stripe.lock:
+            return stripe.discard(key)
+
+    def clear(self):
+        """Drop and wipe every entry."""
+        for stripe in self._stripes:
+            with stripe.lock:
+                for entry in stripe.entries.values():
+                    entry.wipe()
+                stripe.entries.clear()
+                stripe.size = 0
+
+    def purge_expired(self) -> int:
+        """
+        Drop entries older than the TTL.
+
+        Returns:
+            Number of entries removed
+        """
+        removed = 0
+        now = time.monotonic()
+        for stripe in self._stripes:
+            with stripe.lock:
+                expired = [key for key, entry in stripe.entries.items()
+                           if now - entry.created > self.ttl_seconds]
+                for key in expired:
+                    stripe.discard(key)
+                stripe.expirations += len(expired)
+                removed += len(expired)
+        return removed
+
+    def __contains__(self, key: Hashable) -> bool:
+        stripe = self._stripe(key)
+        with stripe.lock:
+            return key in stripe.entries
+
+    def __len__(self) -> int:
+        return sum(len(stripe.entries) for stripe in self._stripes)
+
+    @property
+    def size_bytes(self) -> int:
+        """Plaintext bytes currently cached."""
+        return sum(stripe.size for stripe in self._stripes)
+
+    def stats(self) -> Dict[str, int]:
+        """Hit/miss/eviction counters and current occupancy."""
+        totals = {'hits': 0, 'misses': 0, 'evictions': 0, 'expirations': 0,
+                  'entries': 0, 'bytes': 0}
+        for stripe in self._stripes:
+            with stripe.lock:
+                totals['hits'] += stripe.hits
+                totals['misses'] += stripe.misses
+                totals['evictions'] += stripe.evictions
+                totals['expirations'] += stripe.expirations
+                totals['entries'] += len(stripe.entries)
+                totals['bytes'] += stripe.size
+        return totals
@@ -0,0 +1,67 @@
+"""
+Search filter for the Secrets password lists.
+
+Search results are computed by matching the query against the path indexes
+(see fuzzy_index and field_query); PathSearchFilter only applies the
+resulting set of paths to a Gtk.FilterListModel.
+"""
+
+import gi
+gi.require_version("Gtk", "4.0")
+from gi.repository import Gtk
+
+
+class PathSearchFilter(Gtk.Filter):
+    """
+    Filter for search results: matches items whose path is in the match set
+    of the current query.
+
+    Changes are announced with hints, so a Gtk.FilterListModel only re-checks
+    the items that still match when the query gets longer, and only the
+    hidden ones when it gets shorter.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self._query = ""
+        self._matches = None  # None matches everything
+
+    @property
+    def query(self) -> str:
+        return self._query
+
+    def set_query(self, query: str, matches, items_changed: bool = False):
+        """
+        Args:
+            query: The search query (lowercased)
+            matches: Paths matching it, or None to match everything
+            items_changed: The filtered items were replaced since the last query
+        """
+        previous = self._query
+        self._query = query
+        self._matches = None if matches is None else set(matches)
+        # Fuzzy matching only narrows as characters are added
+        if items_changed:
+            change = Gtk.FilterChange.DIFFERENT
+        elif query.startswith(previous):
+            change = Gtk.FilterChange.MORE_STRICT
+        elif previous.startswith(query):
+            change = Gtk.FilterChange.LESS_STRICT
+        else:
+            change = Gtk.FilterChange.DIFFERENT
+        self.changed(change)
+
+    def do_match(self, item) -> bool:
+        if self._matches is None:
+            return True
+        # Flat lists of passwords hold plain path strings
+        if isinstance(item, Gtk.StringObject):
+            return item.get_string() in self._matches
+        return item.full_path in self._matches
+
+    def do_get_strictness(self):
+        if self._matches is None:
+            return Gtk.FilterMatch.ALL
+        if not self._matches:
+            return Gtk.FilterMatch.NONE
+        return Gtk.FilterMatch.SOME
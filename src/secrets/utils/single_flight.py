@@ -0,0 +1,120 @@
+"""
+Request coalescing for expensive, idempotent operations.
+
+SingleFlight lets concurrent callers asking for the same key share one
+execution: the first caller runs the function and everyone who arrives while
+it is still running waits for and receives the same result. FailureCache
+remembers recent failures for a short time so that a failing operation (e.g.
+a decrypt the user just cancelled at the pinentry prompt) is not retried in a
+tight loop by independent callers.
+"""
+
+import threading
+import time
+from concurrent.futures import Future
+from typing import Callable, Dict, Hashable, Optional, Tuple, TypeVar
+
+T = TypeVar("T")
+
+
+class SingleFlight:
+    """Table of in-flight calls keyed by request."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls: Dict[Hashable, Future] = {}
+        self.executions = 0
+        self.shared = 0
+
+    def do(self, key: Hashable, fn: Callable[[], T]) -> T:
+        """
+        Run fn for key unless a call for key is already in flight, in which
+        case wait for that call and return its result (or raise its exception).
+        """
+        with self._lock:
+            future = self._calls.get(key)
+            leader = future is None
+            if leader:
+                future = Future()
+                self._calls[key] = future
+                self.executions += 1
+            else:
+                self.shared += 1
+
+        if not leader:
+            return future.result()
+
+        try:
+            result = fn()
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            with self._lock:
+                self._calls.pop(key, None)
+
+    def in_flight(self, key: Hashable) -> bool:
+        """Check whether a call for key is currently running."""
+        with self._lock:
+            return key in self._calls
+
+
+class FailureCache:
+    """Short-lived memory of failed results, optionally tied to a stamp."""
+
+    def __init__(self, ttl_seconds: float = 15):
+        """
+        Args:
+            ttl_seconds: How long a failure is remembered
+        """
+        self.ttl_seconds = ttl_seconds
+        self._lock = threading.Lock()
+        self._failures: Dict[Hashable, Tuple[float, Optional[Hashable], object]] = {}
+
+    def get(self, key: Hashable, stamp: Optional[Hashable] = None):
+        """
+        Get a remembered failure.
+
+        Args:
+            key: Request key
+            stamp: If given, the failure only applies if it was recorded with
+                the same stamp (e.g. the file's mtime)
+
+        Returns:
+            The recorded failure, or None
+        """
+        with self._lock:
+            record = self._failures.get(key)
+            if record is None:
+                return None
+            expires, recorded_stamp, failure = record
+            if time.monotonic() >= expires or (stamp is not None and recorded_stamp != stamp):
+                del self._failures[key]
+                return None
+            return failure
+
+    def put(self, key: Hashable, failure, stamp: Optional[Hashable] = None):
+        """Remember a failure for ttl_seconds."""
+        if self.ttl_seconds <= 0:
+            return
+        now = time.monotonic()
+        with self._lock:
+            if len(self._failures) >= 256:
+                self._failures = {k: r for k, r in self._failures.items() if r[0] > now}
+            self._failures[key] = (now + self.ttl_seconds, stamp, failure)
+
+    def invalidate(self, key: Hashable):
+        """Forget the failure for one key."""
+        with self._lock:
+            self._failures.pop(key, None)
+
+    def clear(self):
+        """Forget all failures."""
+        with self._lock:
+            self._failures.clear()
+
+    def __len__(self) -> int:
+        return len(self._failures)
@@ -0,0 +1,400 @@
+"""
+In-memory index of the password store's entries and folders.
+
+The index is built with a single os.scandir pass over the store and then kept
+current incrementally: PasswordStore applies its own changes directly, and
+when Gio is available every indexed folder is watched with a Gio.FileMonitor
+so that edits made outside the application (`pass` in a terminal, git pulls)
+are picked up as well. Listing, existence and folder-membership queries are
+answered from memory without touching the disk.
+"""
+
+import os
+import threading
+from typing import Dict, List, Optional, Set
+
+# Gio is optional; without it the index is only updated by PasswordStore itself
+_gio_available = False
+try:
+    import gi
+    gi.require_version("Gio", "2.0")
+    from gi.repository import Gio
+    _gio_available = True
+except (ImportError, ValueError):
+    pass
+
+# Import logging for error handling
+try:
+    from ..logging_system import get_logger, LogCategory
+    logger = get_logger(LogCategory.PASSWORD_STORE, "StoreIndex")
+except ImportError:
+    import logging
+    logger = logging.getLogger(__name__)
+
+
+ENTRY_SUFFIX = ".gpg"
+IGNORED_DIRS = {".git"}
+
+
+class _Folder:
+    """Direct children of one folder: entry names and subfolder names."""
+
+    __slots__ = ("entries", "folders")
+
+    def __init__(self):
+        self.entries: Set[str] = set()
+        self.folders: Set[str] = set()
+
+
+def _join(folder: str, name: str) -> str:
+    return f"{folder}/{name}" if folder else name
+
+
+class StoreIndex:
+    """
+    Index of entry paths (relative, without .gpg) and folder paths.
+
+    The root folder is "". All methods are thread-safe.
+    """
+
+    def __init__(self, store_dir: str):
+        """
+        Args:
+            store_dir: Root directory of the password store
+        """
+        self.store_dir = store_dir
+        self._folders: Dict[str, _Folder] = {}
+        self._entries: Set[str] = set()
+        self._built = False
+        self._sorted_entries: Optional[List[str]] = None
+        self._sorted_folders: Optional[List[str]] = None
+        self._monitors: Dict[str, "Gio.FileMonitor"] = {}
+        self._monitoring = False
+        self._lock = threading.RLock()
+
+    # Building
+
+    def ensure_built(self):
+        """Build the index on first use."""
+        with self._lock:
+            if not self._built:
+                self.rebuild()
+
+    def rebuild(self):
+        """Rescan the whole store."""
+        with self._lock:
+            self._folders = {}
+            self._entries = set()
+            self._changed()
+            if self.store_dir and os.path.isdir(self.store_dir):
+                self._folders[""] = _Folder()
+                self._scan("")
+            self._built = True
+            if self._monitoring:
+                for folder in [f for f in self._monitors if f not in self._folders]:
+                    self._unwatch(folder)
+                for folder in self._folders:
+                    self._watch(folder)
+            logger.debug("Store index built", extra={
+                'entries': len(self._entries),
+                'folders': len(self._folders)
+            })
+
+    def invalidate(self):
+        """Mark the index stale; it is rebuilt on next use."""
+        with self._lock:
+            self._built = False
+
+    def start_monitoring(self) -> bool:
+        """
+        Watch every indexed folder for changes.
+
+        Returns:
+            True if file monitoring is active
+        """
+        if not _gio_available:
+            return False
+        with self._lock:
+            self.ensure_built()
+            if not self._monitoring:
+                self._monitoring = True
+                for folder in list(self._folders):
+                    self._watch(folder)
+            return True
+
+    def stop_monitoring(self):
+        """Stop watching the store."""
+        with self._lock:
+            self._monitoring = False
+            for monitor in self._monitors.values():
+                monitor.cancel()
+            self._monitors.clear()
+
+    @property
+    def is_monitoring(self) -> bool:
+        """Whether external changes are picked up automatically."""
+        return self._monitoring
+
+    # Queries
+
+    def list_entries(self) -> List[str]:
+        """All entry paths, sorted."""
+        with self._lock:
+            self.ensure_built()
+            if self._sorted_entries is None:
+                self._sorted_entries = sorted(self._entries)
+            return list(self._sorted_entries)
+
+    def list_folders(self) -> List[str]:
+        """All folder paths (excluding the root), sorted."""
+        with self._lock:
+            self.ensure_built()
+            if self._sorted_folders is None:
+                self._sorted_folders = sorted(f for f in self._folders if f)
+            return list(self._sorted_folders)
+
+    def has_entry(self, path: str) -> bool:
+        """Check whether an entry exists."""
+        with self._lock:
+            self.ensure_built()
+            return path in self._entries
+
+    def has_folder(self, folder: str) -> bool:
+        """Check whether a folder exists."""
+        with self._lock:
+            self.ensure_built()
+            return folder.strip("/") in self._folders
+
+    def entries_in(self, folder: str, recursive: bool = False) -> List[str]:
+        """
+        Entry paths inside a folder.
+
+        Args:
+            folder: Folder path ("" for the root)
+            recursive: Include entries of subfolders
+
+        Returns:
+            Sorted list of entry paths
+        """
+        with self._lock:
+            self.ensure_built()
+            folder = folder.strip("/")
+            result = []
+            for current in self._walk(folder) if recursive else [folder]:
+                node = self._folders.get(current)
+                if node:
+                    result.extend(_join(current, name) for name in node.entries)
+            return sorted(result)
+
+    def folders_in(self, folder: str, recursive: bool = False) -> List[str]:
+        """Subfolder paths of a folder, sorted."""
+        with self._lock:
+            self.ensure_built()
+            folder = folder.strip("/")
+            if recursive:
+                return sorted(f for f in self._walk(folder) if f != folder)
+            node = self._folders.get(folder)
+            return sorted(_join(folder, name) for name in node.folders) if node else []
+
+    def has_entries_under(self, folder: str) -> bool:
+        """Check whether a folder or any of its subfolders contains entries."""
+        with self._lock:
+            self.ensure_built()
+            return any(self._folders[f].entries for f in self._walk(folder.strip("/")))
+
+    # Updates
+
+    def add_entry(self, path: str):
+        """Record an entry (and its parent folders)."""
+        with self._lock:
+            if not self._built:
+                return
+            folder, name = os.path.split(path)
+            self._add_folder_chain(folder).entries.add(name)
+            if path not in self._entries:
+                self._entries.add(path)
+                self._changed()
+
+    def remove_entry(self, path: str):
+        """Forget an entry."""
+        with self._lock:
+            if path not in self._entries:
+                return
+            folder, name = os.path.split(path)
+            self._entries.discard(path)
+            node = self._folders.get(folder)
+            if node:
+                node.entries.discard(name)
+            self._changed()
+
+    def add_folder(self, folder: str):
+        """Record a folder and scan whatever it already contains."""
+        with self._lock:
+            if not self._built:
+                return
+            folder = folder.strip("/")
+            known = folder in self._folders
+            self._add_folder_chain(folder)
+            if not known:
+                self._scan(folder)
+
+    def remove_folder(self, folder: str):
+        """Forget a folder and everything below it."""
+        with self._lock:
+            folder = folder.strip("/")
+            if not folder or folder not in self._folders:
+                return
+            for current in self._walk(folder):
+                node = self._folders.pop(current)
+                for name in node.entries:
+                    self._entries.discard(_join(current, name))
+                self._unwatch(current)
+            parent, name = os.path.split(folder)
+            if parent in self._folders:
+                self._folders[parent].folders.discard(name)
+            self._changed()
+
+    def sync_folder(self, folder: str):
+        """
+        Bring a folder up to date with the disk.
+
+        Rescans the folder's subtree if it exists. If it no longer exists
+        (e.g. `pass mv`/`pass rm` pruned it), it is removed together with any
+        parents that were pruned too.
+        """
+        with self._lock:
+            if not self._built:
+                return
+            folder = folder.strip("/")
+            while folder and not os.path.isdir(os.path.join(self.store_dir, folder)):
+                self.remove_folder(folder)
+                folder = os.path.dirname(folder)
+            if not folder:
+                self.rebuild()
+                return
+            self.remove_folder(folder)
+            self._add_folder_chain(folder)
+            self._scan(folder)
+
+    # Internals
+
+    def _changed(self):
+        self._sorted_entries = None
+        self._sorted_folders = None
+
+    def _walk(self, folder: str) -> List[str]:
+        """The folder and all folders below it."""
+        if folder not in self._folders:
+            return []
+        result = []
+        stack = [folder]
+        while stack:
+            current = stack.pop()
+            result.append(current)
+            stack.extend(_join(current, name) for name in self._folders[current].folders)
+        return result
+
+    def _add_folder_chain(self, folder: str) -> _Folder:
+        """Make sure a folder and all its parents are indexed."""
+        node = self._folders.get(folder)
+        if node is not None:
+            return node
+        node = _Folder()
+        self._folders[folder] = node
+        self._changed()
+        if folder:
+            parent, name = os.path.split(folder)
+            self._add_folder_chain(parent).folders.add(name)
+        if self._monitoring:
+            self._watch(folder)
+        return node
+
+    def _scan(self, folder: str):
+        """Index the subtree below an already indexed folder with os.scandir."""
+        stack = [folder]
+        while stack:
+            current = stack.pop()
+            node = self._folders[current]
+            try:
+                with os.scandir(os.path.join(self.store_dir, current)) as it:
+                    for dir_entry in it:
+                        name = dir_entry.name
+                        try:
+                            is_dir = dir_entry.is_dir()
+                        except OSError:
+                            is_dir = False
+                        if is_dir:
+                            if name in IGNORED_DIRS:
+                                continue
+                            child = _join(current, name)
+                            node.folders.add(name)
+                            if child not in self._folders:
+                                self._folders[child] = _Folder()
+                                if self._monitoring:
+                                    self._watch(child)
+                            # Like os.walk, list symlinked folders but do not descend
+                            if not dir_entry.is_symlink():
+                                stack.append(child)
+                        elif name.endswith(ENTRY_SUFFIX):
+                            entry_name = name[:-len(ENTRY_SUFFIX)]
+                            node.entries.add(entry_name)
+                            self._entries.add(_join(current, entry_name))
+            except OSError as e:
+                logger.warning("Could not scan folder", extra={'folder': current, 'error': str(e)})
+        self._changed()
+
+    def _watch(self, folder: str):
+        if folder in self._monitors:
+            return
+        try:
+            directory = Gio.File.new_for_path(os.path.join(self.store_dir, folder))
+            monitor = directory.monitor_directory(Gio.FileMonitorFlags.WATCH_MOVES, None)
+        except Exception as e:
+            logger.debug("Could not monitor folder", extra={'folder': folder, 'error': str(e)})
+            return
+        monitor.connect("changed", self._on_monitor_changed)
+        self._monitors[folder] = monitor
+
+    def _unwatch(self, folder: str):
+        monitor = self._monitors.pop(folder, None)
+        if monitor is not None:
+            monitor.cancel()
+
+    def _relative(self, gio_file) -> Optional[str]:
+        if gio_file is None or gio_file.get_path() is None:
+            return None
+        relative = os.path.relpath(gio_file.get_path(), self.store_dir)
+        if relative.startswith("..") or relative == ".":
+            return None
+        if any(part in IGNORED_DIRS for part in relative.split(os.sep)):
+            return None
+        return relative.replace(os.sep, "/")
+
+    def _on_monitor_changed(self, monitor, gio_file, other_file, event_type):
+        """Apply a Gio.FileMonitor event to the index."""
+        event = Gio.FileMonitorEvent
+        if event_type in (event.CREATED, event.MOVED_IN):
+            self._on_path_added(self._relative(gio_file))
+        elif event_type in (event.DELETED, event.MOVED_OUT):
+            self._on_path_removed(self._relative(gio_file))
+        elif event_type == event.RENAMED:
+            self._on_path_removed(self._relative(gio_file))
+            self._on_path_added(self._relative(other_file))
+
+    def _on_path_added(self, relative: Optional[str]):
+        if not relative:
+            return
+        full_path = os.path.join(self.store_dir, relative)
+        if os.path.isdir(full_path):
+            self.add_folder(relative)
+        elif relative.endswith(ENTRY_SUFFIX):
+            self.add_entry(relative[:-len(ENTRY_SUFFIX)])
+
+    def _on_path_removed(self, relative: Optional[str]):
+        if not relative:
+            return
+        with self._lock:
+            if relative in self._folders:
+                self.remove_folder(relative)
+            elif relative.endswith(ENTRY_SUFFIX):
+                self.remove_entry(relative[:-len(ENTRY_SUFFIX)])
@@ -0,0 +1,298 @@
+"""
+Transactional bulk writes to the password store.
+
+`pass insert` encrypts, stages and commits one entry per process chain, so
+importing thousands of entries produces thousands of git commits. A
+StoreTransaction collects entries first and then, on commit:
+
+1. encrypts them in parallel straight to the recipients of each entry's
+   folder (the same gpg options `pass insert` uses) into staging files next
+   to their destinations,
+2. moves every staged file into place with an atomic rename, keeping the
+   previous version of overwritten entries as a backup,
+3. stages all files and creates a single git commit (if the store is a git
+   repository).
+
+If any step fails, the entries already written are restored from their
+backups (or removed), the git index is put back and the store is left as it
+was before the transaction.
+"""
+
+import os
+import shutil
+import subprocess
+import uuid
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+# Import logging for error handling
+try:
+    from ..logging_system import get_logger, LogCategory
+    logger = get_logger(LogCategory.PASSWORD_STORE, "StoreTransaction")
+except ImportError:
+    import logging
+    logger = logging.getLogger(__name__)
+
+
+ProgressCallback = Callable[[int, int], None]
+
+# Paths per git command line when staging many files
+GIT_PATHS_PER_CALL = 500
+# Paths listed in the commit message body before summarizing the rest
+COMMIT_MESSAGE_PATHS = 50
+
+
+class StoreTransaction:
+    """A batch of entries written to the store with a single git commit."""
+
+    def __init__(self, store_dir: str, backend, max_workers: Optional[int] = None,
+                 on_commit: Optional[Callable[[Dict[str, str]], None]] = None):
+        """
+        Args:
+            store_dir: Password store directory
+            backend: Decryption backend; provides encrypt_file and the GPG environment
+            max_workers: Concurrent gpg processes (default: CPUs, at most 8)
+            on_commit: Called with the written entries (path -> content) after
+                a successful commit
+        """
+        self.store_dir = store_dir
+        self.backend = backend
+        self.max_workers = max_workers or min(8, os.cpu_count() or 1)
+        self.on_commit = on_commit
+        self._entries: Dict[str, str] = {}
+        self._id = uuid.uuid4().hex[:8]
+        self.inserted: List[str] = []
+        self.skipped: List[str] = []
+        self.committed = False
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def insert(self, path: str, content: str, force: bool = True) -> Tuple[bool, str]:
+        """
+        Add an entry to the transaction. Nothing is written until commit().
+
+        Args:
+            path: Entry path relative to the store, without .gpg
+            content: Full content of the entry
+            force: Overwrite an existing entry; otherwise it is skipped
+
+        Returns:
+            Tuple of (accepted, message)
+        """
+        if self.committed:
+            return False, "Transaction has already been committed."
+        if not path:
+            return False, "Password path cannot be empty."
+        if ".." in path or path.startswith("/"):
+            return False, "Invalid password path."
+        if not force and (os.path.exists(self._entry_file(path)) or path in self._entries):
+            self.skipped.append(path)
+            return False, f"Password '{path}' already exists."
+        self._entries[path] = content
+        return True, ""
+
+    def commit(self, message: Optional[str] = None,
+               progress_callback: Optional[ProgressCallback] = None) -> Tuple[bool, str]:
+        """
+        Encrypt, write and commit every entry of the transaction, or none.
+
+        Args:
+            message: Git commit message (default: a summary of the entries)
+            progress_callback: Called as (encrypted, total) while encrypting
+
+        Returns:
+            Tuple of (success, message)
+        """
+        if self.committed:
+            return False, "Transaction has already been committed."
+        paths = sorted(self._entries)
+        if not paths:
+            self.committed = True
+            return True, "No passwords to save."
+
+        created_dirs = self._create_folders(paths)
+        staged: Dict[str, str] = {}
+        applied: List[Tuple[str, Optional[str]]] = []
+        index_backup = None
+        try:
+            success, error = self._encrypt_all(paths, staged, progress_callback)
+            if not success:
+                return False, error
+
+            success, error = self._apply(paths, staged, applied)
+            if not success:
+                return False, error
+
+            if self._is_git_store():
+                index_backup = self._backup_git_index()
+                success, error = self._git_commit(paths, message or self._summary(paths))
+                if not success:
+                    self._restore_git_index(index_backup)
+                    return False, error
+
+            self._remove_backups(applied)
+            applied = []
+            self.committed = True
+            self.inserted = paths
+            if self.on_commit:
+                self.on_commit({path: self._entries[path] for path in paths})
+            logger.info(f"Committed {len(paths)} passwords in one transaction")
+            return True, f"Successfully saved {len(paths)} passwords."
+        except Exception as e:
+            if index_backup:
+                self._restore_git_index(index_backup)
+            return False, f"An unexpected error occurred while saving: {e}"
+        finally:
+            if not self.committed:
+                self._rollback(applied, staged, created_dirs)
+            if index_backup and index_backup[1] and os.path.exists(index_backup[1]):
+                os.remove(index_backup[1])
+
+    def _entry_file(self, path: str) -> str:
+        return os.path.join(self.store_dir, path + ".gpg")
+
+    def _create_folders(self, paths: Iterable[str]) -> List[str]:
+        """Create missing parent folders; returns them so a rollback can remove them."""
+        created = []
+        for path in paths:
+            folder = os.path.dirname(self._entry_file(path))
+            missing = []
+            while not os.path.isdir(folder):
+                missing.append(folder)
+                folder = os.path.dirname(folder)
+            for folder in reversed(missing):
+                os.mkdir(folder)
+                created.append(folder)
+        return created
+
+    def _encrypt_all(self, paths: List[str], staged: Dict[str, str],
+                     progress_callback: Optional[ProgressCallback]) -> Tuple[bool, str]:
+        """Encrypt every entry into a staging file next to its destination."""
+        total = len(paths)
+        done = 0
+        errors = []
+        with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            futures = {}
+            for path in paths:
+                staging_file = f"{self._entry_file(path)}.{self._id}.staged"
+                futures[pool.submit(self.backend.encrypt_file, self._entries[path],
+                                    staging_file, os.path.dirname(path))] = (path, staging_file)
+            for future in as_completed(futures):
+                path, staging_file = futures[future]
+                try:
+                    success, error = future.result()
+                except Exception as e:
+                    success, error = False, str(e)
+                if success:
+                    staged[path] = staging_file
+                else:
+                    errors.append(f"{path}: {error}")
+                    # Nothing will be written, so stop encrypting the rest
+                    for pending in futures:
+                        pending.cancel()
+                done += 1
+                if progress_callback:
+                    progress_callback(done, total)
+
+        if errors:
+            return False, f"Error encrypting passwords: {errors[0]}"
+        return True, ""
+
+    def _apply(self, paths: List[str], staged: Dict[str, str],
+               applied: List[Tuple[str, Optional[str]]]) -> Tuple[bool, str]:
+        """Move staged files into place, keeping overwritten entries as backups."""
+        try:
+            for path in paths:
+                entry_file = self._entry_file(path)
+                backup = None
+                if os.path.exists(entry_file):
+                    backup = f"{entry_file}.{self._id}.bak"
+                    os.replace(entry_file, backup)
+                # Recorded before the rename so a failure restores the backup
+                applied.append((path, backup))
+                os.replace(staged.pop(path), entry_file)
+        except OSError as e:
+            return False, f"Error writing password files: {e}"
+        return True, ""
+
+    def _rollback(self, applied: List[Tuple[str, Optional[str]]], staged: Dict[str, str],
+                  created_dirs: List[str]):
+        """Put the store back the way it was before the transaction."""
+        for path, backup in reversed(applied):
+            entry_file = self._entry_file(path)
+            try:
+                if backup:
+                    os.replace(backup, entry_file)
+                elif os.path.exists(entry_file):
+                    os.remove(entry_file)
+            except OSError as e:
+                logger.error(f"Failed to roll back {path}: {e}")
+        for staging_file in staged.values():
+            if os.path.exists(staging_file):
+                os.remove(staging_file)
+        for folder in reversed(created_dirs):
+            try:
+                os.rmdir(folder)
+            except OSError:
+                pass
+
+    @staticmethod
+    def _remove_backups(applied: List[Tuple[str, Optional[str]]]):
+        for _, backup in applied:
+            if backup and os.path.exists(backup):
+                os.remove(backup)
+
+    def _summary(self, paths: List[str]) -> str:
+        """Commit message in the style of `pass insert`, listing the entries."""
+        if len(paths) == 1:
+            return f"Add given password for {paths[0]} to store."
+        lines = [f"Add {len(paths)} passwords to store.", ""]
+        lines += [f"- {path}" for path in paths[:COMMIT_MESSAGE_PATHS]]
+        if len(paths) > COMMIT_MESSAGE_PATHS:
+            lines.append(f"- ... and {len(paths) - COMMIT_MESSAGE_PATHS} more")
+        return "\n".join(lines)
+
+    def _is_git_store(self) -> bool:
+        return os.path.isdir(os.path.join(self.store_dir, ".git"))
+
+    def _run_git(self, args: List[str]) -> subprocess.CompletedProcess:
+        return subprocess.run(["git", "-C", self.store_dir] + args, capture_output=True,
+                              text=True, check=False, env=self.backend.env_factory())
+
+    def _git_commit(self, paths: List[str], message: str) -> Tuple[bool, str]:
+        """Stage the written files and create one commit."""
+        files = [path + ".gpg" for path in paths]
+        for start in range(0, len(files), GIT_PATHS_PER_CALL):
+            process = self._run_git(["add", "--"] + files[start:start + GIT_PATHS_PER_CALL])
+            if process.returncode != 0:
+                return False, f"Error staging passwords: {process.stderr.strip()}"
+
+        command = ["commit", "-q", "-m", message]
+        # Honour the same setting `pass` uses for signed commits
+        if self._run_git(["config", "--bool", "pass.signcommits"]).stdout.strip() == "true":
+            command.insert(1, "-S")
+        process = self._run_git(command)
+        if process.returncode != 0:
+            error = process.stderr.strip() or process.stdout.strip()
+            return False, f"Error committing passwords: {error}"
+        return True, ""
+
+    def _backup_git_index(self) -> Tuple[str, Optional[str]]:
+        """Copy the git index so a failed commit can be unstaged exactly."""
+        process = self._run_git(["rev-parse", "--git-path", "index"])
+        index_file = os.path.join(self.store_dir, process.stdout.strip() or os.path.join(".git", "index"))
+        if not os.path.exists(index_file):
+            return index_file, None
+        backup = f"{index_file}.{self._id}.bak"
+        shutil.copy2(index_file, backup)
+        return index_file, backup
+
+    @staticmethod
+    def _restore_git_index(index_backup: Tuple[str, Optional[str]]):
+        index_file, backup = index_backup
+        if backup:
+            os.replace(backup, index_file)
+        elif os.path.exists(index_file):
+            # The repository had no index before the transaction
+            os.remove(index_file)
@@ -0,0 +1,130 @@
+"""
+Differences between two loads of the password store.
+
+A reload after adding, editing, moving or deleting an entry compares the
+new entries, folders and metadata with the ones already shown and updates
+only what differs, so expansion, scrolling and what bulk processing found
+about the unchanged entries are kept.
+
+Entries are compared by a fingerprint of their ciphertext file (size and
+modification time): an entry whose fingerprint changed has new content, and
+a removed and an added entry with the same fingerprint are a move (``pass
+mv`` renames the file without re-encrypting it).
+"""
+
+import os
+from dataclasses import dataclass, field
+from difflib import SequenceMatcher
+from typing import Any, Dict, Hashable, Iterable, List, Optional, Sequence, Tuple
+
+Fingerprint = Optional[Tuple[int, int]]
+
+
+@dataclass
+class TreeDiff:
+    """What changed between two loads; moved entries are not also added/removed."""
+    added: List[str] = field(default_factory=list)
+    removed: List[str] = field(default_factory=list)
+    moved: Dict[str, str] = field(default_factory=dict)  # old path -> new path
+    changed: List[str] = field(default_factory=list)  # Content changed
+    metadata_changed: List[str] = field(default_factory=list)  # New paths
+    folders_added: List[str] = field(default_factory=list)
+    folders_removed: List[str] = field(default_factory=list)
+
+    def __bool__(self) -> bool:
+        return bool(self.added or self.removed or self.moved or self.changed or
+                    self.metadata_changed or self.folders_added or self.folders_removed)
+
+
+def entry_fingerprints(store_dir: str, password_paths: Iterable[str]) -> Dict[str, Fingerprint]:
+    """Size and mtime of each entry's ciphertext file (None if it cannot be read)."""
+    fingerprints = {}
+    for password_path in password_paths:
+        try:
+            stat = os.stat(os.path.join(store_dir, password_path + ".gpg"))
+            fingerprints[password_path] = (stat.st_size, stat.st_mtime_ns)
+        except OSError:
+            fingerprints[password_path] = None
+    return fingerprints
+
+
+def diff_tree(old_entries: Dict[str, Fingerprint], new_entries: Dict[str, Fingerprint],
+              old_folders: Iterable[str] = (), new_folders: Iterable[str] = (),
+              old_metadata: Optional[Dict[str, Any]] = None,
+              new_metadata: Optional[Dict[str, Any]] = None) -> TreeDiff:
+    """
+    Compare two loads of the store.
+
+    Args:
+        old_entries, new_entries: Entry path -> fingerprint
+        old_folders, new_folders: Folder paths
+        old_metadata, new_metadata: Entry path -> metadata, compared for equality
+
+    Returns:
+        TreeDiff from the old load to the new one
+    """
+    old_metadata = old_metadata or {}
+    new_metadata = new_metadata or {}
+    diff = TreeDiff()
+
+    removed = [path for path in old_entries if path not in new_entries]
+    added = [path for path in new_entries if path not in old_entries]
+
+    # Pair removed and added entries whose fingerprint identifies one file
+    removed_by_fingerprint = _unique_by_fingerprint(removed, old_entries)
+    added_by_fingerprint = _unique_by_fingerprint(added, new_entries)
+    for fingerprint, old_path in removed_by_fingerprint.items():
+        new_path = added_by_fingerprint.get(fingerprint)
+        if new_path is not None:
+            diff.moved[old_path] = new_path
+    moved_to = set(diff.moved.values())
+    diff.removed = sorted(path for path in removed if path not in diff.moved)
+    diff.added = sorted(path for path in added if path not in moved_to)
+
+    for path, fingerprint in new_entries.items():
+        if path in old_entries and old_entries[path] != fingerprint:
+            diff.changed.append(path)
+    diff.changed.sort()
+
+    for old_path, new_path in [(path, path) for path in new_entries if path in old_entries] + list(diff.moved.items()):
+        if old_metadata.get(old_path) != new_metadata.get(new_path):
+            diff.metadata_changed.append(new_path)
+    diff.metadata_changed.sort()
+
+    old_folders = set(old_folders)
+    new_folders = set(new_folders)
+    diff.folders_added = sorted(new_folders - old_folders)
+    diff.folders_removed = sorted(old_folders - new_folders)
+    return diff
+
+
+def _unique_by_fingerprint(paths: Iterable[str], fingerprints: Dict[str, Fingerprint]) -> Dict[Fingerprint, str]:
+    """Fingerprint -> path for the fingerprints only one of the paths has."""
+    unique = {}
+    ambiguous = set()
+    for path in paths:
+        fingerprint = fingerprints[path]
+        if fingerprint is None or fingerprint in ambiguous:
+            continue
+        if fingerprint in unique:
+            del unique[fingerprint]
+            ambiguous.add(fingerprint)
+        else:
+            unique[fingerprint] = path
+    return unique
+
+
+def splice_ops(old: Sequence[Hashable], new: Sequence[Hashable]) -> List[Tuple[int, int, list]]:
+    """
+    The (position, n_removals, additions) splices turning old into new.
+
+    They are ordered last position first, so each can be applied to a list
+    model (Gio.ListStore.splice, Gtk.StringList.splice) as it comes.
+    """
+    matcher = SequenceMatcher(None, old, new, autojunk=False)
+    ops = []
+    for tag, old_start, old_end, new_start, new_end in matcher.get_opcodes():
+        if tag != "equal":
+            ops.append((old_start, old_end - old_start, list(new[new_start:new_end])))
+    ops.reverse()
+    return ops
@@ -78,7 +78,7 @@ class SecretsWindow(Adw.ApplicationWindow):
     search_clamp = Gtk.Template.Child()
     search_entry = Gtk.Template.Child()
     password_list_scrolled = Gtk.Template.Child()
-    password_list_box = Gtk.Template.Child()
+    password_list_view = Gtk.Template.Child()
     welcome_status_page = Gtk.Template.Child()
 
     def __init__(self, config_manager=None, **kwargs):
@@ -94,7 +94,14 @@ class SecretsWindow(Adw.ApplicationWindow):
         self.app_state = AppState()
 
         # Initialize password store and service
-        self.password_store = PasswordStore()
+        performance_config = self.config_manager.get_config().performance
+        git_config = self.config_manager.get_config().git
+        self.password_store = PasswordStore(
+            decryption_backend=performance_config.decryption_backend,
+            max_decryption_workers=performance_config.max_decryption_workers,
+            commit_idle_seconds=git_config.commit_idle_seconds,
+            commit_max_changes=git_config.commit_max_changes
+        )
         self.password_service = PasswordService(self.password_store)
 
         # Initialize managers
@@ -177,11 +184,11 @@ class SecretsWindow(Adw.ApplicationWindow):
             on_setup_complete=self._on_setup_complete
         )
 
-        # Dynamic folder controller - creates AdwExpanderRow and AdwActionRow dynamically
+        # Dynamic folder controller - folder tree in a virtualized list view
         self.folder_controller = DynamicFolderController(
             self.password_store,
             self.toast_manager,
-            self.password_list_box,  # Use simple password list box
+            self.password_list_view,
             self.search_entry,
             on_selection_changed=self._on_selection_changed,
             parent_window=self,
@@ -212,6 +219,9 @@ class SecretsWindow(Adw.ApplicationWindow):
         # Set up folder action callbacks
         self.folder_controller.add_subfolder_requested = self._on_add_subfolder_requested
 
+        # Batch operations report once; reload the list once per batch
+        self.password_service.register_change_callback(self._on_store_batch_changed)
+
         # Initialize ActionController for menu actions and keyboard shortcuts
         self.action_controller = ActionController(
             self,
@@ -308,6 +318,7 @@ class SecretsWindow(Adw.ApplicationWindow):
 
             # Execute git pull
             self.toast_manager.show_info("Pulling changes from remote repository...")
+            self.password_store.flush_pending_commits()
             success, message = self.git_manager.pull()
             
             if success:
@@ -333,8 +344,9 @@ class SecretsWindow(Adw.ApplicationWindow):
                 self._show_git_setup_dialog()
                 return
 
-            # Execute git push
+            # Execute git push, including deferred commits
             self.toast_manager.show_info("Pushing changes to remote repository...")
+            self.password_store.flush_pending_commits()
             success, message = self.git_manager.push()
             
             if success:
@@ -739,15 +751,12 @@ class SecretsWindow(Adw.ApplicationWindow):
         try:
             if old_path != new_path:
                 # Folder path changed - need to rename the folder
-                success, message = self.password_store.rename_folder(old_path, new_path)
+                # Entries and metadata move together; the list reloads on the change notification
+                success, message = self.password_service.rename_folder(old_path, new_path)
 
                 if success:
-                    # Update metadata for the renamed folder
-                    self.password_store.rename_folder_metadata(old_path, new_path)
                     self.password_store.set_folder_metadata(new_path, color, icon)
                     self.toast_manager.show_success(f"Folder renamed from '{old_path}' to '{new_path}'")
-                    # Refresh the folder list to show the changes
-                    self.folder_controller.load_passwords()
                     dialog.close()
                 else:
                     self.toast_manager.show_error(f"Failed to rename folder: {message}")
@@ -855,10 +864,15 @@ class SecretsWindow(Adw.ApplicationWindow):
             self.folder_controller.load_passwords()
             self.toast_manager.show_success("Password list refreshed")
 
+    def _on_store_batch_changed(self, change):
+        """Reload the password list after a batch move, delete or retag."""
+        GLib.idle_add(self._refresh_password_list_after_import)
+
     def _refresh_password_list_after_import(self):
         """Refresh the password list after import operations."""
         if hasattr(self, 'folder_controller'):
             self.folder_controller.load_passwords()
+        return False
 
 
     def _on_application_locked(self):
@@ -884,6 +898,9 @@ class SecretsWindow(Adw.ApplicationWindow):
         # Stop security monitoring
         if hasattr(self, 'security_manager'):
             self.security_manager.stop_security_monitoring()
+        # Commit deferred changes and stop the background decryption worker
+        self.password_store.flush_pending_commits()
+        self.password_store.shutdown_decryption_backend()
         return super().close_request()
 
     def _update_git_button_states(self):
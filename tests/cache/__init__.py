@@ -0,0 +1 @@
+# Cache tests package
\ No newline at end of file
@@ -0,0 +1,313 @@
+"""Unit tests for the persistent password content cache."""
+
+import json
+import os
+import shutil
+import subprocess
+from pathlib import Path
+from types import SimpleNamespace
+from unittest.mock import patch
+
+import pytest
+
+from src.secrets.cache.content_cache import PasswordContentCache, git_blob_id
+
+
+class FakeBackend:
+    """Stands in for the GPG backend; "encrypts" by adding a prefix."""
+
+    def __init__(self):
+        self.decrypts = 0
+
+    def encrypt_file(self, content, file_path, folder=""):
+        Path(file_path).write_text("ENC:" + content)
+        return True, ""
+
+    def decrypt_file(self, file_path):
+        self.decrypts += 1
+        data = Path(file_path).read_text()
+        if not data.startswith("ENC:"):
+            return False, "decryption failed"
+        return True, data[len("ENC:"):]
+
+
+@pytest.fixture
+def store(temp_dir: Path) -> SimpleNamespace:
+    """Create a store with a few entries."""
+    for name in ["email", "bank", "vpn"]:
+        (temp_dir / (name + ".gpg")).write_text("x")
+    return SimpleNamespace(store_dir=str(temp_dir), decryption_backend=FakeBackend())
+
+
+def cache_dir(store) -> Path:
+    return Path(store.store_dir) / ".secrets-cache"
+
+
+def snapshot_file(store) -> Path:
+    return cache_dir(store) / "content_cache.snapshot"
+
+
+def segment_files(store):
+    return sorted(cache_dir(store).glob("content_cache.journal.*"))
+
+
+def read_encrypted(path: Path) -> str:
+    data = path.read_text()
+    assert data.startswith("ENC:")
+    return data[len("ENC:"):]
+
+
+class TestPasswordContentCache:
+    """Test cases for PasswordContentCache."""
+
+    def test_round_trip(self, store):
+        """Test that entries survive a restart with a single decryption."""
+        cache = PasswordContentCache(store)
+        cache.set_content_info("email", True, True, "https://example.com", "alice")
+        cache.set_content_info("bank", False, False)
+        cache.close()
+
+        assert [p.name for p in cache_dir(store).iterdir()] == ["content_cache.snapshot"]
+        store.decryption_backend = FakeBackend()
+        reloaded = PasswordContentCache(store)
+
+        assert store.decryption_backend.decrypts == 1
+        assert reloaded.get_content_info("email")["url"] == "https://example.com"
+        assert reloaded.get_content_info("email")["username"] == "alice"
+        assert reloaded.get_content_info("bank")["has_totp"] is False
+        reloaded.close()
+
+    def test_nothing_written_in_plaintext(self, store):
+        """Test that the snapshot and journal segments go through the backend."""
+        cache = PasswordContentCache(store)
+        cache.set_content_info("email", True, True, "https://example.com")
+        cache.flush()
+        cache.set_content_info("bank", False, False)
+        cache.close()
+        cache = PasswordContentCache(store)
+        cache.set_content_info("vpn", True, False)
+        cache.flush()
+
+        for path in cache_dir(store).iterdir():
+            read_encrypted(path)
+        cache.close()
+
+    def test_search_tokens_are_not_persisted(self, store):
+        """Test that search tokens found in a snapshot are dropped from it on load."""
+        cache = PasswordContentCache(store)
+        cache.set_content_info("email", False, True, "https://example.com", "alice")
+        cache.close()
+        data = json.loads(read_encrypted(snapshot_file(store)))
+        data["cache"]["email"]["tokens"] = ["alice", "recovery"]
+        snapshot_file(store).write_text("ENC:" + json.dumps(data))
+
+        reloaded = PasswordContentCache(store)
+
+        assert reloaded.get_content_info("email")["username"] == "alice"
+        assert "recovery" not in read_encrypted(snapshot_file(store))
+        reloaded.close()
+
+    def test_writes_are_deferred_and_appended(self, store):
+        """Test that mutations are batched into journal segments, not the snapshot."""
+        cache = PasswordContentCache(store)
+        cache.set_content_info("email", True, False)
+        cache.set_content_info("bank", False, True)
+        cache.invalidate("email")
+
+        assert segment_files(store) == []
+
+        cache.flush()
+        cache.set_content_info("vpn", False, False)
+        cache.flush()
+
+        segments = segment_files(store)
+        assert not snapshot_file(store).exists()
+        assert [len(read_encrypted(p).splitlines()) for p in segments] == [3, 1]
+        cache.close()
+
+    def test_segments_replayed_after_crash(self, store):
+        """Test that journal segments left by an unclean exit are applied."""
+        cache = PasswordContentCache(store)
+        cache.set_content_info("email", True, False)
+        cache.flush()
+        cache.invalidate("email")
+        cache.set_content_info("bank", False, True)
+        cache.flush()
+        cache._closed = True  # Simulate a crash: no compaction on close
+
+        reloaded = PasswordContentCache(store)
+
+        assert reloaded.get_content_info("email") is None
+        assert reloaded.get_content_info("bank")["has_url"] is True
+        assert segment_files(store) == []
+        reloaded.close()
+
+    def test_compaction(self, store):
+        """Test that a journal larger than the cache is folded into a snapshot."""
+        cache = PasswordContentCache(store)
+        cache.MIN_COMPACTION_RECORDS = 2
+        for _ in range(3):
+            cache.set_content_info("email", True, False)
+        cache.flush()
+
+        assert segment_files(store) == []
+        assert list(json.loads(read_encrypted(snapshot_file(store)))["cache"]) == ["email"]
+        cache.close()
+
+    def test_compaction_bounds_segment_count(self, store):
+        """Test that many small flushes do not multiply startup decryptions."""
+        cache = PasswordContentCache(store)
+        cache.MIN_COMPACTION_RECORDS = 1000
+        for _ in range(cache.MAX_JOURNAL_SEGMENTS * 2):
+            cache.set_content_info("email", True, False)
+            cache.flush()
+
+        assert len(segment_files(store)) < cache.MAX_JOURNAL_SEGMENTS
+        cache.close()
+
+    def test_torn_journal_tail_is_ignored(self, store):
+        """Test that a partially written last record does not break loading."""
+        cache = PasswordContentCache(store)
+        cache.set_content_info("email", True, False)
+        cache.flush()
+        cache._closed = True
+        segment = segment_files(store)[0]
+        segment.write_text(segment.read_text() + '{"op":"set","path":"bank","ent')
+
+        reloaded = PasswordContentCache(store)
+
+        assert reloaded.get_content_info("email") is not None
+        assert reloaded.get_content_info("bank") is None
+        reloaded.close()
+
+    def test_journal_older_than_snapshot_is_skipped(self, store):
+        """Test a crash between writing the snapshot and removing the journal."""
+        cache = PasswordContentCache(store)
+        cache.set_content_info("email", True, False)
+        cache.clear_all()
+        cache.flush()
+        segment = segment_files(store)[0]
+        journal_before = segment.read_text()
+        cache.set_content_info("bank", False, True)
+        cache._compact()
+        cache.close()
+        segment.write_text(journal_before)
+
+        reloaded = PasswordContentCache(store)
+
+        assert reloaded.get_content_info("bank") is not None
+        assert reloaded.get_content_info("email") is None
+        reloaded.close()
+
+    def test_undecryptable_snapshot_disables_persistence(self, store):
+        """Test that a snapshot we cannot decrypt is neither used nor overwritten."""
+        cache_dir(store).mkdir()
+        snapshot_file(store).write_text("not ours")
+
+        cache = PasswordContentCache(store)
+        cache.set_content_info("email", True, False)
+        cache.close()
+
+        assert cache.get_content_info("email") is not None
+        assert snapshot_file(store).read_text() == "not ours"
+        assert segment_files(store) == []
+
+    def test_no_backend_keeps_cache_in_memory(self, temp_dir):
+        """Test that without a GPG backend nothing is written to disk."""
+        (temp_dir / "email.gpg").write_text("x")
+        cache = PasswordContentCache(SimpleNamespace(store_dir=str(temp_dir)))
+        cache.set_content_info("email", True, False)
+        cache.close()
+
+        assert cache.get_content_info("email") is not None
+        assert not (temp_dir / ".secrets-cache").exists()
+
+    def test_migrates_legacy_plaintext_cache(self, store):
+        """Test that a plaintext cache from an earlier version is encrypted and removed."""
+        cache = PasswordContentCache(store)
+        file_hash = cache._get_file_hash("vpn")
+        cache.close()
+        cache_dir(store).mkdir(exist_ok=True)
+        legacy = cache_dir(store) / "content_cache.json"
+        legacy.write_text(json.dumps({"version": "1.0", "created": 0, "cache": {
+            "vpn": {"has_totp": True, "has_url": False, "url": None,
+                    "file_hash": file_hash, "cached_at": 0}
+        }}, indent=2))
+        (cache_dir(store) / "content_cache.journal").write_text(
+            json.dumps({"op": "set", "path": "email", "seq": 1, "entry": {
+                "has_totp": False, "has_url": True, "url": None,
+                "file_hash": file_hash, "cached_at": 0}}) + "\n")
+
+        reloaded = PasswordContentCache(store)
+
+        assert reloaded.get_content_info("vpn")["has_totp"] is True
+        assert reloaded.get_content_info("email")["has_url"] is True
+        assert [p.name for p in cache_dir(store).iterdir()] == ["content_cache.snapshot"]
+        reloaded.close()
+
+    def test_stale_entry_is_dropped(self, store):
+        """Test that a changed password file invalidates its entry."""
+        cache = PasswordContentCache(store)
+        cache.set_content_info("email", True, False)
+        (Path(store.store_dir) / "email.gpg").write_text("changed content")
+
+        assert cache.get_content_info("email") is None
+        cache.close()
+
+        assert PasswordContentCache(store).get_content_info("email") is None
+
+    def test_validate_all(self, store):
+        """Test that one sweep drops stale entries and reports what needs work."""
+        cache = PasswordContentCache(store)
+        cache.set_content_info("email", True, False)
+        cache.set_content_info("bank", False, True)
+        cache.set_content_info("vpn", False, False)
+        (Path(store.store_dir) / "bank.gpg").write_text("changed content")
+        (Path(store.store_dir) / "vpn.gpg").unlink()
+        (Path(store.store_dir) / "work").mkdir()
+        (Path(store.store_dir) / "work" / "mail.gpg").write_text("x")
+
+        assert cache.validate_all() == {"bank", "work/mail"}
+        assert cache.validate_all(["email", "bank"]) == {"bank"}
+        assert cache.get_content_info("email") is not None
+
+        cache.flush()
+        last_record = read_encrypted(segment_files(store)[-1]).splitlines()[-1]
+        assert sorted(json.loads(last_record)["paths"]) == ["bank", "vpn"]
+        cache.close()
+
+    def test_touch_keeps_entries(self, store):
+        """Test that rewriting a file with the same ciphertext keeps its entry."""
+        cache = PasswordContentCache(store)
+        cache.set_content_info("email", True, False)
+        cache.set_content_info("bank", False, True)
+        for name in ["email", "bank"]:
+            entry = Path(store.store_dir) / (name + ".gpg")
+            os.utime(entry, ns=(0, 0))
+        (Path(store.store_dir) / "bank.gpg").write_text("y")
+
+        assert cache.validate_all(["email", "bank"]) == {"bank"}
+        assert cache._cache["email"]["stat"].endswith(":0")
+        assert cache.get_content_info("email")["has_totp"] is True
+        cache.close()
+
+    @pytest.mark.skipif(shutil.which("git") is None, reason="git not installed")
+    def test_blob_ids_from_git_index(self, store):
+        """Test that tracked, unmodified files take their id from git."""
+        run = lambda *args: subprocess.run(["git", "-C", store.store_dir, *args],
+                                           check=True, capture_output=True)
+        (Path(store.store_dir) / "work").mkdir()
+        (Path(store.store_dir) / "work" / "mail.gpg").write_text("m")
+        run("init", "-q")
+        run("add", "email.gpg", "work/mail.gpg", "bank.gpg")
+        (Path(store.store_dir) / "bank.gpg").write_text("modified")
+        cache = PasswordContentCache(store)
+
+        with patch.object(cache, "_get_file_hash", wraps=cache._get_file_hash) as hasher:
+            blob_ids = cache._compute_blob_ids(["email", "work/mail", "bank", "vpn"])
+
+        assert blob_ids["work/mail"] == git_blob_id(b"m")
+        assert blob_ids["bank"] == git_blob_id(b"modified")
+        assert blob_ids["vpn"] == git_blob_id(b"x")
+        assert sorted(call.args[0] for call in hasher.call_args_list) == ["bank", "vpn"]
+        cache.close()
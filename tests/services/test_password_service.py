@@ -9,6 +9,7 @@ import pytest
 from src.secrets.models import PasswordEntry
 from src.secrets.services.password_service import PasswordService
 from src.secrets.password_store import PasswordStore
+from src.secrets.utils.decrypt_scheduler import DecryptQueue
 
 
 class TestPasswordService:
@@ -19,6 +20,7 @@ class TestPasswordService:
         """Create a mock PasswordStore."""
         store = Mock(spec=PasswordStore)
         store.is_initialized = True
+        store.has_folder.return_value = False
         return store
     
     @pytest.fixture
@@ -112,10 +114,7 @@ class TestPasswordService:
     
     def test_get_entry_details_folder(self, password_service, mock_password_store):
         """Test get_entry_details for a folder."""
-        mock_password_store.list_passwords.return_value = [
-            "folder/password1",
-            "folder/password2"
-        ]
+        mock_password_store.has_folder.return_value = True
         
         success, entry = password_service.get_entry_details("folder")
         
@@ -215,14 +214,22 @@ class TestPasswordService:
         
         assert success
         assert entries == []
+
+    def test_iter_search_entries_streams_matches(self, password_service, mock_password_store):
+        """Test that streamed search fills the queue and yields entries."""
+        mock_password_store.list_passwords.return_value = ["a", "b", "c"]
+        mock_password_store.iter_search_passwords.side_effect = lambda query, queue: iter(["c", "a"])
+        queue = DecryptQueue()
+
+        entries = list(password_service.iter_search_entries("mail", queue))
+
+        assert [e.path for e in entries] == ["c", "a"]
+        assert sorted(queue.pending()) == ["a", "b", "c"]
     
     def test_is_folder_path(self, password_service, mock_password_store):
         """Test _is_folder_path method."""
-        mock_password_store.list_passwords.return_value = [
-            "folder/password1",
-            "folder/subfolder/password2",
-            "other/password3"
-        ]
+        folders = {"folder", "folder/subfolder", "other"}
+        mock_password_store.has_folder.side_effect = lambda path: path in folders
         
         # Test folder paths
         assert password_service._is_folder_path("folder")
@@ -232,4 +239,69 @@ class TestPasswordService:
         # Test non-folder paths
         assert not password_service._is_folder_path("folder/password1")
         assert not password_service._is_folder_path("nonexistent")
-        assert not password_service._is_folder_path("fold")  # Partial match should fail
\ No newline at end of file
+        assert not password_service._is_folder_path("fold")  # Partial match should fail
+
+    def test_move_entries_notifies_once(self, password_service, mock_password_store):
+        """Test that a batch move is one store call and one change notification."""
+        from src.secrets.performance import password_cache
+        mock_password_store.move_passwords.return_value = (True, "Successfully moved 2 passwords.")
+        password_cache.put("a", PasswordEntry(path="a"))
+        changes = []
+        password_service.register_change_callback(changes.append)
+
+        success, _ = password_service.move_entries({"a": "work/a", "b": "work/b"})
+
+        assert success
+        mock_password_store.move_passwords.assert_called_once_with({"a": "work/a", "b": "work/b"}, True)
+        assert changes == [{'action': 'move', 'paths': {"a": "work/a", "b": "work/b"}}]
+        assert password_cache.get("a") is None
+
+    def test_delete_entries_failure_does_not_notify(self, password_service, mock_password_store):
+        """Test that a failed batch delete reports the error and no change."""
+        mock_password_store.delete_passwords.return_value = (False, "Error deleting passwords: b is not in the password store.")
+        changes = []
+        password_service.register_change_callback(changes.append)
+
+        success, message = password_service.delete_entries(["a", "b"])
+
+        assert not success
+        assert "b is not in the password store" in message
+        assert changes == []
+
+    def test_retag_entries(self, password_service, mock_password_store):
+        """Test that retagging sets metadata for all paths at once."""
+        mock_password_store.set_passwords_metadata.return_value = (True, "Updated 2 passwords.")
+        changes = []
+        password_service.register_change_callback(changes.append)
+
+        success, _ = password_service.retag_entries(["a", "b"], "#e01b24", "starred-symbolic")
+
+        assert success
+        mock_password_store.set_passwords_metadata.assert_called_once_with(["a", "b"], "#e01b24", "starred-symbolic")
+        assert len(changes) == 1
+
+    def test_retag_entries_unknown_path_does_not_notify(self, password_service, mock_password_store):
+        """Test that retagging a path missing from the store reports the error and no change."""
+        mock_password_store.set_passwords_metadata.return_value = (
+            False, "Error updating passwords: b is not in the password store."
+        )
+        changes = []
+        password_service.register_change_callback(changes.append)
+
+        success, message = password_service.retag_entries(["a", "b"], "#e01b24", "starred-symbolic")
+
+        assert not success
+        assert "b is not in the password store" in message
+        assert changes == []
+
+    def test_rename_folder_notifies_once(self, password_service, mock_password_store):
+        """Test that a folder rename is one store call and one change notification."""
+        mock_password_store.rename_folder.return_value = (True, "Folder renamed from 'work' to 'job'")
+        changes = []
+        password_service.register_change_callback(changes.append)
+
+        success, _ = password_service.rename_folder("work", "job")
+
+        assert success
+        mock_password_store.rename_folder.assert_called_once_with("work", "job")
+        assert changes == [{'action': 'rename_folder', 'paths': {"work": "job"}}]
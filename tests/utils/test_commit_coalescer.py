@@ -0,0 +1,157 @@
+"""Unit tests for deferred, coalesced git commits."""
+
+import shutil
+import subprocess
+import time
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+from src.secrets.utils.commit_coalescer import CommitCoalescer
+
+
+def git(store: Path, *args) -> str:
+    return subprocess.run(["git", "-C", str(store), *args], check=True,
+                          capture_output=True, text=True).stdout
+
+
+@pytest.fixture
+def store(temp_dir: Path) -> Path:
+    """Create a git-backed store with one committed entry."""
+    (temp_dir / "email.gpg").write_text("x")
+    git(temp_dir, "init", "-q")
+    git(temp_dir, "config", "user.email", "test@example.com")
+    git(temp_dir, "config", "user.name", "Test")
+    git(temp_dir, "add", "email.gpg")
+    git(temp_dir, "commit", "-q", "-m", "Initial")
+    return temp_dir
+
+
+def commit_count(store: Path) -> int:
+    return int(git(store, "rev-list", "--count", "HEAD"))
+
+
+@pytest.mark.skipif(shutil.which("git") is None, reason="git not installed")
+class TestCommitCoalescer:
+    """Test cases for CommitCoalescer."""
+
+    def test_changes_committed_together(self, store):
+        """Test that a burst of changes becomes a single commit on flush."""
+        commits = CommitCoalescer(str(store), idle_seconds=60)
+        with commits.change("Add given password for bank to store.", ["bank.gpg"]):
+            (store / "bank.gpg").write_text("b")
+        with commits.change("Rename email to work/email.", ["email.gpg", "work/email.gpg"]):
+            (store / "work").mkdir()
+            (store / "email.gpg").rename(store / "work" / "email.gpg")
+        with commits.change("Remove nothing from store.", ["missing.gpg"]):
+            pass
+
+        assert commit_count(store) == 1
+        assert commits.pending() == 3
+
+        assert commits.flush()[0]
+
+        assert commit_count(store) == 2
+        assert git(store, "status", "--porcelain") == ""
+        assert git(store, "log", "-1", "--format=%s") == "Apply 3 changes to store.\n"
+        assert not Path(commits.journal_file).exists()
+
+    def test_single_change_keeps_its_message(self, store):
+        """Test that a lone change is committed with its own message."""
+        commits = CommitCoalescer(str(store), idle_seconds=60)
+        with commits.change("Remove email from store.", ["email.gpg"]):
+            (store / "email.gpg").unlink()
+
+        commits.flush()
+
+        assert git(store, "log", "-1", "--format=%s") == "Remove email from store.\n"
+
+    def test_idle_timer_commits(self, store):
+        """Test that pending changes are committed once the store is idle."""
+        commits = CommitCoalescer(str(store), idle_seconds=0.05)
+        with commits.change("Add given password for bank to store.", ["bank.gpg"]):
+            (store / "bank.gpg").write_text("b")
+
+        deadline = time.monotonic() + 5
+        while commit_count(store) == 1 and time.monotonic() < deadline:
+            time.sleep(0.02)
+
+        assert commit_count(store) == 2
+
+    def test_max_changes_commits_immediately(self, store):
+        """Test that reaching max_changes commits without waiting."""
+        commits = CommitCoalescer(str(store), idle_seconds=60, max_changes=2)
+        for name in ["a", "b"]:
+            with commits.change(f"Add given password for {name} to store.", [f"{name}.gpg"]):
+                (store / f"{name}.gpg").write_text(name)
+
+        assert commit_count(store) == 2
+        assert commits.pending() == 0
+
+    def test_recover_commits_journal_from_crash(self, store):
+        """Test that changes journaled by a crashed session are committed."""
+        crashed = CommitCoalescer(str(store), idle_seconds=60)
+        with crashed.change("Add given password for bank to store.", ["bank.gpg"]):
+            (store / "bank.gpg").write_text("b")
+        crashed._cancel_timer()
+        with open(crashed.journal_file, "a") as f:
+            f.write('{"message": "torn')
+
+        commits = CommitCoalescer(str(store), idle_seconds=60)
+        commits.recover()
+        deadline = time.monotonic() + 5
+        while commit_count(store) == 1 and time.monotonic() < deadline:
+            time.sleep(0.02)
+
+        assert commit_count(store) == 2
+        assert "bank.gpg" in git(store, "ls-files")
+
+    def test_failed_commit_keeps_journal(self, store):
+        """Test that a rejected commit leaves the changes pending."""
+        hook = store / ".git" / "hooks" / "pre-commit"
+        hook.write_text("#!/bin/sh\nexit 1\n")
+        hook.chmod(0o755)
+        commits = CommitCoalescer(str(store), idle_seconds=60)
+        with commits.change("Add given password for bank to store.", ["bank.gpg"]):
+            (store / "bank.gpg").write_text("b")
+
+        assert not commits.flush()[0]
+        assert commits.pending() == 1
+
+        hook.unlink()
+        assert commits.flush()[0]
+        assert commit_count(store) == 2
+
+    def test_discarded_change_leaves_no_record(self, store):
+        """Test that a change the block discards is neither journaled nor committed."""
+        commits = CommitCoalescer(str(store), idle_seconds=60)
+        with commits.change("Add given password for bank to store.", ["bank.gpg"]):
+            (store / "bank.gpg").write_text("b")
+        with commits.change("Remove email from store.", ["email.gpg"]) as change:
+            change.discard()
+
+        assert commits.pending() == 1
+        assert commits.flush()[0]
+        assert git(store, "log", "-1", "--format=%s") == "Add given password for bank to store.\n"
+
+    def test_failed_batch_leaves_nothing_pending(self, store):
+        """Test that a batch rolled back by the password store is not journaled."""
+        from src.secrets.password_store import PasswordStore
+
+        (store / "bank.gpg").write_text("b")
+        git(store, "add", "bank.gpg")
+        git(store, "commit", "-q", "-m", "Add bank")
+        password_store = PasswordStore(store_dir=str(store), commit_idle_seconds=60)
+
+        with patch("src.secrets.password_store.os.replace", side_effect=OSError("busy")):
+            success, _ = password_store.delete_passwords(["email", "bank"])
+
+        assert not success
+        assert password_store.commits.pending() == 0
+        assert not Path(password_store.commits.journal_file).exists()
+
+    def test_disabled_without_git(self, temp_dir):
+        """Test that deferral only applies to git stores."""
+        assert not CommitCoalescer(str(temp_dir), idle_seconds=5).enabled
+        assert not CommitCoalescer(str(temp_dir), idle_seconds=0).enabled
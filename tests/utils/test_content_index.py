@@ -0,0 +1,92 @@
+"""Unit tests for the in-memory content search index."""
+
+from src.secrets.utils.content_index import ContentIndex, content_tokens, query_terms
+
+
+ENTRY = """hunter2
+username: alice@example.com
+url: https://mail.example.com/login
+otpauth://totp/Example:alice?secret=JBSWY3DPEHPK3PXP
+pin: 4321
+Recovery codes are in the safe
+"""
+
+
+class TestContentTokens:
+    """Test cases for token extraction."""
+
+    def test_fields_notes_and_urls_are_tokenized(self):
+        """Test that usernames, URLs and notes become lowercase tokens."""
+        tokens = content_tokens(ENTRY)
+
+        assert {"username", "alice", "example", "com", "mail", "login", "safe"} <= tokens
+
+    def test_password_and_secrets_are_not_indexed(self):
+        """Test that the password line and secret values stay out of the index."""
+        tokens = content_tokens(ENTRY)
+
+        assert "hunter2" not in tokens
+        assert "jbswy3dpehpk3pxp" not in tokens
+        assert "4321" not in tokens
+        assert "pin" in tokens
+
+    def test_query_terms(self):
+        """Test that queries are split into lowercase words."""
+        assert query_terms("Alice  MAIL.example") == ["alice", "mail", "example"]
+        assert query_terms("  :: ") == []
+
+
+class TestContentIndex:
+    """Test cases for ContentIndex."""
+
+    def test_prefix_and_all_terms_must_match(self):
+        """Test that every query word must prefix-match a token of the entry."""
+        index = ContentIndex()
+        index.update("mail/alice", ENTRY)
+        index.update("bank", "pw\nusername: bob\nurl: bank.example.org\n")
+
+        assert index.search("exam") == {"mail/alice", "bank"}
+        assert index.search("ali exam") == {"mail/alice"}
+        assert index.search("bob mail") == set()
+        assert index.search("hunter2") == set()
+        assert index.search("--") is None
+
+    def test_update_replaces_previous_tokens(self):
+        """Test that re-indexing an entry forgets its old content."""
+        index = ContentIndex()
+        index.update("a", "pw\nuser: old\n")
+        index.update("a", "pw\nuser: new\n")
+
+        assert index.search("old") == set()
+        assert index.search("new") == {"a"}
+        assert len(index) == 1
+
+    def test_remove_move_and_clear(self):
+        """Test that entries can be forgotten, re-keyed and cleared."""
+        index = ContentIndex()
+        index.update("a", "pw\nnote: shared\n")
+        index.update("b", "pw\nnote: shared\n")
+
+        index.remove("a")
+        assert index.search("shared") == {"b"}
+        index.move("b", "c")
+        assert index.search("shared") == {"c"}
+        index.clear()
+        assert index.search("shared") == set()
+        assert len(index) == 0
+
+    def test_unindexed_reports_missing_and_changed_entries(self):
+        """Test that entries changed since indexing are reported."""
+        index = ContentIndex()
+        index.update("a", "pw\n", stamp=1.0)
+        index.update("b", "pw\n", stamp=1.0)
+        stamps = {"a": 1.0, "b": 2.0, "c": 1.0}
+
+        assert index.unindexed(["a", "b", "c"], stamps.get) == ["b", "c"]
+
+    def test_add_tokens_from_saved_tokens(self):
+        """Test that tokens saved earlier can be indexed without the content."""
+        index = ContentIndex()
+        index.add_tokens("a", sorted(content_tokens(ENTRY)), stamp=1.0)
+
+        assert index.search("alice") == {"a"}
@@ -0,0 +1,225 @@
+"""Unit tests for adaptive decryption scheduling."""
+
+import threading
+import time
+
+from src.secrets.utils.decrypt_scheduler import (
+    AdaptiveDecryptScheduler, ConcurrencyController, DecryptQueue
+)
+
+
+class TestConcurrencyController:
+    """Test cases for ConcurrencyController."""
+
+    def test_serial_until_unlocked(self):
+        """Test that no scaling happens before the agent is unlocked."""
+        controller = ConcurrencyController(max_workers=8)
+
+        for _ in range(20):
+            controller.record(0.01, True)
+
+        assert controller.workers == 1
+
+        controller.mark_unlocked()
+        assert controller.workers == 2
+
+    def test_scales_up_while_throughput_improves(self):
+        """Test that constant latency (i.e. linear throughput) adds workers."""
+        controller = ConcurrencyController(max_workers=6)
+        controller.mark_unlocked()
+
+        for _ in range(200):
+            controller.record(0.01, True)
+
+        assert controller.workers == 6
+
+    def test_settles_when_extra_worker_does_not_help(self):
+        """Test that latency growing with workers stops the climb."""
+        controller = ConcurrencyController(max_workers=16)
+        controller.mark_unlocked()
+
+        # Saturated at 4: beyond that, latency grows with the worker count
+        for _ in range(400):
+            controller.record(0.01 * max(1, controller.workers / 4), True)
+
+        assert 3 <= controller.workers <= 5
+
+    def test_backs_off_on_errors(self):
+        """Test that a high error rate halves the worker count."""
+        controller = ConcurrencyController(max_workers=8, initial_workers=8)
+        controller.mark_unlocked()
+
+        for _ in range(16):
+            controller.record(0.01, False)
+
+        assert controller.workers == 4
+
+
+class TestDecryptQueue:
+    """Test cases for DecryptQueue."""
+
+    def test_insertion_order_by_default(self):
+        """Test that equal priorities keep insertion order."""
+        queue = DecryptQueue(["a", "b", "c", "a"])
+
+        assert [queue.pop() for _ in range(4)] == ["a", "b", "c", None]
+
+    def test_prioritize_moves_paths_ahead(self):
+        """Test that the latest hints win among equal priorities."""
+        queue = DecryptQueue(["a", "b", "c", "d", "e"])
+        queue.prioritize(["e"], DecryptQueue.EXPANDED)
+        queue.prioritize(["c"], DecryptQueue.VISIBLE)
+        queue.prioritize(["d"], DecryptQueue.VISIBLE)
+
+        assert queue.pending() == ["d", "c", "e", "a", "b"]
+        assert queue.pop() == "d"
+
+    def test_prioritize_never_lowers(self):
+        """Test that a weaker hint does not demote a path."""
+        queue = DecryptQueue(["a", "b"])
+        queue.prioritize(["b"], DecryptQueue.VISIBLE)
+        queue.prioritize(["b"], DecryptQueue.EXPANDED)
+
+        assert queue.pending() == ["b", "a"]
+
+    def test_cancel_and_discard(self):
+        """Test removal of single paths and of everything."""
+        queue = DecryptQueue(["a", "b", "c"])
+        queue.discard("b")
+
+        assert queue.pending() == ["a", "c"]
+
+        queue.cancel()
+        queue.add(["d"])
+
+        assert queue.cancelled
+        assert queue.pop() is None
+        assert len(queue) == 0
+
+
+class TestAdaptiveDecryptScheduler:
+    """Test cases for AdaptiveDecryptScheduler."""
+
+    def test_returns_every_result(self):
+        """Test that every path is decrypted exactly once."""
+        scheduler = AdaptiveDecryptScheduler(lambda path: (True, path.upper()), max_workers=4)
+
+        results = dict(scheduler.run([f"entry{i}" for i in range(50)]))
+
+        assert len(results) == 50
+        assert results["entry7"] == (True, "ENTRY7")
+
+    def test_serial_while_locked(self):
+        """Test that failures before the first success never overlap."""
+        active = []
+        peak = []
+        lock = threading.Lock()
+
+        def decrypt(path):
+            with lock:
+                active.append(path)
+                peak.append(len(active))
+            time.sleep(0.005)
+            with lock:
+                active.remove(path)
+            return False, "Operation cancelled"
+
+        scheduler = AdaptiveDecryptScheduler(decrypt, max_workers=8)
+        list(scheduler.run([f"entry{i}" for i in range(10)]))
+
+        assert max(peak) == 1
+        assert not scheduler.controller.unlocked
+
+    def test_failures_while_locked_stop_the_run(self):
+        """Test that a locked agent that keeps failing is not asked for every entry."""
+        calls = []
+
+        def decrypt(path):
+            calls.append(path)
+            return False, "gpg: decryption failed: Bad passphrase"
+
+        queue = DecryptQueue([f"entry{i}" for i in range(100)])
+        scheduler = AdaptiveDecryptScheduler(decrypt, max_workers=8)
+        results = list(scheduler.run(queue))
+
+        assert len(calls) == AdaptiveDecryptScheduler.LOCKED_FAILURE_LIMIT
+        assert len(results) == len(calls)
+        assert queue.cancelled
+
+    def test_cancelled_pinentry_stops_the_run(self):
+        """Test that a dismissed passphrase prompt or a missing key ends the run at once."""
+        for error in ("gpg: public key decryption failed: Operation cancelled",
+                      "gpg: decryption failed: No secret key"):
+            calls = []
+
+            def decrypt(path):
+                calls.append(path)
+                return False, error
+
+            scheduler = AdaptiveDecryptScheduler(decrypt, max_workers=8)
+            list(scheduler.run([f"entry{i}" for i in range(100)]))
+
+            assert len(calls) == 1
+
+    def test_failures_after_unlock_do_not_stop_the_run(self):
+        """Test that once the agent is unlocked, failing entries are only reported."""
+        scheduler = AdaptiveDecryptScheduler(lambda path: (False, "gpg: decryption failed: No secret key"),
+                                             max_workers=2, unlocked=True)
+
+        assert len(list(scheduler.run([f"entry{i}" for i in range(20)]))) == 20
+
+    def test_runs_concurrently_when_unlocked(self):
+        """Test that an unlocked agent allows parallel decrypts."""
+        active = []
+        peak = []
+        lock = threading.Lock()
+
+        def decrypt(path):
+            with lock:
+                active.append(path)
+                peak.append(len(active))
+            time.sleep(0.005)
+            with lock:
+                active.remove(path)
+            return True, path
+
+        scheduler = AdaptiveDecryptScheduler(decrypt, max_workers=4, unlocked=True)
+        list(scheduler.run([f"entry{i}" for i in range(40)]))
+
+        assert max(peak) > 1
+
+    def test_os_errors_become_failures(self):
+        """Test that an OSError from the backend is reported, not raised."""
+        def decrypt(path):
+            raise OSError("gpg vanished")
+
+        scheduler = AdaptiveDecryptScheduler(decrypt)
+
+        assert list(scheduler.run(["a"])) == [("a", (False, "gpg vanished"))]
+
+    def test_follows_queue_priorities(self):
+        """Test that reprioritizing during a run changes what runs next."""
+        queue = DecryptQueue([f"entry{i}" for i in range(10)])
+        scheduler = AdaptiveDecryptScheduler(lambda path: (True, path), max_workers=1)
+
+        order = []
+        for path, _ in scheduler.run(queue):
+            order.append(path)
+            if path == "entry0":
+                queue.prioritize(["entry9", "entry8"])
+
+        assert order[:3] == ["entry0", "entry9", "entry8"]
+        assert len(order) == 10
+
+    def test_cancel_stops_run(self):
+        """Test that cancelling the queue ends the run without further results."""
+        queue = DecryptQueue([f"entry{i}" for i in range(20)])
+        scheduler = AdaptiveDecryptScheduler(lambda path: (True, path), max_workers=1)
+
+        results = []
+        for path, _ in scheduler.run(queue):
+            results.append(path)
+            if len(results) == 3:
+                queue.cancel()
+
+        assert len(results) == 3
@@ -0,0 +1,183 @@
+"""Unit tests for the pluggable decryption backends."""
+
+import os
+import shutil
+import stat
+import subprocess
+from pathlib import Path
+
+import pytest
+
+from src.secrets.utils.decryption_backend import (
+    DirectGpgBackend, GpgIdResolver, PassCliBackend, create_decryption_backend
+)
+
+
+FAKE_GPG = """#!/bin/sh
+for last; do :; done
+case "$last" in
+    *locked*) echo "gpg: decryption failed: No secret key" >&2; exit 2;;
+esac
+cat "$last"
+"""
+
+
+@pytest.fixture
+def store(temp_dir: Path) -> Path:
+    """Create a small store with a nested .gpg-id."""
+    store_dir = temp_dir / "store"
+    (store_dir / "work").mkdir(parents=True)
+    (store_dir / ".gpg-id").write_text("ROOTKEY\n")
+    (store_dir / "work" / ".gpg-id").write_text("# team key\nWORKKEY1\n\nWORKKEY2 # backup\n")
+    (store_dir / "email.gpg").write_text("hunter2\nusername: alice\n")
+    (store_dir / "work" / "vpn.gpg").write_text("s3cret\nurl: https://vpn.example.com\n")
+    (store_dir / "work" / "locked.gpg").write_text("unreadable")
+    return store_dir
+
+
+class TestGpgIdResolver:
+    """Test cases for GpgIdResolver."""
+
+    def test_nearest_gpg_id_wins(self, store):
+        """Test that entries use the closest .gpg-id walking up."""
+        resolver = GpgIdResolver(str(store))
+
+        assert resolver.recipients_for("email") == ["ROOTKEY"]
+        assert resolver.recipients_for("work/vpn") == ["WORKKEY1", "WORKKEY2"]
+        assert resolver.recipients_for("work/deep/nested/entry") == ["WORKKEY1", "WORKKEY2"]
+
+    def test_cache_revalidates_on_change(self, store):
+        """Test that re-initialising a folder is picked up."""
+        resolver = GpgIdResolver(str(store))
+        assert resolver.recipients_for("work/vpn") == ["WORKKEY1", "WORKKEY2"]
+
+        gpg_id = store / "work" / ".gpg-id"
+        gpg_id.write_text("NEWKEY\n")
+        mtime = gpg_id.stat().st_mtime + 10
+        os.utime(gpg_id, (mtime, mtime))
+
+        assert resolver.recipients_for("work/vpn") == ["NEWKEY"]
+
+    def test_store_without_gpg_id(self, temp_dir):
+        """Test that an uninitialised store has no recipients."""
+        resolver = GpgIdResolver(str(temp_dir))
+
+        assert resolver.recipients_for("anything") == []
+
+
+class TestDirectGpgBackend:
+    """Test cases for DirectGpgBackend."""
+
+    @pytest.fixture
+    def backend(self, store, temp_dir):
+        """Create a backend using a stand-in gpg binary."""
+        script = temp_dir / "fake-gpg"
+        script.write_text(FAKE_GPG)
+        script.chmod(script.stat().st_mode | stat.S_IEXEC)
+        backend = DirectGpgBackend(str(store), gpg_binary=str(script))
+        yield backend
+        backend.close()
+
+    def test_decrypt(self, backend):
+        """Test decrypting an entry by its store path."""
+        assert backend.decrypt("work/vpn") == (True, "s3cret\nurl: https://vpn.example.com\n")
+
+    def test_missing_entry(self, backend):
+        """Test the error for an entry that does not exist."""
+        success, message = backend.decrypt("nope")
+
+        assert not success
+        assert "is not in the password store" in message
+
+    def test_error_names_recipients(self, backend):
+        """Test that a missing key error says which keys the entry needs."""
+        success, message = backend.decrypt("work/locked")
+
+        assert not success
+        assert "WORKKEY1" in message
+
+    def test_decrypt_many(self, backend):
+        """Test that every requested entry gets a result."""
+        results = dict(backend.decrypt_many(["email", "work/vpn", "nope"]))
+
+        assert results["email"][0]
+        assert results["work/vpn"][0]
+        assert not results["nope"][0]
+
+    def test_grep(self, backend):
+        """Test content search over decrypted entries."""
+        assert backend.grep("vpn\\.example", ["email", "work/vpn"]) == (True, ["work/vpn"])
+        # Invalid expressions are matched literally
+        assert backend.grep("user(", ["email"]) == (True, [])
+
+
+@pytest.mark.skipif(shutil.which("gpg") is None, reason="gpg not installed")
+class TestFileEncryption:
+    """Test cases for encrypting and decrypting files outside the store's entries."""
+
+    @pytest.fixture
+    def gpg_env(self, temp_dir):
+        """Create a GNUPGHOME with a passphrase-less key."""
+        home = temp_dir / "gnupg"
+        home.mkdir(mode=0o700)
+        env = dict(os.environ, GNUPGHOME=str(home))
+        subprocess.run(
+            ["gpg", "--batch", "--passphrase", "", "--quick-gen-key",
+             "Test <test@example.com>", "default", "default", "never"],
+            env=env, check=True, capture_output=True
+        )
+        yield env
+        subprocess.run(["gpgconf", "--kill", "gpg-agent"], env=env, capture_output=True)
+
+    @pytest.mark.parametrize("backend_class", [PassCliBackend, DirectGpgBackend])
+    def test_round_trip(self, temp_dir, gpg_env, backend_class):
+        """Test that a file encrypted to the store's .gpg-id decrypts again."""
+        store_dir = temp_dir / "store"
+        store_dir.mkdir()
+        (store_dir / ".gpg-id").write_text("test@example.com\n")
+        target = store_dir / "blob"
+        backend = backend_class(str(store_dir), lambda: dict(gpg_env))
+        backend.gpg_binary = "gpg"
+
+        assert backend.encrypt_file("derived data\n", str(target)) == (True, "")
+        assert b"derived data" not in target.read_bytes()
+        assert backend.decrypt_file(str(target)) == (True, "derived data\n")
+        backend.close()
+
+    def test_gpg_opts_come_from_session_environment(self, temp_dir, monkeypatch):
+        """Test that file decryption takes PASSWORD_STORE_GPG_OPTS from env_factory, not os.environ."""
+        monkeypatch.setenv("PASSWORD_STORE_GPG_OPTS", "--from-parent")
+        script = temp_dir / "echo-gpg"
+        script.write_text('#!/bin/sh\necho "$@"\n')
+        script.chmod(script.stat().st_mode | stat.S_IEXEC)
+        backend = PassCliBackend(str(temp_dir), lambda: dict(os.environ, PASSWORD_STORE_GPG_OPTS="--from-session"))
+        backend.gpg_binary = str(script)
+
+        success, output = backend.decrypt_file(str(temp_dir / "blob"))
+
+        assert success
+        assert "--from-session" in output
+        assert "--from-parent" not in output
+
+    def test_encrypt_without_gpg_id(self, temp_dir):
+        """Test that nothing is written when the store has no recipients."""
+        backend = PassCliBackend(str(temp_dir))
+
+        success, error = backend.encrypt_file("data", str(temp_dir / "blob"))
+
+        assert not success
+        assert ".gpg-id" in error
+        assert not (temp_dir / "blob").exists()
+
+
+class TestCreateDecryptionBackend:
+    """Test cases for create_decryption_backend."""
+
+    def test_by_name(self, temp_dir):
+        """Test backend selection by config name."""
+        assert isinstance(create_decryption_backend("pass", str(temp_dir)), PassCliBackend)
+        assert isinstance(create_decryption_backend("gpg", str(temp_dir)), DirectGpgBackend)
+
+    def test_unknown_falls_back_to_gpg(self, temp_dir):
+        """Test that an unknown name uses the direct backend."""
+        assert isinstance(create_decryption_backend("bogus", str(temp_dir)), DirectGpgBackend)
@@ -0,0 +1,91 @@
+"""Unit tests for the persistent decryption worker."""
+
+import stat
+from pathlib import Path
+
+import pytest
+
+from src.secrets.utils.decryption_worker import DecryptionWorker
+
+
+FAKE_GPG = """#!/bin/sh
+# Last argument is the file to "decrypt"
+for last; do :; done
+case "$last" in
+    *missing*) echo "gpg: decryption failed: No secret key" >&2; exit 2;;
+esac
+cat "$last"
+"""
+
+
+class TestDecryptionWorker:
+    """Test cases for DecryptionWorker."""
+
+    @pytest.fixture
+    def fake_gpg(self, temp_dir: Path) -> str:
+        """Create a stand-in gpg binary that echoes the file contents."""
+        script = temp_dir / "fake-gpg"
+        script.write_text(FAKE_GPG)
+        script.chmod(script.stat().st_mode | stat.S_IEXEC)
+        return str(script)
+
+    @pytest.fixture
+    def worker(self, fake_gpg):
+        """Create a worker using the fake gpg binary."""
+        worker = DecryptionWorker(gpg_binary=fake_gpg)
+        yield worker
+        worker.stop()
+
+    @pytest.fixture
+    def entries(self, temp_dir: Path):
+        """Create a few fake encrypted entries."""
+        paths = []
+        for i in range(20):
+            entry = temp_dir / f"entry{i}.gpg"
+            entry.write_text(f"secret{i}\nusername: user{i}\n")
+            paths.append(str(entry))
+        return paths
+
+    def test_decrypt_single(self, worker, entries):
+        """Test decrypting a single file."""
+        success, content = worker.decrypt(entries[0])
+
+        assert success
+        assert content == "secret0\nusername: user0\n"
+
+    def test_decrypt_failure_reports_stderr(self, worker, temp_dir):
+        """Test that gpg errors are returned as the error message."""
+        missing = temp_dir / "missing.gpg"
+        missing.write_text("x")
+
+        success, message = worker.decrypt(str(missing))
+
+        assert not success
+        assert "No secret key" in message
+
+    def test_decrypt_many_uses_one_process(self, worker, entries):
+        """Test that a batch is streamed through a single worker process."""
+        worker.start()
+        pid = worker._process.pid
+
+        results = dict(worker.decrypt_many(entries))
+
+        assert worker._process.pid == pid
+        assert len(results) == len(entries)
+        assert results[entries[5]] == (True, "secret5\nusername: user5\n")
+
+    def test_abandoned_batch_does_not_desync(self, worker, entries):
+        """Test that stopping iteration early keeps the protocol aligned."""
+        batch = worker.decrypt_many(entries)
+        next(batch)
+        batch.close()
+
+        assert worker.decrypt(entries[3]) == (True, "secret3\nusername: user3\n")
+
+    def test_restarts_after_stop(self, worker, entries):
+        """Test that the worker starts again on demand after being stopped."""
+        worker.decrypt(entries[0])
+        worker.stop()
+
+        assert not worker.is_alive()
+        assert worker.decrypt(entries[1])[0]
@@ -0,0 +1,102 @@
+"""Unit tests for field-scoped search queries."""
+
+from src.secrets.utils.field_query import FieldIndex, parse_query
+from src.secrets.utils.metadata_handler import EntryMetadata, MetadataHandler
+
+
+def build_index():
+    """Index a few entries with folders, tags and content fields."""
+    index = FieldIndex()
+    index.add_path("work/github", ["prod", "code"])
+    index.add_path("work/clients/acme", ["prod"])
+    index.add_path("personal/mail")
+    index.add_path("bank")
+    index.set_content("work/github", "alice@example.com", "https://github.com/login", True)
+    index.set_content("work/clients/acme", "bob", "www.acme.example.org", False)
+    index.set_content("personal/mail", "Alice Smith", None, True)
+    return index
+
+
+class TestParseQuery:
+    """Test cases for parse_query."""
+
+    def test_field_terms_and_free_text(self):
+        """Test that known fields become terms and the rest stays text."""
+        query = parse_query('mail User:Alice -tag:old url:"git hub" foo:bar')
+
+        assert query.terms == [("user", "alice", False), ("tag", "old", True), ("url", "git hub", False)]
+        assert query.text == "mail foo:bar"
+
+    def test_aliases_and_incomplete_terms(self):
+        """Test field aliases and that empty values are left as text."""
+        query = parse_query("login:bob in:work has: is:totp")
+
+        assert query.terms == [("user", "bob", False), ("folder", "work", False), ("has", "totp", False)]
+        assert query.text == "has:"
+
+
+class TestFieldIndex:
+    """Test cases for FieldIndex."""
+
+    def test_terms_are_intersected(self):
+        """Test that every field term must match."""
+        index = build_index()
+
+        assert index.search("user:alice") == {"work/github", "personal/mail"}
+        assert index.search("user:alice folder:work") == {"work/github"}
+        assert index.search("tag:prod has:totp") == {"work/github"}
+        assert index.search("user:alice url:acme") == set()
+
+    def test_prefix_matching_on_values_and_words(self):
+        """Test prefix matches on whole values and on their words."""
+        index = build_index()
+
+        assert index.search("url:git") == {"work/github"}
+        assert index.search("url:acme.ex") == {"work/clients/acme"}
+        assert index.search("user:smi") == {"personal/mail"}
+        assert index.search('user:"alice s"') == {"personal/mail"}
+        assert index.search("folder:clients") == {"work/clients/acme"}
+        assert index.search("folder:work/cl") == {"work/clients/acme"}
+
+    def test_has_and_negation(self):
+        """Test presence checks and excluded terms."""
+        index = build_index()
+
+        assert index.search("has:url") == {"work/github", "work/clients/acme"}
+        assert index.search("has:tag -tag:code") == {"work/clients/acme"}
+        assert index.search("-has:totp") == {"work/clients/acme", "bank"}
+
+    def test_no_field_terms(self):
+        """Test that queries without field terms are left to the caller."""
+        assert build_index().search("github") is None
+
+    def test_updates_move_and_remove(self):
+        """Test that changed, moved and removed entries are re-indexed."""
+        index = build_index()
+
+        index.set_content("work/github", "carol", None, False)
+        assert index.search("user:alice") == {"personal/mail"}
+        index.move("work/github", "archive/github")
+        assert index.search("user:carol") == {"archive/github"}
+        assert index.search("tag:code folder:archive") == {"archive/github"}
+        assert index.search("folder:work") == {"work/clients/acme"}
+        index.remove("archive/github")
+        assert index.search("user:carol") == set()
+        index.clear()
+        assert index.search("has:totp") == set()
+        assert len(index) == 0
+
+    def test_tags_from_stored_metadata(self, temp_dir):
+        """Test that tags saved in the entry metadata files answer tag: queries."""
+        handler = MetadataHandler(str(temp_dir))
+        handler.set_entry_metadata("work/api", EntryMetadata(tags=["prod", "backend"]))
+        handler.set_entry_metadata("work/staging", EntryMetadata(tags=["staging"]))
+        handler.set_entry_metadata("bank", EntryMetadata(color="green"))
+        index = FieldIndex()
+        entry_tags = MetadataHandler(str(temp_dir)).get_all_entry_tags()
+        for path in ["work/api", "work/staging", "bank"]:
+            index.add_path(path, entry_tags.get(path, ()))
+
+        assert entry_tags == {"work/api": ["prod", "backend"], "work/staging": ["staging"]}
+        assert index.search("tag:prod") == {"work/api"}
+        assert index.search("has:tag") == {"work/api", "work/staging"}
@@ -0,0 +1,100 @@
+"""Unit tests for frame-budgeted UI work."""
+
+import pytest
+
+from src.secrets.utils.frame_scheduler import WorkQueue
+
+
+class FakeClock:
+    """Clock advanced by the work itself."""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def work(clock, cost, log, name):
+    """A work item that takes `cost` seconds."""
+    def run():
+        clock.now += cost
+        log.append(name)
+    return run
+
+
+class TestWorkQueue:
+    """Test cases for WorkQueue."""
+
+    def test_runs_in_order_within_budget(self):
+        """Test that work stops once the next item would exceed the budget."""
+        clock = FakeClock()
+        queue = WorkQueue(clock)
+        log = []
+        for i in range(10):
+            queue.push("row", work(clock, 0.001, log, i))
+
+        assert queue.run(0.004) == 4
+        assert log == [0, 1, 2, 3]
+        assert len(queue) == 6
+        assert queue.estimated_cost("row") == pytest.approx(0.001)
+
+    def test_at_least_one_item_per_run(self):
+        """Test that an item costlier than the budget still runs."""
+        clock = FakeClock()
+        queue = WorkQueue(clock)
+        log = []
+        queue.push("slow", work(clock, 0.010, log, "a"))
+        queue.push("slow", work(clock, 0.010, log, "b"))
+
+        assert queue.run(0.004) == 1
+        assert queue.run(0.004) == 1
+        assert log == ["a", "b"]
+
+    def test_costs_are_tracked_per_kind(self):
+        """Test that cheap work is not held back by the cost of other kinds."""
+        clock = FakeClock()
+        queue = WorkQueue(clock)
+        log = []
+        queue.push("favicon", work(clock, 0.003, log, "f1"))
+        queue.run(0.004)
+        for i in range(5):
+            queue.push("row", work(clock, 0.0005, log, i))
+        queue.push("favicon", work(clock, 0.003, log, "f2"))
+
+        queue.run(0.004)
+
+        # 2.5 ms of rows leave no room for another 3 ms favicon
+        assert log == ["f1", 0, 1, 2, 3, 4]
+        assert len(queue) == 1
+
+    def test_failing_work_does_not_stop_the_queue(self):
+        """Test that an exception in one item is logged and the rest run."""
+        clock = FakeClock()
+        queue = WorkQueue(clock)
+        log = []
+
+        def fail():
+            raise RuntimeError("boom")
+
+        queue.push("row", fail)
+        queue.push("row", work(clock, 0.0, log, "ok"))
+
+        assert queue.run(0.004) == 2
+        assert log == ["ok"]
+
+    def test_cancel_by_kind(self):
+        """Test that queued work of one kind can be dropped."""
+        clock = FakeClock()
+        queue = WorkQueue(clock)
+        log = []
+        queue.push("row", work(clock, 0.0, log, "row"))
+        queue.push("favicon", work(clock, 0.0, log, "favicon"))
+
+        queue.cancel("row")
+        queue.run(0.004)
+
+        assert log == ["favicon"]
+        queue.push("row", work(clock, 0.0, log, "row"))
+        queue.cancel()
+        assert len(queue) == 0
@@ -0,0 +1,86 @@
+"""Unit tests for fuzzy path matching."""
+
+from src.secrets.utils import fuzzy_index
+from src.secrets.utils.fuzzy_index import FuzzyPathIndex, fuzzy_score
+
+
+PATHS = [
+    "email/work",
+    "email/personal",
+    "dev/github",
+    "dev/gitlab",
+    "servers/prod/db-admin",
+    "social/mastodon",
+    "Shopping/Amazon",
+]
+
+
+class TestFuzzyScore:
+    """Test cases for fuzzy_score."""
+
+    def test_characters_must_appear_in_order(self):
+        """Test that a term matches only as an ordered subsequence."""
+        assert fuzzy_score("dev/github", "gh") is not None
+        assert fuzzy_score("dev/github", "hg") is None
+
+    def test_segment_starts_and_consecutive_characters_rank_higher(self):
+        """Test the bonuses for path segments and runs of characters."""
+        assert fuzzy_score("dev/github", "git", 4) > fuzzy_score("dev/digits", "git", 4)
+        assert fuzzy_score("servers/prod/db-admin", "adm", 13) > fuzzy_score("x/a-d-m", "adm", 2)
+
+    def test_entry_name_preferred_over_folder(self):
+        """Test that a match in the last segment beats one in a folder name."""
+        assert fuzzy_score("work/mail", "work", 5) < fuzzy_score("mail/work", "work", 5)
+
+
+class TestFuzzyPathIndex:
+    """Test cases for FuzzyPathIndex."""
+
+    def test_ranked_results(self):
+        """Test that the best match comes first."""
+        index = FuzzyPathIndex(PATHS)
+
+        results = index.search("gith")
+
+        assert [path for path, _ in results] == ["dev/github"]
+        assert [path for path, _ in index.search("git")][:2] == ["dev/github", "dev/gitlab"]
+
+    def test_all_terms_must_match(self):
+        """Test that space-separated terms are combined with AND."""
+        index = FuzzyPathIndex(PATHS)
+
+        assert [path for path, _ in index.search("email work")] == ["email/work"]
+        assert index.search("email zzz") == []
+
+    def test_case_insensitive_and_original_paths_returned(self):
+        """Test that matching ignores case but results keep the original path."""
+        index = FuzzyPathIndex(PATHS)
+
+        assert [path for path, _ in index.search("AMAZ")] == ["Shopping/Amazon"]
+
+    def test_narrowing_and_widening_queries(self):
+        """Test that results stay correct when a query is extended and shortened."""
+        index = FuzzyPathIndex(PATHS)
+
+        assert len(index.search("e")) == 5
+        assert [path for path, _ in index.search("epe")] == ["email/personal"]
+        assert [path for path, _ in index.search("epe z")] == []
+        assert len(index.search("e")) == 5
+
+    def test_limit_and_empty_query(self):
+        """Test the result limit and queries without terms."""
+        index = FuzzyPathIndex(PATHS)
+
+        assert len(index.search("e", limit=2)) == 2
+        assert index.search("   ") == []
+        assert FuzzyPathIndex().search("a") == []
+
+    def test_large_results_keep_every_match(self, monkeypatch):
+        """Test that matches beyond the scored window are still returned."""
+        monkeypatch.setattr(fuzzy_index, "RANK_LIMIT", 2)
+        index = FuzzyPathIndex(PATHS)
+
+        results = index.search("e")
+
+        assert len(results) == 5
+        assert [score for _, score in results[2:]] == [0, 0, 0]
@@ -8,7 +8,7 @@ from pathlib import Path
 
 import pytest
 
-from src.secrets.utils.gpg_utils import GPGSetupHelper
+from src.secrets.utils.gpg_utils import GPGSetupHelper, GPGSession
 
 
 class TestGPGSetupHelper:
@@ -291,4 +291,114 @@ ssb   rsa4096/STU123VWX456 2023-01-02 [E]
         ]
         
         for email in invalid_emails:
-            assert not gpg_helper._validate_email(email)
\ No newline at end of file
+            assert not gpg_helper._validate_email(email)
+
+
+class TestGPGSession:
+    """Test cases for the session-scoped GPG environment."""
+
+    @pytest.fixture
+    def agent_socket(self, temp_dir):
+        """Create a stand-in agent socket file."""
+        socket = temp_dir / "S.gpg-agent"
+        socket.write_text("")
+        return socket
+
+    @pytest.fixture
+    def session(self, temp_dir, agent_socket, monkeypatch):
+        """Create a session with the expensive setup calls mocked out."""
+        monkeypatch.setenv("GNUPGHOME", str(temp_dir))
+        with patch.object(GPGSetupHelper, "ensure_gui_pinentry"), \
+             patch.object(GPGSetupHelper, "setup_gpg_environment",
+                          side_effect=lambda: {"GNUPGHOME": os.environ["GNUPGHOME"]}) as mock_setup, \
+             patch.object(GPGSession, "_find_agent_socket", return_value=str(agent_socket)):
+            session = GPGSession()
+            session.mock_setup = mock_setup
+            yield session
+
+    def test_environment_built_once(self, session):
+        """Test that repeated calls reuse the environment."""
+        for _ in range(5):
+            session.environment()
+
+        assert session.mock_setup.call_count == 1
+
+    def test_environment_is_a_copy(self, session):
+        """Test that callers cannot modify the shared environment."""
+        session.environment()["PASSWORD_STORE_DIR"] = "/elsewhere"
+
+        assert "PASSWORD_STORE_DIR" not in session.environment()
+
+    def test_rebuilt_when_gnupghome_changes(self, session, temp_dir, monkeypatch):
+        """Test that switching GNUPGHOME rebuilds the environment."""
+        session.environment()
+        other_home = temp_dir / "other"
+        other_home.mkdir()
+        monkeypatch.setenv("GNUPGHOME", str(other_home))
+
+        assert session.environment()["GNUPGHOME"] == str(other_home)
+        assert session.mock_setup.call_count == 2
+
+    def test_rebuilt_when_agent_restarts(self, session, agent_socket):
+        """Test that a recreated agent socket rebuilds the environment."""
+        session.environment()
+        replacement = agent_socket.with_name("S.gpg-agent.new")
+        replacement.write_text("")
+        os.replace(replacement, agent_socket)
+
+        session.environment()
+
+        assert session.mock_setup.call_count == 2
+
+
+
+class TestProbeAgentCache:
+    """Test cases for GPGSetupHelper.probe_agent_cache."""
+
+    SECRET_KEYS = "\n".join([
+        "sec:u:255:22:AAAA1111AAAA1111:1700000000:::u:::scESC:::+:::ed25519:::0:",
+        "fpr:::::::::0000AAAA1111AAAA1111AAAA1111AAAA1111AAAA:",
+        "grp:::::::::PRIMARYGRIP:",
+        "uid:u::::1700000000::HASH::Test <test@example.com>::::::::::0:",
+        "ssb:u:255:18:BBBB2222BBBB2222:1700000000::::::e:::+:::cv25519::",
+        "fpr:::::::::0000BBBB2222BBBB2222BBBB2222BBBB2222BBBB:",
+        "grp:::::::::SUBKEYGRIP:",
+    ])
+
+    @staticmethod
+    def run_with(secret_keys, keyinfo):
+        """Answer gpg with the given key listing and the agent with the given KEYINFO lines."""
+        def run(command, **kwargs):
+            stdout = keyinfo if command[0] == "gpg-connect-agent" else secret_keys
+            return subprocess.CompletedProcess(command, 0, stdout=stdout, stderr="")
+        return run
+
+    @staticmethod
+    def keyinfo(keygrip, cached):
+        return f"S KEYINFO {keygrip} D - - {'1' if cached else '-'} P - - -\n"
+
+    def test_cached_encryption_subkey(self):
+        """Test that a cached encryption subkey means unlocked."""
+        with patch("subprocess.run", side_effect=self.run_with(
+                self.SECRET_KEYS, self.keyinfo("PRIMARYGRIP", False) + self.keyinfo("SUBKEYGRIP", True))):
+            assert GPGSetupHelper.probe_agent_cache(["test@example.com"], env={}) is True
+
+    def test_cached_primary_key_does_not_count(self):
+        """Test that a cached signing key leaves the encryption subkey locked."""
+        with patch("subprocess.run", side_effect=self.run_with(
+                self.SECRET_KEYS, self.keyinfo("PRIMARYGRIP", True) + self.keyinfo("SUBKEYGRIP", False))):
+            assert GPGSetupHelper.probe_agent_cache(["test@example.com"], env={}) is False
+
+    def test_no_encryption_key_for_recipients(self):
+        """Test that other cached agent keys do not count when the recipients have no secret key."""
+        with patch("subprocess.run", side_effect=self.run_with(
+                "", self.keyinfo("SUBKEYGRIP", True))):
+            assert GPGSetupHelper.probe_agent_cache(["someone@example.com"], env={}) is False
+
+    def test_uses_given_gpg_binary(self):
+        """Test that the keys are listed with the store's gpg executable."""
+        with patch("subprocess.run", side_effect=self.run_with(
+                self.SECRET_KEYS, self.keyinfo("SUBKEYGRIP", True))) as mock_run:
+            GPGSetupHelper.probe_agent_cache(["test@example.com"], env={}, gpg_binary="/usr/bin/gpg2")
+
+        assert mock_run.call_args_list[0].args[0][0] == "/usr/bin/gpg2"
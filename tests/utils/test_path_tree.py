@@ -0,0 +1,47 @@
+"""Unit tests for the path-based folder tree."""
+
+from src.secrets.utils.path_tree import PathTree
+
+
+PATHS = [
+    "email/work",
+    "email/personal",
+    "dev/github",
+    "dev/gitlab/main",
+    "dev/gitlab/ci",
+    "dev/git-old",
+    "bank",
+    "servers/prod/db/admin",
+]
+
+
+class TestPathTree:
+    """Test cases for PathTree."""
+
+    def test_root_children(self):
+        """Test that the root lists top-level folders and entries in path order."""
+        tree = PathTree(PATHS)
+
+        assert tree.children() == [("bank", False), ("dev", True), ("email", True), ("servers", True)]
+        assert len(tree) == len(PATHS)
+
+    def test_folder_children(self):
+        """Test the children of nested folders."""
+        tree = PathTree(PATHS)
+
+        assert tree.children("dev") == [("dev/git-old", False), ("dev/github", False), ("dev/gitlab", True)]
+        assert tree.children("dev/gitlab") == [("dev/gitlab/ci", False), ("dev/gitlab/main", False)]
+        assert tree.children("servers") == [("servers/prod", True)]
+
+    def test_folder_names_sharing_a_prefix(self):
+        """Test that "a" does not list the entries of "ab" or "a-b"."""
+        tree = PathTree(["a/x", "a-b/y", "ab/z", "a/sub/w"])
+
+        assert tree.children("a") == [("a/sub", True), ("a/x", False)]
+        # "-" sorts before "/", so "a-b" comes first as in a sorted path list
+        assert tree.children() == [("a-b", True), ("a", True), ("ab", True)]
+
+    def test_unknown_folder(self):
+        """Test that a folder without entries has no children."""
+        assert PathTree(PATHS).children("missing") == []
+        assert PathTree().children() == []
@@ -0,0 +1,141 @@
+"""Unit tests for the plaintext content cache."""
+
+import random
+import threading
+from unittest.mock import patch
+
+from src.secrets.utils.plaintext_cache import PlaintextCache
+
+
+class TestPlaintextCache:
+    """Test cases for PlaintextCache."""
+
+    def test_get_and_put(self):
+        """Test basic storage, hits and misses."""
+        cache = PlaintextCache()
+        cache.put("email", "hunter2")
+
+        assert cache.get("email") == "hunter2"
+        assert cache.get("missing") is None
+        assert cache.stats()['hits'] == 1
+        assert cache.stats()['misses'] == 1
+
+    def test_evicts_least_recently_used_by_bytes(self):
+        """Test that the byte budget, not the entry count, drives eviction."""
+        cache = PlaintextCache(max_bytes=30, stripes=1)
+        cache.put("a", "x" * 10)
+        cache.put("b", "x" * 10)
+        cache.put("c", "x" * 10)
+        cache.get("a")
+
+        cache.put("d", "x" * 10)
+
+        assert "b" not in cache
+        assert "a" in cache and "c" in cache and "d" in cache
+        assert cache.size_bytes == 30
+        assert cache.stats()['evictions'] == 1
+
+    def test_oversized_value_not_cached(self):
+        """Test that a value larger than a stripe's budget is skipped."""
+        cache = PlaintextCache(max_bytes=10, stripes=1)
+        cache.put("big", "x" * 11)
+
+        assert "big" not in cache
+        assert cache.size_bytes == 0
+
+    def test_ttl_expiry(self):
+        """Test that entries older than the TTL are misses."""
+        cache = PlaintextCache(ttl_seconds=10)
+        with patch("src.secrets.utils.plaintext_cache.time.monotonic", return_value=100.0):
+            cache.put("email", "hunter2")
+        with patch("src.secrets.utils.plaintext_cache.time.monotonic", return_value=105.0):
+            assert cache.get("email") == "hunter2"
+        with patch("src.secrets.utils.plaintext_cache.time.monotonic", return_value=111.0):
+            assert cache.get("email") is None
+
+        assert cache.stats()['expirations'] == 1
+        assert len(cache) == 0
+
+    def test_purge_expired_honours_changed_ttl(self):
+        """Test that shortening the TTL lets purge_expired drop old entries."""
+        cache = PlaintextCache(ttl_seconds=100)
+        with patch("src.secrets.utils.plaintext_cache.time.monotonic", return_value=0.0):
+            cache.put("old", "a")
+        with patch("src.secrets.utils.plaintext_cache.time.monotonic", return_value=50.0):
+            cache.put("new", "b")
+            cache.ttl_seconds = 30
+
+            assert cache.purge_expired() == 1
+
+        assert "old" not in cache
+        assert "new" in cache
+
+    def test_stamp_mismatch_drops_entry(self):
+        """Test that a changed stamp (file mtime) invalidates the entry."""
+        cache = PlaintextCache()
+        cache.put("email", "hunter2", stamp=1.0)
+
+        assert cache.get("email", stamp=1.0) == "hunter2"
+        assert cache.get("email", stamp=2.0) is None
+        assert "email" not in cache
+
+    def test_plaintext_wiped_on_removal(self):
+        """Test that evicted, invalidated and cleared entries are zeroed."""
+        cache = PlaintextCache(max_bytes=10, stripes=1)
+        cache.put("a", "secret")
+        evicted = cache._stripes[0].entries["a"].data
+        cache.put("b", "password")
+
+        cache.put("c", "pin")
+        invalidated = cache._stripes[0].entries["c"].data
+        cache.invalidate("c")
+
+        cache.put("d", "key")
+        cleared = cache._stripes[0].entries["d"].data
+        cache.clear()
+
+        for data in (evicted, invalidated, cleared):
+            assert data == bytearray(len(data))
+        assert len(cache) == 0
+        assert cache.size_bytes == 0
+
+    def test_concurrent_access(self):
+        """Hammer the cache from many threads and check its bookkeeping."""
+        cache = PlaintextCache(max_bytes=4096, stripes=8)
+        keys = [f"entry{i}" for i in range(200)]
+        gets = [0] * 16
+        errors = []
+
+        def worker(index):
+            rng = random.Random(index)
+            try:
+                for _ in range(2000):
+                    key = rng.choice(keys)
+                    action = rng.random()
+                    if action < 0.5:
+                        value = cache.get(key)
+                        gets[index] += 1
+                        assert value is None or value == key * (len(value) // len(key))
+                    elif action < 0.9:
+                        cache.put(key, key * rng.randint(1, 8))
+                    elif action < 0.98:
+                        cache.invalidate(key)
+                    else:
+                        cache.purge_expired()
+            except Exception as e:
+                errors.append(e)
+
+        threads = [threading.Thread(target=worker, args=(i,)) for i in range(16)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert not errors
+        for stripe in cache._stripes:
+            assert stripe.size == sum(len(entry.data) for entry in stripe.entries.values())
+            assert stripe.size <= 4096 // 8
+        stats = cache.stats()
+        assert stats['hits'] + stats['misses'] == sum(gets)
+        assert stats['bytes'] == cache.size_bytes
+        assert stats['entries'] == len(cache)
@@ -0,0 +1,107 @@
+"""Unit tests for request coalescing and the failure cache."""
+
+import threading
+import time
+from unittest.mock import patch
+
+import pytest
+
+from src.secrets.utils.single_flight import SingleFlight, FailureCache
+
+
+class TestSingleFlight:
+    """Test cases for SingleFlight."""
+
+    def test_concurrent_callers_share_one_execution(self):
+        """Test that callers arriving during a call receive its result."""
+        flights = SingleFlight()
+        started = threading.Event()
+        release = threading.Event()
+        calls = []
+
+        def slow():
+            calls.append(1)
+            started.set()
+            release.wait(5)
+            return True, "secret"
+
+        results = []
+        leader = threading.Thread(target=lambda: results.append(flights.do("email", slow)))
+        leader.start()
+        started.wait(5)
+        followers = [
+            threading.Thread(target=lambda: results.append(flights.do("email", slow)))
+            for _ in range(5)
+        ]
+        for thread in followers:
+            thread.start()
+        while flights.shared < 5:
+            time.sleep(0.001)
+        release.set()
+        for thread in [leader] + followers:
+            thread.join()
+
+        assert len(calls) == 1
+        assert results == [(True, "secret")] * 6
+        assert not flights.in_flight("email")
+
+    def test_sequential_calls_run_again(self):
+        """Test that completed calls are not cached by the flight table."""
+        flights = SingleFlight()
+        counter = iter(range(10))
+
+        assert flights.do("a", lambda: next(counter)) == 0
+        assert flights.do("a", lambda: next(counter)) == 1
+        assert flights.executions == 2
+
+    def test_exception_propagates_and_clears(self):
+        """Test that an exception reaches the caller and frees the key."""
+        flights = SingleFlight()
+
+        def fail():
+            raise OSError("gpg vanished")
+
+        with pytest.raises(OSError):
+            flights.do("a", fail)
+        assert flights.do("a", lambda: "ok") == "ok"
+
+
+class TestFailureCache:
+    """Test cases for FailureCache."""
+
+    def test_remembers_until_ttl(self):
+        """Test that failures expire after the TTL."""
+        failures = FailureCache(ttl_seconds=10)
+        with patch("src.secrets.utils.single_flight.time.monotonic", return_value=0.0):
+            failures.put("email", "No secret key")
+        with patch("src.secrets.utils.single_flight.time.monotonic", return_value=5.0):
+            assert failures.get("email") == "No secret key"
+        with patch("src.secrets.utils.single_flight.time.monotonic", return_value=10.0):
+            assert failures.get("email") is None
+        assert len(failures) == 0
+
+    def test_stamp_change_forgets_failure(self):
+        """Test that a changed file is retried."""
+        failures = FailureCache()
+        failures.put("email", "No secret key", stamp=1.0)
+
+        assert failures.get("email", stamp=1.0) == "No secret key"
+        assert failures.get("email", stamp=2.0) is None
+
+    def test_invalidate_and_clear(self):
+        """Test explicit removal."""
+        failures = FailureCache()
+        failures.put("a", "x")
+        failures.put("b", "y")
+
+        failures.invalidate("a")
+        assert failures.get("a") is None
+        failures.clear()
+        assert failures.get("b") is None
+
+    def test_disabled_with_zero_ttl(self):
+        """Test that a zero TTL disables negative caching."""
+        failures = FailureCache(ttl_seconds=0)
+        failures.put("a", "x")
+
+        assert failures.get("a") is None
@@ -0,0 +1,118 @@
+"""Unit tests for the in-memory store index."""
+
+import shutil
+from pathlib import Path
+
+import pytest
+
+from src.secrets.utils.store_index import StoreIndex
+
+
+@pytest.fixture
+def store(temp_dir: Path) -> Path:
+    """Create a small store layout."""
+    store_dir = temp_dir / "store"
+    for path in ["email", "work/vpn", "work/servers/db", "work/servers/web", "personal/bank"]:
+        entry = store_dir / (path + ".gpg")
+        entry.parent.mkdir(parents=True, exist_ok=True)
+        entry.write_text("x")
+    (store_dir / "empty").mkdir()
+    (store_dir / ".gpg-id").write_text("KEY\n")
+    (store_dir / ".git" / "objects").mkdir(parents=True)
+    (store_dir / ".git" / "ignored.gpg").write_text("x")
+    return store_dir
+
+
+@pytest.fixture
+def index(store) -> StoreIndex:
+    """Create a built index for the store."""
+    index = StoreIndex(str(store))
+    index.rebuild()
+    return index
+
+
+class TestStoreIndex:
+    """Test cases for StoreIndex."""
+
+    def test_lists_entries_and_folders(self, index):
+        """Test the initial scan, ignoring .git and non-entry files."""
+        assert index.list_entries() == [
+            "email", "personal/bank", "work/servers/db", "work/servers/web", "work/vpn"
+        ]
+        assert index.list_folders() == ["empty", "personal", "work", "work/servers"]
+
+    def test_membership_queries(self, index):
+        """Test existence and folder queries."""
+        assert index.has_entry("work/vpn")
+        assert not index.has_entry("work")
+        assert index.has_folder("work/servers")
+        assert not index.has_folder(".git")
+        assert index.entries_in("work") == ["work/vpn"]
+        assert index.entries_in("work", recursive=True) == [
+            "work/servers/db", "work/servers/web", "work/vpn"
+        ]
+        assert index.folders_in("") == ["empty", "personal", "work"]
+        assert index.has_entries_under("work")
+        assert not index.has_entries_under("empty")
+
+    def test_add_and_remove_entry(self, index):
+        """Test incremental entry updates, including new parent folders."""
+        index.add_entry("new/deep/entry")
+
+        assert index.has_entry("new/deep/entry")
+        assert "new/deep" in index.list_folders()
+
+        index.remove_entry("new/deep/entry")
+
+        assert not index.has_entry("new/deep/entry")
+        assert index.has_folder("new/deep")
+
+    def test_remove_folder_drops_subtree(self, index):
+        """Test that removing a folder forgets everything below it."""
+        index.remove_folder("work")
+
+        assert index.list_entries() == ["email", "personal/bank"]
+        assert index.list_folders() == ["empty", "personal"]
+
+    def test_add_folder_scans_contents(self, index, store):
+        """Test that a folder appearing with content is scanned."""
+        (store / "imported" / "sub").mkdir(parents=True)
+        (store / "imported" / "sub" / "site.gpg").write_text("x")
+
+        index.add_folder("imported")
+
+        assert index.has_entry("imported/sub/site")
+
+    def test_sync_folder_prunes_removed_parents(self, index, store):
+        """Test syncing after `pass rm` removed now-empty folders."""
+        shutil.rmtree(store / "personal")
+
+        index.sync_folder("personal")
+
+        assert not index.has_folder("personal")
+        assert not index.has_entry("personal/bank")
+
+    def test_sync_folder_picks_up_changes(self, index, store):
+        """Test that syncing a folder reconciles it with the disk."""
+        (store / "work" / "vpn.gpg").unlink()
+        (store / "work" / "mail.gpg").write_text("x")
+
+        index.sync_folder("work")
+
+        assert index.entries_in("work") == ["work/mail"]
+        assert index.has_entry("work/servers/db")
+
+    def test_updates_ignored_before_build(self, store):
+        """Test that an unbuilt index reads the disk when first used."""
+        index = StoreIndex(str(store))
+        index.add_entry("phantom")
+
+        assert not index.has_entry("phantom")
+        assert index.has_entry("email")
+
+    def test_missing_store(self, temp_dir):
+        """Test that a missing store yields an empty index."""
+        index = StoreIndex(str(temp_dir / "nope"))
+
+        assert index.list_entries() == []
+        assert index.list_folders() == []
@@ -0,0 +1,132 @@
+"""Unit tests for transactional bulk writes."""
+
+import os
+import shutil
+import subprocess
+from pathlib import Path
+
+import pytest
+
+from src.secrets.utils.store_transaction import StoreTransaction
+
+
+class FakeBackend:
+    """Stands in for the GPG backend; "encrypts" by adding a prefix."""
+
+    def __init__(self, fail_on=None):
+        self.fail_on = fail_on
+        self.env_factory = os.environ.copy
+
+    def encrypt_file(self, content, file_path, folder=""):
+        if self.fail_on and self.fail_on in content:
+            return False, "encryption failed"
+        Path(file_path).write_text("ENC:" + content)
+        return True, ""
+
+
+def git(store: Path, *args) -> str:
+    return subprocess.run(["git", "-C", str(store), *args], check=True,
+                          capture_output=True, text=True).stdout
+
+
+@pytest.fixture
+def store(temp_dir: Path) -> Path:
+    """Create a git-backed store with one committed entry."""
+    (temp_dir / "email.gpg").write_text("ENC:old")
+    git(temp_dir, "init", "-q")
+    git(temp_dir, "config", "user.email", "test@example.com")
+    git(temp_dir, "config", "user.name", "Test")
+    git(temp_dir, "add", "email.gpg")
+    git(temp_dir, "commit", "-q", "-m", "Initial")
+    return temp_dir
+
+
+def commit_count(store: Path) -> int:
+    return int(git(store, "rev-list", "--count", "HEAD"))
+
+
+@pytest.mark.skipif(shutil.which("git") is None, reason="git not installed")
+class TestStoreTransaction:
+    """Test cases for StoreTransaction."""
+
+    def test_commit_writes_all_entries_in_one_git_commit(self, store):
+        """Test that every entry is encrypted, written and committed once."""
+        committed = []
+        transaction = StoreTransaction(str(store), FakeBackend(), on_commit=committed.extend)
+        for i in range(20):
+            transaction.insert(f"imported/site{i}", f"pw{i}")
+        transaction.insert("email", "new")
+
+        success, message = transaction.commit()
+
+        assert success, message
+        assert (store / "imported" / "site7.gpg").read_text() == "ENC:pw7"
+        assert (store / "email.gpg").read_text() == "ENC:new"
+        assert commit_count(store) == 2
+        assert git(store, "status", "--porcelain") == ""
+        assert git(store, "log", "-1", "--format=%s") == "Add 21 passwords to store.\n"
+        assert sorted(committed) == sorted(transaction.inserted)
+        assert not [p for p in store.rglob("*") if p.suffix in (".staged", ".bak", ".tmp")]
+
+    def test_existing_entries_skipped_without_force(self, store):
+        """Test that force=False leaves existing entries alone."""
+        transaction = StoreTransaction(str(store), FakeBackend())
+        accepted, _ = transaction.insert("email", "new", force=False)
+        transaction.insert("bank", "pw", force=False)
+
+        assert not accepted
+        assert transaction.commit()[0]
+        assert transaction.skipped == ["email"]
+        assert transaction.inserted == ["bank"]
+        assert (store / "email.gpg").read_text() == "ENC:old"
+
+    def test_invalid_paths_rejected(self, store):
+        """Test that paths escaping the store are refused."""
+        transaction = StoreTransaction(str(store), FakeBackend())
+
+        assert not transaction.insert("../outside", "pw")[0]
+        assert not transaction.insert("/etc/passwd", "pw")[0]
+        assert len(transaction) == 0
+
+    def test_encryption_failure_writes_nothing(self, store):
+        """Test that one failed encryption leaves the store untouched."""
+        transaction = StoreTransaction(str(store), FakeBackend(fail_on="bad"), max_workers=2)
+        transaction.insert("email", "new")
+        transaction.insert("work/vpn", "bad")
+        transaction.insert("work/db", "pw")
+
+        success, message = transaction.commit()
+
+        assert not success
+        assert "work/vpn" in message
+        assert (store / "email.gpg").read_text() == "ENC:old"
+        assert not (store / "work").exists()
+        assert commit_count(store) == 1
+
+    def test_git_failure_rolls_back(self, store):
+        """Test that a rejected commit restores files and the git index."""
+        hook = store / ".git" / "hooks" / "pre-commit"
+        hook.write_text("#!/bin/sh\nexit 1\n")
+        hook.chmod(0o755)
+        transaction = StoreTransaction(str(store), FakeBackend())
+        transaction.insert("email", "new")
+        transaction.insert("bank", "pw")
+
+        success, _ = transaction.commit()
+
+        assert not success
+        assert (store / "email.gpg").read_text() == "ENC:old"
+        assert not (store / "bank.gpg").exists()
+        assert git(store, "status", "--porcelain") == ""
+        assert not transaction.committed
+
+    def test_progress_reported(self, temp_dir):
+        """Test progress callbacks, also for stores without git."""
+        progress = []
+        transaction = StoreTransaction(str(temp_dir), FakeBackend())
+        for i in range(5):
+            transaction.insert(f"site{i}", "pw")
+
+        assert transaction.commit(progress_callback=lambda done, total: progress.append((done, total)))[0]
+        assert progress == [(i, 5) for i in range(1, 6)]
+        assert transaction.commit()[0] is False
@@ -0,0 +1,86 @@
+"""Unit tests for reload diffs."""
+
+from src.secrets.utils.tree_diff import diff_tree, entry_fingerprints, splice_ops
+
+
+class TestDiffTree:
+    """Test cases for diff_tree."""
+
+    def test_added_removed_and_changed(self):
+        """Test entries compared by path and fingerprint."""
+        old = {"a": (1, 1), "b": (2, 2), "c": (3, 3)}
+        new = {"a": (1, 1), "c": (3, 4), "d": (5, 5)}
+
+        diff = diff_tree(old, new)
+
+        assert diff.added == ["d"]
+        assert diff.removed == ["b"]
+        assert diff.changed == ["c"]
+        assert diff.moved == {}
+
+    def test_moves_are_matched_by_fingerprint(self):
+        """Test that a renamed file is a move, unless its fingerprint is ambiguous."""
+        old = {"work/a": (1, 1), "x": (7, 7), "y": (7, 7)}
+        new = {"archive/a": (1, 1), "z": (7, 7)}
+
+        diff = diff_tree(old, new)
+
+        assert diff.moved == {"work/a": "archive/a"}
+        assert diff.added == ["z"]
+        assert diff.removed == ["x", "y"]
+
+    def test_metadata_and_folders(self):
+        """Test metadata changes (followed across moves) and folder changes."""
+        old = {"a": (1, 1), "b": (2, 2), "c": (3, 3)}
+        new = {"a": (1, 1), "b": (2, 2), "d/c": (3, 3)}
+        old_metadata = {"a": {"color": "red"}, "b": {"color": "red"}, "c": {"color": "red"}}
+        new_metadata = {"a": {"color": "red"}, "b": {"color": "blue"}, "d/c": {"color": "green"}}
+
+        diff = diff_tree(old, new, ["e"], ["d"], old_metadata, new_metadata)
+
+        assert diff.metadata_changed == ["b", "d/c"]
+        assert diff.folders_added == ["d"]
+        assert diff.folders_removed == ["e"]
+
+    def test_no_changes(self):
+        """Test that identical loads give an empty diff."""
+        entries = {"a": (1, 1)}
+        assert not diff_tree(entries, dict(entries), ["f"], ["f"], {"a": {}}, {"a": {}})
+
+
+class TestEntryFingerprints:
+    """Test cases for entry_fingerprints."""
+
+    def test_missing_files_have_no_fingerprint(self, tmp_path):
+        """Test fingerprints of present and missing ciphertext files."""
+        (tmp_path / "site.gpg").write_bytes(b"cipher")
+
+        fingerprints = entry_fingerprints(str(tmp_path), ["site", "gone"])
+
+        assert fingerprints["site"][0] == 6
+        assert fingerprints["gone"] is None
+
+
+class TestSpliceOps:
+    """Test cases for splice_ops."""
+
+    def apply(self, old, new):
+        """Apply the splices for old -> new to a copy of old."""
+        items = list(old)
+        for position, n_removals, additions in splice_ops(old, new):
+            items[position:position + n_removals] = additions
+        return items
+
+    def test_splices_turn_old_into_new(self):
+        """Test that applying the splices in order gives the new list."""
+        old = ["a", "b", "c", "d", "e"]
+        new = ["a", "x", "c", "e", "f", "g"]
+
+        assert self.apply(old, new) == new
+        assert self.apply([], new) == new
+        assert self.apply(old, []) == []
+
+    def test_only_differences_are_spliced(self):
+        """Test that unchanged items are left alone."""
+        assert splice_ops(["a", "b"], ["a", "b"]) == []
+        assert splice_ops(["a", "c"], ["a", "b", "c"]) == [(1, 0, ["b"])]